@@ -0,0 +1,393 @@
+"""Offline benchmarks of the client-side overhead of the CLI.
+
+AWS is never reached: clients are stubbed with botocore's `Stubber`. Each
+benchmark measures a time in seconds, the best of several repeats, or a
+count of API calls. Results are written to `results.json` and compared
+against `baseline.json`, and the run fails when a time regresses by more
+than the tolerance or a count grows, or when there is no baseline.
+
+Usage:
+    nox -s benchmarks                     # compare against the baseline
+    nox -s benchmarks -- --save-baseline  # record a new baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess  # noqa: S404
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from unittest import mock
+
+import boto3
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from sych_llm_playground.providers.aws import deploy
+from sych_llm_playground.providers.aws.emulate import create_emulator
+from sych_llm_playground.providers.aws.utils import resources
+from sych_llm_playground.providers.aws.utils.invocation import build_chat_payload
+from sych_llm_playground.providers.aws.utils.invocation import build_predict_payload
+from sych_llm_playground.providers.aws.utils.invocation import gateway_invoker
+from sych_llm_playground.providers.aws.utils.invocation import invoke_endpoint
+from sych_llm_playground.providers.aws.utils.invocation import parse_chat_response
+from sych_llm_playground.providers.aws.utils.invocation import parse_predict_response
+from sych_llm_playground.utils.provider_selection import functions_mapping
+
+
+BENCHMARKS_DIR = Path(__file__).parent
+RESULTS_FILE = BENCHMARKS_DIR / "results.json"
+BASELINE_FILE = BENCHMARKS_DIR / "baseline.json"
+
+REGION = "us-east-1"
+
+# Regressions of times smaller than this many seconds are treated as noise.
+NOISE_FLOOR = 0.001
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def make_client(service: str) -> Any:
+    """Create a client that never reaches AWS."""
+    return boto3.client(
+        service,
+        region_name=REGION,
+        aws_access_key_id="x",
+        aws_secret_access_key="x",
+    )
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator[None]:
+    """Silence the loader and the output of the code being measured."""
+    with mock.patch.multiple(
+        resources, start_loader=mock.DEFAULT, stop_loader=mock.DEFAULT
+    ), mock.patch.multiple(
+        deploy, start_loader=mock.DEFAULT, stop_loader=mock.DEFAULT
+    ), contextlib.redirect_stdout(
+        io.StringIO()
+    ):
+        yield
+
+
+def best_of(
+    func: Callable[[], Any],
+    setup: Optional[Callable[[], None]] = None,
+    repeat: int = 5,
+) -> float:
+    """Return the best time of several runs of a function.
+
+    Args:
+        func (Callable[[], Any]): The function to time.
+        setup (Optional[Callable[[], None]]): Run, untimed, before each run.
+        repeat (int): The number of runs.
+
+    Returns:
+        float: The best time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_get_resources(count: int = 10_000) -> Results:
+    """Time listing endpoints, uncached and cached."""
+    client = make_client("sagemaker")
+    stubber = Stubber(client)
+    endpoints = {
+        "Endpoints": [
+            {
+                "EndpointName": f"sych-llm-pg-meta-textgeneration-llama-2-7b-e-{i}",
+                "EndpointArn": f"arn:aws:sagemaker:{REGION}:123456789012:endpoint/{i}",
+                "CreationTime": "2023-08-19T00:00:00Z",
+                "LastModifiedTime": "2023-08-19T00:00:00Z",
+                "EndpointStatus": "InService",
+            }
+            for i in range(count)
+        ]
+    }
+
+    def setup() -> None:
+        resources.invalidate_resources()
+        stubber.add_response("list_endpoints", endpoints)
+
+    def list_endpoints() -> None:
+        listed = resources.get_resources("Endpoint", client, max_results=count)
+        if len(listed) != count:
+            raise RuntimeError(f"Listed {len(listed)} of {count} endpoints")
+
+    with quiet(), stubber, mock.patch.dict(os.environ, AWS_DEFAULT_REGION=REGION):
+        uncached = best_of(list_endpoints, setup)
+        cached = best_of(list_endpoints)
+
+    return {
+        f"get_resources[{count} endpoints]": {"value": uncached, "unit": "s"},
+        f"get_resources[{count} endpoints, cached]": {"value": cached, "unit": "s"},
+    }
+
+
+def _stub_invocation(stubber: Stubber, response: Any) -> None:
+    """Queue a response of the SageMaker Runtime client."""
+    body = json.dumps(response).encode("utf-8")
+    stubber.add_response(
+        "invoke_endpoint", {"Body": StreamingBody(io.BytesIO(body), len(body))}
+    )
+
+
+def bench_invocation_payloads(lengths: Optional[List[int]] = None) -> Results:
+    """Time building, sending and decoding predict and chat payloads."""
+    client = make_client("sagemaker-runtime")
+    stubber = Stubber(client)
+    results: Results = {}
+
+    with stubber:
+        prompt = "I believe the meaning of life is " * 50
+        predict_response = [{"generation": prompt}]
+
+        def predict() -> None:
+            payload = build_predict_payload(prompt)
+            parse_predict_response(invoke_endpoint("endpoint", payload, client))
+
+        results["predict"] = {
+            "value": best_of(
+                predict, lambda: _stub_invocation(stubber, predict_response)
+            ),
+            "unit": "s",
+        }
+
+        for length in lengths or [1, 10, 100, 1000]:
+            history = [
+                {
+                    "role": "user" if i % 2 == 0 else "assistant",
+                    "content": f"Message {i} of the conversation. " * 20,
+                }
+                for i in range(length)
+            ]
+            chat_response = [
+                {"generation": {"role": "assistant", "content": history[-1]["content"]}}
+            ]
+
+            def chat(history: List[Dict[str, str]] = history) -> None:
+                payload = build_chat_payload(history)
+                parse_chat_response(invoke_endpoint("endpoint", payload, client))
+
+            def setup(response: Any = chat_response) -> None:
+                _stub_invocation(stubber, response)
+
+            results[f"chat[{length} messages]"] = {
+                "value": best_of(chat, setup),
+                "unit": "s",
+            }
+
+    return results
+
+
+def bench_gateway_compression(lengths: Optional[List[int]] = None) -> Results:
+    """Measure bytes on the wire and latency of chats through an API Gateway.
+
+    The gateway is the local emulator, which decompresses requests and
+    compresses responses like the APIs created by `deploy`.
+    """
+    server = create_emulator("127.0.0.1", 0, time_to_first_token=0, token_delay=0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/prod/predict"
+    results: Results = {}
+
+    try:
+        with quiet():
+            for length in lengths or [10, 100, 1000]:
+                payload = build_chat_payload(
+                    [
+                        {"role": "user", "content": f"Message {i} of the chat. " * 20}
+                        for i in range(length)
+                    ]
+                )
+                for compress in (False, True):
+                    name = f"gateway_chat[{length} messages, gzip={compress}]"
+                    invoke = gateway_invoker(url, compress=compress)
+                    sent = server.bytes_received
+                    invoke(payload)
+                    results[f"{name}[bytes]"] = {
+                        "value": server.bytes_received - sent,
+                        "unit": "bytes",
+                    }
+
+                    def chat(
+                        invoke: Callable[[Any], Any] = invoke, payload: Any = payload
+                    ) -> None:
+                        invoke(payload)
+
+                    results[name] = {"value": best_of(chat), "unit": "s"}
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    return results
+
+
+def bench_create_api_gateway() -> Results:
+    """Count and time the API Gateway calls made by a deployment."""
+    client = make_client("apigateway")
+    stubber = Stubber(client)
+    calls: List[str] = []
+    client.meta.events.register(
+        "provide-client-params.apigateway.*",
+        lambda model, **kwargs: calls.append(model.name),
+    )
+
+    def setup() -> None:
+        calls.clear()
+        stubber.add_response("create_rest_api", {"id": "a1b2c3d4e5"})
+        stubber.add_response("get_resources", {"items": [{"id": "root"}]})
+        stubber.add_response("create_resource", {"id": "predict"})
+        stubber.add_response("put_method", {})
+        stubber.add_response("put_integration", {})
+        for _ in range(4):
+            stubber.add_response("put_method_response", {})
+        for _ in range(4):
+            stubber.add_response("put_integration_response", {})
+        stubber.add_response("create_deployment", {})
+
+    def create() -> None:
+        deploy.create_api_gateway(
+            "endpoint", "arn:aws:iam::123456789012:role/sagemaker"
+        )
+
+    with quiet(), stubber, mock.patch.object(
+        deploy, "get_client", return_value=client
+    ), mock.patch.dict(os.environ, AWS_DEFAULT_REGION=REGION):
+        elapsed = best_of(create, setup)
+
+    return {
+        "create_api_gateway": {"value": elapsed, "unit": "s"},
+        "create_api_gateway[calls]": {"value": len(calls), "unit": "calls"},
+    }
+
+
+def bench_import_time(repeat: int = 3) -> Results:
+    """Time importing the CLI and the provider module of each subcommand.
+
+    Each import runs in a fresh interpreter, so the times include its
+    startup, but not credential loading or any AWS client creation.
+    """
+    results: Results = {}
+    for command, path in functions_mapping["AWS"].items():
+        module = "sych_llm_playground." + path.rsplit(".", 1)[0]
+        code = f"import sych_llm_playground.__main__, {module}"
+
+        def run(code: str = code) -> None:
+            subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+        results[f"import_time[{command}]"] = {
+            "value": best_of(run, repeat=repeat),
+            "unit": "s",
+        }
+    return results
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """Compare results against a baseline.
+
+    Args:
+        results (Results): The results of this run.
+        baseline (Results): The baseline results.
+        tolerance (float): Maximum ratio of a time to its baseline.
+
+    Returns:
+        List[str]: The regressions.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        value, expected = result["value"], baseline[name]["value"]
+        if result["unit"] in ("calls", "bytes"):
+            regressed = value > expected
+        else:
+            regressed = value > expected * tolerance and value - expected > NOISE_FLOOR
+        if regressed:
+            regressions.append(
+                f"{name}: {value:.6g} {result['unit']} "
+                + f"(baseline {expected:.6g} {result['unit']})"
+            )
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmarks, and compare or save the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Save the results as the new baseline.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Maximum ratio of a time to its baseline (default: 1.25).",
+    )
+    args = parser.parse_args()
+
+    results: Results = {}
+    benchmarks: List[Callable[[], Results]] = [
+        bench_get_resources,
+        bench_invocation_payloads,
+        bench_gateway_compression,
+        bench_create_api_gateway,
+        bench_import_time,
+    ]
+    for benchmark in benchmarks:
+        results.update(benchmark())
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+    for name, result in results.items():
+        print(f"{name:<45} {result['value']:>12.6g} {result['unit']}")
+
+    RESULTS_FILE.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        BASELINE_FILE.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline saved to {BASELINE_FILE}.")
+        return
+
+    if not BASELINE_FILE.exists():
+        print(
+            f"\nNo baseline at {BASELINE_FILE} to compare against, "
+            + "record one with --save-baseline.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    baseline = json.loads(BASELINE_FILE.read_text())["benchmarks"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        print("\n".join(f"  {regression}" for regression in regressions))
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
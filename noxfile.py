@@ -169,6 +169,13 @@ def tests(session: Session) -> None:
             session.notify("coverage", posargs=[])
 
 
+@session(python=python_versions[0])
+def benchmarks(session: Session) -> None:
+    """Run the offline benchmarks and compare them against the baseline."""
+    session.install(".")
+    session.run("python", "benchmarks/run.py", *session.posargs)
+
+
 @session(python=python_versions[0])
 def coverage(session: Session) -> None:
     """Produce the coverage report."""
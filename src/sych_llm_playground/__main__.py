@@ -4,13 +4,37 @@ This module provides the main entry point for sych_llm_playground,
 a command-line tool to manage and interact with language models in the cloud.
 """
 
+import time
+from typing import Optional
+
 import click
 
 from .cleanup import cleanup
+from .compare import compare
 from .configure import configure
 from .deploy import deploy
+from .emulate import emulate
+from .hibernate import hibernate
 from .interact import interact
 from .list import list
+from .loadgen import loadgen
+from .resume import resume
+from .serve import serve
+from .shell import shell
+from .submit import submit
+from .sweep import sweep
+from .transform import transform
+from .update import update
+from .utils.metrics import enable_metrics
+from .utils.metrics import export_metrics
+from .utils.metrics import gauge
+
+
+LAST_RUN = gauge(
+    "sych_llm_pg_last_run_timestamp_seconds",
+    "Unix time at which a command last finished.",
+    ["command"],
+)
 
 
 @click.group(
@@ -23,9 +47,35 @@ from .list import list
     )  # Replace with your actual shortened URL
 )
 @click.version_option()
-def main() -> None:
-    """Main command-line interface function for sych_llm_playground."""
-    pass
+@click.option(
+    "--metrics",
+    "metrics_target",
+    metavar="PATH",
+    help=(
+        "Write metrics in the Prometheus text format to PATH, e.g. for the "
+        "node-exporter textfile collector, or to stdout with '-'."
+    ),
+)
+@click.pass_context
+def main(ctx: click.Context, metrics_target: Optional[str]) -> None:
+    """Main command-line interface function for sych_llm_playground.
+
+    Args:
+        ctx (click.Context): The context of the command.
+        metrics_target (Optional[str]): The file metrics are written to
+            when the command finishes, or "-" for stdout.
+    """
+    if not metrics_target:
+        return
+
+    enable_metrics()
+    command = ctx.invoked_subcommand or ""
+
+    def write_metrics() -> None:
+        LAST_RUN.set(time.time(), command=command)
+        export_metrics(metrics_target)
+
+    ctx.call_on_close(write_metrics)
 
 
 main.add_command(configure)
@@ -33,6 +83,17 @@ main.add_command(deploy)
 main.add_command(list)
 main.add_command(cleanup)
 main.add_command(interact)
+main.add_command(shell)
+main.add_command(serve)
+main.add_command(submit)
+main.add_command(transform)
+main.add_command(emulate)
+main.add_command(loadgen)
+main.add_command(sweep)
+main.add_command(compare)
+main.add_command(update)
+main.add_command(hibernate)
+main.add_command(resume)
 
 if __name__ == "__main__":
     main(prog_name="sych_llm_playground")  # pragma: no cover
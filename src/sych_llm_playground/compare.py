@@ -0,0 +1,94 @@
+"""Module to compare deployed models side by side.
+
+This module provides a CLI command that sends the same prompts to several
+deployed models in parallel and shows their responses side by side, with
+the latency and throughput of every model.
+
+Functions:
+    compare: CLI function to compare deployed models.
+"""
+
+from typing import Optional
+from typing import Tuple
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Compare the responses of several deployed models.")
+@click.option(
+    "--prompt",
+    "prompts",
+    multiple=True,
+    help="A prompt to send to every model. Repeat for several.",
+)
+@click.option(
+    "--prompts",
+    "prompt_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="A text file with one prompt per line.",
+)
+@click.option(
+    "--max-new-tokens",
+    default=256,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of tokens generated per response.",
+)
+@click.option(
+    "--top-p",
+    default=0.9,
+    show_default=True,
+    type=click.FloatRange(min=0, max=1),
+    help="top_p of the generations.",
+)
+@click.option(
+    "--temperature",
+    default=0.6,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Temperature of the generations.",
+)
+@click.option(
+    "--width",
+    type=click.IntRange(min=20),
+    help="Width of the side-by-side output. Defaults to the terminal width.",
+)
+@click.option(
+    "--output",
+    "output_file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the result of every request to a JSONL file.",
+)
+def compare(
+    prompts: Tuple[str, ...],
+    prompt_file: Optional[str],
+    max_new_tokens: int,
+    top_p: float,
+    temperature: float,
+    width: Optional[int],
+    output_file: Optional[str],
+) -> None:
+    """Compare deployed models side by side with the chosen provider.
+
+    Args:
+        prompts (Tuple[str, ...]): The prompts to send to every model.
+        prompt_file (Optional[str]): A text file with one prompt per line.
+        max_new_tokens (int): Maximum number of generated tokens.
+        top_p (float): The top_p of the generations.
+        temperature (float): The temperature of the generations.
+        width (Optional[int]): The width of the side-by-side output.
+        output_file (Optional[str]): A JSONL file the result of every
+            request is written to.
+    """
+    select_provider_and_call_function(
+        "compare",
+        prompts=[*prompts],
+        prompt_file=prompt_file,
+        max_new_tokens=max_new_tokens,
+        top_p=top_p,
+        temperature=temperature,
+        width=width,
+        output_file=output_file,
+    )
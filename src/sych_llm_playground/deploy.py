@@ -7,17 +7,242 @@ the provider-specific function through the
 `utils.provider_selection` module.
 """
 
+from typing import Optional
+
 import click
 
 from .utils.provider_selection import select_provider_and_call_function
 
 
 @click.command(help="Deploy models.")
-def deploy() -> None:
+@click.option(
+    "--async",
+    "async_inference",
+    is_flag=True,
+    help="Deploy an asynchronous endpoint, invoked through S3 with 'submit'.",
+)
+@click.option(
+    "--max-concurrent-invocations",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Requests an instance of an asynchronous endpoint processes at a time.",
+)
+@click.option(
+    "--scale-to-zero",
+    is_flag=True,
+    help="Let an asynchronous endpoint scale in to zero instances when idle.",
+)
+@click.option(
+    "--components",
+    is_flag=True,
+    help="Pack several models onto one shared endpoint as inference components.",
+)
+@click.option(
+    "--instance-type",
+    default="ml.g5.12xlarge",
+    show_default=True,
+    help="Instance type of the shared endpoint.",
+)
+@click.option(
+    "--instance-count",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of instances of the shared endpoint.",
+)
+@click.option(
+    "--copies",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of copies of every model on the shared endpoint.",
+)
+@click.option(
+    "--refresh-artifacts",
+    is_flag=True,
+    help="Resolve the JumpStart artifacts again instead of using the cache.",
+)
+@click.option(
+    "--warmup",
+    is_flag=True,
+    help="Warm up the endpoint and its API until their latency stabilizes.",
+)
+@click.option(
+    "--warmup-payloads",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSONL file of representative payloads to warm up with.",
+)
+@click.option(
+    "--warmup-concurrency",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Highest number of concurrent warm-up requests.",
+)
+@click.option(
+    "--trace",
+    "trace_file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the timeline of the deployment to a Chrome trace file.",
+)
+@click.option(
+    "--gateway",
+    default="rest",
+    show_default=True,
+    type=click.Choice(["rest", "http"]),
+    help=(
+        "Type of the API Gateway. HTTP APIs have a lower latency and cost "
+        "but no cache or usage plans."
+    ),
+)
+@click.option(
+    "--regions",
+    envvar="SYCH_LLM_PG_REGIONS",
+    help=(
+        "Comma-separated regions to deploy the model to concurrently, "
+        "e.g. us-east-1,eu-west-1."
+    ),
+)
+@click.option(
+    "--gateway-cache",
+    type=click.Choice(["0.5", "1.6", "6.1", "13.5", "28.4", "58.2", "118", "237"]),
+    help=(
+        "Cache responses of the API in a cache cluster of this size in GB. "
+        "Clients must send the SHA-256 of the body in X-Sych-Body-SHA256."
+    ),
+)
+@click.option(
+    "--gateway-cache-ttl",
+    default=300,
+    show_default=True,
+    type=click.IntRange(0, 3600),
+    help="Seconds for which the API caches responses.",
+)
+@click.option(
+    "--gateway-rate-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Requests per second allowed by the API.",
+)
+@click.option(
+    "--gateway-burst-limit",
+    type=click.IntRange(min=0),
+    help="Requests allowed in a burst by the API.",
+)
+@click.option(
+    "--gateway-quota",
+    type=click.IntRange(min=1),
+    help="Requests per day allowed by a usage plan with an API key.",
+)
+def deploy(
+    async_inference: bool,
+    max_concurrent_invocations: int,
+    scale_to_zero: bool,
+    components: bool,
+    instance_type: str,
+    instance_count: int,
+    copies: int,
+    refresh_artifacts: bool,
+    warmup: bool,
+    warmup_payloads: Optional[str],
+    warmup_concurrency: int,
+    trace_file: Optional[str],
+    gateway: str,
+    regions: Optional[str],
+    gateway_cache: Optional[str],
+    gateway_cache_ttl: int,
+    gateway_rate_limit: Optional[float],
+    gateway_burst_limit: Optional[int],
+    gateway_quota: Optional[int],
+) -> None:
     """Deploy the selected model with the chosen provider.
 
     This function prompts the user to select a provider.
     It handles the deployment process by calling the
     provider-specific function.
+
+    Args:
+        async_inference (bool): Whether to deploy an asynchronous endpoint.
+        max_concurrent_invocations (int): Maximum number of requests an
+            instance of an asynchronous endpoint processes at a time.
+        scale_to_zero (bool): Whether an asynchronous endpoint scales in
+            to zero instances when idle.
+        components (bool): Whether to pack several models onto a shared
+            endpoint as inference components.
+        instance_type (str): The instance type of the shared endpoint.
+        instance_count (int): The number of instances of the shared endpoint.
+        copies (int): The number of copies of every model.
+        refresh_artifacts (bool): Whether to resolve the JumpStart artifacts
+            again instead of using the cache.
+        warmup (bool): Whether to warm up the endpoint and its API.
+        warmup_payloads (Optional[str]): A JSONL file of payloads to warm
+            up with.
+        warmup_concurrency (int): The highest concurrency of the warm-up.
+        trace_file (Optional[str]): A file to write the timeline of the
+            deployment to, in the Chrome trace format.
+        gateway (str): The type of the API Gateway, "rest" or "http".
+        regions (Optional[str]): Comma-separated regions to deploy to.
+        gateway_cache (Optional[str]): The size in GB of the cache cluster
+            of the API, if any.
+        gateway_cache_ttl (int): Seconds for which responses are cached.
+        gateway_rate_limit (Optional[float]): Requests per second allowed
+            by the API.
+        gateway_burst_limit (Optional[int]): Requests allowed in a burst
+            by the API.
+        gateway_quota (Optional[int]): Requests per day allowed by a usage
+            plan with an API key.
+
+    Raises:
+        UsageError: If the options cannot be combined.
     """
-    select_provider_and_call_function("deploy")
+    if scale_to_zero and not async_inference:
+        raise click.UsageError("--scale-to-zero requires --async.")
+    if components and async_inference:
+        raise click.UsageError("--components cannot be combined with --async.")
+    if warmup and (async_inference or components):
+        raise click.UsageError(
+            "--warmup cannot be combined with --async or --components."
+        )
+    gateway_options = (
+        gateway_cache,
+        gateway_rate_limit,
+        gateway_burst_limit,
+        gateway_quota,
+    )
+    if (async_inference or components) and (
+        gateway != "rest" or any(option is not None for option in gateway_options)
+    ):
+        raise click.UsageError(
+            "--gateway options cannot be combined with --async or --components."
+        )
+    if regions and (async_inference or components or warmup):
+        raise click.UsageError(
+            "--regions cannot be combined with --async, --components or --warmup."
+        )
+    if gateway == "http" and (gateway_cache or gateway_quota):
+        raise click.UsageError(
+            "--gateway-cache and --gateway-quota require --gateway rest."
+        )
+
+    select_provider_and_call_function(
+        "deploy",
+        async_inference=async_inference,
+        max_concurrent_invocations=max_concurrent_invocations,
+        scale_to_zero=scale_to_zero,
+        components=components,
+        instance_type=instance_type,
+        instance_count=instance_count,
+        copies=copies,
+        refresh_artifacts=refresh_artifacts,
+        warmup=warmup,
+        warmup_payloads=warmup_payloads,
+        warmup_concurrency=warmup_concurrency,
+        trace_file=trace_file,
+        gateway=gateway,
+        regions=regions,
+        gateway_cache=gateway_cache,
+        gateway_cache_ttl=gateway_cache_ttl,
+        gateway_rate_limit=gateway_rate_limit,
+        gateway_burst_limit=gateway_burst_limit,
+        gateway_quota=gateway_quota,
+    )
@@ -0,0 +1,116 @@
+"""Module to emulate deployed models locally.
+
+This module provides a CLI command that runs a local stand-in for the
+SageMaker Runtime and the API Gateway of deployed Llama models, with a
+configurable latency model, for development and load testing.
+
+Functions:
+    emulate: CLI function to run the local endpoint emulator.
+"""
+
+from typing import Optional
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Emulate deployed models locally for development and testing.")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Host to bind.")
+@click.option("--port", default=8080, show_default=True, help="Port to bind.")
+@click.option(
+    "--ttft",
+    "time_to_first_token",
+    default=0.2,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds before the first generated token.",
+)
+@click.option(
+    "--token-delay",
+    default=0.02,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds between consecutive generated tokens.",
+)
+@click.option(
+    "--jitter",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(min=0, max=1),
+    help="Maximum relative deviation of every delay, e.g. 0.1 for 10%.",
+)
+@click.option(
+    "--max-tokens",
+    default=32,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of tokens of a generation.",
+)
+@click.option(
+    "--error-rate",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(min=0, max=1),
+    help="Share of invocations failing with the injected error.",
+)
+@click.option(
+    "--error",
+    default="throttling",
+    show_default=True,
+    type=click.Choice(["throttling", "model", "unavailable", "internal"]),
+    help="The injected error.",
+)
+@click.option(
+    "--max-concurrency",
+    type=click.IntRange(min=1),
+    help="Maximum number of concurrent invocations, others are throttled.",
+)
+@click.option(
+    "--queue-timeout",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds an invocation waits for a free slot before being throttled.",
+)
+def emulate(
+    host: str,
+    port: int,
+    time_to_first_token: float,
+    token_delay: float,
+    jitter: float,
+    max_tokens: int,
+    error_rate: float,
+    error: str,
+    max_concurrency: Optional[int],
+    queue_timeout: float,
+) -> None:
+    """Run a local emulator of deployed models with the chosen provider.
+
+    Args:
+        host (str): The host to bind to.
+        port (int): The port to bind to.
+        time_to_first_token (float): Seconds before the first token.
+        token_delay (float): Seconds between consecutive tokens.
+        jitter (float): Maximum relative deviation of every delay.
+        max_tokens (int): Maximum number of tokens of a generation.
+        error_rate (float): Share of invocations failing with the injected error.
+        error (str): The injected error.
+        max_concurrency (Optional[int]): Maximum number of concurrent
+            invocations.
+        queue_timeout (float): Seconds an invocation waits for a free slot
+            before being throttled.
+    """
+    select_provider_and_call_function(
+        "emulate",
+        host=host,
+        port=port,
+        time_to_first_token=time_to_first_token,
+        token_delay=token_delay,
+        jitter=jitter,
+        max_tokens=max_tokens,
+        error_rate=error_rate,
+        error=error,
+        max_concurrency=max_concurrency,
+        queue_timeout=queue_timeout,
+    )
@@ -0,0 +1,19 @@
+"""Module to hibernate deployed endpoints.
+
+This module provides a CLI command that deletes a deployed endpoint while
+keeping its model, configuration and API Gateway, so it can be resumed
+later without a full redeploy.
+
+Functions:
+    hibernate: CLI function to hibernate a deployed endpoint.
+"""
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Delete an endpoint, keeping it to resume later.")
+def hibernate() -> None:
+    """Hibernate a deployed endpoint with the chosen provider."""
+    select_provider_and_call_function("hibernate")
@@ -7,17 +7,70 @@ Functions:
     interact: CLI function to interact with deployed models.
 """
 
+from typing import Optional
+
 import click
 
 from .utils.provider_selection import select_provider_and_call_function
 
 
 @click.command(help="Communicate with deployed models.")
-def interact() -> None:
+@click.option(
+    "--resume",
+    metavar="SESSION_ID",
+    help="Resume a previous chat session instead of choosing an endpoint.",
+)
+@click.option(
+    "--balance",
+    type=click.Choice(["least-outstanding", "p2c"]),
+    help="Balance requests across all endpoints of the same model.",
+)
+@click.option(
+    "--deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds after which a request to the model fails.",
+)
+@click.option(
+    "--hedge-percentile",
+    type=click.FloatRange(min=0, max=100),
+    help="Send a duplicate request when a request has not answered "
+    + "after this percentile of observed latency.",
+)
+@click.option(
+    "--regions",
+    envvar="SYCH_LLM_PG_REGIONS",
+    metavar="REGIONS",
+    help="Comma-separated regions to choose the endpoint from. Requests are "
+    + "sent to the region with the lowest round-trip time.",
+)
+def interact(
+    resume: Optional[str],
+    balance: Optional[str],
+    deadline: Optional[float],
+    hedge_percentile: Optional[float],
+    regions: Optional[str],
+) -> None:
     """Interact with deployed models on the cloud.
 
     This function allows users to select and interact with
     models, delegating specific provider handling to the
     `select_provider_and_call_function` method.
+
+    Args:
+        resume (Optional[str]): The ID of a chat session to resume.
+        balance (Optional[str]): A routing policy to balance requests
+            across all endpoints of the selected endpoint's model.
+        deadline (Optional[float]): Seconds after which a request fails.
+        hedge_percentile (Optional[float]): Percentile of observed latency
+            after which a duplicate request is sent.
+        regions (Optional[str]): Comma-separated regions to choose the
+            endpoint from.
     """
-    select_provider_and_call_function("interact")
+    select_provider_and_call_function(
+        "interact",
+        resume=resume,
+        balance=balance,
+        deadline=deadline,
+        hedge_percentile=hedge_percentile,
+        regions=regions,
+    )
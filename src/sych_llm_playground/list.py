@@ -7,19 +7,30 @@ Functions:
     list: CLI function to list deployed resources with the selected provider.
 """
 
+from typing import Optional
+
 import click
 
 from .utils.provider_selection import select_provider_and_call_function
 
 
 @click.command(help="Display deployed resources.")
-def list() -> None:
+@click.option(
+    "--regions",
+    envvar="SYCH_LLM_PG_REGIONS",
+    help="Comma-separated regions to list resources in, concurrently.",
+)
+def list(regions: Optional[str]) -> None:
     """List deployed resources with the chosen provider.
 
     This function prompts the user to select a provider.
     Then, it retrieves and prints the names of deployed resources.
+
+    Args:
+        regions (Optional[str]): Comma-separated regions to list resources
+            in. Defaults to the region of the credentials.
     """
-    select_provider_and_call_function("list")
+    select_provider_and_call_function("list", regions=regions)
 
 
 if __name__ == "__main__":
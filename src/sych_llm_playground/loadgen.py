@@ -0,0 +1,165 @@
+"""Module to generate open-loop load against deployed models.
+
+This module provides a CLI command that sends requests to a deployed model
+at a target arrival rate, or replays a recorded trace, and reports the
+latency of the model against the offered load.
+
+Functions:
+    loadgen: CLI function to generate load against a deployed model.
+"""
+
+from typing import Optional
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Generate open-loop load against a deployed model.")
+@click.option(
+    "--arrival",
+    default="poisson",
+    show_default=True,
+    type=click.Choice(["constant", "poisson", "step"]),
+    help="Arrival process of the requests. 'step' ramps up the rate.",
+)
+@click.option(
+    "--rate",
+    default=1.0,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Requests per second, of the first step of a ramp.",
+)
+@click.option(
+    "--duration",
+    default=60.0,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds of the test, or of every step of a ramp.",
+)
+@click.option(
+    "--step-rate",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Requests per second added by every step of a ramp. Defaults to --rate.",
+)
+@click.option(
+    "--steps",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of steps of a ramp.",
+)
+@click.option(
+    "--trace",
+    "trace_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help=(
+        "Replay a JSONL trace of requests with a 'timestamp' and "
+        "'prompt_words' instead of generating arrivals."
+    ),
+)
+@click.option(
+    "--prompt-words",
+    default=128,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of words of every prompt.",
+)
+@click.option(
+    "--max-new-tokens",
+    default=64,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of tokens generated per request.",
+)
+@click.option(
+    "--max-in-flight",
+    default=256,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of requests in flight.",
+)
+@click.option(
+    "--window",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds of every point of the reported load curve.",
+)
+@click.option(
+    "--url",
+    help="Send the load to an API Gateway URL instead of choosing an endpoint.",
+)
+@click.option(
+    "--payload-format",
+    default="predict",
+    show_default=True,
+    type=click.Choice(["predict", "chat"]),
+    help="Payload format of the model behind --url.",
+)
+@click.option(
+    "--api-key",
+    envvar="SYCH_LLM_PG_API_KEY",
+    help="API key of the API Gateway behind --url, if it has a usage plan.",
+)
+@click.option(
+    "--output",
+    "output_file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the result of every request to a JSONL file.",
+)
+@click.option("--seed", type=int, help="Seed of the Poisson arrivals.")
+def loadgen(
+    arrival: str,
+    rate: float,
+    duration: float,
+    step_rate: Optional[float],
+    steps: int,
+    trace_file: Optional[str],
+    prompt_words: int,
+    max_new_tokens: int,
+    max_in_flight: int,
+    window: Optional[float],
+    url: Optional[str],
+    payload_format: str,
+    output_file: Optional[str],
+    seed: Optional[int],
+    api_key: Optional[str],
+) -> None:
+    """Generate open-loop load against a deployed model with the chosen provider.
+
+    Args:
+        arrival (str): The arrival process, "constant", "poisson" or "step".
+        rate (float): Requests per second, of the first step of a ramp.
+        duration (float): Seconds of the test, or of every step of a ramp.
+        step_rate (Optional[float]): Requests per second added by every
+            step of a ramp.
+        steps (int): The number of steps of a ramp.
+        trace_file (Optional[str]): A recorded trace to replay instead.
+        prompt_words (int): The number of words of every prompt.
+        max_new_tokens (int): Maximum number of generated tokens.
+        max_in_flight (int): Maximum number of requests in flight.
+        window (Optional[float]): Seconds of every point of the load curve.
+        url (Optional[str]): An API Gateway URL to send the load to.
+        payload_format (str): The payload format of the model behind the URL.
+        output_file (Optional[str]): A JSONL file the result of every
+            request is written to.
+        seed (Optional[int]): Seed of the Poisson arrivals.
+        api_key (Optional[str]): The API key of the API Gateway behind the URL.
+    """
+    select_provider_and_call_function(
+        "loadgen",
+        arrival=arrival,
+        rate=rate,
+        duration=duration,
+        step_rate=step_rate,
+        steps=steps,
+        trace_file=trace_file,
+        prompt_words=prompt_words,
+        max_new_tokens=max_new_tokens,
+        max_in_flight=max_in_flight,
+        window=window,
+        url=url,
+        payload_format=payload_format,
+        output_file=output_file,
+        seed=seed,
+        api_key=api_key,
+    )
@@ -1,23 +1,33 @@
 """Module for cleaning up deployed resources on AWS.
 
 This module provides functions to delete deployed resources such as models,
-endpoints, and API Gateways from the cloud. It includes functions to
-select resources and initiate their cleanup.
+endpoints, and API Gateways, REST or HTTP APIs, from the cloud. It includes functions to
+select resources and initiate their cleanup. Hibernated endpoints are cleaned
+up by deleting their endpoint configuration and dropping their record.
 
 Functions:
     choose_resource: Helps the user select a resource for deletion.
     cleanup_resource: Deletes the selected resource.
+    cleanup_hibernated: Deletes a hibernated endpoint.
     cleanup: Main function for cleaning up resources.
 """
 
-import boto3
+import os
+
 import click
 import inquirer
 
 from ...utils.loader import start_loader
 from ...utils.loader import stop_loader
+from .utils.clients import get_client
 from .utils.credentials import load_credentials
+from .utils.gateway import delete_usage_plans
+from .utils.hibernation import choose_hibernated
+from .utils.hibernation import drop_hibernation
+from .utils.http_api import delete_http_api
+from .utils.resources import RESOURCE_SERVICES
 from .utils.resources import choose_resource
+from .utils.resources import invalidate_resources
 
 
 def cleanup_resource(resource_type: str) -> None:
@@ -29,13 +39,10 @@ def cleanup_resource(resource_type: str) -> None:
 
     Args:
         resource_type (str): The type of resource to delete
-            (e.g., "Model", "Endpoint", "API Gateway").
+            (e.g., "Model", "Endpoint", "Inference Component", "API Gateway",
+            "HTTP API").
     """
-    client = (
-        boto3.client("sagemaker")
-        if resource_type != "API Gateway"
-        else boto3.client("apigateway")
-    )
+    client = get_client(RESOURCE_SERVICES.get(resource_type, "sagemaker"))
     selected_resource = choose_resource(resource_type, client, "cleanup")
 
     try:
@@ -46,9 +53,23 @@ def cleanup_resource(resource_type: str) -> None:
             client.delete_model(ModelName=selected_resource["name"])
         elif resource_type == "Endpoint":
             client.delete_endpoint(EndpointName=selected_resource["name"])
+            # A record left behind by an interrupted hibernation would
+            # otherwise resume the endpoint.
+            drop_hibernation(
+                selected_resource["name"], os.environ["AWS_DEFAULT_REGION"]
+            )
+        elif resource_type == "Inference Component":
+            client.delete_inference_component(
+                InferenceComponentName=selected_resource["name"]
+            )
         elif resource_type == "API Gateway":
+            delete_usage_plans(client, selected_resource["id"])
             client.delete_rest_api(restApiId=selected_resource["id"])
+        elif resource_type == "HTTP API":
+            # Also deletes the proxy function of the API.
+            delete_http_api(client, get_client("lambda"), selected_resource)
         stop_loader(loader_thread)
+        invalidate_resources(resource_type)
 
     except Exception as e:
         stop_loader(loader_thread)
@@ -60,6 +81,36 @@ def cleanup_resource(resource_type: str) -> None:
     click.secho(f"{resource_type} cleaned up successfully. \n", fg="green")
 
 
+def cleanup_hibernated() -> None:
+    """Delete a selected hibernated endpoint from AWS.
+
+    The endpoint configuration is deleted and the record of the endpoint is
+    dropped, so it can no longer be resumed. Its model and API Gateway are
+    cleaned up as models and API Gateways.
+    """
+    region = os.environ["AWS_DEFAULT_REGION"]
+    record = choose_hibernated(region, "cleanup")
+
+    try:
+        loader_thread = start_loader(
+            message="Deleting selected hibernated endpoint...", color="green"
+        )
+        get_client("sagemaker").delete_endpoint_config(
+            EndpointConfigName=record["endpoint_config"]
+        )
+        drop_hibernation(record["endpoint_name"], region)
+        stop_loader(loader_thread)
+
+    except Exception as e:
+        stop_loader(loader_thread)
+        click.secho(
+            f"An error occurred while deleting hibernated endpoints: {e}", fg="red"
+        )
+        exit(1)
+
+    click.secho("Hibernated Endpoint cleaned up successfully. \n", fg="green")
+
+
 def cleanup() -> None:
     """Main function for cleaning up AWS resources.
 
@@ -77,7 +128,10 @@ def cleanup() -> None:
             choices=[
                 "Model",
                 "Endpoint",
+                "Inference Component",
                 "API Gateway",
+                "HTTP API",
+                "Hibernated Endpoint",
             ],
         ),
     ]
@@ -85,4 +139,7 @@ def cleanup() -> None:
     answers = inquirer.prompt(questions)
     selected_option = answers["cleanup_options"]
 
-    cleanup_resource(selected_option)
+    if selected_option == "Hibernated Endpoint":
+        cleanup_hibernated()
+    else:
+        cleanup_resource(selected_option)
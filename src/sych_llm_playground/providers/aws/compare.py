@@ -0,0 +1,221 @@
+"""This module compares deployed models on AWS side by side.
+
+The same prompts are sent to several chosen endpoints, or inference
+components of shared endpoints, in parallel, and their responses are shown
+side by side with the latency and throughput of every model.
+
+Functions:
+    choose_targets: Choose the endpoints and inference components to compare.
+    print_comparison: Print the responses of the models to a prompt.
+    print_comparison_summary: Print the latency and throughput of every model.
+    compare: Main function to compare deployed models.
+"""
+
+import json
+import shutil
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import click
+import inquirer
+
+from .interact import INTERACTION_FUNCTIONS
+from .utils.clients import get_client
+from .utils.compare import Target
+from .utils.compare import compare_prompt
+from .utils.compare import side_by_side
+from .utils.compare import summarize_comparison
+from .utils.components import is_shared_endpoint
+from .utils.components import model_id_from_component
+from .utils.credentials import load_credentials
+from .utils.invocation import endpoint_invoker
+from .utils.resources import get_resources
+from .utils.resources import model_id_from_endpoint
+from .utils.sweep import read_prompts
+
+
+def _candidates() -> List[Tuple[str, str, Optional[str], str]]:
+    """List the endpoints and inference components of supported models.
+
+    Returns:
+        List[Tuple[str, str, Optional[str], str]]: The model ID, endpoint,
+            inference component, if any, and interaction type of every
+            candidate.
+    """
+    sagemaker_client = get_client("sagemaker")
+    endpoints = get_resources("Endpoint", sagemaker_client)
+    models: List[Tuple[Optional[str], str, Optional[str]]] = [
+        (model_id_from_endpoint(endpoint["name"]), endpoint["name"], None)
+        for endpoint in endpoints
+        if not is_shared_endpoint(endpoint["name"])
+    ]
+    if any(is_shared_endpoint(endpoint["name"]) for endpoint in endpoints):
+        models.extend(
+            (
+                model_id_from_component(component["name"]),
+                component["endpoint"],
+                component["name"],
+            )
+            for component in get_resources("Inference Component", sagemaker_client)
+        )
+
+    candidates = []
+    for model_id, endpoint_name, component_name in models:
+        interaction_function = INTERACTION_FUNCTIONS.get(model_id or "")
+        if model_id and interaction_function:
+            candidates.append(
+                (model_id, endpoint_name, component_name, interaction_function.__name__)
+            )
+    return candidates
+
+
+def choose_targets() -> List[Target]:
+    """Choose the endpoints and inference components to compare.
+
+    Models are labelled by their model ID, or by the name of their endpoint
+    or component when several of the chosen ones serve the same model.
+
+    Returns:
+        List[Target]: The chosen models, at least two.
+    """
+    candidates = _candidates()
+    if len(candidates) < 2:
+        click.secho("At least two deployed models are needed to compare. \n", fg="red")
+        exit(1)
+
+    questions = [
+        inquirer.Checkbox(
+            "targets",
+            message="Select the models to compare",
+            choices=[
+                (component or endpoint, index)
+                for index, (_, endpoint, component, _) in enumerate(candidates)
+            ],
+        ),
+    ]
+    chosen = [candidates[index] for index in inquirer.prompt(questions)["targets"]]
+    if len(chosen) < 2:
+        click.secho("Select at least two models to compare. \n", fg="red")
+        exit(1)
+
+    model_ids = [model_id for model_id, _, _, _ in chosen]
+    return [
+        (
+            model_id if model_ids.count(model_id) == 1 else component or endpoint,
+            endpoint_invoker(endpoint, component),
+            kind,
+        )
+        for model_id, endpoint, component, kind in chosen
+    ]
+
+
+def print_comparison(prompt: str, results: List[Dict[str, Any]], width: int) -> None:
+    """Print the responses of the models to a prompt side by side.
+
+    Args:
+        prompt (str): The prompt.
+        results (List[Dict[str, Any]]): The results of `compare_prompt`.
+        width (int): The width of the output.
+    """
+    click.secho(f"Prompt: {prompt}\n", fg="blue")
+    click.secho(
+        side_by_side(
+            [f"{result['target']} ({result['latency']:.2f}s)" for result in results],
+            width,
+        ),
+        fg="green",
+    )
+    click.secho(
+        side_by_side(
+            [
+                f"Error: {result['error']}" if result["error"] else result["output"]
+                for result in results
+            ],
+            width,
+        ),
+        fg="white",
+    )
+    click.secho("\n", nl=False)
+
+
+def print_comparison_summary(rows: List[Dict[str, Any]]) -> None:
+    """Print the latency and throughput of every model.
+
+    Args:
+        rows (List[Dict[str, Any]]): The rows of `summarize_comparison`.
+    """
+    label_width = max(len("model"), *(len(row["target"]) for row in rows))
+    click.secho(
+        f"{'model':<{label_width}} {'requests':>8} {'latency':>9} {'p90':>9} "
+        + f"{'tokens':>7} {'tokens/s':>9} {'errors':>6}",
+        fg="yellow",
+    )
+    for row in rows:
+        latency = f"{row['latency']:8.2f}s" if row["latency"] is not None else "-"
+        p90 = f"{row['p90']:8.2f}s" if row["p90"] is not None else "-"
+        tokens = (
+            f"{row['output_tokens']:.0f}" if row["output_tokens"] is not None else "-"
+        )
+        throughput = (
+            f"{row['tokens_per_second']:.1f}"
+            if row["tokens_per_second"] is not None
+            else "-"
+        )
+        click.echo(
+            f"{row['target']:<{label_width}} {row['requests']:>8} {latency:>9} "
+            + f"{p90:>9} {tokens:>7} {throughput:>9} {row['errors']:>6}"
+        )
+    click.secho("\n", nl=False)
+
+
+def compare(
+    prompts: List[str],
+    prompt_file: Optional[str],
+    max_new_tokens: int,
+    top_p: float,
+    temperature: float,
+    width: Optional[int],
+    output_file: Optional[str],
+) -> None:
+    """Main function to compare deployed models on AWS side by side.
+
+    Args:
+        prompts (List[str]): The prompts to send to every model.
+        prompt_file (Optional[str]): A text file with more prompts, one per
+            line.
+        max_new_tokens (int): Maximum number of generated tokens.
+        top_p (float): The top_p of the generations.
+        temperature (float): The temperature of the generations.
+        width (Optional[int]): The width of the output. Defaults to the
+            width of the terminal.
+        output_file (Optional[str]): A JSONL file the result of every
+            request is written to.
+    """
+    prompts = [*prompts, *(read_prompts(prompt_file) if prompt_file else [])]
+    if not prompts:
+        click.secho("No prompts to send. \n", fg="red")
+        exit(1)
+
+    load_credentials()
+    targets = choose_targets()
+    parameters = {
+        "max_new_tokens": max_new_tokens,
+        "top_p": top_p,
+        "temperature": temperature,
+    }
+    width = width or shutil.get_terminal_size().columns
+
+    results: List[Dict[str, Any]] = []
+    for index, prompt in enumerate(prompts):
+        prompt_results = compare_prompt(targets, prompt, parameters)
+        print_comparison(prompt, prompt_results, width)
+        results.extend({**result, "prompt": index} for result in prompt_results)
+
+    if output_file:
+        with open(output_file, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    print_comparison_summary(summarize_comparison(targets, results))
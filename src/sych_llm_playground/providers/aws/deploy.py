@@ -8,6 +8,14 @@ animation provided by the `start_loader` and `stop_loader` functions from
 the `utils.loader` module.
 
 Functions:
+    create_http_api: Create an HTTP API in front of an endpoint.
+    warm_up_deployment: Warm up a new endpoint and its API Gateway.
+    create_endpoint_config: Create the configuration of a single-model endpoint.
+    report_trace: Write the trace of a deployment and summarize it.
+    deploy_endpoint: Create a model and its endpoint in a region.
+    deploy_model: Deploy the selected model to its own endpoint.
+    deploy_to_regions: Deploy the selected model to several regions.
+    deploy_components: Deploy models as inference components of a shared endpoint.
     deploy: Main function that orchestrates the deployment process.
 
 Usage:
@@ -29,20 +37,78 @@ Dependencies:
 
 import os
 import time
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 
-import boto3
 import click
 import inquirer
-from sagemaker.jumpstart.model import JumpStartModel
+from sagemaker import production_variant
 
 from ...utils.loader import start_loader
 from ...utils.loader import stop_loader
+from ...utils.metrics import counter
+from ...utils.metrics import histogram
+from ...utils.tracing import Tracer
+from ...utils.tracing import annotate
+from ...utils.tracing import span
+from ...utils.tracing import start_tracing
+from ...utils.tracing import stop_tracing
+from .interact import interaction_type
+from .submit import read_payloads
+from .utils.artifacts import build_model
+from .utils.artifacts import invalidate_artifacts
+from .utils.artifacts import resolve_artifacts
+from .utils.async_inference import build_async_inference_config
+from .utils.async_inference import enable_scale_to_zero
+from .utils.clients import get_client
+from .utils.clients import get_sagemaker_session
+from .utils.components import SHARED_ENDPOINT_PREFIX
+from .utils.components import add_inference_component
+from .utils.components import component_env
+from .utils.components import create_shared_endpoint
+from .utils.components import unfit_models
+from .utils.components import wait_for_status
 from .utils.credentials import load_credentials
+from .utils.gateway import BODY_HASH_HEADER
+from .utils.gateway import DEFAULT_CACHE_TTL
+from .utils.gateway import STAGE_NAME
+from .utils.gateway import caching_enabled
+from .utils.gateway import create_usage_plan
+from .utils.gateway import stage_patch_operations
+from .utils.http_api import INTEGRATION_TIMEOUT_MS
+from .utils.http_api import PROXY_FUNCTION_TAG
+from .utils.http_api import create_proxy_function
+from .utils.http_api import invoke_url
+from .utils.http_api import proxy_function_name
+from .utils.invocation import GATEWAY_MIN_COMPRESSION_SIZE
+from .utils.invocation import endpoint_invoker
+from .utils.invocation import gateway_invoker
+from .utils.regions import fan_out
+from .utils.regions import parse_regions
+from .utils.resources import invalidate_resources
+from .utils.warmup import MAX_ROUNDS
+from .utils.warmup import default_warmup_payloads
+from .utils.warmup import warm_up
 
 
+# Seconds between polls of the status of a new endpoint or component.
+ENDPOINT_POLL_INTERVAL = 10.0
+
+DEPLOY_CALLS = counter(
+    "sych_llm_pg_deploy_calls_total",
+    "AWS calls made while deploying a gateway, by service, call and outcome.",
+    ["service", "call", "outcome"],
+)
+DEPLOY_CALL_SECONDS = histogram(
+    "sych_llm_pg_deploy_call_seconds",
+    "Seconds spent in AWS calls while deploying a gateway, by service and call.",
+    ["service", "call"],
+)
+
 # List of supported supported models
 MODEL_CHOICES: List[Tuple[str, Dict[str, str]]] = [
     (
@@ -97,79 +163,106 @@ questions: List[inquirer.List] = [
     ),
 ]
 
+component_questions: List[inquirer.Checkbox] = [
+    inquirer.Checkbox(
+        "models",
+        message="Select the model ids to pack onto a shared endpoint:",
+        choices=MODEL_CHOICES,
+    ),
+]
+
+
+def _execute_task(
+    start_message: str,
+    color: str,
+    action: Callable[[], Any],
+    stop_message: Optional[str] = None,
+    service: str = "apigateway",
+) -> Any:
+    """Executes a given task with a loading animation.
 
-def create_api_gateway(endpoint_name: str, iam_role_arn: str) -> str:
+    Args:
+        start_message (str): Message to display alongside
+            the start of the loading animation.
+        color (str): Text color for the loading animation.
+        action (Callable[[], Any]): Function to execute.
+            Takes no arguments, returns result.
+        stop_message (Optional[str], optional): Message to
+            display after stopping the loader. Defaults to None.
+        service (str): The AWS service the action calls, labelling its
+            metrics. Defaults to API Gateway.
+
+    Returns:
+        Any: Result of executing the action.
+    """
+    call = start_message.rstrip(".")
+    try:
+        loader_thread = start_loader(message=start_message, color=color)
+        with span(call), DEPLOY_CALL_SECONDS.time(service=service, call=call):
+            result = action()
+        DEPLOY_CALLS.inc(service=service, call=call, outcome="ok")
+        stop_loader(
+            loader_thread,
+            message=stop_message,
+        )
+        return result
+    except Exception as e:
+        DEPLOY_CALLS.inc(service=service, call=call, outcome="error")
+        stop_loader(
+            loader_thread,
+            message=stop_message,
+        )
+        click.secho(
+            f"An error occurred: {e}",
+            fg="red",
+        )
+        exit(1)
+
+
+def create_api_gateway(
+    endpoint_name: str,
+    iam_role_arn: str,
+    settings: Optional[Dict[str, Any]] = None,
+    region: Optional[str] = None,
+) -> Tuple[str, Optional[str]]:
     """Creates a REST API using AWS API Gateway for a specified SageMaker endpoint.
 
     This function performs tasks like creating the REST API, defining
     resources, methods, integration with the SageMaker endpoint, and
     deploying the API to the "prod" stage. It also handles specific
-    headers and response codes mapping.
+    headers and response codes mapping, and enables gzip compression of
+    large request and response bodies. The stage cache, throttling and
+    usage plan are configured from the gateway settings.
 
     :param endpoint_name: Name of the SageMaker endpoint.
     :param iam_role_arn: ARN of the IAM role with required permissions.
-    :return: The URL of the deployed API, accessible via HTTPS POST.
+    :param settings: Gateway settings, see `utils.gateway`.
+    :param region: Region of the endpoint, defaults to the region of the
+        credentials.
+    :return: The URL of the deployed API, accessible via HTTPS POST, and
+        the API key of its usage plan, if any.
 
     Note: The URL is in the format
     `https://<API-ID>.execute-api.<REGION>.amazonaws.com/prod/predict`.
     """
-    region = os.environ["AWS_DEFAULT_REGION"]
-    client = boto3.client("apigateway")
-
-    from typing import Any
-    from typing import Callable
-    from typing import Optional
-
-    def execute_task(
-        start_message: str,
-        color: str,
-        action: Callable[[], Any],
-        stop_message: Optional[str] = None,
-    ) -> Any:
-        """Executes a given task with a loading animation.
-
-        Args:
-            start_message (str): Message to display alongside
-                the start of the loading animation.
-            color (str): Text color for the loading animation.
-            action (Callable[[], Any]): Function to execute.
-                Takes no arguments, returns result.
-            stop_message (Optional[str], optional): Message to
-                display after stopping the loader. Defaults to None.
-
-        Returns:
-            Any: Result of executing the action.
-        """
-        try:
-            loader_thread = start_loader(message=start_message, color=color)
-            result = action()
-            stop_loader(
-                loader_thread,
-                message=stop_message,
-            )
-            return result
-        except Exception as e:
-            stop_loader(
-                loader_thread,
-                message=stop_message,
-            )
-            click.secho(
-                f"An error occurred: {e}",
-                fg="red",
-            )
-            exit(1)
+    region = region or os.environ["AWS_DEFAULT_REGION"]
+    client = get_client("apigateway", region)
+    settings = settings or {}
+    cache = caching_enabled(settings)
 
-    api_id = execute_task(
+    api_id = _execute_task(
         "Creating a REST API...",
         "green",
         lambda: client.create_rest_api(
             name=f"sych-llm-pg-api-{endpoint_name}",
             description="API for SageMaker endpoint " + endpoint_name,
+            # Compress large bodies, e.g. of chats resending their history.
+            minimumCompressionSize=GATEWAY_MIN_COMPRESSION_SIZE,
         )["id"],
         "Created REST API",
     )
 
-    root_resource_id = execute_task(
+    root_resource_id = _execute_task(
         "Fetching REST API...",
         "green",
         lambda: client.get_resources(restApiId=api_id,)["items"][
@@ -178,7 +271,7 @@ def create_api_gateway(endpoint_name: str, iam_role_arn: str) -> str:
         "Fetched REST API",
     )
 
-    resource_id = execute_task(
+    resource_id = _execute_task(
         "Creating API resources...",
         "green",
         lambda: client.create_resource(
@@ -189,7 +282,25 @@ def create_api_gateway(endpoint_name: str, iam_role_arn: str) -> str:
         "Created API resources",
     )
 
-    execute_task(
+    # The body hash is part of the cache key, so it is required with a cache.
+    validator = (
+        {
+            "requestValidatorId": _execute_task(
+                "Creating a request validator...",
+                "green",
+                lambda: client.create_request_validator(
+                    restApiId=api_id,
+                    name="sych-llm-pg-request-parameters",
+                    validateRequestParameters=True,
+                )["id"],
+                "Created a request validator",
+            )
+        }
+        if cache
+        else {}
+    )
+
+    _execute_task(
         "Creating a POST method...",
         "green",
         lambda: client.put_method(
@@ -197,16 +308,19 @@ def create_api_gateway(endpoint_name: str, iam_role_arn: str) -> str:
             resourceId=resource_id,
             httpMethod="POST",
             authorizationType="NONE",
+            apiKeyRequired=bool(settings.get("quota")),
             requestParameters={
                 # Header used to pass custom attributes to models.
                 # Also required by Llama 2 to accept EULA.
-                "method.request.header.custom_attributes": True
+                "method.request.header.custom_attributes": True,
+                f"method.request.header.{BODY_HASH_HEADER}": cache,
             },
+            **validator,
         ),
         "Created a POST method",
     )
 
-    execute_task(
+    _execute_task(
         "Creating API integration with the Sagemaker endpoint...",
         "green",
         lambda: client.put_integration(
@@ -227,6 +341,17 @@ def create_api_gateway(endpoint_name: str, iam_role_arn: str) -> str:
                     "method.request.header.custom_attributes"
             },
             # fmt: on
+            **(
+                {
+                    "cacheNamespace": resource_id,
+                    "cacheKeyParameters": [
+                        "method.request.header.custom_attributes",
+                        f"method.request.header.{BODY_HASH_HEADER}",
+                    ],
+                }
+                if cache
+                else {}
+            ),
         ),
         "Created API Integration with SageMaker endpoint",
     )
@@ -255,7 +380,7 @@ def create_api_gateway(endpoint_name: str, iam_role_arn: str) -> str:
                 statusCode=status_code,
             )
 
-        execute_task(
+        _execute_task(
             f"Creating method response for {status_code}...",
             "green",
             action_method_response,
@@ -277,43 +402,500 @@ def create_api_gateway(endpoint_name: str, iam_role_arn: str) -> str:
                 responseTemplates={"application/json": ""},
             )
 
-        execute_task(
+        _execute_task(
             f"Creating API integration response for {status_code}...",
             "green",
             action_integration_response,
             "",
         )
 
-    execute_task(
+    _execute_task(
         "Deploying the API...",
         "green",
         lambda: client.create_deployment(
             restApiId=api_id,
-            stageName="prod",
+            stageName=STAGE_NAME,
+            **(
+                {
+                    "cacheClusterEnabled": True,
+                    "cacheClusterSize": settings["cache_size"],
+                }
+                if cache
+                else {}
+            ),
         ),
         "API Deployed \n",
     )
 
+    patch_operations = stage_patch_operations(settings)
+    if patch_operations:
+        _execute_task(
+            "Configuring the stage cache and throttling...",
+            "green",
+            lambda: client.update_stage(
+                restApiId=api_id,
+                stageName=STAGE_NAME,
+                patchOperations=patch_operations,
+            ),
+            "Configured the stage cache and throttling",
+        )
+
+    api_key = (
+        _execute_task(
+            "Creating a usage plan...",
+            "green",
+            lambda: create_usage_plan(
+                client, api_id, f"sych-llm-pg-api-{endpoint_name}", settings
+            ),
+            "Created a usage plan",
+        )
+        if settings.get("quota")
+        else None
+    )
+
     url = f"https://{api_id}.execute-api.{region}.amazonaws.com/prod/predict"
     click.secho(
         f"Public API HTTP (POST) URL: {url} \n",
         fg="yellow",
     )
+    if api_key:
+        click.secho(
+            f"API key (send it in the x-api-key header): {api_key} \n",
+            fg="yellow",
+        )
+
+    return url, api_key
+
+
+def create_http_api(
+    endpoint_name: str,
+    iam_role_arn: str,
+    settings: Optional[Dict[str, Any]] = None,
+    region: Optional[str] = None,
+) -> str:
+    """Create an HTTP API (API Gateway v2) for a SageMaker endpoint.
+
+    HTTP APIs cannot integrate with SageMaker directly, so the
+    `POST /predict` route of the API proxies to a Lambda function
+    invoking the endpoint, see `utils.http_api`. The API is deployed to
+    the "prod" stage, throttled from the gateway settings.
+
+    Args:
+        endpoint_name (str): The name of the SageMaker endpoint.
+        iam_role_arn (str): The ARN of the IAM role of the proxy function.
+        settings (Optional[Dict[str, Any]]): Gateway settings, of which
+            only the throttling applies to HTTP APIs.
+        region (Optional[str]): The region of the endpoint. Defaults to the
+            region of the credentials.
+
+    Returns:
+        str: The URL of the deployed API, accessible via HTTPS POST, in the
+            same format as the URL of a REST API.
+    """
+    region = region or os.environ["AWS_DEFAULT_REGION"]
+    client = get_client("apigatewayv2", region)
+    lambda_client = get_client("lambda", region)
+    settings = settings or {}
+
+    function_arn = _execute_task(
+        "Creating a proxy function...",
+        "green",
+        lambda: create_proxy_function(lambda_client, endpoint_name, iam_role_arn),
+        "Created a proxy function",
+        service="lambda",
+    )
+
+    api = _execute_task(
+        "Creating an HTTP API...",
+        "green",
+        lambda: client.create_api(
+            Name=f"sych-llm-pg-api-{endpoint_name}",
+            Description="API for SageMaker endpoint " + endpoint_name,
+            ProtocolType="HTTP",
+            Tags={PROXY_FUNCTION_TAG: proxy_function_name(endpoint_name)},
+        ),
+        "Created HTTP API",
+        service="apigatewayv2",
+    )
+    api_id = api["ApiId"]
+
+    integration_id = _execute_task(
+        "Creating API integration with the proxy function...",
+        "green",
+        lambda: client.create_integration(
+            ApiId=api_id,
+            IntegrationType="AWS_PROXY",
+            IntegrationUri=function_arn,
+            PayloadFormatVersion="2.0",
+            TimeoutInMillis=INTEGRATION_TIMEOUT_MS,
+        )["IntegrationId"],
+        "Created API integration with the proxy function",
+        service="apigatewayv2",
+    )
+
+    _execute_task(
+        "Creating a POST route...",
+        "green",
+        lambda: client.create_route(
+            ApiId=api_id,
+            RouteKey="POST /predict",
+            Target=f"integrations/{integration_id}",
+        ),
+        "Created a POST route",
+        service="apigatewayv2",
+    )
+
+    account_id = function_arn.split(":")[4]
+    _execute_task(
+        "Allowing the API to invoke the proxy function...",
+        "green",
+        lambda: lambda_client.add_permission(
+            FunctionName=function_arn,
+            StatementId=f"sych-llm-pg-api-{api_id}",
+            Action="lambda:InvokeFunction",
+            Principal="apigateway.amazonaws.com",
+            SourceArn=f"arn:aws:execute-api:{region}:{account_id}:{api_id}/*/*/predict",
+        ),
+        "Allowed the API to invoke the proxy function",
+        service="lambda",
+    )
+
+    throttling = {
+        key: settings[setting]
+        for key, setting in (
+            ("ThrottlingRateLimit", "rate_limit"),
+            ("ThrottlingBurstLimit", "burst_limit"),
+        )
+        if settings.get(setting) is not None
+    }
+    _execute_task(
+        "Deploying the API...",
+        "green",
+        lambda: client.create_stage(
+            ApiId=api_id,
+            StageName=STAGE_NAME,
+            AutoDeploy=True,
+            **({"DefaultRouteSettings": throttling} if throttling else {}),
+        ),
+        "API Deployed \n",
+        service="apigatewayv2",
+    )
+
+    url = invoke_url(api["ApiEndpoint"])
+    click.secho(
+        f"Public API HTTP (POST) URL: {url} \n",
+        fg="yellow",
+    )
 
     return url
 
 
-def deploy() -> None:
-    """Deploy the selected model to the cloud.
+def _report_warmup_round(point: Dict[str, Any]) -> None:
+    """Print a point of a warm-up curve.
 
-    This function prompts the user to select a model from the predefined
-    list. After selecting the model, it handles the deployment process,
-    It also manages error handling and success messaging. If an error
-    occurs during deployment, it prints an error message and exits with
-    a status code of 1.
+    Args:
+        point (Dict[str, Any]): The point, as returned by `warm_up`.
     """
-    credentials = load_credentials()
+    line = (
+        f"payload {point['payload']} ({point['size']} B) "
+        + f"x{point['concurrency']} round {point['round']}: "
+    )
+    if point["p50"] is not None:
+        line += f"p50 {point['p50']:.2f}s, max {point['max']:.2f}s"
+    if point["errors"]:
+        line += f" {point['errors']} error(s)"
+    click.secho(line, fg="yellow")
+
+
+def warm_up_deployment(
+    endpoint_name: str,
+    url: str,
+    payloads_file: Optional[str],
+    max_concurrency: int,
+    api_key: Optional[str] = None,
+) -> None:
+    """Warm up a new endpoint and its API Gateway and report the warm-up curve.
+
+    Requests to the API Gateway bypass its cache, if any.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+        url (str): The URL of its API Gateway.
+        payloads_file (Optional[str]): A JSONL file of representative
+            payloads. Defaults to prompts of increasing lengths, in the
+            format of the model of the endpoint.
+        max_concurrency (int): The highest concurrency of the warm-up.
+        api_key (Optional[str]): The API key of the API Gateway, if required.
+    """
+    try:
+        payloads = (
+            read_payloads(payloads_file)
+            if payloads_file
+            else default_warmup_payloads(
+                kind=interaction_type(endpoint_name) or "predict"
+            )
+        )
+    except ValueError as e:
+        click.secho(f"Invalid JSONL in {payloads_file!r}: {e}", fg="red")
+        exit(1)
+
+    targets = [
+        ("endpoint", endpoint_invoker(endpoint_name)),
+        ("API Gateway", gateway_invoker(url, api_key=api_key, cache=False)),
+    ]
+    for target, invoker in targets:
+        click.secho(f"Warming up the {target}...", fg="green")
+        with span(f"Warm up the {target}") as span_args:
+            ready, _ = warm_up(
+                invoker, payloads, max_concurrency, on_round=_report_warmup_round
+            )
+            span_args["ready"] = ready
+        if ready:
+            click.secho(f"The {target} is ready: latency stabilized. \n", fg="green")
+        else:
+            click.secho(
+                f"The {target} latency did not stabilize within "
+                + f"{MAX_ROUNDS} rounds per step. \n",
+                fg="yellow",
+            )
+
+
+def deploy_components(
+    credentials: Dict[str, str],
+    instance_type: str,
+    instance_count: int,
+    copies: int,
+) -> None:
+    """Deploy the selected models as inference components of a shared endpoint.
 
+    The endpoint is created without models, and every selected model is
+    attached to it with the accelerators and memory it needs reserved for
+    each of its copies. Requests address a model by its component.
+
+    Args:
+        credentials (Dict[str, str]): The loaded credentials.
+        instance_type (str): The instance type of the shared endpoint.
+        instance_count (int): The number of instances of the shared endpoint.
+        copies (int): The number of copies of every model.
+    """
+    answers = inquirer.prompt(component_questions)
+    selected_models = answers["models"]
+    if not selected_models:
+        click.secho("No models selected. \n", fg="red")
+        exit(1)
+    unfit = unfit_models([model["id"] for model in selected_models], instance_type)
+    if unfit:
+        raise click.UsageError(
+            f"{', '.join(unfit)} need more accelerators than {instance_type} "
+            + "has. Choose a larger --instance-type."
+        )
+
+    timestamp = str(int(time.time()))
+    endpoint_name = f"{SHARED_ENDPOINT_PREFIX}{timestamp}"
+    sagemaker_client = get_client("sagemaker")
+    components = []
+
+    try:
+        loader_thread = start_loader(
+            message="Deploying shared endpoint and models...",
+            color="green",
+        )
+        with span("Create shared endpoint", endpoint_name=endpoint_name):
+            create_shared_endpoint(
+                endpoint_name,
+                instance_type,
+                instance_count,
+                credentials["role_arn"],
+                sagemaker_client,
+            )
+        for selected_model in selected_models:
+            model_id = selected_model["id"]
+            model_name = f"sych-llm-pg-{model_id}-m-{timestamp}"
+            with span("Resolve JumpStart artifacts", model_id=model_id):
+                artifacts = resolve_artifacts(model_id, selected_model["version"])
+            artifacts = {**artifacts, "env": component_env(artifacts["env"], model_id)}
+            with span("Create model", model_name=model_name):
+                build_model(artifacts, credentials["role_arn"], model_name).create(
+                    instance_type=instance_type
+                )
+            components.append(
+                (f"sych-llm-pg-{model_id}-ic-{timestamp}", model_name, model_id)
+            )
+
+        with span("Endpoint Creating → InService", endpoint_name=endpoint_name):
+            wait_for_status(
+                lambda: sagemaker_client.describe_endpoint(EndpointName=endpoint_name),
+                "EndpointStatus",
+                ENDPOINT_POLL_INTERVAL,
+            )
+        stop_loader(loader_thread, "Shared Endpoint Deployed \n")
+
+        loader_thread = start_loader(
+            message="Attaching models as inference components...",
+            color="green",
+        )
+        for component_name, model_name, model_id in components:
+            with span("Create inference component", component_name=component_name):
+                add_inference_component(
+                    endpoint_name,
+                    component_name,
+                    model_name,
+                    model_id,
+                    copies,
+                    sagemaker_client,
+                )
+        for component_name, _, _ in components:
+            with span(
+                "Inference component Creating → InService",
+                component_name=component_name,
+            ):
+                wait_for_status(
+                    lambda name=component_name: (  # type: ignore[misc]
+                        sagemaker_client.describe_inference_component(
+                            InferenceComponentName=name
+                        )
+                    ),
+                    "InferenceComponentStatus",
+                    ENDPOINT_POLL_INTERVAL,
+                )
+        stop_loader(loader_thread, "Inference Components Deployed \n")
+
+    except Exception as e:
+        stop_loader(loader_thread)
+        click.secho(
+            f"An error occurred during deployment: {e}",
+            fg="red",
+        )
+        exit(1)
+
+    invalidate_resources()
+    click.secho(f"Endpoint Name: {endpoint_name} \n", fg="yellow")
+    for component_name, _, _ in components:
+        click.secho(f"Inference Component: {component_name}", fg="yellow")
+    click.secho("\nDeployment successful! \n", fg="green")
+
+
+def create_endpoint_config(
+    config_name: str,
+    model_name: str,
+    artifacts: Dict[str, Any],
+    async_inference_config: Optional[Any] = None,
+    region: Optional[str] = None,
+) -> None:
+    """Create the configuration of an endpoint serving a single model.
+
+    Args:
+        config_name (str): The name of the configuration, that of its
+            endpoint for new endpoints.
+        model_name (str): The name of the model.
+        artifacts (Dict[str, Any]): The artifacts of the model, providing
+            its deployment settings.
+        async_inference_config (Optional[Any]): The `AsyncInferenceConfig`
+            of an asynchronous endpoint.
+        region (Optional[str]): The region of the endpoint. Defaults to the
+            region of the credentials.
+    """
+    config: Dict[str, Any] = {
+        "EndpointConfigName": config_name,
+        "ProductionVariants": [
+            production_variant(model_name, **artifacts["deploy"]),
+        ],
+    }
+    if async_inference_config is not None:
+        config["AsyncInferenceConfig"] = async_inference_config._to_request_dict()
+    get_client("sagemaker", region).create_endpoint_config(**config)
+
+
+def report_trace(tracer: Tracer, trace_file: str) -> None:
+    """Write the trace of a deployment and summarize it.
+
+    Args:
+        tracer (Tracer): The tracer of the deployment.
+        trace_file (str): The file the Chrome trace is written to.
+    """
+    tracer.write(trace_file)
+    click.secho("Deployment timeline:", fg="yellow")
+    click.secho(tracer.summary(), fg="yellow")
+    click.secho(
+        f"\nTrace written to {trace_file}, open it in https://ui.perfetto.dev. \n",
+        fg="yellow",
+    )
+
+
+def deploy_endpoint(
+    role_arn: str,
+    model_id: str,
+    model_version: str,
+    model_name: str,
+    endpoint_name: str,
+    async_inference_config: Optional[Any] = None,
+    region: Optional[str] = None,
+) -> None:
+    """Create a model and its endpoint and wait until the endpoint is in service.
+
+    Args:
+        role_arn (str): The ARN of the IAM role of the model.
+        model_id (str): The JumpStart model ID.
+        model_version (str): The JumpStart model version.
+        model_name (str): The name of the model.
+        endpoint_name (str): The name of the endpoint and its configuration.
+        async_inference_config (Optional[Any]): The `AsyncInferenceConfig`
+            of an asynchronous endpoint.
+        region (Optional[str]): The region of the endpoint. Defaults to the
+            region of the credentials.
+    """
+    sagemaker_client = get_client("sagemaker", region)
+
+    # Deploy the model, from cached artifacts after the first deploy
+    with span("Resolve JumpStart artifacts", model_id=model_id):
+        artifacts = resolve_artifacts(model_id, model_version, region)
+    with span("Create model", model_name=model_name):
+        build_model(
+            artifacts, role_arn, model_name, get_sagemaker_session(region)
+        ).create(instance_type=artifacts["deploy"].get("instance_type"))
+    with span("Create endpoint config", endpoint_name=endpoint_name):
+        create_endpoint_config(
+            endpoint_name, model_name, artifacts, async_inference_config, region
+        )
+    with span("Create endpoint", endpoint_name=endpoint_name):
+        sagemaker_client.create_endpoint(
+            EndpointName=endpoint_name, EndpointConfigName=endpoint_name
+        )
+    with span("Endpoint Creating → InService", endpoint_name=endpoint_name):
+        wait_for_status(
+            lambda: sagemaker_client.describe_endpoint(EndpointName=endpoint_name),
+            "EndpointStatus",
+            ENDPOINT_POLL_INTERVAL,
+        )
+
+
+def deploy_model(
+    credentials: Dict[str, str],
+    async_inference: bool,
+    max_concurrent_invocations: int,
+    scale_to_zero: bool,
+    warmup: bool,
+    warmup_payloads: Optional[str],
+    warmup_concurrency: int,
+    gateway_settings: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Deploy the selected model to its own endpoint.
+
+    Args:
+        credentials (Dict[str, str]): The loaded credentials.
+        async_inference (bool): Whether to deploy an asynchronous endpoint.
+        max_concurrent_invocations (int): Maximum number of requests an
+            instance of an asynchronous endpoint processes at a time.
+        scale_to_zero (bool): Whether an asynchronous endpoint scales in
+            to zero instances when idle.
+        warmup (bool): Whether to warm up the endpoint and its API Gateway.
+        warmup_payloads (Optional[str]): A JSONL file of payloads to warm
+            up with.
+        warmup_concurrency (int): The highest concurrency of the warm-up.
+        gateway_settings (Optional[Dict[str, Any]]): The type, cache,
+            throttling and usage plan of the API Gateway, see
+            `utils.gateway`.
+    """
     # Prompt the user to select a model
     answers = inquirer.prompt(questions)
     model_id = answers["model"]["id"]
@@ -322,6 +904,12 @@ def deploy() -> None:
     timestamp = str(int(time.time()))
     model_name = f"sych-llm-pg-{model_id}-m-{timestamp}"
     endpoint_name = f"sych-llm-pg-{model_id}-e-{timestamp}"
+    sagemaker_client = get_client("sagemaker")
+    annotate(
+        model_id=model_id,
+        model_version=model_version,
+        region=sagemaker_client.meta.region_name,
+    )
 
     try:
         loader_thread = start_loader(
@@ -329,21 +917,30 @@ def deploy() -> None:
             color="green",
         )
 
-        # Deploy the model
-        model = JumpStartModel(
-            model_id=model_id,
-            role=credentials["role_arn"],
-            name=model_name,
-            model_version=model_version,
+        async_inference_config = (
+            build_async_inference_config(
+                get_sagemaker_session().default_bucket(),
+                endpoint_name,
+                max_concurrent_invocations,
+            )
+            if async_inference
+            else None
+        )
+        deploy_endpoint(
+            credentials["role_arn"],
+            model_id,
+            model_version,
+            model_name,
+            endpoint_name,
+            async_inference_config,
         )
-        predictor = model.deploy(endpoint_name=endpoint_name)
         stop_loader(
             loader_thread,
             "Model and Endpoint Deployed \n",
         )
 
         click.secho(
-            f"Endpoint Name: {predictor.endpoint_name} \n",
+            f"Endpoint Name: {endpoint_name} \n",
             fg="yellow",
         )
 
@@ -355,9 +952,222 @@ def deploy() -> None:
         )
         exit(1)
 
-    create_api_gateway(
-        predictor.endpoint_name,
-        credentials["role_arn"],
+    if async_inference:
+        if scale_to_zero:
+            try:
+                with span("Enable scale to zero"):
+                    enable_scale_to_zero(endpoint_name)
+            except Exception as e:
+                click.secho(f"An error occurred while enabling scaling: {e}", fg="red")
+                exit(1)
+            click.secho(
+                "Endpoint scales in to zero instances when idle. \n", fg="yellow"
+            )
+        click.secho(
+            "Submit payloads to the asynchronous endpoint with "
+            + "'sych-llm-playground submit'. \n",
+            fg="yellow",
+        )
+    else:
+        api_key: Optional[str] = None
+        if gateway_settings and gateway_settings.get("type") == "http":
+            url = create_http_api(
+                endpoint_name, credentials["role_arn"], gateway_settings
+            )
+        else:
+            url, api_key = create_api_gateway(
+                endpoint_name,
+                credentials["role_arn"],
+                gateway_settings,
+            )
+        if warmup:
+            warm_up_deployment(
+                endpoint_name, url, warmup_payloads, warmup_concurrency, api_key
+            )
+    invalidate_resources()
+
+    click.secho("Deployment successful! \n", fg="green")
+
+
+def deploy_to_regions(
+    credentials: Dict[str, str],
+    regions: List[str],
+    gateway_settings: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Deploy the selected model to its own endpoint in several regions.
+
+    The endpoints, which take most of the time of a deployment, are
+    created in all regions concurrently under the same name, so that
+    `interact` can find the copies of an endpoint across regions. The API
+    Gateways are then created region by region.
+
+    Args:
+        credentials (Dict[str, str]): The loaded credentials.
+        regions (List[str]): The regions to deploy to.
+        gateway_settings (Optional[Dict[str, Any]]): The type, cache,
+            throttling and usage plan of the API Gateways, see
+            `utils.gateway`.
+    """
+    answers = inquirer.prompt(questions)
+    model_id = answers["model"]["id"]
+    model_version = answers["model"]["version"]
+
+    timestamp = str(int(time.time()))
+    model_name = f"sych-llm-pg-{model_id}-m-{timestamp}"
+    endpoint_name = f"sych-llm-pg-{model_id}-e-{timestamp}"
+    annotate(model_id=model_id, model_version=model_version, regions=regions)
+
+    def deploy_region(region: str) -> None:
+        with span("Deploy region", region=region):
+            deploy_endpoint(
+                credentials["role_arn"],
+                model_id,
+                model_version,
+                model_name,
+                endpoint_name,
+                region=region,
+            )
+
+    loader_thread = start_loader(
+        message=f"Deploying to {len(regions)} regions... "
+        + "Why not grab a cup of coffee?",
+        color="green",
     )
+    _, errors = fan_out(regions, deploy_region)
+    deployed = [region for region in regions if region not in errors]
+    stop_loader(
+        loader_thread,
+        f"Model and Endpoint Deployed in {', '.join(deployed)} \n"
+        if deployed
+        else None,
+    )
+    for region, error in errors.items():
+        click.secho(
+            f"An error occurred during deployment in {region}: {error}", fg="red"
+        )
+    if not deployed:
+        exit(1)
 
+    click.secho(f"Endpoint Name: {endpoint_name} \n", fg="yellow")
+    for region in deployed:
+        click.secho(f"API Gateway in {region}:", fg="yellow")
+        if gateway_settings and gateway_settings.get("type") == "http":
+            create_http_api(
+                endpoint_name, credentials["role_arn"], gateway_settings, region
+            )
+        else:
+            create_api_gateway(
+                endpoint_name, credentials["role_arn"], gateway_settings, region
+            )
+    invalidate_resources()
+
+    if errors:
+        exit(1)
     click.secho("Deployment successful! \n", fg="green")
+
+
+def deploy(
+    async_inference: bool = False,
+    max_concurrent_invocations: int = 4,
+    scale_to_zero: bool = False,
+    components: bool = False,
+    instance_type: str = "ml.g5.12xlarge",
+    instance_count: int = 1,
+    copies: int = 1,
+    refresh_artifacts: bool = False,
+    warmup: bool = False,
+    warmup_payloads: Optional[str] = None,
+    warmup_concurrency: int = 4,
+    trace_file: Optional[str] = None,
+    gateway: str = "rest",
+    regions: Optional[str] = None,
+    gateway_cache: Optional[str] = None,
+    gateway_cache_ttl: int = DEFAULT_CACHE_TTL,
+    gateway_rate_limit: Optional[float] = None,
+    gateway_burst_limit: Optional[int] = None,
+    gateway_quota: Optional[int] = None,
+) -> None:
+    """Deploy the selected model to the cloud.
+
+    This function prompts the user to select a model from the predefined
+    list. After selecting the model, it handles the deployment process,
+    It also manages error handling and success messaging. If an error
+    occurs during deployment, it prints an error message and exits with
+    a status code of 1.
+
+    Asynchronous endpoints read payloads from and write responses to S3,
+    so they are not exposed through an API Gateway.
+
+    Args:
+        async_inference (bool): Whether to deploy an asynchronous endpoint.
+        max_concurrent_invocations (int): Maximum number of requests an
+            instance of an asynchronous endpoint processes at a time.
+        scale_to_zero (bool): Whether an asynchronous endpoint scales in
+            to zero instances when idle.
+        components (bool): Whether to pack several models onto a shared
+            endpoint as inference components.
+        instance_type (str): The instance type of a shared endpoint.
+        instance_count (int): The number of instances of a shared endpoint.
+        copies (int): The number of copies of every model on a shared endpoint.
+        refresh_artifacts (bool): Whether to drop the cached JumpStart
+            artifacts and resolve them again.
+        warmup (bool): Whether to warm up the endpoint and its API Gateway
+            until their latency stabilizes.
+        warmup_payloads (Optional[str]): A JSONL file of payloads to warm
+            up with.
+        warmup_concurrency (int): The highest concurrency of the warm-up.
+        trace_file (Optional[str]): A file to write the timeline of the
+            deployment to, in the Chrome trace format.
+        gateway (str): The type of the API Gateway, a "rest" API or an
+            "http" API, which has a lower latency but no cache or usage
+            plans.
+        regions (Optional[str]): Comma-separated regions to deploy the
+            model to concurrently, instead of the region of the
+            credentials.
+        gateway_cache (Optional[str]): The size in GB of the cache cluster
+            of the API Gateway stage, if any.
+        gateway_cache_ttl (int): Seconds for which responses are cached.
+        gateway_rate_limit (Optional[float]): Requests per second allowed
+            by the API Gateway.
+        gateway_burst_limit (Optional[int]): Requests allowed in a burst
+            by the API Gateway.
+        gateway_quota (Optional[int]): Requests per day allowed by a usage
+            plan with an API key.
+    """
+    credentials = load_credentials()
+
+    if refresh_artifacts:
+        invalidate_artifacts()
+
+    tracer = start_tracing() if trace_file else None
+    try:
+        with span("Deploy"):
+            gateway_settings = {
+                "type": gateway,
+                "cache_size": gateway_cache,
+                "cache_ttl": gateway_cache_ttl,
+                "rate_limit": gateway_rate_limit,
+                "burst_limit": gateway_burst_limit,
+                "quota": gateway_quota,
+            }
+            if components:
+                deploy_components(credentials, instance_type, instance_count, copies)
+            elif parse_regions(regions):
+                deploy_to_regions(
+                    credentials, parse_regions(regions), gateway_settings
+                )
+            else:
+                deploy_model(
+                    credentials,
+                    async_inference,
+                    max_concurrent_invocations,
+                    scale_to_zero,
+                    warmup,
+                    warmup_payloads,
+                    warmup_concurrency,
+                    gateway_settings,
+                )
+    finally:
+        if tracer and trace_file:
+            stop_tracing()
+            report_trace(tracer, trace_file)
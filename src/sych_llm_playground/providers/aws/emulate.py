@@ -0,0 +1,563 @@
+"""This module provides a local stand-in for deployed Llama endpoints.
+
+It runs a local HTTP server implementing the SageMaker Runtime
+`InvokeEndpoint` and `InvokeEndpointWithResponseStream` APIs, and the
+`/prod/predict` route of the API Gateway created by `deploy`. Requests in
+the payload formats of `predict()` and `chat()` are answered with
+Llama-shaped responses, after delays drawn from a configurable latency
+model: a time to first token and a delay per generated token. Errors can
+be injected at a given rate, and the number of concurrent invocations is
+limited like the instances of an endpoint. Like the API Gateways created
+by `deploy`, the `/prod/predict` route accepts gzip-compressed requests
+and compresses large responses for clients accepting gzip.
+
+Clients are pointed at the emulator with the `RUNTIME_URL_ENV` environment
+variable, which overrides the endpoint URL of the SageMaker Runtime
+client, or by invoking its `/prod/predict` URL.
+
+Functions:
+    encode_event: Encode a message of the AWS event stream format.
+    create_emulator: Create the emulator server.
+    emulate: Main function to run the emulator server.
+"""
+
+import binascii
+import gzip
+import json
+import random
+import re
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import click
+
+from .utils.clients import RUNTIME_URL_ENV
+from .utils.invocation import DEFAULT_MAX_NEW_TOKENS
+from .utils.invocation import GATEWAY_MIN_COMPRESSION_SIZE
+
+
+INVOCATION_PATH = re.compile(r"^/endpoints/([^/]+)/invocations$")
+STREAM_PATH = re.compile(r"^/endpoints/([^/]+)/invocations-response-stream$")
+GATEWAY_PATH = "/prod/predict"
+
+# Words cycled through to build the generated text, one token each.
+GENERATED_WORDS = (
+    "This is a generated response from the local SageMaker emulator."
+).split()
+
+# Injectable errors: HTTP status, error code and message of the runtime.
+ERRORS: Dict[str, Tuple[int, str, str]] = {
+    "throttling": (429, "ThrottlingException", "Rate exceeded."),
+    "model": (424, "ModelError", "Received server error (500) from primary."),
+    "unavailable": (503, "ServiceUnavailable", "The service is unavailable."),
+    "internal": (500, "InternalFailure", "An internal failure occurred."),
+}
+
+
+class LatencyModel:
+    """Delays of the generated tokens of an emulated endpoint."""
+
+    def __init__(
+        self,
+        time_to_first_token: float = 0.2,
+        token_delay: float = 0.02,
+        jitter: float = 0.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Initialize the latency model.
+
+        Args:
+            time_to_first_token (float): Seconds before the first token.
+            token_delay (float): Seconds between consecutive tokens.
+            jitter (float): Maximum relative deviation of every delay,
+                e.g. 0.1 for delays within 10% of their mean.
+            rng (Optional[random.Random]): The random number generator.
+        """
+        self.time_to_first_token = time_to_first_token
+        self.token_delay = token_delay
+        self.jitter = jitter
+        self.rng = rng or random.Random()  # noqa: S311
+
+    def _deviate(self, delay: float) -> float:
+        """Apply the jitter to a delay.
+
+        Args:
+            delay (float): The mean delay.
+
+        Returns:
+            float: The delay, never negative.
+        """
+        if not self.jitter:
+            return delay
+        return max(0.0, delay * (1 + self.rng.uniform(-self.jitter, self.jitter)))
+
+    def delays(self, tokens: int) -> List[float]:
+        """Return the delay before each generated token.
+
+        Args:
+            tokens (int): The number of generated tokens.
+
+        Returns:
+            List[float]: The seconds to wait before each token, the first
+                being the time to first token.
+        """
+        return [
+            self._deviate(self.time_to_first_token if index == 0 else self.token_delay)
+            for index in range(tokens)
+        ]
+
+
+def encode_event(headers: Dict[str, str], payload: bytes) -> bytes:
+    """Encode a message of the AWS event stream format.
+
+    A message is its total and header lengths, their CRC32, the headers,
+    the payload and the CRC32 of everything before it.
+
+    Args:
+        headers (Dict[str, str]): The headers of the message, as strings.
+        payload (bytes): The payload of the message.
+
+    Returns:
+        bytes: The encoded message.
+    """
+    encoded_headers = b"".join(
+        struct.pack("B", len(name.encode()))
+        + name.encode()
+        + struct.pack(">BH", 7, len(value.encode()))
+        + value.encode()
+        for name, value in headers.items()
+    )
+    total_length = 12 + len(encoded_headers) + len(payload) + 4
+    prelude = struct.pack(">II", total_length, len(encoded_headers))
+    message = prelude + struct.pack(">I", binascii.crc32(prelude))
+    message += encoded_headers + payload
+    return message + struct.pack(">I", binascii.crc32(message))
+
+
+def _payload_part(data: bytes) -> bytes:
+    """Encode a `PayloadPart` event of a response stream.
+
+    Args:
+        data (bytes): The bytes of the part.
+
+    Returns:
+        bytes: The encoded event.
+    """
+    return encode_event(
+        {
+            ":event-type": "PayloadPart",
+            ":content-type": "application/octet-stream",
+            ":message-type": "event",
+        },
+        data,
+    )
+
+
+class EmulatorServer(ThreadingHTTPServer):
+    """HTTP server emulating deployed Llama endpoints."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        latency: LatencyModel,
+        max_tokens: int = 32,
+        error_rate: float = 0.0,
+        error: str = "throttling",
+        max_concurrency: Optional[int] = None,
+        queue_timeout: float = 0.0,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            server_address (Tuple[str, int]): The host and port to bind to.
+            latency (LatencyModel): The latency model of the generated tokens.
+            max_tokens (int): Maximum number of tokens of a generation,
+                further limited by the "max_new_tokens" of the payload.
+            error_rate (float): Share of invocations failing with `error`.
+            error (str): The injected error, a key of `ERRORS`.
+            max_concurrency (Optional[int]): Maximum number of concurrent
+                invocations. Unlimited if None.
+            queue_timeout (float): Seconds an invocation waits for a free
+                slot before being throttled.
+        """
+        super().__init__(server_address, EmulatorRequestHandler)
+        self.latency = latency
+        self.max_tokens = max_tokens
+        self.error_rate = error_rate
+        self.error = error
+        self.slots = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+        self.queue_timeout = queue_timeout
+        self.invocations = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    def count_bytes(self, received: int = 0, sent: int = 0) -> None:
+        """Count the bytes of bodies, as on the wire.
+
+        Args:
+            received (int): Bytes of a request body.
+            sent (int): Bytes of a response body.
+        """
+        with self._lock:
+            self.bytes_received += received
+            self.bytes_sent += sent
+
+    def acquire_slot(self) -> bool:
+        """Wait for a free invocation slot, up to the queue timeout.
+
+        Returns:
+            bool: Whether a slot was acquired.
+        """
+        if self.slots is None:
+            return True
+        if not self.queue_timeout:
+            return self.slots.acquire(blocking=False)
+        return self.slots.acquire(timeout=self.queue_timeout)
+
+    def release_slot(self) -> None:
+        """Release an invocation slot."""
+        if self.slots is not None:
+            self.slots.release()
+
+    def generate(self, payload: Dict[str, Any]) -> Tuple[List[str], List[float]]:
+        """Generate the tokens answering a payload, and their delays.
+
+        Args:
+            payload (Dict[str, Any]): The Llama payload.
+
+        Returns:
+            Tuple[List[str], List[float]]: The tokens, and the seconds to
+                wait before each of them.
+        """
+        parameters = payload.get("parameters") or {}
+        count = min(
+            self.max_tokens,
+            int(parameters.get("max_new_tokens", DEFAULT_MAX_NEW_TOKENS)),
+        )
+        tokens = [
+            ("" if index == 0 else " ") + GENERATED_WORDS[index % len(GENERATED_WORDS)]
+            for index in range(max(count, 0))
+        ]
+        return tokens, self.latency.delays(len(tokens))
+
+    def inject_error(self) -> Optional[Tuple[int, str, str]]:
+        """Draw whether an invocation fails.
+
+        Returns:
+            Optional[Tuple[int, str, str]]: The status, code and message of
+                the injected error, or None.
+        """
+        with self._lock:
+            self.invocations += 1
+            failed = self.latency.rng.random() < self.error_rate
+        return ERRORS[self.error] if failed else None
+
+
+def _response_body(payload: Dict[str, Any], text: str) -> List[Dict[str, Any]]:
+    """Build the Llama response to a payload.
+
+    Args:
+        payload (Dict[str, Any]): The Llama payload.
+        text (str): The generated text.
+
+    Returns:
+        List[Dict[str, Any]]: The response of `chat()` for conversations,
+            else the response of `predict()`.
+    """
+    if isinstance(payload.get("inputs"), list):
+        return [{"generation": {"role": "assistant", "content": text}}]
+    return [{"generation": text}]
+
+
+class EmulatorRequestHandler(BaseHTTPRequestHandler):
+    """Request handler answering invocations with generated tokens."""
+
+    server: EmulatorServer
+    protocol_version = "HTTP/1.1"
+    compress_response = False
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Handle POST requests to the invocation routes."""
+        path = self.path.split("?")[0]
+        stream = bool(STREAM_PATH.match(path))
+        if not (stream or INVOCATION_PATH.match(path) or path == GATEWAY_PATH):
+            self._read_body()
+            self._send_error(404, "UnknownOperationException", f"Unknown path {path}.")
+            return
+
+        gateway = path == GATEWAY_PATH
+        self.compress_response = gateway and "gzip" in self.headers.get(
+            "Accept-Encoding", ""
+        )
+        try:
+            payload = self._read_payload(gateway)
+        except ValueError as e:
+            self._send_error(400, "ValidationError", f"Invalid payload: {e}")
+            return
+
+        if not self.server.acquire_slot():
+            self._send_error(
+                429, "ThrottlingException", "Too many concurrent requests."
+            )
+            return
+
+        try:
+            error = self.server.inject_error()
+            if error:
+                time.sleep(self.server.latency.time_to_first_token)
+                self._send_error(*error)
+            elif stream:
+                self._stream(payload)
+            else:
+                self._complete(payload)
+        finally:
+            self.server.release_slot()
+
+    def _read_body(self) -> bytes:
+        """Read the body of the request.
+
+        Returns:
+            bytes: The body.
+        """
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length)
+
+    def _read_payload(self, gateway: bool) -> Dict[str, Any]:
+        """Read and decode the payload of an invocation.
+
+        Args:
+            gateway (bool): Whether the request was sent to the API Gateway
+                route, which accepts gzip-compressed bodies.
+
+        Returns:
+            Dict[str, Any]: The payload.
+
+        Raises:
+            ValueError: If the payload is not a JSON object.
+        """
+        body = self._read_body()
+        self.server.count_bytes(received=len(body))
+        if gateway and self.headers.get("Content-Encoding") == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError) as e:
+                raise ValueError(f"Invalid gzip body: {e}") from e
+
+        payload = json.loads(body or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("The payload is not an object.")
+        return payload
+
+    def _complete(self, payload: Dict[str, Any]) -> None:
+        """Send the whole generation once every token is generated.
+
+        Args:
+            payload (Dict[str, Any]): The Llama payload.
+        """
+        tokens, delays = self.server.generate(payload)
+        time.sleep(sum(delays))
+        self._send_json(200, _response_body(payload, "".join(tokens)))
+
+    def _stream(self, payload: Dict[str, Any]) -> None:
+        """Stream the tokens as they are generated, in an event stream.
+
+        Every token is a `data:` line in the format of the Text Generation
+        Inference containers, sent in a `PayloadPart` event.
+
+        Args:
+            payload (Dict[str, Any]): The Llama payload.
+        """
+        tokens, delays = self.server.generate(payload)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.amazon.eventstream")
+        self.send_header("X-Amzn-Invoked-Production-Variant", "AllTraffic")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        for index, (token, delay) in enumerate(zip(tokens, delays, strict=True)):
+            time.sleep(delay)
+            last = index == len(tokens) - 1
+            event = {
+                "token": {"id": index, "text": token, "logprob": 0.0, "special": False},
+                "generated_text": "".join(tokens) if last else None,
+            }
+            self._send_chunk(_payload_part(f"data:{json.dumps(event)}\n\n".encode()))
+        self._send_chunk(b"")
+
+    def _send_chunk(self, data: bytes) -> None:
+        """Write a chunk of a chunked response, the last one if empty.
+
+        Args:
+            data (bytes): The data of the chunk.
+        """
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(
+        self, status: int, body: Any, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Send a JSON response.
+
+        Args:
+            status (int): The HTTP status code.
+            body (Any): The response body.
+            headers (Optional[Dict[str, str]]): Additional headers.
+        """
+        data = json.dumps(body).encode()
+        headers = dict(headers or {})
+        if self.compress_response and len(data) >= GATEWAY_MIN_COMPRESSION_SIZE:
+            data = gzip.compress(data)
+            headers["Content-Encoding"] = "gzip"
+        self.server.count_bytes(sent=len(data))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, code: str, message: str) -> None:
+        """Send an error response in the format of the SageMaker Runtime.
+
+        Args:
+            status (int): The HTTP status code.
+            code (str): The error code.
+            message (str): The error message.
+        """
+        self._send_json(
+            status, {"message": message}, headers={"X-Amzn-ErrorType": code}
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests through click instead of stderr.
+
+        Args:
+            format (str): The format string of the message.
+            *args (Any): The arguments of the format string.
+        """
+        click.secho(format % args, fg="bright_black")
+
+
+def create_emulator(
+    host: str,
+    port: int,
+    time_to_first_token: float = 0.2,
+    token_delay: float = 0.02,
+    jitter: float = 0.0,
+    max_tokens: int = 32,
+    error_rate: float = 0.0,
+    error: str = "throttling",
+    max_concurrency: Optional[int] = None,
+    queue_timeout: float = 0.0,
+    seed: Optional[int] = None,
+) -> EmulatorServer:
+    """Create the emulator server.
+
+    Args:
+        host (str): The host to bind to.
+        port (int): The port to bind to, or 0 for any free port.
+        time_to_first_token (float): Seconds before the first token.
+        token_delay (float): Seconds between consecutive tokens.
+        jitter (float): Maximum relative deviation of every delay.
+        max_tokens (int): Maximum number of tokens of a generation.
+        error_rate (float): Share of invocations failing with `error`.
+        error (str): The injected error, a key of `ERRORS`.
+        max_concurrency (Optional[int]): Maximum number of concurrent
+            invocations. Unlimited if None.
+        queue_timeout (float): Seconds an invocation waits for a free slot
+            before being throttled.
+        seed (Optional[int]): Seed of the jitter and injected errors.
+
+    Returns:
+        EmulatorServer: The server, ready to `serve_forever`.
+    """
+    latency = LatencyModel(
+        time_to_first_token,
+        token_delay,
+        jitter,
+        rng=random.Random(seed),  # noqa: S311
+    )
+    return EmulatorServer(
+        (host, port),
+        latency,
+        max_tokens=max_tokens,
+        error_rate=error_rate,
+        error=error,
+        max_concurrency=max_concurrency,
+        queue_timeout=queue_timeout,
+    )
+
+
+def emulate(
+    host: str,
+    port: int,
+    time_to_first_token: float,
+    token_delay: float,
+    jitter: float,
+    max_tokens: int,
+    error_rate: float,
+    error: str,
+    max_concurrency: Optional[int],
+    queue_timeout: float,
+) -> None:
+    """Main function to run the local endpoint emulator.
+
+    No credentials are needed: the emulator accepts any signature, and
+    serves every endpoint name until interrupted.
+
+    Args:
+        host (str): The host to bind to.
+        port (int): The port to bind to.
+        time_to_first_token (float): Seconds before the first token.
+        token_delay (float): Seconds between consecutive tokens.
+        jitter (float): Maximum relative deviation of every delay.
+        max_tokens (int): Maximum number of tokens of a generation.
+        error_rate (float): Share of invocations failing with `error`.
+        error (str): The injected error, a key of `ERRORS`.
+        max_concurrency (Optional[int]): Maximum number of concurrent
+            invocations. Unlimited if None.
+        queue_timeout (float): Seconds an invocation waits for a free slot
+            before being throttled.
+    """
+    server = create_emulator(
+        host,
+        port,
+        time_to_first_token=time_to_first_token,
+        token_delay=token_delay,
+        jitter=jitter,
+        max_tokens=max_tokens,
+        error_rate=error_rate,
+        error=error,
+        max_concurrency=max_concurrency,
+        queue_timeout=queue_timeout,
+    )
+    url = f"http://{host}:{server.server_port}"
+    click.secho(
+        f"Emulating Llama endpoints on {url}. Point clients at it with "
+        + f"{RUNTIME_URL_ENV}={url}, or invoke {url}{GATEWAY_PATH}. "
+        + "Press Ctrl+C to stop.\n",
+        fg="yellow",
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    click.secho("Emulator stopped. \n", fg="yellow")
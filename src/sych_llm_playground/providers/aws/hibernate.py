@@ -0,0 +1,111 @@
+"""This module hibernates and resumes endpoints on AWS.
+
+Hibernating an endpoint deletes only the endpoint, so its instances stop
+costing money, and keeps its model, endpoint configuration and API Gateway
+along with a local record. Resuming creates the endpoint again from the
+recorded configuration under the same name, so the API Gateway keeps
+working and no JumpStart artifacts are resolved again: resuming takes only
+as long as provisioning the instances.
+
+Functions:
+    hibernate: Main function to hibernate an endpoint.
+    resume: Main function to resume a hibernated endpoint.
+"""
+
+import os
+
+import click
+
+from ...utils.loader import start_loader
+from ...utils.loader import stop_loader
+from .deploy import ENDPOINT_POLL_INTERVAL
+from .utils.async_inference import enable_scale_to_zero
+from .utils.clients import get_client
+from .utils.components import is_shared_endpoint
+from .utils.components import wait_for_status
+from .utils.credentials import load_credentials
+from .utils.hibernation import choose_hibernated
+from .utils.hibernation import drop_hibernation
+from .utils.hibernation import hibernate_endpoint
+from .utils.hibernation import resume_endpoint
+from .utils.resources import choose_resource
+from .utils.resources import invalidate_resources
+
+
+def hibernate() -> None:
+    """Main function to hibernate an endpoint on AWS.
+
+    The endpoint is recorded so it can be resumed, and deleted. Its model,
+    endpoint configuration and API Gateway are kept.
+    """
+    load_credentials()
+    region = os.environ["AWS_DEFAULT_REGION"]
+    sagemaker_client = get_client("sagemaker")
+    endpoint_name = choose_resource("Endpoint", sagemaker_client, "hibernate")["name"]
+    if is_shared_endpoint(endpoint_name):
+        click.secho(
+            f"The shared endpoint {endpoint_name!r} cannot be hibernated, as its "
+            + "inference components would be lost. \n",
+            fg="red",
+        )
+        exit(1)
+
+    try:
+        loader_thread = start_loader(
+            message=f"Hibernating {endpoint_name}...", color="green"
+        )
+        hibernate_endpoint(
+            endpoint_name,
+            region,
+            sagemaker_client,
+            get_client("application-autoscaling"),
+        )
+        sagemaker_client.get_waiter("endpoint_deleted").wait(EndpointName=endpoint_name)
+        stop_loader(loader_thread)
+        invalidate_resources("Endpoint")
+    except Exception as e:
+        stop_loader(loader_thread)
+        click.secho(f"An error occurred while hibernating: {e}", fg="red")
+        exit(1)
+
+    click.secho(
+        f"Endpoint {endpoint_name} hibernated. Its model, configuration and API "
+        + "Gateway are kept; resume it with `sych-llm-playground resume`. \n",
+        fg="green",
+    )
+
+
+def resume() -> None:
+    """Main function to resume a hibernated endpoint on AWS.
+
+    The endpoint is created again from its recorded configuration under
+    the same name, and scales to zero again if it did before.
+    """
+    load_credentials()
+    region = os.environ["AWS_DEFAULT_REGION"]
+    record = choose_hibernated(region, "resume")
+    endpoint_name = record["endpoint_name"]
+
+    sagemaker_client = get_client("sagemaker")
+    try:
+        loader_thread = start_loader(
+            message=f"Resuming {endpoint_name}... This might take a moment.",
+            color="green",
+        )
+        resume_endpoint(record, sagemaker_client)
+        wait_for_status(
+            lambda: sagemaker_client.describe_endpoint(EndpointName=endpoint_name),
+            "EndpointStatus",
+            ENDPOINT_POLL_INTERVAL,
+        )
+        if record["scale_to_zero"] is not None:
+            enable_scale_to_zero(endpoint_name, record["scale_to_zero"])
+        drop_hibernation(endpoint_name, region)
+        stop_loader(loader_thread)
+        invalidate_resources("Endpoint")
+    except Exception as e:
+        stop_loader(loader_thread)
+        click.secho(f"An error occurred while resuming: {e}", fg="red")
+        exit(1)
+
+    click.secho(f"Endpoint {endpoint_name} resumed under the same name. \n", fg="green")
@@ -1,29 +1,137 @@
 """This module provides functions to interact with deployed models on AWS.
 
 It includes functionality to list available endpoints, make predictions,
-and facilitate a chat interaction with a model.
+and facilitate a chat interaction with a model. Chats are logged as
+sessions that can be resumed later. Models packed onto a shared endpoint
+are addressed by their inference component. Endpoints deployed to several
+regions are invoked in the region with the lowest round-trip time.
+
+Connections to the SageMaker Runtime are set up in the background as soon
+as an endpoint is chosen, while the user answers the prompts for sampling
+parameters, so that the first request does not wait for them.
 """
 
 import json
-import re
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
-import boto3
 import click
-from sagemaker.predictor import Predictor
-from sagemaker.serializers import JSONSerializer
+import inquirer
 
 from ...utils.loader import start_loader
 from ...utils.loader import stop_loader
+from ...utils.metrics import counter
+from ...utils.metrics import histogram
+from ...utils.metrics import metrics_enabled
+from .utils.clients import get_client
+from .utils.components import is_shared_endpoint
+from .utils.components import model_id_from_component
 from .utils.credentials import load_credentials
+from .utils.hedging import HedgedInvoker
+from .utils.invocation import Invoker
+from .utils.invocation import build_chat_payload
+from .utils.invocation import build_predict_payload
+from .utils.invocation import endpoint_invoker
+from .utils.invocation import parse_chat_response
+from .utils.invocation import parse_predict_response
+from .utils.invocation import warm_up_connection
+from .utils.regions import RegionSelector
+from .utils.regions import parse_regions
+from .utils.regions import regional_invoker
+from .utils.resilience import FATAL
+from .utils.resilience import CircuitOpenError
+from .utils.resilience import ResilientInvoker
+from .utils.resilience import classify_error
 from .utils.resources import choose_resource
+from .utils.resources import get_resources
+from .utils.resources import get_resources_in_regions
+from .utils.resources import model_id_from_endpoint
+from .utils.router import EndpointRouter
+from .utils.router import group_by_model
+from .utils.sessions import Session
+from .utils.sessions import create_session
+from .utils.sessions import resume_session
+
+
+INVOCATION_SECONDS = histogram(
+    "sych_llm_pg_invocation_seconds",
+    "Latency of model invocations from interact, retries included.",
+    ["mode", "outcome"],
+)
+INVOCATION_BYTES = counter(
+    "sych_llm_pg_invocation_bytes_total",
+    "JSON bytes of the payloads sent to and responses received from models.",
+    ["mode", "direction"],
+)
+
+
+def invoke_measured(invoke: Invoker, payload: Dict[str, Any], mode: str) -> Any:
+    """Invoke a model, recording the latency and bytes of the invocation.
 
+    Args:
+        invoke (Invoker): Sends the payload to the model.
+        payload (Dict[str, Any]): The payload.
+        mode (str): The interaction mode, "predict" or "chat".
+
+    Returns:
+        Any: The decoded response.
+    """
+    if not metrics_enabled():
+        return invoke(payload)
+
+    INVOCATION_BYTES.inc(len(json.dumps(payload)), mode=mode, direction="sent")
+    start = time.perf_counter()
+    try:
+        response_json = invoke(payload)
+    except Exception:
+        INVOCATION_SECONDS.observe(
+            time.perf_counter() - start, mode=mode, outcome="error"
+        )
+        raise
+    INVOCATION_SECONDS.observe(time.perf_counter() - start, mode=mode, outcome="ok")
+    INVOCATION_BYTES.inc(
+        len(json.dumps(response_json)), mode=mode, direction="received"
+    )
+    return response_json
+
+
+def describe_error(error: Exception) -> str:
+    """Describe an invocation error that persisted after retries.
 
-def predict(selected_endpoint: str) -> None:
+    Args:
+        error (Exception): The error.
+
+    Returns:
+        str: The message to display.
+    """
+    if isinstance(error, CircuitOpenError):
+        return f"{error}. Wait a moment before trying again."
+    if classify_error(error) == FATAL:
+        return f"An error occurred during prediction: {error}"
+    return f"The model is busy or unavailable, even after retries ({error})."
+
+
+def predict(
+    selected_endpoint: str,
+    invoker: Optional[Invoker] = None,
+    inference_component: Optional[str] = None,
+) -> None:
     """Make a prediction using the selected endpoint and display the results.
 
     Args:
         selected_endpoint (str): The name of the selected endpoint.
+        invoker (Optional[Invoker]): Sends the payload to the model.
+            Defaults to invoking the selected endpoint.
+        inference_component (Optional[str]): The inference component of a
+            shared endpoint to invoke.
     """
+    invoke = invoker or endpoint_invoker(selected_endpoint, inference_component)
     click.echo("\n")
 
     max_new_tokens = (
@@ -50,26 +158,12 @@ def predict(selected_endpoint: str) -> None:
             message="Waiting for Model response...", color="green"
         )
 
-        predictor = Predictor(endpoint_name=selected_endpoint)
-        predictor.serializer = JSONSerializer(content_type="application/json")
-
-        payload = {
-            "inputs": user_input,
-            "parameters": {
-                "max_new_tokens": int(max_new_tokens),
-                "top_p": float(top_p),
-                "temperature": float(temperature),
-            },
-        }
+        payload = build_predict_payload(user_input, max_new_tokens, top_p, temperature)
 
-        response_bytes = predictor.predict(
-            payload, custom_attributes="accept_eula=true"
-        )
+        response_json = invoke_measured(invoke, payload, "predict")
         stop_loader(loader_thread)
 
-        response_string = response_bytes.decode("utf-8")
-        response_json = json.loads(response_string)
-        content = response_json[0]["generation"]
+        content = parse_predict_response(response_json)
 
         click.secho("Model Output: ", fg="green", nl=False)
         click.secho(content, fg="white")
@@ -77,18 +171,23 @@ def predict(selected_endpoint: str) -> None:
 
     except Exception as e:
         stop_loader(loader_thread)
-        click.secho(f"An error occurred during prediction: {e}", fg="red")
+        click.secho(describe_error(e), fg="red")
         exit(1)
 
 
-def chat(selected_endpoint: str) -> None:
-    """Initiate a chat interaction with the selected endpoint.
+def start_session(
+    selected_endpoint: str, inference_component: Optional[str] = None
+) -> Session:
+    """Prompt for the settings of a chat and start a new session.
 
     Args:
         selected_endpoint (str): The name of the selected endpoint.
-    """
-    click.echo("\n")
+        inference_component (Optional[str]): The inference component of a
+            shared endpoint to chat with.
 
+    Returns:
+        Session: The new session.
+    """
     system_instruction = input(
         click.style(
             "Provide a system instruction to guide the model's "
@@ -107,69 +206,130 @@ def chat(selected_endpoint: str) -> None:
         or 0.6
     )
 
-    conversation_history = []
-    if system_instruction.strip():
-        conversation_history.append({"role": "system", "content": system_instruction})
+    parameters = {
+        "max_new_tokens": int(max_new_tokens),
+        "top_p": float(top_p),
+        "temperature": float(temperature),
+    }
+    session = create_session(
+        selected_endpoint,
+        parameters,
+        system_instruction.strip(),
+        inference_component,
+    )
+    click.secho(
+        f"\nSession ID: {session.session_id} "
+        + f"(resume with 'interact --resume {session.session_id}')",
+        fg="yellow",
+    )
+    return session
+
+
+def read_chat_message() -> Optional[str]:
+    """Prompt the user for a chat message until one is entered.
+
+    Returns:
+        Optional[str]: The message, or None if the user exits the chat.
+    """
+    user_input = ""
+    while not user_input.strip():
+        user_input = input(click.style("You: ", fg="blue"))
+        if user_input.lower() == "exit":
+            click.secho("Exiting chat...", fg="yellow")
+            return None
+    return user_input
+
+
+def chat(
+    selected_endpoint: str,
+    session: Optional[Session] = None,
+    invoker: Optional[Invoker] = None,
+    inference_component: Optional[str] = None,
+) -> None:
+    """Initiate a chat interaction with the selected endpoint.
+
+    Every turn is appended to the session's log as soon as the model
+    has responded, and joins the conversation once it is logged. If a
+    message fails, or its turn cannot be logged, the error is reported and
+    the turn is left out of the conversation, so the chat can go on.
+
+    Args:
+        selected_endpoint (str): The name of the selected endpoint.
+        session (Optional[Session]): A resumed session to continue.
+            A new session is started if not provided.
+        invoker (Optional[Invoker]): Sends the payload to the model.
+            Defaults to invoking the selected endpoint.
+        inference_component (Optional[str]): The inference component of a
+            shared endpoint to chat with, if a new session is started.
+    """
+    invoke = invoker or endpoint_invoker(selected_endpoint, inference_component)
+    click.echo("\n")
+
+    if session is None:
+        session = start_session(selected_endpoint, inference_component)
+    else:
+        click.secho(
+            f"Resumed session {session.session_id} with "
+            + f"{len(session.turns)} turn(s) in context.",
+            fg="yellow",
+        )
+        for turn in session.turns[-1:]:
+            click.secho("You: ", fg="blue", nl=False)
+            click.secho(turn["user"], fg="white")
+            click.secho("Model: ", fg="green", nl=False)
+            click.secho(turn["assistant"], fg="white")
+
+    conversation_history = session.conversation_history()
 
     click.secho("\nType 'exit' to end the chat.\n", fg="yellow")
 
-    exit_chat = False
     while True:
-        user_input = ""
-        while not user_input.strip():
-            user_input = input(click.style("You: ", fg="blue"))
-            if user_input.lower() == "exit":
-                click.secho("Exiting chat...", fg="yellow")
-                exit_chat = True
-                break
-
-        if exit_chat:
+        user_input = read_chat_message()
+        if user_input is None:
             break
 
-        conversation_history.append({"role": "user", "content": user_input})
+        user_message = {"role": "user", "content": user_input}
 
         try:
             loader_thread = start_loader(
                 message="Waiting for Model response...", color="green"
             )
 
-            predictor = Predictor(endpoint_name=selected_endpoint)
-            predictor.serializer = JSONSerializer(content_type="application/json")
-
-            payload = {
-                "inputs": [conversation_history],
-                "parameters": {
-                    "max_new_tokens": int(max_new_tokens),
-                    "top_p": float(top_p),
-                    "temperature": float(temperature),
-                },
-            }
-
-            response_bytes = predictor.predict(
-                payload, custom_attributes="accept_eula=true"
+            payload = build_chat_payload(
+                [*conversation_history, user_message], **session.parameters
             )
-            stop_loader(loader_thread)
-
-            response_string = response_bytes.decode("utf-8")
-            response_json = json.loads(response_string)
-            content = response_json[0]["generation"]["content"]
 
-            # Add the assistant's response to the conversation history
-            conversation_history.append({"role": "assistant", "content": content})
+            response_json = invoke_measured(invoke, payload, "chat")
+            stop_loader(loader_thread)
 
-            click.secho("Model: ", fg="green", nl=False)
-            click.secho(content, fg="white")
-            click.secho("\n", nl=False)
+            content = parse_chat_response(response_json)
 
         except Exception as e:
             stop_loader(loader_thread)
-            click.secho(f"An error occurred during prediction: {e}", fg="red")
-            exit(1)
+            click.secho(describe_error(e), fg="red")
+            click.secho("Your message was not sent, please try again.\n", fg="yellow")
+            continue
+
+        click.secho("Model: ", fg="green", nl=False)
+        click.secho(content, fg="white")
+        click.secho("\n", nl=False)
+
+        try:
+            session.append_turn(user_input, content)
+        except OSError as e:
+            click.secho(f"The turn could not be logged: {e}", fg="red")
+            click.secho("It is left out of the conversation.\n", fg="yellow")
+            continue
+
+        # Add the turn to the conversation history once it is logged
+        conversation_history.extend(
+            [user_message, {"role": "assistant", "content": content}]
+        )
 
     click.secho("Chat ended. \n", fg="yellow")
 
 
-INTERACTION_FUNCTIONS = {
+INTERACTION_FUNCTIONS: Dict[str, Callable[..., None]] = {
     "meta-textgeneration-llama-2-7b": predict,
     "meta-textgeneration-llama-2-7b-f": chat,
     "meta-textgeneration-llama-2-13b": predict,
@@ -179,25 +339,364 @@ INTERACTION_FUNCTIONS = {
 }
 
 
-def interact() -> None:
+def interaction_type(endpoint_name: str) -> Optional[str]:
+    """Return how a deployed endpoint is interacted with.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+
+    Returns:
+        Optional[str]: "predict" or "chat", or None if the model of the
+            endpoint is not supported.
+    """
+    model_id = model_id_from_endpoint(endpoint_name)
+    interaction_function = INTERACTION_FUNCTIONS.get(model_id or "")
+    return interaction_function.__name__ if interaction_function else None
+
+
+def start_connection_warm_up(regions: Optional[List[str]] = None) -> threading.Thread:
+    """Set up the connections to the SageMaker Runtime in the background.
+
+    Args:
+        regions (Optional[List[str]]): The regions whose clients are warmed
+            up. Defaults to the region of the loaded credentials.
+
+    Returns:
+        threading.Thread: The thread warming up the connections.
+    """
+
+    def warm_up() -> None:
+        clients = (
+            [get_client("sagemaker-runtime", region) for region in regions]
+            if regions
+            else [get_client("sagemaker-runtime")]
+        )
+        for client in clients:
+            warm_up_connection(client)
+
+    thread = threading.Thread(target=warm_up, daemon=True)
+    thread.start()
+    return thread
+
+
+def build_router(
+    endpoint_name: str, policy: str, resilience: ResilientInvoker
+) -> EndpointRouter:
+    """Build a router across all endpoints of the same model as an endpoint.
+
+    Args:
+        endpoint_name (str): The name of the selected endpoint.
+        policy (str): The routing policy.
+        resilience (ResilientInvoker): Invokes the chosen endpoints.
+
+    Returns:
+        EndpointRouter: The router.
+    """
+    endpoints = get_resources("Endpoint", get_client("sagemaker"))
+    groups = group_by_model(endpoint["name"] for endpoint in endpoints)
+    group = groups.get(model_id_from_endpoint(endpoint_name) or "", [endpoint_name])
+
+    click.secho(
+        f"Balancing requests across {len(group)} endpoint(s) ({policy}).",
+        fg="yellow",
+    )
+    return EndpointRouter(group, policy=policy, invoke=resilience.invoke_endpoint)
+
+
+def build_regional_invoker(
+    endpoint_name: str, regions: List[str]
+) -> Tuple[Invoker, RegionSelector, List[ResilientInvoker]]:
+    """Build an invoker sending requests to the fastest region of an endpoint.
+
+    Args:
+        endpoint_name (str): The name of the endpoint, the same in every
+            region.
+        regions (List[str]): The regions the endpoint is deployed to.
+
+    Returns:
+        Tuple[Invoker, RegionSelector, List[ResilientInvoker]]: The invoker,
+            the selector choosing the regions and the invokers of every
+            region.
+    """
+    selector = RegionSelector(regions)
+    resilience = {
+        region: ResilientInvoker(runtime_client=get_client("sagemaker-runtime", region))
+        for region in regions
+    }
+    click.secho(
+        f"Sending requests to the fastest of {len(regions)} regions, "
+        + f"probed every {selector.reprobe_interval:.0f}s.",
+        fg="yellow",
+    )
+    invokers = {
+        region: invoker.endpoint_invoker(endpoint_name)
+        for region, invoker in resilience.items()
+    }
+    return regional_invoker(selector, invokers), selector, [*resilience.values()]
+
+
+def print_region_summary(selector: RegionSelector) -> None:
+    """Print the last round-trip time to every region.
+
+    Args:
+        selector (RegionSelector): The selector of the regions.
+    """
+    click.secho("Region round-trip times:", fg="yellow")
+    for stats in selector.summary():
+        click.secho(stats, fg="green")
+    click.secho("\n", nl=False)
+
+
+def print_routing_summary(router: EndpointRouter) -> None:
+    """Print the routing statistics of every endpoint.
+
+    Args:
+        router (EndpointRouter): The router.
+    """
+    click.secho("Routing summary:", fg="yellow")
+    for stats in router.summary():
+        click.secho(stats, fg="green")
+    click.secho("\n", nl=False)
+
+
+def run_interaction(
+    interaction_function: Callable[..., None],
+    endpoint_name: str,
+    session: Optional[Session] = None,
+    balance: Optional[str] = None,
+    deadline: Optional[float] = None,
+    hedge_percentile: Optional[float] = None,
+    inference_component: Optional[str] = None,
+    regions: Optional[List[str]] = None,
+) -> None:
+    """Run an interaction through the configured invocation layers.
+
+    Requests are always sent through a `ResilientInvoker`, which retries
+    throttling and transient errors and adapts the request concurrency.
+
+    Args:
+        interaction_function (Callable[..., None]): `predict` or `chat`.
+        endpoint_name (str): The name of the selected endpoint.
+        session (Optional[Session]): A resumed chat session to continue.
+        balance (Optional[str]): A routing policy to balance requests across
+            all endpoints of the selected endpoint's model.
+        deadline (Optional[float]): Seconds after which a request fails.
+        hedge_percentile (Optional[float]): Percentile of observed latency
+            after which a duplicate request is sent.
+        inference_component (Optional[str]): The inference component of a
+            shared endpoint to invoke. Requests to components are not balanced.
+        regions (Optional[List[str]]): The regions the endpoint is deployed
+            to, of which the fastest is invoked. Not combined with balancing.
+    """
+    resilience = ResilientInvoker()
+    resiliences = [resilience]
+    router = None
+    selector = None
+    if (balance or regions) and inference_component:
+        click.secho(
+            "Balancing and regions are not available for inference components.",
+            fg="yellow",
+        )
+    elif balance:
+        router = build_router(endpoint_name, balance, resilience)
+    elif regions:
+        invoker, selector, resiliences = build_regional_invoker(endpoint_name, regions)
+    if selector is None:
+        invoker = (
+            router.invoke
+            if router
+            else resilience.endpoint_invoker(endpoint_name, inference_component)
+        )
+
+    hedger = None
+    if deadline is not None or hedge_percentile is not None:
+        hedger = HedgedInvoker(invoker, deadline, hedge_percentile)
+        invoker = hedger.invoke
+
+    if session is not None:
+        chat(endpoint_name, session, invoker=invoker)
+    else:
+        interaction_function(
+            endpoint_name, invoker=invoker, inference_component=inference_component
+        )
+
+    print_summaries(router, selector, hedger, resiliences)
+
+
+def print_summaries(
+    router: Optional[EndpointRouter],
+    selector: Optional[RegionSelector],
+    hedger: Optional[HedgedInvoker],
+    resiliences: List[ResilientInvoker],
+) -> None:
+    """Print the summaries of the invocation layers used by an interaction.
+
+    Args:
+        router (Optional[EndpointRouter]): The router, if balancing.
+        selector (Optional[RegionSelector]): The selector of the regions, if
+            the endpoint is deployed to several regions.
+        hedger (Optional[HedgedInvoker]): The hedger, which is shut down.
+        resiliences (List[ResilientInvoker]): The invokers that retried
+            requests.
+    """
+    if router:
+        print_routing_summary(router)
+    if selector:
+        print_region_summary(selector)
+    if hedger:
+        click.secho("Hedging summary:", fg="yellow")
+        click.secho(hedger.summary(), fg="green")
+        click.secho("\n", nl=False)
+        hedger.shutdown()
+    retries = sum(resilience.retries for resilience in resiliences)
+    if retries:
+        click.secho(f"Retried {retries} request(s).\n", fg="yellow")
+
+
+def choose_inference_component(endpoint_name: str) -> str:
+    """Choose an inference component of a shared endpoint.
+
+    Args:
+        endpoint_name (str): The name of the shared endpoint.
+
+    Returns:
+        str: The name of the selected component.
+    """
+    components = [
+        component["name"]
+        for component in get_resources("Inference Component", get_client("sagemaker"))
+        if component["endpoint"] == endpoint_name
+    ]
+    if not components:
+        click.secho(
+            f"The endpoint {endpoint_name!r} has no inference components. \n",
+            fg="red",
+        )
+        exit(1)
+
+    questions = [
+        inquirer.List(
+            "component",
+            message="Select an inference component to interact:",
+            choices=components,
+        ),
+    ]
+    component: str = inquirer.prompt(questions)["component"]
+    return component
+
+
+def choose_regional_endpoint(
+    regions: List[str], endpoint_name: Optional[str] = None
+) -> Tuple[str, List[str]]:
+    """Choose an endpoint deployed to several regions.
+
+    Endpoints deployed by `deploy --regions` have the same name in every
+    region, so they are listed once with the regions hosting them.
+
+    Args:
+        regions (List[str]): The regions to look for endpoints in.
+        endpoint_name (Optional[str]): The name of the endpoint, when
+            already known, e.g. from a resumed chat session.
+
+    Returns:
+        Tuple[str, List[str]]: The name of the endpoint and the regions
+            hosting it.
+    """
+    hosts: Dict[str, List[str]] = {}
+    for endpoint in get_resources_in_regions("Endpoint", regions):
+        hosts.setdefault(endpoint["name"], []).append(endpoint["region"])
+    if endpoint_name is None and hosts:
+        questions = [
+            inquirer.List(
+                "endpoint",
+                message="Select an endpoint to interact:",
+                choices=[
+                    (f"{name} ({', '.join(hosts[name])})", name) for name in hosts
+                ],
+            ),
+        ]
+        endpoint_name = inquirer.prompt(questions)["endpoint"]
+    if endpoint_name not in hosts:
+        click.secho("The endpoint is not deployed to any of the regions. \n", fg="red")
+        exit(1)
+    return endpoint_name, hosts[endpoint_name]
+
+
+def interact(
+    resume: Optional[str] = None,
+    balance: Optional[str] = None,
+    deadline: Optional[float] = None,
+    hedge_percentile: Optional[float] = None,
+    regions: Optional[str] = None,
+) -> None:
     """Main function to interact with deployed models on AWS.
 
     Loads credentials, allows the user to choose an endpoint, and then facilitates
     either prediction or chat interaction based on the selected endpoint.
+
+    Args:
+        resume (Optional[str]): The ID of a chat session to resume
+            instead of choosing an endpoint.
+        balance (Optional[str]): A routing policy to balance requests across
+            all endpoints of the selected endpoint's model.
+        deadline (Optional[float]): Seconds after which a request fails.
+        hedge_percentile (Optional[float]): Percentile of observed latency
+            after which a duplicate request is sent.
+        regions (Optional[str]): Comma-separated regions to choose the
+            endpoint from, invoked in the region with the lowest round-trip
+            time.
     """
     load_credentials()
 
-    sagemaker_client = boto3.client("sagemaker")
-    selected_endpoint = choose_resource("Endpoint", sagemaker_client, "interact")
-    selected_endpoint_name = selected_endpoint["name"]
+    session = None
+    inference_component = None
+    endpoint_regions = None
+    if resume:
+        session = resume_session(resume)
+        if session is None:
+            click.secho(f"No chat session with ID {resume!r} found. \n", fg="red")
+            exit(1)
+        selected_endpoint_name = session.endpoint_name
+        inference_component = session.inference_component
+        if parse_regions(regions) and not inference_component:
+            _, endpoint_regions = choose_regional_endpoint(
+                parse_regions(regions), selected_endpoint_name
+            )
+        start_connection_warm_up(endpoint_regions)
+    elif parse_regions(regions):
+        selected_endpoint_name, endpoint_regions = choose_regional_endpoint(
+            parse_regions(regions)
+        )
+        start_connection_warm_up(endpoint_regions)
+    else:
+        sagemaker_client = get_client("sagemaker")
+        selected_endpoint = choose_resource("Endpoint", sagemaker_client, "interact")
+        selected_endpoint_name = selected_endpoint["name"]
+        start_connection_warm_up()
+        inference_component = (
+            choose_inference_component(selected_endpoint_name)
+            if is_shared_endpoint(selected_endpoint_name)
+            else None
+        )
 
-    # Extract the model ID from the endpoint name using a regular expression
-    match = re.match(r"^sych-llm-pg-(.*?)-e-", selected_endpoint_name)
-    if match:
-        model_id = match.group(1)
+    model_id = (
+        model_id_from_component(inference_component)
+        if inference_component
+        else model_id_from_endpoint(selected_endpoint_name)
+    )
+    if model_id:
         interaction_function = INTERACTION_FUNCTIONS.get(model_id)
         if interaction_function:
-            interaction_function(selected_endpoint_name)
+            run_interaction(
+                interaction_function,
+                selected_endpoint_name,
+                session,
+                balance,
+                deadline,
+                hedge_percentile,
+                inference_component,
+                endpoint_regions,
+            )
         else:
             click.secho(
                 f"The model {model_id!r} is not currently supported. \n",
@@ -1,9 +1,13 @@
 """Module to list deployed resources on AWS.
 
 This module contains a function to display deployed models and endpoints on AWS.
-The resources are listed by type (Model, Endpoint), and the `list` function
-can be executed directly from the command-line interface to view all AWS
-deployed resources.
+The resources are listed by type (Model, Endpoint, Inference Component,
+API Gateway, HTTP API), and the `list` function can be executed directly from the
+command-line interface to view all AWS deployed resources.
+
+The cache, throttling and usage plan of every API Gateway are listed
+along with it. Resources of several regions are listed concurrently.
+Hibernated endpoints are listed from their local records.
 
 Functions:
     list: Function to list deployed resources on AWS SageMaker.
@@ -17,14 +21,74 @@ Dependencies:
     - click: Command Line Interface Creation Kit, used for CLI interaction.
 """
 
-import boto3
+import os
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
 import click
+from botocore.exceptions import ClientError
 
+from .utils.clients import get_client
 from .utils.credentials import load_credentials
+from .utils.gateway import describe_gateway
+from .utils.hibernation import load_hibernated
+from .utils.regions import parse_regions
+from .utils.resources import RESOURCE_SERVICES
 from .utils.resources import get_resources
+from .utils.resources import get_resources_in_regions
+
+
+def _describe_gateways(client: Any, resources: List[Dict[str, Any]]) -> None:
+    """Add the stage settings of API Gateways to their resources.
+
+    Args:
+        client (Any): The API Gateway client.
+        resources (List[Dict[str, Any]]): The API Gateways, updated in place.
+    """
+    if not resources:
+        return
+    usage_plans = client.get_usage_plans()["items"]
+    for resource in resources:
+        try:
+            resource.update(describe_gateway(client, resource["id"], usage_plans))
+        except ClientError:
+            # APIs without a stage, e.g. while they are being deleted.
+            continue
+
+
+def _fetch_resources(resource_type: str, regions: List[str]) -> List[Dict[str, Any]]:
+    """Fetch the resources of a type, with the settings of API Gateways.
 
+    Args:
+        resource_type (str): The type of resource.
+        regions (List[str]): The regions to list resources in. Defaults to
+            the region of the credentials if empty.
 
-def list() -> None:
+    Returns:
+        List[Dict[str, Any]]: The resources.
+    """
+    service = RESOURCE_SERVICES.get(resource_type, "sagemaker")
+    if not regions:
+        resources: List[Dict[str, Any]] = get_resources(
+            resource_type, get_client(service)
+        )
+        if resource_type == "API Gateway":
+            _describe_gateways(get_client(service), resources)
+        return resources
+
+    resources = get_resources_in_regions(resource_type, regions)
+    if resource_type == "API Gateway":
+        for region in regions:
+            _describe_gateways(
+                get_client(service, region),
+                [resource for resource in resources if resource["region"] == region],
+            )
+    return resources
+
+
+def list(regions: Optional[str] = None) -> None:
     """List deployed resources on AWS SageMaker.
 
     This function retrieves and prints the names of deployed models and endpoints
@@ -32,20 +96,30 @@ def list() -> None:
     function from the `utils.resources` module to fetch the resources,
     specifically targeting AWS SageMaker services, and prints them in
     a user-friendly format.
+
+    Args:
+        regions (Optional[str]): Comma-separated regions to list resources
+            in, concurrently. Defaults to the region of the credentials.
     """
     load_credentials()
 
-    resource_types = ["Model", "Endpoint", "API Gateway"]
+    resource_types = [
+        "Model",
+        "Endpoint",
+        "Inference Component",
+        "API Gateway",
+        "HTTP API",
+    ]
     for resource_type in resource_types:
-        client = (
-            boto3.client("sagemaker")
-            if resource_type != "API Gateway"
-            else boto3.client("apigateway")
-        )
-        resources = get_resources(resource_type, client)
+        resources = _fetch_resources(resource_type, parse_regions(regions))
         click.secho(f"Deployed {resource_type}s:", fg="yellow")
         for resource in resources:
             click.secho(resource, fg="green")
+
+    click.secho("Hibernated Endpoints:", fg="yellow")
+    for region in parse_regions(regions) or [os.environ["AWS_DEFAULT_REGION"]]:
+        for record in load_hibernated(region).values():
+            click.secho(record, fg="green")
     click.secho("\n", nl=False)
 
 
@@ -0,0 +1,284 @@
+"""This module generates open-loop load against deployed models on AWS.
+
+Requests are sent to a chosen endpoint, or to an API Gateway URL, at a
+target arrival rate or at the timestamps of a recorded trace, and the
+latency of the endpoint is reported against the offered load.
+
+Functions:
+    build_arrivals: Build the arrival times and payloads of a load test.
+    choose_target: Choose the endpoint or API Gateway URL to send requests to.
+    print_load_curve: Print a load curve and its saturation knee.
+    loadgen: Main function to generate load against an endpoint.
+"""
+
+import json
+import random
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import click
+
+from .interact import INTERACTION_FUNCTIONS
+from .interact import choose_inference_component
+from .utils.clients import get_client
+from .utils.components import is_shared_endpoint
+from .utils.components import model_id_from_component
+from .utils.credentials import load_credentials
+from .utils.invocation import Invoker
+from .utils.invocation import endpoint_invoker
+from .utils.invocation import gateway_invoker
+from .utils.loadgen import Arrival
+from .utils.loadgen import constant_schedule
+from .utils.loadgen import load_curve
+from .utils.loadgen import poisson_schedule
+from .utils.loadgen import read_trace
+from .utils.loadgen import run_open_loop
+from .utils.loadgen import saturation_knee
+from .utils.loadgen import step_schedule
+from .utils.loadgen import synthetic_payload
+from .utils.resources import choose_resource
+from .utils.resources import model_id_from_endpoint
+
+
+# Seconds of every point of the load curve of a replayed trace.
+TRACE_WINDOW = 10.0
+
+
+def build_arrivals(
+    kind: str,
+    arrival: str,
+    rate: float,
+    duration: float,
+    step_rate: Optional[float],
+    steps: int,
+    trace_file: Optional[str],
+    prompt_words: int,
+    max_new_tokens: int,
+    seed: Optional[int] = None,
+) -> List[Arrival]:
+    """Build the arrival times and payloads of a load test.
+
+    Args:
+        kind (str): How the endpoint is interacted with, "predict" or "chat".
+        arrival (str): The arrival process, "constant", "poisson" or "step".
+        rate (float): Requests per second, of the first step of a ramp.
+        duration (float): Seconds of the test, or of every step of a ramp.
+        step_rate (Optional[float]): Requests per second added by every
+            step of a ramp. Defaults to `rate`.
+        steps (int): The number of steps of a ramp.
+        trace_file (Optional[str]): A recorded trace to replay instead.
+        prompt_words (int): The number of words of every prompt.
+        max_new_tokens (int): Maximum number of generated tokens.
+        seed (Optional[int]): Seed of the Poisson process.
+
+    Returns:
+        List[Arrival]: The arrivals.
+    """
+    if trace_file:
+        return [
+            (
+                record["timestamp"],
+                synthetic_payload(
+                    kind,
+                    record["prompt_words"],
+                    int(record.get("max_new_tokens", max_new_tokens)),
+                ),
+            )
+            for record in read_trace(trace_file)
+        ]
+
+    rng = random.Random(seed)  # noqa: S311
+    if arrival == "step":
+        times = step_schedule(rate, step_rate or rate, steps, duration, rng=rng)
+    elif arrival == "poisson":
+        times = poisson_schedule(rate, duration, rng=rng)
+    else:
+        times = constant_schedule(rate, duration)
+    payload = synthetic_payload(kind, prompt_words, max_new_tokens)
+    return [(time, payload) for time in times]
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    """Format a latency in a column of a load curve.
+
+    Args:
+        value (Optional[float]): The latency in seconds, or None.
+
+    Returns:
+        str: The formatted latency.
+    """
+    return f"{value:8.2f}s" if value is not None else f"{'-':>9}"
+
+
+def print_load_curve(curve: List[Dict[str, Any]]) -> None:
+    """Print a load curve and its saturation knee.
+
+    Args:
+        curve (List[Dict[str, Any]]): The load curve.
+    """
+    click.secho(
+        f"{'offered':>10} {'achieved':>10} {'p50':>9} {'p90':>9} {'p99':>9} "
+        + f"{'errors':>7}",
+        fg="yellow",
+    )
+    for point in curve:
+        click.echo(
+            f"{point['offered']:8.2f}/s {point['throughput']:8.2f}/s "
+            + f"{_format_seconds(point['p50'])} {_format_seconds(point['p90'])} "
+            + f"{_format_seconds(point['p99'])} {point['errors']:7.1%}"
+        )
+
+    knee = saturation_knee(curve)
+    if knee is None:
+        click.secho("\nThe endpoint did not saturate. \n", fg="green")
+        return
+    healthy = [point for point in curve if point["offered"] < knee["offered"]]
+    last_healthy = (
+        f" (last healthy load: {max(p['offered'] for p in healthy):.2f}/s)"
+        if healthy
+        else ""
+    )
+    click.secho(
+        f"\nSaturated at {knee['offered']:.2f} requests/s{last_healthy}. \n",
+        fg="yellow",
+    )
+
+
+def choose_target(
+    url: Optional[str], payload_format: str, api_key: Optional[str] = None
+) -> Tuple[Invoker, str, str]:
+    """Choose the endpoint or API Gateway URL to send requests to.
+
+    Requests to an API Gateway bypass its cache, so that they reach the
+    endpoint.
+
+    Args:
+        url (Optional[str]): An API Gateway URL to send the load to, instead
+            of choosing an endpoint.
+        payload_format (str): The payload format for the URL.
+        api_key (Optional[str]): The API key of the API Gateway, if required.
+
+    Returns:
+        Tuple[Invoker, str, str]: The invoker, the payload format and the
+            name of the target.
+    """
+    if url:
+        invoke = gateway_invoker(url, api_key=api_key, cache=False)
+        return invoke, payload_format, url
+
+    load_credentials()
+    selected_endpoint = choose_resource(
+        "Endpoint", get_client("sagemaker"), "load test"
+    )
+    endpoint_name = selected_endpoint["name"]
+    inference_component = (
+        choose_inference_component(endpoint_name)
+        if is_shared_endpoint(endpoint_name)
+        else None
+    )
+    model_id = (
+        model_id_from_component(inference_component)
+        if inference_component
+        else model_id_from_endpoint(endpoint_name)
+    )
+    interaction_function = INTERACTION_FUNCTIONS.get(model_id or "")
+    if interaction_function is None:
+        click.secho(
+            f"The endpoint {endpoint_name!r} does not match any supported models. \n",
+            fg="red",
+        )
+        exit(1)
+    return (
+        endpoint_invoker(endpoint_name, inference_component),
+        interaction_function.__name__,
+        endpoint_name,
+    )
+
+
+def loadgen(
+    arrival: str,
+    rate: float,
+    duration: float,
+    step_rate: Optional[float],
+    steps: int,
+    trace_file: Optional[str],
+    prompt_words: int,
+    max_new_tokens: int,
+    max_in_flight: int,
+    window: Optional[float],
+    url: Optional[str],
+    payload_format: str,
+    output_file: Optional[str],
+    seed: Optional[int],
+    api_key: Optional[str] = None,
+) -> None:
+    """Main function to generate open-loop load against an endpoint on AWS.
+
+    Args:
+        arrival (str): The arrival process, "constant", "poisson" or "step".
+        rate (float): Requests per second, of the first step of a ramp.
+        duration (float): Seconds of the test, or of every step of a ramp.
+        step_rate (Optional[float]): Requests per second added by every
+            step of a ramp.
+        steps (int): The number of steps of a ramp.
+        trace_file (Optional[str]): A recorded trace to replay instead.
+        prompt_words (int): The number of words of every prompt.
+        max_new_tokens (int): Maximum number of generated tokens.
+        max_in_flight (int): Maximum number of requests in flight.
+        window (Optional[float]): Seconds of every point of the load curve.
+            Defaults to `TRACE_WINDOW` for traces, the step duration for
+            ramps and the whole test otherwise.
+        url (Optional[str]): An API Gateway URL to send the load to.
+        payload_format (str): The payload format for the URL.
+        output_file (Optional[str]): A JSONL file the result of every
+            request is written to.
+        seed (Optional[int]): Seed of the Poisson process.
+        api_key (Optional[str]): The API key of the API Gateway behind the
+            URL, if it has a usage plan.
+    """
+    invoke, kind, target = choose_target(url, payload_format, api_key)
+
+    try:
+        arrivals = build_arrivals(
+            kind,
+            arrival,
+            rate,
+            duration,
+            step_rate,
+            steps,
+            trace_file,
+            prompt_words,
+            max_new_tokens,
+            seed,
+        )
+    except ValueError as e:
+        click.secho(f"Invalid trace {trace_file!r}: {e}", fg="red")
+        exit(1)
+    if not arrivals:
+        click.secho("No requests to send. \n", fg="red")
+        exit(1)
+
+    last_arrival = max(offset for offset, _ in arrivals)
+    click.secho(
+        f"Sending {len(arrivals)} request(s) to {target} "
+        + f"over {last_arrival:.0f}s...\n",
+        fg="yellow",
+    )
+    results = run_open_loop(invoke, arrivals, max_in_flight=max_in_flight)
+
+    if output_file:
+        with open(output_file, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+
+    if not window:
+        if trace_file:
+            window = TRACE_WINDOW
+        elif arrival == "step":
+            window = duration
+        else:
+            window = max(last_arrival, duration)
+    print_load_curve(load_curve(results, window))
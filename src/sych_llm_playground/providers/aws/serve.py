@@ -0,0 +1,538 @@
+"""This module provides an OpenAI-compatible proxy in front of deployed models.
+
+It runs a local HTTP server exposing `/v1/completions`,
+`/v1/chat/completions` and `/v1/models`. Requests are translated into the
+Llama payloads used by `predict()` and `chat()` and sent to the deployed
+endpoints through a single pooled SageMaker Runtime client, with a bounded
+number of concurrent invocations. Responses can be streamed as server-sent
+events. Optionally, requests are balanced across all endpoints of the same
+model as the requested endpoint. Non-streaming requests are retried on
+throttling and transient errors, within an adaptive concurrency limit and
+an optional rate limit.
+
+Functions:
+    to_llama_payload: Translate an OpenAI request into a Llama payload.
+    create_server: Create the proxy server.
+    serve: Main function to run the proxy server.
+"""
+
+import json
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import ContextManager
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import click
+
+from .interact import interaction_type
+from .utils.clients import get_client
+from .utils.credentials import load_credentials
+from .utils.invocation import DEFAULT_MAX_NEW_TOKENS
+from .utils.invocation import DEFAULT_TEMPERATURE
+from .utils.invocation import DEFAULT_TOP_P
+from .utils.invocation import build_chat_payload
+from .utils.invocation import build_predict_payload
+from .utils.invocation import invoke_endpoint_stream
+from .utils.invocation import parse_chat_response
+from .utils.invocation import parse_predict_response
+from .utils.resilience import THROTTLED
+from .utils.resilience import AIMDLimiter
+from .utils.resilience import CircuitOpenError
+from .utils.resilience import ResilientInvoker
+from .utils.resilience import classify_error
+from .utils.resources import choose_resource
+from .utils.resources import get_resources
+from .utils.resources import model_id_from_endpoint
+from .utils.router import EndpointRouter
+from .utils.router import group_by_model
+
+
+COMPLETIONS_PATH = "/v1/completions"
+CHAT_COMPLETIONS_PATH = "/v1/chat/completions"
+MODELS_PATH = "/v1/models"
+
+# Seconds a request waits for a free invocation slot before being rejected.
+SLOT_TIMEOUT = 60.0
+
+
+def _messages_to_prompt(messages: List[Dict[str, Any]]) -> str:
+    """Flatten chat messages into a prompt for text generation models.
+
+    Args:
+        messages (List[Dict[str, Any]]): The chat messages.
+
+    Returns:
+        str: The contents of the messages, one per line.
+    """
+    return "\n".join(str(message.get("content", "")) for message in messages)
+
+
+def to_llama_payload(path: str, request: Dict[str, Any], kind: str) -> Dict[str, Any]:
+    """Translate an OpenAI request into a Llama payload.
+
+    Chat requests sent to text generation models are flattened into a
+    prompt, and completion requests sent to chat models are wrapped into
+    a single user message.
+
+    Args:
+        path (str): The path of the request, either `COMPLETIONS_PATH`
+            or `CHAT_COMPLETIONS_PATH`.
+        request (Dict[str, Any]): The decoded OpenAI request.
+        kind (str): How the endpoint is interacted with, "predict" or "chat".
+
+    Returns:
+        Dict[str, Any]: The Llama payload.
+    """
+    parameters = (
+        request.get("max_tokens") or DEFAULT_MAX_NEW_TOKENS,
+        request.get("top_p", DEFAULT_TOP_P),
+        request.get("temperature", DEFAULT_TEMPERATURE),
+    )
+
+    if path == CHAT_COMPLETIONS_PATH:
+        messages = [
+            {"role": message["role"], "content": str(message.get("content", ""))}
+            for message in request.get("messages", [])
+        ]
+        if kind == "chat":
+            return build_chat_payload(messages, *parameters)
+        return build_predict_payload(_messages_to_prompt(messages), *parameters)
+
+    prompt = request.get("prompt", "")
+    if isinstance(prompt, list):
+        prompt = prompt[0] if prompt else ""
+    if kind == "chat":
+        return build_chat_payload([{"role": "user", "content": prompt}], *parameters)
+    return build_predict_payload(prompt, *parameters)
+
+
+def _completion(path: str, model: str, content: str) -> Dict[str, Any]:
+    """Build an OpenAI response for a generated text.
+
+    Args:
+        path (str): The path of the request.
+        model (str): The endpoint that generated the text.
+        content (str): The generated text.
+
+    Returns:
+        Dict[str, Any]: The OpenAI response.
+    """
+    if path == CHAT_COMPLETIONS_PATH:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+    return {
+        "id": f"cmpl-{uuid.uuid4().hex}",
+        "object": "text_completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {"index": 0, "text": content, "logprobs": None, "finish_reason": "stop"}
+        ],
+    }
+
+
+def _completion_chunk(
+    path: str, completion_id: str, model: str, token: Optional[str]
+) -> Dict[str, Any]:
+    """Build an OpenAI streaming chunk for a generated token.
+
+    Args:
+        path (str): The path of the request.
+        completion_id (str): The ID shared by all chunks of a response.
+        model (str): The endpoint that generated the token.
+        token (Optional[str]): The generated token, or None for the last chunk.
+
+    Returns:
+        Dict[str, Any]: The OpenAI streaming chunk.
+    """
+    finish_reason = "stop" if token is None else None
+    if path == CHAT_COMPLETIONS_PATH:
+        choice: Dict[str, Any] = {
+            "index": 0,
+            "delta": {"content": token} if token is not None else {},
+            "finish_reason": finish_reason,
+        }
+        obj = "chat.completion.chunk"
+    else:
+        choice = {
+            "index": 0,
+            "text": token or "",
+            "logprobs": None,
+            "finish_reason": finish_reason,
+        }
+        obj = "text_completion"
+    return {
+        "id": completion_id,
+        "object": obj,
+        "created": int(time.time()),
+        "model": model,
+        "choices": [choice],
+    }
+
+
+class ProxyServer(ThreadingHTTPServer):
+    """HTTP server forwarding OpenAI requests to deployed endpoints."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        default_endpoint: str,
+        endpoints: Iterable[str],
+        runtime_client: Any,
+        max_concurrency: int,
+        balance: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            server_address (Tuple[str, int]): The host and port to bind to.
+            default_endpoint (str): The endpoint used when a request does
+                not name a known endpoint as its model.
+            endpoints (Iterable[str]): The endpoints requests may name.
+            runtime_client (Any): The SageMaker Runtime client shared
+                by all requests.
+            max_concurrency (int): Maximum number of concurrent invocations.
+            balance (Optional[str]): A routing policy to balance requests
+                across all endpoints of the same model.
+            rate_limit (Optional[float]): Maximum invocations per second.
+        """
+        super().__init__(server_address, ProxyRequestHandler)
+        self.default_endpoint = default_endpoint
+        self.endpoints = {default_endpoint, *endpoints}
+        self.runtime_client = runtime_client
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.resilience = ResilientInvoker(
+            runtime_client,
+            rate_limit=rate_limit,
+            limiter=AIMDLimiter(initial=max_concurrency, maximum=max_concurrency),
+        )
+        self.routers = {
+            model_id: EndpointRouter(group, policy=balance)
+            for model_id, group in group_by_model(sorted(self.endpoints)).items()
+            if balance
+        }
+
+    def resolve_endpoint(self, model: Optional[str]) -> str:
+        """Return the endpoint addressed by the model of a request.
+
+        Args:
+            model (Optional[str]): The model named by the request.
+
+        Returns:
+            str: The named endpoint if it is known, else the default endpoint.
+        """
+        return model if model in self.endpoints else self.default_endpoint
+
+    def route(self, endpoint: str) -> ContextManager[str]:
+        """Route a request for an endpoint.
+
+        Args:
+            endpoint (str): The endpoint addressed by the request.
+
+        Returns:
+            ContextManager[str]: A context yielding the endpoint to invoke,
+                balanced across the endpoint's model if enabled.
+        """
+        router = self.routers.get(model_id_from_endpoint(endpoint) or "")
+        return router.acquire() if router else nullcontext(endpoint)
+
+
+class ProxyRequestHandler(BaseHTTPRequestHandler):
+    """Request handler translating between OpenAI and Llama payloads."""
+
+    server: ProxyServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handle GET requests, listing the endpoints as models."""
+        if self.path.rstrip("/") != MODELS_PATH:
+            self._send_error(404, f"Unknown path {self.path!r}.")
+            return
+
+        models = [
+            {"id": endpoint, "object": "model", "owned_by": "sych-llm-playground"}
+            for endpoint in sorted(self.server.endpoints)
+        ]
+        self._send_json(200, {"object": "list", "data": models})
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Handle POST requests to the completion routes."""
+        path = self.path.rstrip("/")
+        if path not in (COMPLETIONS_PATH, CHAT_COMPLETIONS_PATH):
+            self._send_error(404, f"Unknown path {self.path!r}.")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_error(400, f"Invalid JSON body: {e}")
+            return
+        if not isinstance(request, dict):
+            self._send_error(400, "The JSON body must be an object.")
+            return
+
+        endpoint = self.server.resolve_endpoint(request.get("model"))
+
+        kind = interaction_type(endpoint)
+        if kind is None:
+            self._send_error(400, f"The endpoint {endpoint!r} is not supported.")
+            return
+
+        try:
+            payload = to_llama_payload(path, request, kind)
+        except (KeyError, TypeError, ValueError) as e:
+            self._send_error(400, f"Invalid request: {e}")
+            return
+
+        self._respond(path, endpoint, kind, payload, bool(request.get("stream")))
+
+    def _respond(
+        self,
+        path: str,
+        endpoint: str,
+        kind: str,
+        payload: Dict[str, Any],
+        stream: bool,
+    ) -> None:
+        """Invoke the endpoint once an invocation slot is free and respond.
+
+        Args:
+            path (str): The path of the request.
+            endpoint (str): The endpoint to invoke.
+            kind (str): How the endpoint is interacted with, "predict" or "chat".
+            payload (Dict[str, Any]): The Llama payload.
+            stream (bool): Whether to stream the generated tokens.
+        """
+        if not self.server.slots.acquire(timeout=SLOT_TIMEOUT):
+            self._send_error(503, "Too many concurrent requests.")
+            return
+
+        try:
+            with self.server.route(endpoint) as target:
+                if stream:
+                    self._stream(path, target, payload)
+                else:
+                    self._complete(path, target, kind, payload)
+        except CircuitOpenError as e:
+            self._send_error(503, f"{e}")
+        except Exception as e:
+            status = 429 if classify_error(e) == THROTTLED else 502
+            self._send_error(status, f"An error occurred during prediction: {e}")
+        finally:
+            self.server.slots.release()
+
+    def _complete(
+        self, path: str, endpoint: str, kind: str, payload: Dict[str, Any]
+    ) -> None:
+        """Send the whole generated text as a single response.
+
+        Args:
+            path (str): The path of the request.
+            endpoint (str): The endpoint to invoke.
+            kind (str): How the endpoint is interacted with, "predict" or "chat".
+            payload (Dict[str, Any]): The Llama payload.
+        """
+        response_json = self.server.resilience.invoke_endpoint(endpoint, payload)
+        content = (
+            parse_chat_response(response_json)
+            if kind == "chat"
+            else parse_predict_response(response_json)
+        )
+        self._send_json(200, _completion(path, endpoint, content))
+
+    def _stream(self, path: str, endpoint: str, payload: Dict[str, Any]) -> None:
+        """Stream the generated tokens as server-sent events.
+
+        The first token is fetched before the response headers are sent,
+        so that failed invocations can still be reported with a status code.
+
+        Args:
+            path (str): The path of the request.
+            endpoint (str): The endpoint to invoke.
+            payload (Dict[str, Any]): The Llama payload.
+        """
+        tokens = invoke_endpoint_stream(endpoint, payload, self.server.runtime_client)
+        first_token = next(tokens, None)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        completion_id = f"cmpl-{uuid.uuid4().hex}"
+        try:
+            if first_token is not None:
+                self._send_event(
+                    _completion_chunk(path, completion_id, endpoint, first_token)
+                )
+                for token in tokens:
+                    self._send_event(
+                        _completion_chunk(path, completion_id, endpoint, token)
+                    )
+            self._send_event(_completion_chunk(path, completion_id, endpoint, None))
+        except Exception as e:
+            # Headers are already sent, so the error is reported in-stream.
+            self._send_event({"error": {"message": f"{e}", "type": "server_error"}})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_event(self, chunk: Dict[str, Any]) -> None:
+        """Write a single server-sent event.
+
+        Args:
+            chunk (Dict[str, Any]): The data of the event.
+        """
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.flush()
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        """Send a JSON response.
+
+        Args:
+            status (int): The HTTP status code.
+            body (Dict[str, Any]): The response body.
+        """
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, message: str) -> None:
+        """Send an OpenAI-style error response.
+
+        Args:
+            status (int): The HTTP status code.
+            message (str): The error message.
+        """
+        error_type = (
+            "rate_limit_error"
+            if status == 429
+            else "invalid_request_error" if status < 500 else "server_error"
+        )
+        self._send_json(status, {"error": {"message": message, "type": error_type}})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests through click instead of stderr.
+
+        Args:
+            format (str): The format string of the message.
+            *args (Any): The arguments of the format string.
+        """
+        click.secho(format % args, fg="bright_black")
+
+
+def create_server(
+    host: str,
+    port: int,
+    default_endpoint: str,
+    endpoints: Iterable[str] = (),
+    runtime_client: Optional[Any] = None,
+    max_concurrency: int = 8,
+    balance: Optional[str] = None,
+    rate_limit: Optional[float] = None,
+) -> ProxyServer:
+    """Create the proxy server.
+
+    Args:
+        host (str): The host to bind to.
+        port (int): The port to bind to, or 0 for any free port.
+        default_endpoint (str): The endpoint used when a request does
+            not name a known endpoint as its model.
+        endpoints (Iterable[str]): The endpoints requests may name.
+        runtime_client (Optional[Any]): The SageMaker Runtime client to use.
+            Defaults to the cached client.
+        max_concurrency (int): Maximum number of concurrent invocations.
+        balance (Optional[str]): A routing policy to balance requests
+            across all endpoints of the same model.
+        rate_limit (Optional[float]): Maximum invocations per second.
+
+    Returns:
+        ProxyServer: The server, ready to `serve_forever`.
+    """
+    return ProxyServer(
+        (host, port),
+        default_endpoint,
+        endpoints,
+        runtime_client or get_client("sagemaker-runtime"),
+        max_concurrency,
+        balance,
+        rate_limit,
+    )
+
+
+def serve(
+    host: str,
+    port: int,
+    max_concurrency: int,
+    balance: Optional[str] = None,
+    rate_limit: Optional[float] = None,
+) -> None:
+    """Main function to run the OpenAI-compatible proxy server.
+
+    Loads credentials, allows the user to choose the default endpoint and
+    serves requests for all deployed endpoints until interrupted.
+
+    Args:
+        host (str): The host to bind to.
+        port (int): The port to bind to.
+        max_concurrency (int): Maximum number of concurrent invocations.
+        balance (Optional[str]): A routing policy to balance requests
+            across all endpoints of the same model.
+        rate_limit (Optional[float]): Maximum invocations per second.
+    """
+    load_credentials()
+
+    sagemaker_client = get_client("sagemaker")
+    selected_endpoint = choose_resource("Endpoint", sagemaker_client, "serve")
+    endpoints = [
+        endpoint["name"] for endpoint in get_resources("Endpoint", sagemaker_client)
+    ]
+
+    server = create_server(
+        host,
+        port,
+        selected_endpoint["name"],
+        endpoints,
+        max_concurrency=max_concurrency,
+        balance=balance,
+        rate_limit=rate_limit,
+    )
+    click.secho(
+        f"Serving OpenAI-compatible API on http://{host}:{server.server_port}/v1 "
+        + f"(default model: {selected_endpoint['name']}). Press Ctrl+C to stop.\n",
+        fg="yellow",
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    click.secho("Server stopped. \n", fg="yellow")
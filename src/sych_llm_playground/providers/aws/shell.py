@@ -0,0 +1,33 @@
+"""Module to prepare an interactive shell session on AWS.
+
+This module loads credentials once and warms up the clients and
+resource listings that subsequent shell commands reuse.
+
+Functions:
+    shell: Warm up credentials, clients and resources for a shell session.
+"""
+
+from .utils.clients import get_client
+from .utils.clients import get_sagemaker_session
+from .utils.credentials import load_credentials
+from .utils.resources import get_resources
+
+
+def shell() -> None:
+    """Warm up credentials, clients and resources for a shell session.
+
+    The SageMaker, SageMaker Runtime and API Gateway clients are created
+    and the deployed resources are fetched once, so that commands run
+    inside the shell find them cached.
+    """
+    load_credentials()
+
+    sagemaker_client = get_client("sagemaker")
+    apigateway_client = get_client("apigateway")
+    get_client("sagemaker-runtime")
+    get_sagemaker_session()
+
+    for resource_type in ["Model", "Endpoint"]:
+        get_resources(resource_type, sagemaker_client)
+    get_resources("API Gateway", apigateway_client)
+    get_resources("HTTP API", get_client("apigatewayv2"))
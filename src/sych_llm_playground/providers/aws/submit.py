@@ -0,0 +1,96 @@
+"""This module submits payloads to asynchronous endpoints on AWS.
+
+Payloads are read from a JSONL file, one Llama payload per line, uploaded
+to S3 and submitted to an endpoint deployed with `deploy --async`. The
+responses are collected in parallel as they arrive and written to a JSONL
+file, one record per payload with its index in the input file.
+
+Functions:
+    read_payloads: Read the payloads of a JSONL file.
+    submit: Main function to submit payloads to an asynchronous endpoint.
+"""
+
+import json
+from typing import Any
+from typing import Dict
+from typing import List
+
+import click
+from botocore.exceptions import ClientError
+
+from .utils.async_inference import AsyncInferenceClient
+from .utils.async_inference import AsyncInferenceError
+from .utils.clients import get_client
+from .utils.credentials import load_credentials
+from .utils.resources import choose_resource
+
+
+def read_payloads(input_file: str) -> List[Dict[str, Any]]:
+    """Read the payloads of a JSONL file.
+
+    Args:
+        input_file (str): The path of the file.
+
+    Returns:
+        List[Dict[str, Any]]: The payloads, skipping blank lines.
+    """
+    with open(input_file) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def submit(input_file: str, output_file: str, max_workers: int) -> None:
+    """Main function to submit payloads to an asynchronous endpoint on AWS.
+
+    Args:
+        input_file (str): The JSONL file of payloads.
+        output_file (str): The JSONL file the responses are written to.
+        max_workers (int): Maximum number of uploads and polls in parallel.
+    """
+    load_credentials()
+
+    try:
+        payloads = read_payloads(input_file)
+    except ValueError as e:
+        click.secho(f"Invalid JSONL in {input_file!r}: {e}", fg="red")
+        exit(1)
+
+    sagemaker_client = get_client("sagemaker")
+    selected_endpoint = choose_resource("Endpoint", sagemaker_client, "submit to")
+
+    try:
+        client = AsyncInferenceClient.for_endpoint(
+            selected_endpoint["name"], sagemaker_client, max_workers=max_workers
+        )
+    except AsyncInferenceError as e:
+        click.secho(f"{e}. Deploy one with 'deploy --async'. \n", fg="red")
+        exit(1)
+    except ClientError as e:
+        click.secho(f"An error occurred while describing the endpoint: {e}", fg="red")
+        exit(1)
+
+    click.secho(
+        f"Submitting {len(payloads)} payload(s) to {selected_endpoint['name']}...",
+        fg="yellow",
+    )
+
+    failures = 0
+    with open(output_file, "w") as f:
+        for completed, (index, result) in enumerate(client.map(payloads), start=1):
+            if isinstance(result, Exception):
+                failures += 1
+                record = {"index": index, "error": f"{result}"}
+            else:
+                record = {"index": index, "output": result}
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            click.secho(
+                f"[{completed}/{len(payloads)}] payload {index} "
+                + ("failed" if "error" in record else "completed"),
+                fg="red" if "error" in record else "green",
+            )
+
+    click.secho(
+        f"\n{len(payloads) - failures} of {len(payloads)} payload(s) completed. "
+        + f"Responses written to {output_file}. \n",
+        fg="yellow",
+    )
@@ -0,0 +1,169 @@
+"""This module sweeps the sampling parameters of deployed models on AWS.
+
+A set of prompts is sent to a chosen endpoint, or to an API Gateway URL,
+with every cell of a grid or random sample of `max_new_tokens`, `top_p`
+and `temperature` values, and the cells are reported in a table sorted by
+a metric.
+
+Functions:
+    build_cells: Build the cells of a sweep from the values of its parameters.
+    print_sweep: Print the summary of a sweep as a table.
+    sweep: Main function to sweep the sampling parameters of an endpoint.
+"""
+
+import json
+import random
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import click
+
+from .loadgen import choose_target
+from .utils.sweep import Values
+from .utils.sweep import grid_cells
+from .utils.sweep import parse_values
+from .utils.sweep import random_cells
+from .utils.sweep import read_prompts
+from .utils.sweep import run_sweep
+from .utils.sweep import sort_cells
+from .utils.sweep import summarize_sweep
+
+
+def build_cells(
+    max_new_tokens: str,
+    top_p: str,
+    temperature: str,
+    samples: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Build the cells of a sweep from the values of its parameters.
+
+    Args:
+        max_new_tokens (str): The values or range of `max_new_tokens`.
+        top_p (str): The values or range of `top_p`.
+        temperature (str): The values or range of `temperature`.
+        samples (Optional[int]): The number of cells to sample at random,
+            instead of the full grid.
+        seed (Optional[int]): Seed of the random sample.
+
+    Returns:
+        List[Dict[str, Any]]: The cells.
+
+    Raises:
+        ValueError: If a parameter cannot be parsed, or has a range in a
+            grid.
+    """
+    space: Dict[str, Values] = {
+        "max_new_tokens": parse_values(max_new_tokens, integer=True),
+        "top_p": parse_values(top_p),
+        "temperature": parse_values(temperature),
+    }
+    if samples:
+        return random_cells(space, samples, random.Random(seed))  # noqa: S311
+    return grid_cells(space)
+
+
+def _format(value: Optional[float], format_spec: str, width: int) -> str:
+    """Format a metric in a column of the sweep table.
+
+    Args:
+        value (Optional[float]): The metric, or None.
+        format_spec (str): The format of the metric.
+        width (int): The width of the column.
+
+    Returns:
+        str: The formatted metric.
+    """
+    return (
+        format(value, format_spec).rjust(width)
+        if value is not None
+        else "-".rjust(width)
+    )
+
+
+def print_sweep(rows: List[Dict[str, Any]]) -> None:
+    """Print the summary of a sweep as a table.
+
+    Args:
+        rows (List[Dict[str, Any]]): The rows of `summarize_sweep`.
+    """
+    click.secho(
+        f"{'max_new_tokens':>14} {'top_p':>6} {'temperature':>11} {'latency':>9} "
+        + f"{'p90':>9} {'tokens':>7} {'tokens/s':>9} {'errors':>7}",
+        fg="yellow",
+    )
+    for row in rows:
+        click.echo(
+            f"{row['max_new_tokens']:>14} {row['top_p']:>6g} "
+            + f"{row['temperature']:>11g} {_format(row['latency'], '.2f', 8)}s "
+            + f"{_format(row['p90'], '.2f', 8)}s "
+            + f"{_format(row['output_tokens'], '.0f', 7)} "
+            + f"{_format(row['tokens_per_second'], '.1f', 9)} "
+            + f"{row['errors']:7.1%}"
+        )
+    click.secho("\n", nl=False)
+
+
+def sweep(
+    prompts: List[str],
+    prompt_file: Optional[str],
+    max_new_tokens: str,
+    top_p: str,
+    temperature: str,
+    samples: Optional[int],
+    seed: Optional[int],
+    max_in_flight: int,
+    sort_by: str,
+    url: Optional[str],
+    payload_format: str,
+    api_key: Optional[str],
+    output_file: Optional[str],
+) -> None:
+    """Main function to sweep the sampling parameters of an endpoint on AWS.
+
+    Args:
+        prompts (List[str]): The prompts to send with every cell.
+        prompt_file (Optional[str]): A text file with more prompts, one per
+            line.
+        max_new_tokens (str): Comma-separated values or a "min:max" range
+            of `max_new_tokens`.
+        top_p (str): Comma-separated values or a "min:max" range of `top_p`.
+        temperature (str): Comma-separated values or a "min:max" range of
+            `temperature`.
+        samples (Optional[int]): The number of cells to sample at random,
+            instead of the full grid.
+        seed (Optional[int]): Seed of the random sample.
+        max_in_flight (int): Maximum number of requests in flight.
+        sort_by (str): The metric the table is sorted by, best first.
+        url (Optional[str]): An API Gateway URL to send the requests to.
+        payload_format (str): The payload format for the URL.
+        api_key (Optional[str]): The API key of the API Gateway behind the
+            URL, if it has a usage plan.
+        output_file (Optional[str]): A JSONL file the result of every
+            request is written to.
+    """
+    prompts = [*prompts, *(read_prompts(prompt_file) if prompt_file else [])]
+    if not prompts:
+        click.secho("No prompts to send. \n", fg="red")
+        exit(1)
+    try:
+        cells = build_cells(max_new_tokens, top_p, temperature, samples, seed)
+    except ValueError as e:
+        click.secho(f"Invalid sampling parameters: {e}", fg="red")
+        exit(1)
+
+    invoke, kind, target = choose_target(url, payload_format, api_key)
+    click.secho(
+        f"Sweeping {len(cells)} cell(s) of {len(prompts)} prompt(s) on {target}, "
+        + f"{max_in_flight} request(s) at a time...\n",
+        fg="yellow",
+    )
+    results = run_sweep(invoke, kind, prompts, cells, max_in_flight=max_in_flight)
+
+    if output_file:
+        with open(output_file, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    print_sweep(sort_cells(summarize_sweep(cells, results), sort_by))
@@ -0,0 +1,205 @@
+"""This module runs Batch Transform jobs over datasets on AWS.
+
+A transform job runs one of the models created by `deploy()`, or a model
+created for the job only, over a JSONL dataset of Llama payloads without
+a live endpoint. Local datasets are uploaded to the SageMaker default
+bucket first. The progress of the job is tracked until it finishes, and
+the merged results are then streamed to a local file.
+
+Functions:
+    choose_model: Choose an existing model, or create one for the job.
+    transform: Main function to run a Batch Transform job.
+"""
+
+import os
+import time
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import click
+import inquirer
+from sagemaker import instance_types
+
+from ...utils.loader import start_loader
+from ...utils.loader import stop_loader
+from .deploy import MODEL_CHOICES
+from .deploy import questions
+from .utils.artifacts import build_model
+from .utils.artifacts import resolve_artifacts
+from .utils.batch_transform import TRANSFORM_PREFIX
+from .utils.batch_transform import create_transform_job
+from .utils.batch_transform import list_dataset
+from .utils.batch_transform import model_id_from_model
+from .utils.batch_transform import stream_results
+from .utils.batch_transform import upload_dataset
+from .utils.batch_transform import wait_for_transform_job
+from .utils.clients import get_client
+from .utils.clients import get_sagemaker_session
+from .utils.credentials import load_credentials
+from .utils.resources import choose_resource
+from .utils.resources import invalidate_resources
+
+
+def _create_model(credentials: Dict[str, str]) -> Tuple[str, str, str]:
+    """Create a model without deploying it to an endpoint.
+
+    Args:
+        credentials (Dict[str, str]): The loaded credentials.
+
+    Returns:
+        Tuple[str, str, str]: The name, model ID and version of the model.
+    """
+    answers = inquirer.prompt(questions)
+    model_id = answers["model"]["id"]
+    model_version = answers["model"]["version"]
+    model_name = f"sych-llm-pg-{model_id}-m-{int(time.time())}"
+
+    try:
+        loader_thread = start_loader(message="Creating model...", color="green")
+        artifacts = resolve_artifacts(model_id, model_version)
+        build_model(artifacts, credentials["role_arn"], model_name).create(
+            instance_type=artifacts["deploy"].get("instance_type")
+        )
+        stop_loader(loader_thread, "Model created \n")
+    except Exception as e:
+        stop_loader(loader_thread)
+        click.secho(f"An error occurred while creating the model: {e}", fg="red")
+        exit(1)
+
+    invalidate_resources("Model")
+    return model_name, model_id, model_version
+
+
+def choose_model(
+    credentials: Dict[str, str], create_model: bool
+) -> Tuple[str, str, Optional[str]]:
+    """Choose an existing model, or create one for the job.
+
+    Args:
+        credentials (Dict[str, str]): The loaded credentials.
+        create_model (bool): Whether to create a new model.
+
+    Returns:
+        Tuple[str, str, Optional[str]]: The name, model ID and version of the
+            model. The version is that of `MODEL_CHOICES` for existing models.
+    """
+    if create_model:
+        return _create_model(credentials)
+
+    selected_model = choose_resource("Model", get_client("sagemaker"), "transform with")
+    model_id = model_id_from_model(selected_model["name"])
+    if model_id is None:
+        click.secho(
+            f"The model {selected_model['name']!r} does not match "
+            + "any supported models. \n",
+            fg="red",
+        )
+        exit(1)
+
+    versions = {choice["id"]: choice["version"] for _, choice in MODEL_CHOICES}
+    return selected_model["name"], model_id, versions.get(model_id)
+
+
+def _default_instance_type(model_id: str, model_version: Optional[str]) -> str:
+    """Return the default inference instance type of a JumpStart model.
+
+    Args:
+        model_id (str): The JumpStart model ID.
+        model_version (Optional[str]): The JumpStart model version.
+
+    Returns:
+        str: The instance type.
+    """
+    instance_type: str = instance_types.retrieve_default(
+        region=os.environ["AWS_DEFAULT_REGION"],
+        model_id=model_id,
+        model_version=model_version or "*",
+        scope="inference",
+    )
+    return instance_type
+
+
+def transform(
+    input_path: str,
+    output_file: str,
+    instance_type: Optional[str],
+    instance_count: int,
+    max_concurrent_transforms: int,
+    max_payload_mb: int,
+    create_model: bool,
+) -> None:
+    """Main function to run a Batch Transform job on AWS.
+
+    Args:
+        input_path (str): A local JSONL dataset, or the S3 URI of a
+            dataset file or prefix.
+        output_file (str): The local file the merged results are written to.
+        instance_type (Optional[str]): The instance type. Defaults to the
+            default inference instance type of the model.
+        instance_count (int): The number of instances.
+        max_concurrent_transforms (int): Maximum number of requests sent to
+            each instance at a time.
+        max_payload_mb (int): Maximum size of a mini-batch in MB.
+        create_model (bool): Whether to create a new model for the job.
+    """
+    credentials = load_credentials()
+    model_name, model_id, model_version = choose_model(credentials, create_model)
+    instance_type = instance_type or _default_instance_type(model_id, model_version)
+
+    job_name = f"sych-llm-pg-{int(time.time())}-t"
+    bucket = get_sagemaker_session().default_bucket()
+    output_uri = f"s3://{bucket}/{TRANSFORM_PREFIX}/{job_name}/output"
+
+    try:
+        loader_thread = start_loader(message="Preparing dataset...", color="green")
+        if input_path.startswith("s3://"):
+            input_uri = input_path
+            input_keys = list_dataset(input_uri)
+        else:
+            input_uri, input_keys = upload_dataset(
+                input_path,
+                bucket,
+                f"{TRANSFORM_PREFIX}/{job_name}/input",
+                # Several shards per instance spread the load and
+                # show the progress.
+                shards=instance_count * 4,
+            )
+        if not input_keys:
+            raise ValueError(f"No records found in {input_path!r}")
+
+        create_transform_job(
+            job_name,
+            model_name,
+            input_uri,
+            output_uri,
+            instance_type,
+            instance_count,
+            max_concurrent_transforms,
+            max_payload_mb,
+        )
+        stop_loader(loader_thread, f"Transform job {job_name} launched \n")
+    except Exception as e:
+        stop_loader(loader_thread)
+        click.secho(f"An error occurred while launching the job: {e}", fg="red")
+        exit(1)
+
+    def report(status: str, done: int, total: int) -> None:
+        click.secho(f"{status}: {done}/{total} file(s) transformed", fg="yellow")
+
+    job = wait_for_transform_job(job_name, input_uri, output_uri, input_keys, report)
+    if job["TransformJobStatus"] != "Completed":
+        click.secho(
+            f"The transform job {job['TransformJobStatus'].lower()}: "
+            + f"{job.get('FailureReason', 'no reason given')} \n",
+            fg="red",
+        )
+        exit(1)
+
+    records = 0
+    with open(output_file, "wb") as f:
+        for line in stream_results(input_uri, output_uri, input_keys):
+            f.write(line + b"\n")
+            records += 1
+
+    click.secho(f"\n{records} result(s) written to {output_file}. \n", fg="green")
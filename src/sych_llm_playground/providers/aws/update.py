@@ -0,0 +1,241 @@
+"""This module updates deployed endpoints on AWS in place.
+
+An endpoint is moved to another version of its model, or to another
+instance type or count, with a blue/green deployment: the new fleet is
+provisioned next to the old one, traffic shifts to it all at once, as a
+canary or in linear steps, and alarms roll the update back if the new
+fleet fails. The endpoint keeps its name, so its API Gateway URL does not
+change, and the old fleet keeps serving until the new one takes over.
+
+Functions:
+    start_update: Create the new model and configuration and start the update.
+    delete_superseded: Delete the model and configuration an update replaced.
+    update: Main function to update an endpoint in place.
+"""
+
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import click
+
+from ...utils.loader import start_loader
+from ...utils.loader import stop_loader
+from .deploy import ENDPOINT_POLL_INTERVAL
+from .deploy import MODEL_CHOICES
+from .deploy import create_endpoint_config
+from .utils.artifacts import build_model
+from .utils.artifacts import resolve_artifacts
+from .utils.clients import get_client
+from .utils.components import is_shared_endpoint
+from .utils.components import wait_for_status
+from .utils.credentials import load_credentials
+from .utils.resources import choose_resource
+from .utils.resources import invalidate_resources
+from .utils.resources import model_id_from_endpoint
+from .utils.updates import build_deployment_config
+from .utils.updates import create_rollback_alarms
+from .utils.updates import delete_rollback_alarms
+from .utils.updates import traffic_routing
+
+
+def start_update(
+    role_arn: str,
+    endpoint_name: str,
+    model_id: str,
+    model_version: str,
+    deployment_config: Dict[str, Any],
+    instance_type: Optional[str] = None,
+    instance_count: Optional[int] = None,
+) -> Tuple[str, str]:
+    """Create the new model and configuration of an endpoint and start the update.
+
+    The new fleet has the instance type and count of the current one,
+    unless they are given.
+
+    Args:
+        role_arn (str): The ARN of the IAM role of the model.
+        endpoint_name (str): The name of the endpoint.
+        model_id (str): The JumpStart model ID of the endpoint.
+        model_version (str): The JumpStart model version to update to.
+        deployment_config (Dict[str, Any]): The blue/green deployment
+            configuration.
+        instance_type (Optional[str]): The instance type of the new fleet.
+        instance_count (Optional[int]): The number of instances of the new
+            fleet.
+
+    Returns:
+        Tuple[str, str]: The names of the current and the new endpoint
+            configuration.
+
+    Raises:
+        ValueError: If the endpoint is asynchronous, which blue/green
+            deployments do not support.
+    """
+    sagemaker_client = get_client("sagemaker")
+    current = sagemaker_client.describe_endpoint(EndpointName=endpoint_name)[
+        "EndpointConfigName"
+    ]
+    current_config = sagemaker_client.describe_endpoint_config(
+        EndpointConfigName=current
+    )
+    if "AsyncInferenceConfig" in current_config:
+        raise ValueError("Asynchronous endpoints cannot be updated blue/green")
+    variant = current_config["ProductionVariants"][0]
+
+    timestamp = str(int(time.time()))
+    model_name = f"sych-llm-pg-{model_id}-m-{timestamp}"
+    config_name = f"sych-llm-pg-{model_id}-c-{timestamp}"
+    artifacts = resolve_artifacts(model_id, model_version)
+    deploy_settings = {
+        **artifacts["deploy"],
+        "instance_type": instance_type or variant["InstanceType"],
+        "initial_instance_count": instance_count or variant["InitialInstanceCount"],
+    }
+
+    build_model(artifacts, role_arn, model_name).create(
+        instance_type=deploy_settings["instance_type"]
+    )
+    create_endpoint_config(
+        config_name, model_name, {**artifacts, "deploy": deploy_settings}
+    )
+    sagemaker_client.update_endpoint(
+        EndpointName=endpoint_name,
+        EndpointConfigName=config_name,
+        DeploymentConfig=deployment_config,
+    )
+    return current, config_name
+
+
+def delete_superseded(config_name: str) -> None:
+    """Delete the model and configuration an update replaced.
+
+    Args:
+        config_name (str): The name of the replaced endpoint configuration.
+    """
+    sagemaker_client = get_client("sagemaker")
+    config = sagemaker_client.describe_endpoint_config(EndpointConfigName=config_name)
+    sagemaker_client.delete_endpoint_config(EndpointConfigName=config_name)
+    for variant in config["ProductionVariants"]:
+        sagemaker_client.delete_model(ModelName=variant["ModelName"])
+
+
+def _choose_endpoint() -> Tuple[str, str]:
+    """Choose the endpoint to update.
+
+    Returns:
+        Tuple[str, str]: The name of the endpoint and its model ID.
+    """
+    selected_endpoint = choose_resource("Endpoint", get_client("sagemaker"), "update")
+    endpoint_name = selected_endpoint["name"]
+    model_id = model_id_from_endpoint(endpoint_name)
+    if is_shared_endpoint(endpoint_name) or model_id is None:
+        click.secho(
+            f"The endpoint {endpoint_name!r} does not serve a single supported "
+            + "model. \n",
+            fg="red",
+        )
+        exit(1)
+    return endpoint_name, model_id
+
+
+def update(
+    model_version: Optional[str],
+    instance_type: Optional[str],
+    instance_count: Optional[int],
+    traffic_shift: str,
+    step_percent: int,
+    wait_interval: int,
+    termination_wait: int,
+    alarms: List[str],
+    rollback_on_errors: bool,
+    max_latency_ms: Optional[float],
+) -> None:
+    """Main function to update an endpoint on AWS in place, blue/green.
+
+    Args:
+        model_version (Optional[str]): The JumpStart model version to update
+            to. Defaults to the version of `MODEL_CHOICES`.
+        instance_type (Optional[str]): The instance type of the new fleet.
+            Defaults to the current one.
+        instance_count (Optional[int]): The number of instances of the new
+            fleet. Defaults to the current one.
+        traffic_shift (str): How traffic shifts to the new fleet,
+            "all-at-once", "canary" or "linear".
+        step_percent (int): The share of capacity of the canary, or of every
+            linear step, in percent.
+        wait_interval (int): Seconds between the steps of the shift.
+        termination_wait (int): Seconds the old fleet is kept after all
+            traffic has shifted.
+        alarms (List[str]): Existing CloudWatch alarms rolling the update
+            back.
+        rollback_on_errors (bool): Whether to roll back on 5xx errors of the
+            model.
+        max_latency_ms (Optional[float]): The average model latency in
+            milliseconds to roll back above, if any.
+    """
+    credentials = load_credentials()
+    endpoint_name, model_id = _choose_endpoint()
+    versions = {choice["id"]: choice["version"] for _, choice in MODEL_CHOICES}
+    model_version = model_version or versions.get(model_id) or "*"
+    cloudwatch_client = get_client("cloudwatch")
+    rollback_alarms: List[str] = []
+
+    try:
+        loader_thread = start_loader(
+            message=f"Updating {endpoint_name} ({traffic_shift})... "
+            + "The endpoint keeps serving throughout.",
+            color="green",
+        )
+        rollback_alarms = create_rollback_alarms(
+            cloudwatch_client, endpoint_name, rollback_on_errors, max_latency_ms
+        )
+        deployment_config = build_deployment_config(
+            traffic_routing(traffic_shift, step_percent, wait_interval),
+            [*alarms, *rollback_alarms],
+            termination_wait,
+        )
+        previous, config_name = start_update(
+            credentials["role_arn"],
+            endpoint_name,
+            model_id,
+            model_version,
+            deployment_config,
+            instance_type,
+            instance_count,
+        )
+        wait_for_status(
+            lambda: get_client("sagemaker").describe_endpoint(
+                EndpointName=endpoint_name
+            ),
+            "EndpointStatus",
+            ENDPOINT_POLL_INTERVAL,
+        )
+        stop_loader(loader_thread)
+    except Exception as e:
+        stop_loader(loader_thread)
+        click.secho(f"An error occurred during the update: {e}", fg="red")
+        delete_rollback_alarms(cloudwatch_client, rollback_alarms)
+        exit(1)
+
+    description = get_client("sagemaker").describe_endpoint(EndpointName=endpoint_name)
+    delete_rollback_alarms(cloudwatch_client, rollback_alarms)
+    invalidate_resources()
+    if description["EndpointConfigName"] != config_name:
+        delete_superseded(config_name)
+        click.secho(
+            "The update was rolled back: "
+            + f"{description.get('FailureReason', 'an alarm fired')}. \n",
+            fg="red",
+        )
+        exit(1)
+
+    delete_superseded(previous)
+    click.secho(
+        f"Endpoint {endpoint_name} updated to {model_id} {model_version}. "
+        + "Its API Gateway URL is unchanged. \n",
+        fg="green",
+    )
@@ -0,0 +1,219 @@
+"""Utility module caching resolved JumpStart deployment artifacts.
+
+Creating a `JumpStartModel` resolves the specification, image URI, model
+data URI and default environment of a model over the network, and the
+resolution gives the same result for the same model ID, version and
+region. The resolved artifacts are cached in `ARTIFACTS_FILE`, keyed by
+region, model ID and version, so repeat deploys of a model create a plain
+SageMaker `Model` from the cache without any lookups.
+
+The cache records `ARTIFACTS_CACHE_VERSION` and the version of the
+SageMaker SDK that resolved it, and is discarded when either changes.
+Entries are dropped explicitly with `invalidate_artifacts`.
+
+Functions:
+    load_artifacts: Load the cached artifacts.
+    invalidate_artifacts: Drop cached artifacts.
+    resolve_artifacts: Return the artifacts of a model, resolving them once.
+    build_model: Build a SageMaker model from resolved artifacts.
+"""
+
+import json
+import os
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+import sagemaker
+from sagemaker.model import Model
+
+from .clients import get_sagemaker_session
+from .credentials import BASE_DIR
+
+
+ARTIFACTS_FILE = os.path.join(BASE_DIR, "providers", "aws", ".artifacts.json")
+
+# Bumped whenever the format of the cached artifacts changes.
+ARTIFACTS_CACHE_VERSION = 1
+
+# Deployment settings of a JumpStart model, passed to `Model.deploy`.
+DEPLOY_SETTINGS = [
+    "initial_instance_count",
+    "instance_type",
+    "volume_size",
+    "model_data_download_timeout",
+    "container_startup_health_check_timeout",
+]
+
+
+def _artifacts_key(model_id: str, model_version: str, region: str) -> str:
+    """Return the cache key of the artifacts of a model.
+
+    Args:
+        model_id (str): The JumpStart model ID.
+        model_version (str): The JumpStart model version.
+        region (str): The AWS region.
+
+    Returns:
+        str: The key.
+    """
+    return f"{region}/{model_id}/{model_version}"
+
+
+def load_artifacts() -> Dict[str, Dict[str, Any]]:
+    """Load the cached artifacts.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The artifacts by key. Empty if there is
+            no cache, or if it was written by another version of the cache
+            or of the SageMaker SDK.
+    """
+    try:
+        with open(ARTIFACTS_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get("version") != ARTIFACTS_CACHE_VERSION or (
+        cache.get("sagemaker_version") != sagemaker.__version__
+    ):
+        return {}
+    artifacts: Dict[str, Dict[str, Any]] = cache.get("artifacts", {})
+    return artifacts
+
+
+def _save_artifacts(artifacts: Dict[str, Dict[str, Any]]) -> None:
+    """Write the cached artifacts, replacing the cache file atomically.
+
+    Args:
+        artifacts (Dict[str, Dict[str, Any]]): The artifacts by key.
+    """
+    os.makedirs(os.path.dirname(ARTIFACTS_FILE), exist_ok=True)
+    temporary_file = f"{ARTIFACTS_FILE}.tmp"
+    with open(temporary_file, "w") as f:
+        json.dump(
+            {
+                "version": ARTIFACTS_CACHE_VERSION,
+                "sagemaker_version": sagemaker.__version__,
+                "artifacts": artifacts,
+            },
+            f,
+            indent=2,
+        )
+    os.replace(temporary_file, ARTIFACTS_FILE)
+
+
+def invalidate_artifacts(model_id: Optional[str] = None) -> None:
+    """Drop cached artifacts so the next deploy resolves them again.
+
+    Args:
+        model_id (Optional[str]): The model ID to drop the artifacts of,
+            in every version and region. Defaults to all models.
+    """
+    artifacts = load_artifacts()
+    for key in [*artifacts]:
+        if model_id is None or key.split("/")[1] == model_id:
+            del artifacts[key]
+    _save_artifacts(artifacts)
+
+
+def _resolve(model_id: str, model_version: str, region: str) -> Dict[str, Any]:
+    """Resolve the artifacts of a JumpStart model over the network.
+
+    Args:
+        model_id (str): The JumpStart model ID.
+        model_version (str): The JumpStart model version.
+        region (str): The AWS region.
+
+    Returns:
+        Dict[str, Any]: The image URI, model data, environment and network
+            isolation of the model, and its deployment settings.
+    """
+    from sagemaker.jumpstart.factory.model import get_deploy_kwargs
+    from sagemaker.jumpstart.factory.model import get_init_kwargs
+
+    init_kwargs = get_init_kwargs(
+        model_id=model_id,
+        model_version=model_version,
+        region=region,
+        sagemaker_session=get_sagemaker_session(region),
+    )
+    deploy_kwargs = get_deploy_kwargs(
+        model_id=model_id,
+        model_version=model_version,
+        region=region,
+        instance_type=init_kwargs.instance_type,
+    )
+    return {
+        "image_uri": init_kwargs.image_uri,
+        "model_data": init_kwargs.model_data,
+        "env": init_kwargs.env or {},
+        "enable_network_isolation": bool(init_kwargs.enable_network_isolation),
+        "deploy": {
+            setting: getattr(deploy_kwargs, setting)
+            for setting in DEPLOY_SETTINGS
+            if getattr(deploy_kwargs, setting) is not None
+        },
+    }
+
+
+def resolve_artifacts(
+    model_id: str,
+    model_version: str,
+    region: Optional[str] = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """Return the artifacts of a JumpStart model, resolving them once.
+
+    Args:
+        model_id (str): The JumpStart model ID.
+        model_version (str): The JumpStart model version.
+        region (Optional[str]): The AWS region. Defaults to the region of
+            the SageMaker session.
+        refresh (bool): Whether to resolve the artifacts again even if
+            they are cached.
+
+    Returns:
+        Dict[str, Any]: The artifacts, as returned by `_resolve`.
+    """
+    region = region or get_sagemaker_session().boto_region_name
+    key = _artifacts_key(model_id, model_version, region)
+    artifacts = load_artifacts()
+    if not refresh and key in artifacts:
+        return artifacts[key]
+
+    artifacts[key] = _resolve(model_id, model_version, region)
+    _save_artifacts(artifacts)
+    return artifacts[key]
+
+
+def build_model(
+    artifacts: Dict[str, Any],
+    role: str,
+    name: str,
+    sagemaker_session: Optional[Any] = None,
+) -> Model:
+    """Build a SageMaker model from resolved artifacts.
+
+    The model is deployed with the deployment settings of the artifacts,
+    e.g. `model.deploy(endpoint_name=..., **artifacts["deploy"])`.
+
+    Args:
+        artifacts (Dict[str, Any]): The artifacts of the model.
+        role (str): The ARN of the IAM role of the model.
+        name (str): The name of the model.
+        sagemaker_session (Optional[Any]): The SageMaker session to use.
+            Defaults to the cached session.
+
+    Returns:
+        Model: The model, not yet created in SageMaker.
+    """
+    return Model(
+        image_uri=artifacts["image_uri"],
+        model_data=artifacts["model_data"],
+        env=artifacts["env"],
+        enable_network_isolation=artifacts["enable_network_isolation"],
+        role=role,
+        name=name,
+        sagemaker_session=sagemaker_session or get_sagemaker_session(),
+    )
@@ -0,0 +1,442 @@
+"""Utility module for SageMaker Asynchronous Inference.
+
+Asynchronous endpoints read their payloads from S3 and write their
+responses back to S3, so long generations do not time out and requests
+queue up instead of failing while the endpoint scales. This module
+contains the helpers to configure asynchronous endpoints, and an
+`AsyncInferenceClient` that uploads payloads, submits them with
+`invoke_endpoint_async` and collects the responses in parallel.
+
+Functions:
+    parse_s3_uri: Split an S3 URI into its bucket and key.
+    build_async_inference_config: Build the configuration of an asynchronous endpoint.
+    enable_scale_to_zero: Let an asynchronous endpoint scale in to zero instances.
+
+Example:
+    client = AsyncInferenceClient.for_endpoint(endpoint_name)
+    for index, result in client.map(payloads):
+        print(index, result)
+"""
+
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+from botocore.exceptions import ClientError
+
+from .clients import get_client
+from .invocation import CUSTOM_ATTRIBUTES
+
+
+ASYNC_PREFIX = "sych-llm-pg/async"
+
+# Backlog size per instance that the scaling policy tracks.
+TARGET_BACKLOG_PER_INSTANCE = 5.0
+
+# Seconds between polls for the response of a request.
+POLL_INTERVAL = 5.0
+
+# Seconds after which a request whose response has not arrived is given up.
+RESULT_TIMEOUT = 3600.0
+
+
+class AsyncInferenceError(Exception):
+    """Raised when an asynchronous request fails or does not complete in time."""
+
+
+def parse_s3_uri(uri: str) -> Tuple[str, str]:
+    """Split an S3 URI into its bucket and key.
+
+    Args:
+        uri (str): The URI, e.g. `s3://bucket/path/to/object`.
+
+    Returns:
+        Tuple[str, str]: The bucket and key.
+
+    Raises:
+        ValueError: If the URI is not an S3 URI.
+    """
+    if not uri.startswith("s3://"):
+        raise ValueError(f"Not an S3 URI: {uri!r}")
+    bucket, _, key = uri[len("s3://") :].partition("/")
+    return bucket, key
+
+
+def build_async_inference_config(
+    bucket: str, endpoint_name: str, max_concurrent_invocations: int
+) -> Any:
+    """Build the configuration of an asynchronous endpoint.
+
+    Responses and failures are written under `ASYNC_PREFIX` in the bucket,
+    next to the uploaded payloads.
+
+    Args:
+        bucket (str): The bucket of the payloads and responses.
+        endpoint_name (str): The name of the endpoint.
+        max_concurrent_invocations (int): Maximum number of requests an
+            instance processes at a time.
+
+    Returns:
+        AsyncInferenceConfig: The configuration to deploy with.
+    """
+    from sagemaker.async_inference import AsyncInferenceConfig
+
+    prefix = f"s3://{bucket}/{ASYNC_PREFIX}/{endpoint_name}"
+    return AsyncInferenceConfig(
+        output_path=f"{prefix}/output",
+        failure_path=f"{prefix}/failure",
+        max_concurrent_invocations_per_instance=max_concurrent_invocations,
+    )
+
+
+def enable_scale_to_zero(
+    endpoint_name: str,
+    max_instances: int = 1,
+    autoscaling_client: Optional[Any] = None,
+    cloudwatch_client: Optional[Any] = None,
+) -> None:
+    """Let an asynchronous endpoint scale in to zero instances when idle.
+
+    The instance count tracks the backlog of queued requests per instance,
+    and an alarm on queued requests without any instance scales the
+    endpoint out from zero.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+        max_instances (int): The maximum number of instances.
+        autoscaling_client (Optional[Any]): The Application Auto Scaling
+            client to use. Defaults to the cached client.
+        cloudwatch_client (Optional[Any]): The CloudWatch client to use.
+            Defaults to the cached client.
+    """
+    autoscaling = autoscaling_client or get_client("application-autoscaling")
+    cloudwatch = cloudwatch_client or get_client("cloudwatch")
+    resource_id = f"endpoint/{endpoint_name}/variant/AllTraffic"
+    dimension = "sagemaker:variant:DesiredInstanceCount"
+
+    autoscaling.register_scalable_target(
+        ServiceNamespace="sagemaker",
+        ResourceId=resource_id,
+        ScalableDimension=dimension,
+        MinCapacity=0,
+        MaxCapacity=max_instances,
+    )
+    autoscaling.put_scaling_policy(
+        PolicyName=f"{endpoint_name}-backlog",
+        ServiceNamespace="sagemaker",
+        ResourceId=resource_id,
+        ScalableDimension=dimension,
+        PolicyType="TargetTrackingScaling",
+        TargetTrackingScalingPolicyConfiguration={
+            "TargetValue": TARGET_BACKLOG_PER_INSTANCE,
+            "CustomizedMetricSpecification": {
+                "MetricName": "ApproximateBacklogSizePerInstance",
+                "Namespace": "AWS/SageMaker",
+                "Dimensions": [{"Name": "EndpointName", "Value": endpoint_name}],
+                "Statistic": "Average",
+            },
+            "ScaleInCooldown": 600,
+            "ScaleOutCooldown": 300,
+        },
+    )
+
+    # Target tracking cannot scale out from zero, as there is no backlog
+    # per instance without instances, so a step policy does.
+    step_policy = autoscaling.put_scaling_policy(
+        PolicyName=f"{endpoint_name}-from-zero",
+        ServiceNamespace="sagemaker",
+        ResourceId=resource_id,
+        ScalableDimension=dimension,
+        PolicyType="StepScaling",
+        StepScalingPolicyConfiguration={
+            "AdjustmentType": "ChangeInCapacity",
+            "MetricAggregationType": "Average",
+            "Cooldown": 300,
+            "StepAdjustments": [
+                {"MetricIntervalLowerBound": 0, "ScalingAdjustment": 1}
+            ],
+        },
+    )
+    cloudwatch.put_metric_alarm(
+        AlarmName=f"{endpoint_name}-has-backlog-without-capacity",
+        MetricName="HasBacklogWithoutCapacity",
+        Namespace="AWS/SageMaker",
+        Dimensions=[{"Name": "EndpointName", "Value": endpoint_name}],
+        Statistic="Average",
+        Period=60,
+        EvaluationPeriods=2,
+        DatapointsToAlarm=2,
+        Threshold=1,
+        ComparisonOperator="GreaterThanOrEqualToThreshold",
+        TreatMissingData="missing",
+        AlarmActions=[step_policy["PolicyARN"]],
+    )
+
+
+class AsyncInferenceClient:
+    """Submit payloads to an asynchronous endpoint and collect the responses."""
+
+    def __init__(
+        self,
+        endpoint_name: str,
+        output_path: str,
+        s3_client: Optional[Any] = None,
+        runtime_client: Optional[Any] = None,
+        max_workers: int = 8,
+        poll_interval: float = POLL_INTERVAL,
+        timeout: float = RESULT_TIMEOUT,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            endpoint_name (str): The name of the asynchronous endpoint.
+            output_path (str): The S3 output path of the endpoint. Payloads
+                are uploaded next to it.
+            s3_client (Optional[Any]): The S3 client to use.
+                Defaults to the cached client.
+            runtime_client (Optional[Any]): The SageMaker Runtime client to use.
+                Defaults to the cached client.
+            max_workers (int): Maximum number of requests handled in parallel.
+            poll_interval (float): Seconds between polls for a response.
+            timeout (float): Seconds after which a response is given up.
+        """
+        self.endpoint_name = endpoint_name
+        self.bucket, output_key = parse_s3_uri(output_path)
+        parent = output_key.rstrip("/").rpartition("/")[0]
+        self.input_prefix = f"{parent}/input" if parent else "input"
+        self.s3_client = s3_client or get_client("s3")
+        self.runtime_client = runtime_client or get_client("sagemaker-runtime")
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    @classmethod
+    def for_endpoint(
+        cls, endpoint_name: str, sagemaker_client: Optional[Any] = None, **kwargs: Any
+    ) -> "AsyncInferenceClient":
+        """Create a client for a deployed endpoint.
+
+        Args:
+            endpoint_name (str): The name of the endpoint.
+            sagemaker_client (Optional[Any]): The SageMaker client to use.
+                Defaults to the cached client.
+            **kwargs (Any): Further arguments of the client.
+
+        Returns:
+            AsyncInferenceClient: The client.
+
+        Raises:
+            AsyncInferenceError: If the endpoint is not asynchronous.
+        """
+        sagemaker = sagemaker_client or get_client("sagemaker")
+        config_name = sagemaker.describe_endpoint(EndpointName=endpoint_name)[
+            "EndpointConfigName"
+        ]
+        config = sagemaker.describe_endpoint_config(EndpointConfigName=config_name)
+        if "AsyncInferenceConfig" not in config:
+            raise AsyncInferenceError(
+                f"The endpoint {endpoint_name!r} is not an asynchronous endpoint"
+            )
+        output_path = config["AsyncInferenceConfig"]["OutputConfig"]["S3OutputPath"]
+        return cls(endpoint_name, output_path, **kwargs)
+
+    def submit(self, payload: Dict[str, Any]) -> Dict[str, str]:
+        """Upload a payload and submit it to the endpoint.
+
+        Args:
+            payload (Dict[str, Any]): The payload to send.
+
+        Returns:
+            Dict[str, str]: The "InferenceId", "OutputLocation" and,
+                if reported, "FailureLocation" of the request.
+        """
+        inference_id = uuid.uuid4().hex
+        key = f"{self.input_prefix}/{inference_id}.json"
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=json.dumps(payload).encode("utf-8"),
+            ContentType="application/json",
+        )
+        response = self.runtime_client.invoke_endpoint_async(
+            EndpointName=self.endpoint_name,
+            InputLocation=f"s3://{self.bucket}/{key}",
+            ContentType="application/json",
+            Accept="application/json",
+            CustomAttributes=CUSTOM_ATTRIBUTES,
+            InferenceId=inference_id,
+        )
+        request = {
+            "InferenceId": inference_id,
+            "OutputLocation": response["OutputLocation"],
+        }
+        if response.get("FailureLocation"):
+            request["FailureLocation"] = response["FailureLocation"]
+        return request
+
+    def _read(self, uri: str) -> Optional[bytes]:
+        """Read an object from S3.
+
+        Args:
+            uri (str): The S3 URI of the object.
+
+        Returns:
+            Optional[bytes]: The content, or None if the object does not exist yet.
+        """
+        bucket, key = parse_s3_uri(uri)
+        try:
+            body: bytes = self.s3_client.get_object(Bucket=bucket, Key=key)[
+                "Body"
+            ].read()
+            return body
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+
+    def poll(self, request: Dict[str, str]) -> Tuple[bool, Any]:
+        """Check once whether the response of a submitted request has arrived.
+
+        Args:
+            request (Dict[str, str]): The request returned by `submit`.
+
+        Returns:
+            Tuple[bool, Any]: Whether the response has arrived, and the
+                decoded response if it has.
+
+        Raises:
+            AsyncInferenceError: If the request failed.
+        """
+        output = self._read(request["OutputLocation"])
+        if output is not None:
+            return True, json.loads(output.decode("utf-8"))
+
+        failure = (
+            self._read(request["FailureLocation"])
+            if "FailureLocation" in request
+            else None
+        )
+        if failure is not None:
+            raise AsyncInferenceError(failure.decode("utf-8", "replace"))
+        return False, None
+
+    def _timeout_error(self, request: Dict[str, str]) -> AsyncInferenceError:
+        """Build the error of a request whose response did not arrive in time.
+
+        Args:
+            request (Dict[str, str]): The request returned by `submit`.
+
+        Returns:
+            AsyncInferenceError: The error.
+        """
+        return AsyncInferenceError(
+            f"No response for request {request['InferenceId']} "
+            + f"within {self.timeout} seconds"
+        )
+
+    def result(self, request: Dict[str, str]) -> Any:
+        """Wait for the response of a submitted request.
+
+        Args:
+            request (Dict[str, str]): The request returned by `submit`.
+
+        Returns:
+            Any: The decoded response.
+
+        Raises:
+            AsyncInferenceError: If the request timed out.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            done, response = self.poll(request)
+            if done:
+                return response
+            if time.monotonic() >= deadline:
+                raise self._timeout_error(request)
+            time.sleep(self.poll_interval)
+
+    def invoke(self, payload: Dict[str, Any]) -> Any:
+        """Submit a payload and wait for its response.
+
+        Args:
+            payload (Dict[str, Any]): The payload to send.
+
+        Returns:
+            Any: The decoded response.
+        """
+        return self.result(self.submit(payload))
+
+    def map(self, payloads: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, Any]]:
+        """Submit payloads and yield the responses as they arrive.
+
+        All payloads are submitted up front, in parallel, so that they queue
+        at the endpoint. The outstanding responses are then polled in
+        parallel every `poll_interval` seconds.
+
+        Args:
+            payloads (Iterable[Dict[str, Any]]): The payloads to send.
+
+        Yields:
+            Tuple[int, Any]: The index of each payload with its decoded
+                response, or with the exception raised for it.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            submissions = {
+                executor.submit(self.submit, payload): index
+                for index, payload in enumerate(payloads)
+            }
+            pending: Dict[int, Dict[str, str]] = {}
+            for future in as_completed(submissions):
+                error = future.exception()
+                if error:
+                    yield submissions[future], error
+                else:
+                    pending[submissions[future]] = future.result()
+
+            deadline = time.monotonic() + self.timeout
+            while pending:
+                yield from self._poll_pending(executor, pending)
+                if pending and time.monotonic() >= deadline:
+                    for index, request in pending.items():
+                        yield index, self._timeout_error(request)
+                    return
+                if pending:
+                    time.sleep(self.poll_interval)
+
+    def _poll_pending(
+        self, executor: ThreadPoolExecutor, pending: Dict[int, Dict[str, str]]
+    ) -> Iterator[Tuple[int, Any]]:
+        """Poll the outstanding requests once, in parallel.
+
+        Requests whose response or failure has arrived are removed from
+        `pending`.
+
+        Args:
+            executor (ThreadPoolExecutor): The executor polling the requests.
+            pending (Dict[int, Dict[str, str]]): The outstanding requests
+                by the index of their payload.
+
+        Yields:
+            Tuple[int, Any]: The index of each payload with its decoded
+                response, or with the exception raised for it.
+        """
+        polls = {
+            index: executor.submit(self.poll, request)
+            for index, request in pending.items()
+        }
+        for index, poll in polls.items():
+            try:
+                done, response = poll.result()
+            except Exception as e:
+                done, response = True, e
+            if done:
+                del pending[index]
+                yield index, response
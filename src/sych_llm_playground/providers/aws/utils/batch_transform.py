@@ -0,0 +1,284 @@
+"""Utility module for SageMaker Batch Transform jobs.
+
+Batch Transform runs a model over a dataset in S3 without a live endpoint.
+Datasets are JSONL files of Llama payloads. Each file is split into
+records by line and the records are sent to the model in mini-batches,
+while the files are spread across the instances of the job. Local
+datasets are therefore uploaded as several shards, which also lets the
+progress of a job be tracked by the number of shards transformed.
+
+Functions:
+    model_id_from_model: Extract the model ID from the name of a model.
+    shard_lines: Split the lines of a dataset into shards.
+    upload_dataset: Upload a local dataset to S3 as shards.
+    list_dataset: List the files of a dataset in S3.
+    create_transform_job: Launch a Batch Transform job.
+    wait_for_transform_job: Wait for a job to finish, reporting its progress.
+    stream_results: Stream the merged results of a job.
+"""
+
+import re
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .async_inference import parse_s3_uri
+from .clients import get_client
+
+
+TRANSFORM_PREFIX = "sych-llm-pg/transform"
+
+# Statuses of a transform job that has finished.
+FINAL_STATUSES = ["Completed", "Failed", "Stopped"]
+
+# Seconds between polls of the status of a job.
+POLL_INTERVAL = 30.0
+
+
+def model_id_from_model(model_name: str) -> Optional[str]:
+    """Extract the model ID from the name of a model.
+
+    Args:
+        model_name (str): The name of the model, in the format
+            `sych-llm-pg-{model_id}-m-{timestamp}`.
+
+    Returns:
+        Optional[str]: The model ID, or None if the name does not match.
+    """
+    match = re.match(r"^sych-llm-pg-(.*?)-m-", model_name)
+    return match.group(1) if match else None
+
+
+def shard_lines(lines: Iterable[bytes], shards: int) -> List[List[bytes]]:
+    """Split the lines of a dataset into contiguous shards.
+
+    Blank lines are dropped. Shards keep the order of the lines, so that
+    concatenating the results of the shards in order gives the results of
+    the dataset in order.
+
+    Args:
+        lines (Iterable[bytes]): The lines of the dataset.
+        shards (int): The maximum number of shards.
+
+    Returns:
+        List[List[bytes]]: The non-empty shards.
+    """
+    records = [line.rstrip(b"\r\n") for line in lines if line.strip()]
+    size = max(1, -(-len(records) // shards))
+    return [records[i : i + size] for i in range(0, len(records), size)]
+
+
+def upload_dataset(
+    path: str,
+    bucket: str,
+    prefix: str,
+    shards: int,
+    s3_client: Optional[Any] = None,
+) -> Tuple[str, List[str]]:
+    """Upload a local dataset to S3 as shards.
+
+    Args:
+        path (str): The path of the local JSONL dataset.
+        bucket (str): The bucket to upload to.
+        prefix (str): The key prefix of the shards.
+        shards (int): The maximum number of shards.
+        s3_client (Optional[Any]): The S3 client to use.
+            Defaults to the cached client.
+
+    Returns:
+        Tuple[str, List[str]]: The S3 URI of the dataset and the keys of
+            its shards, in order.
+    """
+    s3 = s3_client or get_client("s3")
+    with open(path, "rb") as f:
+        parts = shard_lines(f, shards)
+
+    keys = []
+    for index, part in enumerate(parts):
+        key = f"{prefix}/part-{index:05d}.jsonl"
+        s3.put_object(Bucket=bucket, Key=key, Body=b"\n".join(part) + b"\n")
+        keys.append(key)
+    return f"s3://{bucket}/{prefix}/", keys
+
+
+def list_dataset(input_uri: str, s3_client: Optional[Any] = None) -> List[str]:
+    """List the files of a dataset in S3.
+
+    Args:
+        input_uri (str): The S3 URI of a file or a prefix.
+        s3_client (Optional[Any]): The S3 client to use.
+            Defaults to the cached client.
+
+    Returns:
+        List[str]: The keys of the files, sorted.
+    """
+    s3 = s3_client or get_client("s3")
+    bucket, prefix = parse_s3_uri(input_uri)
+    keys: List[str] = []
+    for page in s3.get_paginator("list_objects_v2").paginate(
+        Bucket=bucket, Prefix=prefix
+    ):
+        keys.extend(
+            item["Key"] for item in page.get("Contents", []) if item["Size"] > 0
+        )
+    return sorted(keys)
+
+
+def create_transform_job(
+    job_name: str,
+    model_name: str,
+    input_uri: str,
+    output_uri: str,
+    instance_type: str,
+    instance_count: int = 1,
+    max_concurrent_transforms: int = 4,
+    max_payload_mb: int = 6,
+    sagemaker_client: Optional[Any] = None,
+) -> None:
+    """Launch a Batch Transform job over a JSONL dataset.
+
+    Records are split by line and sent in mini-batches of up to
+    `max_payload_mb`, and the results are assembled by line.
+
+    Args:
+        job_name (str): The name of the job.
+        model_name (str): The name of the SageMaker model.
+        input_uri (str): The S3 URI of the dataset, a file or a prefix.
+        output_uri (str): The S3 URI the results are written to.
+        instance_type (str): The instance type.
+        instance_count (int): The number of instances.
+        max_concurrent_transforms (int): Maximum number of requests sent
+            to each instance at a time.
+        max_payload_mb (int): Maximum size of a mini-batch in MB.
+        sagemaker_client (Optional[Any]): The SageMaker client to use.
+            Defaults to the cached client.
+    """
+    sagemaker = sagemaker_client or get_client("sagemaker")
+    sagemaker.create_transform_job(
+        TransformJobName=job_name,
+        ModelName=model_name,
+        MaxConcurrentTransforms=max_concurrent_transforms,
+        MaxPayloadInMB=max_payload_mb,
+        BatchStrategy="MultiRecord",
+        # Required by Llama 2 models to accept the EULA, as batch requests
+        # cannot carry custom attributes.
+        Environment={"accept_eula": "true"},
+        TransformInput={
+            "DataSource": {
+                "S3DataSource": {"S3DataType": "S3Prefix", "S3Uri": input_uri}
+            },
+            "ContentType": "application/jsonlines",
+            "SplitType": "Line",
+        },
+        TransformOutput={
+            "S3OutputPath": output_uri,
+            "Accept": "application/jsonlines",
+            "AssembleWith": "Line",
+        },
+        TransformResources={
+            "InstanceType": instance_type,
+            "InstanceCount": instance_count,
+        },
+    )
+
+
+def _output_key(input_key: str, input_prefix: str, output_prefix: str) -> str:
+    """Return the key of the results of a dataset file.
+
+    Batch Transform writes the results of each file to the output path,
+    keeping its path relative to the input prefix and appending `.out`.
+
+    Args:
+        input_key (str): The key of the dataset file.
+        input_prefix (str): The key prefix of the dataset.
+        output_prefix (str): The key prefix of the results.
+
+    Returns:
+        str: The key of the results.
+    """
+    relative = input_key[len(input_prefix) :].lstrip("/") or input_key.split("/")[-1]
+    return f"{output_prefix.rstrip('/')}/{relative}.out"
+
+
+def wait_for_transform_job(
+    job_name: str,
+    input_uri: str,
+    output_uri: str,
+    input_keys: List[str],
+    on_progress: Callable[[str, int, int], None],
+    poll_interval: float = POLL_INTERVAL,
+    sagemaker_client: Optional[Any] = None,
+    s3_client: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """Wait for a transform job to finish, reporting its progress.
+
+    Args:
+        job_name (str): The name of the job.
+        input_uri (str): The S3 URI of the dataset.
+        output_uri (str): The S3 URI of the results.
+        input_keys (List[str]): The keys of the dataset files.
+        on_progress (Callable[[str, int, int], None]): Called after every
+            poll with the status of the job, the number of files
+            transformed and the number of files.
+        poll_interval (float): Seconds between polls.
+        sagemaker_client (Optional[Any]): The SageMaker client to use.
+            Defaults to the cached client.
+        s3_client (Optional[Any]): The S3 client to use.
+            Defaults to the cached client.
+
+    Returns:
+        Dict[str, Any]: The final description of the job.
+    """
+    sagemaker = sagemaker_client or get_client("sagemaker")
+    _, input_prefix = parse_s3_uri(input_uri)
+    output_bucket, output_prefix = parse_s3_uri(output_uri)
+    expected = {_output_key(key, input_prefix, output_prefix) for key in input_keys}
+
+    while True:
+        job: Dict[str, Any] = sagemaker.describe_transform_job(
+            TransformJobName=job_name
+        )
+        done = set(list_dataset(f"s3://{output_bucket}/{output_prefix}", s3_client))
+        on_progress(job["TransformJobStatus"], len(expected & done), len(expected))
+        if job["TransformJobStatus"] in FINAL_STATUSES:
+            return job
+        time.sleep(poll_interval)
+
+
+def stream_results(
+    input_uri: str,
+    output_uri: str,
+    input_keys: List[str],
+    s3_client: Optional[Any] = None,
+) -> Iterator[bytes]:
+    """Stream the merged results of a transform job.
+
+    The results of the dataset files are read one after the other, in the
+    order of the files, without downloading them first.
+
+    Args:
+        input_uri (str): The S3 URI of the dataset.
+        output_uri (str): The S3 URI of the results.
+        input_keys (List[str]): The keys of the dataset files, in order.
+        s3_client (Optional[Any]): The S3 client to use.
+            Defaults to the cached client.
+
+    Yields:
+        bytes: The result lines, without line endings.
+    """
+    s3 = s3_client or get_client("s3")
+    _, input_prefix = parse_s3_uri(input_uri)
+    output_bucket, output_prefix = parse_s3_uri(output_uri)
+    for key in input_keys:
+        body = s3.get_object(
+            Bucket=output_bucket, Key=_output_key(key, input_prefix, output_prefix)
+        )["Body"]
+        for line in body.iter_lines():
+            if line:
+                yield line
@@ -0,0 +1,102 @@
+"""Utility module for creating and reusing AWS service clients.
+
+Creating a boto3 client resolves credentials, loads service models and
+builds an HTTP connection pool, which is expensive relative to a single
+API call. This module keeps one client per service and region so that
+repeated commands (e.g. inside the interactive shell) reuse them.
+
+The SageMaker Runtime client sends its requests to the URL in the
+`RUNTIME_URL_ENV` environment variable when it is set, e.g. to a local
+emulator started with `sych-llm-playground emulate`. It makes a single
+attempt per request, as invocations are retried by `ResilientInvoker`,
+which also backs off and counts the failures of an endpoint.
+
+Functions:
+    get_client: Return a cached boto3 client for a service.
+    get_sagemaker_session: Return a cached SageMaker SDK session.
+    reset_clients: Drop all cached clients.
+"""
+
+import os
+import threading
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import boto3
+from botocore.config import Config
+
+
+# Maximum number of pooled HTTP connections kept per client.
+MAX_POOL_CONNECTIONS = 32
+
+# Environment variable overriding the endpoint URL of the SageMaker Runtime.
+RUNTIME_URL_ENV = "SYCH_LLM_PG_RUNTIME_URL"
+
+# Retries of the SageMaker Runtime client, leaving them to `ResilientInvoker`.
+RUNTIME_RETRIES = {"total_max_attempts": 1, "mode": "standard"}
+
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+# boto3's default session is not thread-safe, so client creation is serialized.
+_clients_lock = threading.Lock()
+_sagemaker_sessions: Dict[Optional[str], Any] = {}
+
+
+def get_client(service_name: str, region: Optional[str] = None) -> Any:
+    """Return a cached boto3 client for the given service.
+
+    Args:
+        service_name (str): The AWS service name (e.g., "sagemaker").
+        region (Optional[str]): The region of the client. Defaults to
+            the region of the loaded credentials.
+
+    Returns:
+        Any: The boto3 client.
+    """
+    key = (service_name, region)
+    with _clients_lock:
+        if key not in _clients:
+            endpoint_url = None
+            config = Config(max_pool_connections=MAX_POOL_CONNECTIONS)
+            if service_name == "sagemaker-runtime":
+                endpoint_url = os.environ.get(RUNTIME_URL_ENV) or None
+                config = config.merge(Config(retries=RUNTIME_RETRIES))
+            _clients[key] = boto3.client(
+                service_name,
+                region_name=region,
+                endpoint_url=endpoint_url,
+                config=config,
+            )
+        return _clients[key]
+
+
+def get_sagemaker_session(region: Optional[str] = None) -> Any:
+    """Return a cached SageMaker SDK session built on the cached clients.
+
+    The SageMaker SDK is imported lazily as importing it takes longer
+    than most commands that only need boto3.
+
+    Args:
+        region (Optional[str]): The region of the session. Defaults to
+            the region of the loaded credentials.
+
+    Returns:
+        Any: The `sagemaker.session.Session`.
+    """
+    if region not in _sagemaker_sessions:
+        from sagemaker.session import Session
+
+        _sagemaker_sessions[region] = Session(
+            boto_session=boto3.Session(region_name=region) if region else None,
+            sagemaker_client=get_client("sagemaker", region),
+            sagemaker_runtime_client=get_client("sagemaker-runtime", region),
+        )
+    return _sagemaker_sessions[region]
+
+
+def reset_clients() -> None:
+    """Drop all cached clients, e.g. after credentials have changed."""
+    with _clients_lock:
+        _clients.clear()
+        _sagemaker_sessions.clear()
@@ -0,0 +1,136 @@
+"""Utility module to compare the responses of several deployed models.
+
+The same prompt is sent to every compared model at once, in the payload
+format of each model. Responses are laid out side by side, and every model
+is summarized by its latency and throughput over all prompts.
+
+Functions:
+    compare_prompt: Send a prompt to several models concurrently.
+    summarize_comparison: Summarize the latency and throughput of every model.
+    side_by_side: Lay out texts side by side in columns.
+"""
+
+import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from .invocation import Invoker
+from .invocation import parse_chat_response
+from .invocation import parse_predict_response
+from .sweep import build_payload
+from .sweep import estimate_tokens
+from .sweep import summarize_results
+
+
+# A compared model: its label, its invoker, and whether it is
+# interacted with by "predict" or "chat".
+Target = Tuple[str, Invoker, str]
+
+
+def compare_prompt(
+    targets: List[Target],
+    prompt: str,
+    parameters: Dict[str, Any],
+    clock: Callable[[], float] = time.perf_counter,
+) -> List[Dict[str, Any]]:
+    """Send a prompt to several models concurrently.
+
+    Args:
+        targets (List[Target]): The compared models.
+        prompt (str): The prompt.
+        parameters (Dict[str, Any]): The sampling parameters.
+        clock (Callable[[], float]): Clock in seconds.
+
+    Returns:
+        List[Dict[str, Any]]: One result per model, in order, with its
+            "target" label, its "output", the "latency", the estimated
+            "output_tokens" and the "error", if any.
+    """
+
+    def send(target: Target) -> Dict[str, Any]:
+        label, invoke, kind = target
+        parse = parse_chat_response if kind == "chat" else parse_predict_response
+        output, error = "", None
+        start = clock()
+        try:
+            output = parse(invoke(build_payload(kind, prompt, parameters)))
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        return {
+            "target": label,
+            "output": output,
+            "latency": clock() - start,
+            "output_tokens": estimate_tokens(output),
+            "error": error,
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, len(targets))) as executor:
+        return list(executor.map(send, targets))
+
+
+def summarize_comparison(
+    targets: List[Target], results: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Summarize the latency and throughput of every model.
+
+    Args:
+        targets (List[Target]): The compared models.
+        results (List[Dict[str, Any]]): The results of `compare_prompt` for
+            all prompts.
+
+    Returns:
+        List[Dict[str, Any]]: One row per model with its "target" label,
+            its "requests", the mean "latency" and "p90" latency of
+            successful requests in seconds, their mean "output_tokens",
+            the "tokens_per_second" generated over their total latency and
+            the number of "errors".
+    """
+    return [
+        {
+            "target": label,
+            **summarize_results(
+                [result for result in results if result["target"] == label]
+            ),
+        }
+        for label, _, _ in targets
+    ]
+
+
+def side_by_side(texts: List[str], width: int, gap: int = 3) -> str:
+    """Lay out texts side by side in columns.
+
+    Args:
+        texts (List[str]): The text of every column.
+        width (int): The total width of the columns.
+        gap (int): The spaces between columns.
+
+    Returns:
+        str: The lines of the columns, each text wrapped to the width of
+            its column.
+    """
+    if not texts:
+        return ""
+    column_width = max(10, (width - gap * (len(texts) - 1)) // len(texts))
+    columns = [
+        [
+            line
+            for paragraph in text.splitlines() or [""]
+            for line in textwrap.wrap(paragraph, column_width) or [""]
+        ]
+        for text in texts
+    ]
+    height = max(len(column) for column in columns)
+    return "\n".join(
+        (" " * gap)
+        .join(
+            (column[row] if row < len(column) else "").ljust(column_width)
+            for column in columns
+        )
+        .rstrip()
+        for row in range(height)
+    )
@@ -0,0 +1,252 @@
+"""Utility module for SageMaker inference components.
+
+Inference components pack several models onto the instances of a single
+shared endpoint. Every component reserves accelerators and memory for each
+of its copies, and SageMaker places the copies on the instances. Requests
+address a model by passing the name of its component along with the name
+of the endpoint.
+
+Shared endpoints are named `sych-llm-pg-shared-e-{timestamp}` and their
+components `sych-llm-pg-{model_id}-ic-{timestamp}`.
+
+Functions:
+    model_id_from_component: Extract the model ID from the name of a component.
+    is_shared_endpoint: Check whether an endpoint hosts inference components.
+    unfit_models: Find the models that need more accelerators than an instance has.
+    component_env: Size the environment of a model to its accelerators.
+    create_shared_endpoint: Create an endpoint without models.
+    add_inference_component: Attach a model to a shared endpoint.
+    wait_for_status: Wait for a resource to reach a status.
+"""
+
+import re
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from .clients import get_client
+
+
+SHARED_ENDPOINT_PREFIX = "sych-llm-pg-shared-e-"
+
+# Accelerators and memory reserved for each copy of a model.
+COMPONENT_REQUIREMENTS: Dict[str, Dict[str, int]] = {
+    "meta-textgeneration-llama-2-7b": {
+        "NumberOfAcceleratorDevicesRequired": 1,
+        "MinMemoryRequiredInMb": 16384,
+    },
+    "meta-textgeneration-llama-2-7b-f": {
+        "NumberOfAcceleratorDevicesRequired": 1,
+        "MinMemoryRequiredInMb": 16384,
+    },
+    "meta-textgeneration-llama-2-13b": {
+        "NumberOfAcceleratorDevicesRequired": 2,
+        "MinMemoryRequiredInMb": 32768,
+    },
+    "meta-textgeneration-llama-2-13b-f": {
+        "NumberOfAcceleratorDevicesRequired": 2,
+        "MinMemoryRequiredInMb": 32768,
+    },
+    "meta-textgeneration-llama-2-70b": {
+        "NumberOfAcceleratorDevicesRequired": 8,
+        "MinMemoryRequiredInMb": 131072,
+    },
+    "meta-textgeneration-llama-2-70b-f": {
+        "NumberOfAcceleratorDevicesRequired": 8,
+        "MinMemoryRequiredInMb": 131072,
+    },
+}
+
+# Accelerators of the instance types that host inference components.
+INSTANCE_ACCELERATORS: Dict[str, int] = {
+    "ml.g5.xlarge": 1,
+    "ml.g5.2xlarge": 1,
+    "ml.g5.4xlarge": 1,
+    "ml.g5.8xlarge": 1,
+    "ml.g5.16xlarge": 1,
+    "ml.g5.12xlarge": 4,
+    "ml.g5.24xlarge": 4,
+    "ml.g5.48xlarge": 8,
+    "ml.p4d.24xlarge": 8,
+    "ml.p4de.24xlarge": 8,
+    "ml.p5.48xlarge": 8,
+}
+
+# Seconds between polls of the status of an endpoint or component.
+POLL_INTERVAL = 30.0
+
+
+class ComponentDeploymentError(Exception):
+    """Raised when an endpoint or inference component fails to deploy."""
+
+
+def model_id_from_component(component_name: str) -> Optional[str]:
+    """Extract the model ID from the name of an inference component.
+
+    Args:
+        component_name (str): The name of the component, in the format
+            `sych-llm-pg-{model_id}-ic-{timestamp}`.
+
+    Returns:
+        Optional[str]: The model ID, or None if the name does not match.
+    """
+    match = re.match(r"^sych-llm-pg-(.*?)-ic-", component_name)
+    return match.group(1) if match else None
+
+
+def is_shared_endpoint(endpoint_name: str) -> bool:
+    """Check whether an endpoint hosts inference components.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+
+    Returns:
+        bool: True for endpoints created for inference components.
+    """
+    return endpoint_name.startswith(SHARED_ENDPOINT_PREFIX)
+
+
+def unfit_models(model_ids: List[str], instance_type: str) -> List[str]:
+    """Find the models that need more accelerators than an instance has.
+
+    Args:
+        model_ids (List[str]): The model IDs.
+        instance_type (str): The instance type. Instance types missing from
+            `INSTANCE_ACCELERATORS` are not checked.
+
+    Returns:
+        List[str]: The model IDs that do not fit on a single instance.
+    """
+    accelerators = INSTANCE_ACCELERATORS.get(instance_type)
+    if accelerators is None:
+        return []
+    return [
+        model_id
+        for model_id in model_ids
+        if COMPONENT_REQUIREMENTS[model_id]["NumberOfAcceleratorDevicesRequired"]
+        > accelerators
+    ]
+
+
+def component_env(env: Dict[str, str], model_id: str) -> Dict[str, str]:
+    """Size the environment of a model to the accelerators of its component.
+
+    JumpStart sets `SM_NUM_GPUS` to the accelerators of the default instance
+    type of a model, while a component only sees the accelerators it
+    reserves, so the model would otherwise shard itself over devices it
+    does not have.
+
+    Args:
+        env (Dict[str, str]): The environment of the model.
+        model_id (str): The model ID.
+
+    Returns:
+        Dict[str, str]: A copy of the environment, with `SM_NUM_GPUS` set to
+            the accelerators reserved for each copy of the model.
+    """
+    accelerators = COMPONENT_REQUIREMENTS[model_id][
+        "NumberOfAcceleratorDevicesRequired"
+    ]
+    return {**env, "SM_NUM_GPUS": str(accelerators)}
+
+
+def create_shared_endpoint(
+    endpoint_name: str,
+    instance_type: str,
+    instance_count: int,
+    role_arn: str,
+    sagemaker_client: Optional[Any] = None,
+) -> None:
+    """Create an endpoint without models, to attach inference components to.
+
+    Args:
+        endpoint_name (str): The name of the endpoint and its configuration.
+        instance_type (str): The instance type.
+        instance_count (int): The number of instances.
+        role_arn (str): The ARN of the IAM role the endpoint runs with.
+        sagemaker_client (Optional[Any]): The SageMaker client to use.
+            Defaults to the cached client.
+    """
+    sagemaker = sagemaker_client or get_client("sagemaker")
+    sagemaker.create_endpoint_config(
+        EndpointConfigName=endpoint_name,
+        ExecutionRoleArn=role_arn,
+        ProductionVariants=[
+            {
+                "VariantName": "AllTraffic",
+                "InstanceType": instance_type,
+                "InitialInstanceCount": instance_count,
+                "RoutingConfig": {"RoutingStrategy": "LEAST_OUTSTANDING_REQUESTS"},
+            }
+        ],
+    )
+    sagemaker.create_endpoint(
+        EndpointName=endpoint_name, EndpointConfigName=endpoint_name
+    )
+
+
+def add_inference_component(
+    endpoint_name: str,
+    component_name: str,
+    model_name: str,
+    model_id: str,
+    copies: int = 1,
+    sagemaker_client: Optional[Any] = None,
+) -> None:
+    """Attach a model to a shared endpoint as an inference component.
+
+    Args:
+        endpoint_name (str): The name of the shared endpoint.
+        component_name (str): The name of the component.
+        model_name (str): The name of the SageMaker model.
+        model_id (str): The model ID, selecting the resources reserved
+            for each copy from `COMPONENT_REQUIREMENTS`.
+        copies (int): The number of copies of the model.
+        sagemaker_client (Optional[Any]): The SageMaker client to use.
+            Defaults to the cached client.
+    """
+    sagemaker = sagemaker_client or get_client("sagemaker")
+    sagemaker.create_inference_component(
+        InferenceComponentName=component_name,
+        EndpointName=endpoint_name,
+        VariantName="AllTraffic",
+        Specification={
+            "ModelName": model_name,
+            "ComputeResourceRequirements": COMPONENT_REQUIREMENTS[model_id],
+        },
+        RuntimeConfig={"CopyCount": copies},
+    )
+
+
+def wait_for_status(
+    describe: Callable[[], Dict[str, Any]],
+    status_key: str,
+    poll_interval: float = POLL_INTERVAL,
+) -> None:
+    """Wait for an endpoint or inference component to be in service.
+
+    Updated endpoints are in service again once the update has completed or
+    rolled back.
+
+    Args:
+        describe (Callable[[], Dict[str, Any]]): Describes the resource.
+        status_key (str): The key of the status in the description.
+        poll_interval (float): Seconds between polls.
+
+    Raises:
+        ComponentDeploymentError: If the resource failed to deploy, or an
+            update failed to roll back.
+    """
+    while True:
+        description = describe()
+        status = description[status_key]
+        if status == "InService":
+            return
+        if status in ("Failed", "UpdateRollbackFailed"):
+            raise ComponentDeploymentError(
+                description.get("FailureReason", "Deployment failed")
+            )
+        time.sleep(poll_interval)
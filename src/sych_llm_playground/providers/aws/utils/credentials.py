@@ -22,13 +22,19 @@ Example:
 
 import os
 from typing import Dict
+from typing import Optional
 
 import click
 
+from .clients import reset_clients
+
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 CREDENTIALS_FILE = os.path.join(BASE_DIR, "providers", "aws", ".credentials")
 
+# Credentials loaded by this process, reused by subsequent commands.
+_loaded_credentials: Optional[Dict[str, str]] = None
+
 
 def validate_credentials() -> bool:
     """Validates that the required keys are present in the credentials file.
@@ -64,9 +70,16 @@ def validate_credentials() -> bool:
 def load_credentials() -> Dict[str, str]:
     """Loads the credentials from the file.
 
+    Credentials are only read and validated once per process; later calls
+    return the already loaded credentials.
+
     Returns:
         Dict[str, str]: A dictionary containing the loaded credentials.
     """
+    global _loaded_credentials
+    if _loaded_credentials is not None:
+        return _loaded_credentials
+
     if not validate_credentials():
         exit(1)
 
@@ -82,6 +95,7 @@ def load_credentials() -> Dict[str, str]:
 
     click.secho(" \n✓ Cloud Credentials loaded. \n", fg="green")
 
+    _loaded_credentials = credentials
     return credentials
 
 
@@ -92,10 +106,15 @@ def save_credentials(credentials: Dict[str, str]) -> None:
         credentials (Dict[str, str]): A dictionary
             containing the credentials to be saved.
     """
+    global _loaded_credentials
     with open(CREDENTIALS_FILE, "w") as f:
         for key, value in credentials.items():
             f.write(f"{key}={value}\n")
 
+    # Anything built from the previous credentials is now stale.
+    _loaded_credentials = None
+    reset_clients()
+
 
 def existing_credentials() -> Dict[str, str]:
     """Retrieves the existing credentials from the file.
@@ -0,0 +1,207 @@
+"""Utility module for the stage settings of the API Gateways of endpoints.
+
+The `prod` stage of an API created by `deploy` can cache responses and
+throttle requests. API Gateway caches responses by request parameters
+only, never by body, so clients send the SHA-256 of the body in the
+`BODY_HASH_HEADER` header, which is part of the cache key together with
+the `custom_attributes` header. While caching is enabled, the header is
+required. A usage plan with an API key can also cap the requests of
+clients with a daily quota.
+
+Gateway settings are dictionaries with the optional keys "type" ("rest",
+or "http" for the HTTP APIs of `utils.http_api`), "cache_size" (in GB),
+"cache_ttl" (in seconds), "rate_limit" (requests per second),
+"burst_limit" (requests) and "quota" (requests per day).
+
+Functions:
+    body_hash: Return the hash of a request body sent in `BODY_HASH_HEADER`.
+    caching_enabled: Check whether gateway settings enable the stage cache.
+    stage_patch_operations: Build the operations applying method settings.
+    create_usage_plan: Create a usage plan and API key for an API.
+    delete_usage_plans: Delete the usage plans and API keys of an API.
+    describe_gateway: Describe the cache, throttling and usage plan of an API.
+"""
+
+import hashlib
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+STAGE_NAME = "prod"
+
+# Header carrying the SHA-256 of the request body, part of the cache key.
+BODY_HASH_HEADER = "X-Sych-Body-SHA256"
+
+# Sizes in GB of the cache clusters of API Gateway stages.
+CACHE_CLUSTER_SIZES = ["0.5", "1.6", "6.1", "13.5", "28.4", "58.2", "118", "237"]
+
+DEFAULT_CACHE_TTL = 300
+MAX_CACHE_TTL = 3600
+
+# Method settings path of the predict method, with "/" escaped as "~1".
+PREDICT_METHOD_PATH = "/~1predict/POST"
+
+
+def body_hash(body: bytes) -> str:
+    """Return the hash of a request body sent in `BODY_HASH_HEADER`.
+
+    Args:
+        body (bytes): The uncompressed body.
+
+    Returns:
+        str: The hex SHA-256 of the body.
+    """
+    return hashlib.sha256(body).hexdigest()
+
+
+def caching_enabled(settings: Optional[Dict[str, Any]]) -> bool:
+    """Check whether gateway settings enable the stage cache.
+
+    Args:
+        settings (Optional[Dict[str, Any]]): The gateway settings.
+
+    Returns:
+        bool: True if a cache cluster size is set.
+    """
+    return bool(settings and settings.get("cache_size"))
+
+
+def stage_patch_operations(settings: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Build the operations applying the method settings of the predict method.
+
+    Args:
+        settings (Dict[str, Any]): The gateway settings.
+
+    Returns:
+        List[Dict[str, str]]: The patch operations of `update_stage`, empty
+            if there is nothing to apply.
+    """
+    values: Dict[str, Any] = {}
+    if caching_enabled(settings):
+        values["caching/enabled"] = "true"
+        values["caching/ttlInSeconds"] = settings.get("cache_ttl", DEFAULT_CACHE_TTL)
+    if settings.get("rate_limit") is not None:
+        values["throttling/rateLimit"] = settings["rate_limit"]
+    if settings.get("burst_limit") is not None:
+        values["throttling/burstLimit"] = settings["burst_limit"]
+    return [
+        {
+            "op": "replace",
+            "path": f"{PREDICT_METHOD_PATH}/{setting}",
+            "value": str(value),
+        }
+        for setting, value in values.items()
+    ]
+
+
+def create_usage_plan(
+    client: Any, api_id: str, name: str, settings: Dict[str, Any]
+) -> str:
+    """Create a usage plan with an API key for the stage of an API.
+
+    Args:
+        client (Any): The API Gateway client.
+        api_id (str): The ID of the REST API.
+        name (str): The name of the usage plan and API key.
+        settings (Dict[str, Any]): The gateway settings, with a "quota".
+
+    Returns:
+        str: The value of the API key, sent in the `x-api-key` header.
+    """
+    throttle = {
+        key: settings[setting]
+        for key, setting in (("rateLimit", "rate_limit"), ("burstLimit", "burst_limit"))
+        if settings.get(setting) is not None
+    }
+    plan = client.create_usage_plan(
+        name=name,
+        description=f"Usage plan of {name}",
+        apiStages=[{"apiId": api_id, "stage": STAGE_NAME}],
+        quota={"limit": settings["quota"], "period": "DAY"},
+        **({"throttle": throttle} if throttle else {}),
+    )
+    key = client.create_api_key(name=name, enabled=True)
+    client.create_usage_plan_key(
+        usagePlanId=plan["id"], keyId=key["id"], keyType="API_KEY"
+    )
+    value: str = key["value"]
+    return value
+
+
+def delete_usage_plans(client: Any, api_id: str) -> None:
+    """Delete the usage plans and API keys of an API.
+
+    An API cannot be deleted while it is part of a usage plan, and the
+    usage plans created by `create_usage_plan` serve a single API.
+
+    Args:
+        client (Any): The API Gateway client.
+        api_id (str): The ID of the REST API.
+    """
+    for plan in client.get_usage_plans()["items"]:
+        stages = [
+            api_stage
+            for api_stage in plan.get("apiStages", [])
+            if api_stage["apiId"] == api_id
+        ]
+        if not stages:
+            continue
+        for key in client.get_usage_plan_keys(usagePlanId=plan["id"])["items"]:
+            client.delete_api_key(apiKey=key["id"])
+        client.update_usage_plan(
+            usagePlanId=plan["id"],
+            patchOperations=[
+                {
+                    "op": "remove",
+                    "path": "/apiStages",
+                    "value": f"{api_id}:{stage['stage']}",
+                }
+                for stage in stages
+            ],
+        )
+        client.delete_usage_plan(usagePlanId=plan["id"])
+
+
+def describe_gateway(
+    client: Any, api_id: str, usage_plans: List[Dict[str, Any]]
+) -> Dict[str, str]:
+    """Describe the cache, throttling and usage plan of an API.
+
+    Args:
+        client (Any): The API Gateway client.
+        api_id (str): The ID of the REST API.
+        usage_plans (List[Dict[str, Any]]): The usage plans of the account,
+            as returned by `get_usage_plans`.
+
+    Returns:
+        Dict[str, str]: The "cache", "throttling" and "usage_plan" of the
+            API, for those that are configured.
+    """
+    stage = client.get_stage(restApiId=api_id, stageName=STAGE_NAME)
+    method = stage.get("methodSettings", {}).get(PREDICT_METHOD_PATH.lstrip("/"), {})
+    description = {}
+
+    if stage.get("cacheClusterEnabled"):
+        ttl = method.get("cacheTtlInSeconds", DEFAULT_CACHE_TTL)
+        enabled = "" if method.get("cachingEnabled") else ", disabled for predict"
+        description["cache"] = (
+            f"{stage.get('cacheClusterSize')} GB, TTL {ttl}s{enabled}"
+        )
+    if "throttlingRateLimit" in method:
+        description["throttling"] = (
+            f"{method['throttlingRateLimit']:g} requests/s, "
+            + f"burst {method.get('throttlingBurstLimit', 0)}"
+        )
+    for plan in usage_plans:
+        api_stages = plan.get("apiStages", [])
+        if any(api_stage["apiId"] == api_id for api_stage in api_stages):
+            quota = plan.get("quota", {})
+            description["usage_plan"] = plan["name"]
+            if quota:
+                description["usage_plan"] += (
+                    f": {quota.get('limit')} requests/"
+                    + quota.get("period", "").lower()
+                )
+    return description
@@ -0,0 +1,247 @@
+"""Utility module for deadlines and hedged invocations.
+
+A `HedgedInvoker` wraps an `Invoker` to bound how long an invocation may
+take and to cut tail latency. When an invocation has not answered after a
+configurable percentile of the latencies observed so far, a duplicate is
+sent, the first answer wins and the other one is cancelled. Each attempt
+calls the wrapped invoker, so a router sends the duplicate to an alternate
+endpoint while a single endpoint invoker sends it to the same endpoint.
+
+Note:
+    An attempt that has already been sent cannot be aborted, as boto3
+    offers no way to cancel a request in flight. Its response is
+    discarded when it arrives.
+
+Example:
+    invoker = HedgedInvoker(router.invoke, deadline=30, hedge_percentile=95)
+    response_json = invoker.invoke(payload)
+    click.echo(invoker.summary())
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Optional
+from typing import Set
+
+from .invocation import Invoker
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when an invocation does not answer before its deadline."""
+
+
+class LatencyTracker:
+    """Sliding window of observed latencies."""
+
+    def __init__(self, window: int = 200) -> None:
+        """Initialize an empty window.
+
+        Args:
+            window (int): The number of most recent latencies kept.
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of latencies in the window.
+
+        Returns:
+            int: The number of latencies.
+        """
+        return len(self._samples)
+
+    def add(self, latency: float) -> None:
+        """Add an observed latency.
+
+        Args:
+            latency (float): The latency in seconds.
+        """
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Return a percentile of the latencies in the window.
+
+        Args:
+            percentile (float): The percentile, between 0 and 100.
+
+        Returns:
+            Optional[float]: The latency in seconds, or None if no
+                latencies have been observed.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = round(percentile / 100 * (len(samples) - 1))
+        return samples[index]
+
+
+class HedgedInvoker:
+    """Invoker with per-request deadlines and optional hedging."""
+
+    def __init__(
+        self,
+        invoker: Invoker,
+        deadline: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        min_samples: int = 5,
+        max_workers: int = 16,
+    ) -> None:
+        """Initialize the invoker.
+
+        Args:
+            invoker (Invoker): The invoker each attempt is sent through.
+            deadline (Optional[float]): Seconds after which an invocation
+                fails with `DeadlineExceededError`. No deadline if None.
+            hedge_percentile (Optional[float]): Percentile of the observed
+                latencies after which a duplicate is sent. No hedging if None.
+            min_samples (int): Number of latencies to observe before hedging.
+            max_workers (int): Maximum number of attempts in flight.
+        """
+        self.invoker = invoker
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.deadlines_exceeded = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Return the seconds after which a duplicate is sent.
+
+        Returns:
+            Optional[float]: The delay, or None if no duplicate is sent.
+        """
+        if self.hedge_percentile is None or len(self.latencies) < self.min_samples:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    def _remaining(self, start: float) -> Optional[float]:
+        """Return the seconds left until the deadline.
+
+        Args:
+            start (float): When the invocation started.
+
+        Returns:
+            Optional[float]: The seconds left, or None without a deadline.
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, start + self.deadline - time.monotonic())
+
+    def _count(self, counter: str) -> None:
+        """Increment one of the counters.
+
+        Args:
+            counter (str): The name of the counter attribute.
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def invoke(self, payload: Dict[str, Any]) -> Any:
+        """Invoke the model, hedging slow attempts, within the deadline.
+
+        Args:
+            payload (Dict[str, Any]): The payload to send.
+
+        Returns:
+            Any: The decoded response of the first successful attempt.
+
+        Raises:
+            DeadlineExceededError: If no attempt answered before the deadline.
+        """
+        self._count("requests")
+        start = time.monotonic()
+        primary = self._executor.submit(self.invoker, payload)
+        pending = self._hedge(primary, payload, start)
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(
+                pending, timeout=self._remaining(start), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is None:
+                error = next(iter(done)).exception()
+                continue
+            for loser in pending:
+                loser.cancel()
+            self.latencies.add(time.monotonic() - start)
+            if winner is not primary:
+                self._count("hedge_wins")
+            return winner.result()
+
+        if error is not None and not pending:
+            raise error
+
+        for loser in pending:
+            loser.cancel()
+        self._count("deadlines_exceeded")
+        raise DeadlineExceededError(
+            f"No response within the deadline of {self.deadline} seconds"
+        )
+
+    def _hedge(
+        self, primary: "Future[Any]", payload: Dict[str, Any], start: float
+    ) -> Set["Future[Any]"]:
+        """Send a duplicate if the primary attempt is slow to answer.
+
+        Args:
+            primary (Future[Any]): The primary attempt.
+            payload (Dict[str, Any]): The payload to send.
+            start (float): When the invocation started.
+
+        Returns:
+            Set[Future[Any]]: The attempts in flight.
+        """
+        pending = {primary}
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is None:
+            return pending
+
+        remaining = self._remaining(start)
+        if remaining is not None and hedge_delay >= remaining:
+            return pending
+
+        done, _ = wait(pending, timeout=hedge_delay)
+        if not done:
+            self._count("hedged")
+            pending.add(self._executor.submit(self.invoker, payload))
+        return pending
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the hedging statistics.
+
+        Returns:
+            Dict[str, Any]: The number of requests, hedged requests, wins of
+                the duplicates and exceeded deadlines, and the hedge rate.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_rate": (
+                    round(self.hedged / self.requests, 3) if self.requests else 0.0
+                ),
+                "hedge_wins": self.hedge_wins,
+                "deadlines_exceeded": self.deadlines_exceeded,
+            }
+
+    def shutdown(self) -> None:
+        """Release the worker threads without waiting for attempts in flight."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
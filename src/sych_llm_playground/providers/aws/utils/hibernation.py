@@ -0,0 +1,210 @@
+"""Utility module for hibernating endpoints.
+
+A hibernated endpoint is deleted, which stops its instances and their
+costs, while its model, endpoint configuration and API Gateway are kept.
+The endpoint is recorded in `HIBERNATION_FILE`, keyed by region and
+endpoint name, so it can be resumed from its configuration under the same
+name: the gateway integration, which targets the endpoint by name, keeps
+working, and no JumpStart artifacts, model or gateway are created again.
+The record is written before the endpoint is deleted, so an interrupted
+hibernation can still be resumed.
+
+Scaling to zero of asynchronous endpoints is deregistered along with the
+endpoint, recorded, and enabled again when the endpoint resumes.
+
+Functions:
+    load_hibernated: Load the records of hibernated endpoints.
+    record_hibernation: Record a hibernated endpoint.
+    drop_hibernation: Drop the record of a resumed endpoint.
+    choose_hibernated: Prompt the user to select a hibernated endpoint.
+    hibernate_endpoint: Delete an endpoint, keeping its configuration.
+    resume_endpoint: Create a hibernated endpoint again.
+"""
+
+import json
+import os
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+import click
+import inquirer
+
+from .credentials import BASE_DIR
+
+
+HIBERNATION_FILE = os.path.join(BASE_DIR, "providers", "aws", ".hibernated.json")
+
+# Scalable dimension of the instance count of endpoints.
+SCALABLE_DIMENSION = "sagemaker:variant:DesiredInstanceCount"
+
+
+def _hibernation_key(endpoint_name: str, region: str) -> str:
+    """Return the key of the record of a hibernated endpoint.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+        region (str): The AWS region.
+
+    Returns:
+        str: The key.
+    """
+    return f"{region}/{endpoint_name}"
+
+
+def load_hibernated(region: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Load the records of hibernated endpoints.
+
+    Args:
+        region (Optional[str]): The region to load the records of. Defaults
+            to all regions.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The records by key. Empty if there are
+            none.
+    """
+    try:
+        with open(HIBERNATION_FILE) as f:
+            records: Dict[str, Dict[str, Any]] = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {
+        key: record
+        for key, record in records.items()
+        if region is None or record["region"] == region
+    }
+
+
+def _save_hibernated(records: Dict[str, Dict[str, Any]]) -> None:
+    """Write the records, replacing the records file atomically.
+
+    Args:
+        records (Dict[str, Dict[str, Any]]): The records by key.
+    """
+    os.makedirs(os.path.dirname(HIBERNATION_FILE), exist_ok=True)
+    temporary_file = f"{HIBERNATION_FILE}.tmp"
+    with open(temporary_file, "w") as f:
+        json.dump(records, f, indent=2)
+    os.replace(temporary_file, HIBERNATION_FILE)
+
+
+def record_hibernation(record: Dict[str, Any]) -> None:
+    """Record a hibernated endpoint.
+
+    Args:
+        record (Dict[str, Any]): The record, as returned by
+            `hibernate_endpoint`.
+    """
+    records = load_hibernated()
+    records[_hibernation_key(record["endpoint_name"], record["region"])] = record
+    _save_hibernated(records)
+
+
+def drop_hibernation(endpoint_name: str, region: str) -> None:
+    """Drop the record of a resumed endpoint.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+        region (str): The AWS region of the endpoint.
+    """
+    records = load_hibernated()
+    records.pop(_hibernation_key(endpoint_name, region), None)
+    _save_hibernated(records)
+
+
+def choose_hibernated(region: str, purpose: str) -> Dict[str, Any]:
+    """Prompt the user to select a hibernated endpoint of a region.
+
+    Args:
+        region (str): The AWS region.
+        purpose (str): The purpose to choose an endpoint, e.g. resume.
+
+    Returns:
+        Dict[str, Any]: The record of the selected endpoint.
+    """
+    records = load_hibernated(region)
+    if not records:
+        click.secho(f"No hibernated endpoints in {region}. \n", fg="yellow")
+        exit(0)
+
+    questions = [
+        inquirer.List(
+            "endpoint",
+            message=f"Select a hibernated endpoint to {purpose}:",
+            choices=[record["endpoint_name"] for record in records.values()],
+        ),
+    ]
+    endpoint_name = inquirer.prompt(questions)["endpoint"]
+    return records[_hibernation_key(endpoint_name, region)]
+
+
+def hibernate_endpoint(
+    endpoint_name: str,
+    region: str,
+    sagemaker_client: Any,
+    autoscaling_client: Any,
+) -> Dict[str, Any]:
+    """Delete an endpoint, keeping its model and configuration.
+
+    The endpoint is recorded before anything is changed. The record is
+    dropped again only if deleting the endpoint is refused, so an endpoint
+    whose deletion was started can always be resumed.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+        region (str): The AWS region of the endpoint.
+        sagemaker_client (Any): The SageMaker client.
+        autoscaling_client (Any): The Application Auto Scaling client.
+
+    Returns:
+        Dict[str, Any]: The record of the hibernated endpoint, with the name
+            of its configuration and the maximum number of instances it
+            scales out to from zero, if it scales to zero.
+    """
+    description = sagemaker_client.describe_endpoint(EndpointName=endpoint_name)
+    resource_id = f"endpoint/{endpoint_name}/variant/AllTraffic"
+    targets = autoscaling_client.describe_scalable_targets(
+        ServiceNamespace="sagemaker",
+        ResourceIds=[resource_id],
+        ScalableDimension=SCALABLE_DIMENSION,
+    )["ScalableTargets"]
+    scale_to_zero = next(
+        (target["MaxCapacity"] for target in targets if target["MinCapacity"] == 0),
+        None,
+    )
+    record = {
+        "endpoint_name": endpoint_name,
+        "endpoint_config": description["EndpointConfigName"],
+        "region": region,
+        "scale_to_zero": scale_to_zero,
+        "hibernated_at": int(time.time()),
+    }
+    record_hibernation(record)
+
+    try:
+        if targets:
+            # Also deletes the scaling policies of the endpoint.
+            autoscaling_client.deregister_scalable_target(
+                ServiceNamespace="sagemaker",
+                ResourceId=resource_id,
+                ScalableDimension=SCALABLE_DIMENSION,
+            )
+        sagemaker_client.delete_endpoint(EndpointName=endpoint_name)
+    except Exception:
+        drop_hibernation(endpoint_name, region)
+        raise
+    return record
+
+
+def resume_endpoint(record: Dict[str, Any], sagemaker_client: Any) -> None:
+    """Create a hibernated endpoint again from its configuration.
+
+    Args:
+        record (Dict[str, Any]): The record of the hibernated endpoint.
+        sagemaker_client (Any): The SageMaker client.
+    """
+    sagemaker_client.create_endpoint(
+        EndpointName=record["endpoint_name"],
+        EndpointConfigName=record["endpoint_config"],
+    )
@@ -0,0 +1,171 @@
+"""Utility module for the HTTP APIs (API Gateway v2) of endpoints.
+
+HTTP APIs have a lower latency and cost per request than REST APIs, but
+cannot integrate with SageMaker directly: their AWS service integrations
+do not include SageMaker Runtime, and their HTTP integrations do not sign
+requests. The `POST /predict` route of an HTTP API therefore proxies to a
+small Lambda function that invokes the endpoint, passing the status code
+of the endpoint through and handling gzip-compressed bodies like the REST
+API does.
+
+The name of the function is kept in the `PROXY_FUNCTION_TAG` tag of the
+API, so that both are deleted together.
+
+Functions:
+    proxy_function_name: Return the name of the proxy function of an endpoint.
+    build_proxy_package: Build the deployment package of the proxy function.
+    create_proxy_function: Create the proxy function of an endpoint.
+    delete_http_api: Delete an HTTP API and its proxy function.
+    invoke_url: Return the URL of the predict route of an HTTP API.
+"""
+
+import io
+import zipfile
+from typing import Any
+from typing import Dict
+
+from .gateway import STAGE_NAME
+from .invocation import GATEWAY_MIN_COMPRESSION_SIZE
+
+
+PROXY_FUNCTION_TAG = "sych-llm-pg-function"
+PROXY_FUNCTION_PREFIX = "sych-llm-pg-proxy-"
+PROXY_RUNTIME = "python3.12"
+
+# HTTP APIs time out integrations after at most 30 seconds.
+INTEGRATION_TIMEOUT_MS = 30000
+
+PROXY_SOURCE = '''"""Proxy of an HTTP API to a SageMaker endpoint."""
+
+import base64
+import gzip
+import json
+import os
+
+import boto3
+from botocore.exceptions import ClientError
+
+runtime = boto3.client("sagemaker-runtime")
+
+
+def handler(event, context):
+    headers = event.get("headers") or {}
+    body = event.get("body") or ""
+    if event.get("isBase64Encoded"):
+        body = base64.b64decode(body)
+    else:
+        body = body.encode("utf-8")
+    if headers.get("content-encoding") == "gzip":
+        body = gzip.decompress(body)
+
+    arguments = {}
+    if headers.get("custom_attributes"):
+        arguments["CustomAttributes"] = headers["custom_attributes"]
+    try:
+        response = runtime.invoke_endpoint(
+            EndpointName=os.environ["ENDPOINT_NAME"],
+            ContentType="application/json",
+            Body=body,
+            **arguments,
+        )
+        status, payload = 200, response["Body"].read()
+    except ClientError as e:
+        status = e.response["ResponseMetadata"]["HTTPStatusCode"]
+        payload = json.dumps({"message": str(e)}).encode("utf-8")
+
+    result = {"statusCode": status, "headers": {"Content-Type": "application/json"}}
+    compress = len(payload) >= int(os.environ["MIN_COMPRESSION_SIZE"])
+    if compress and "gzip" in headers.get("accept-encoding", ""):
+        result["headers"]["Content-Encoding"] = "gzip"
+        result["body"] = base64.b64encode(gzip.compress(payload)).decode("ascii")
+        result["isBase64Encoded"] = True
+    else:
+        result["body"] = payload.decode("utf-8")
+    return result
+'''
+
+
+def proxy_function_name(endpoint_name: str) -> str:
+    """Return the name of the proxy function of an endpoint.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+
+    Returns:
+        str: The name of the function, within the 64 characters allowed by
+            Lambda.
+    """
+    suffix = endpoint_name.removeprefix("sych-llm-pg-")
+    return PROXY_FUNCTION_PREFIX + suffix[-(64 - len(PROXY_FUNCTION_PREFIX)) :]
+
+
+def build_proxy_package() -> bytes:
+    """Build the deployment package of the proxy function.
+
+    Returns:
+        bytes: A zip archive with the `proxy` module.
+    """
+    package = io.BytesIO()
+    with zipfile.ZipFile(package, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("proxy.py", PROXY_SOURCE)
+    return package.getvalue()
+
+
+def create_proxy_function(
+    lambda_client: Any, endpoint_name: str, iam_role_arn: str
+) -> str:
+    """Create the proxy function of an endpoint and wait until it is active.
+
+    Args:
+        lambda_client (Any): The Lambda client.
+        endpoint_name (str): The name of the endpoint.
+        iam_role_arn (str): The ARN of the role of the function, which
+            Lambda must be able to assume.
+
+    Returns:
+        str: The ARN of the function.
+    """
+    name = proxy_function_name(endpoint_name)
+    function = lambda_client.create_function(
+        FunctionName=name,
+        Runtime=PROXY_RUNTIME,
+        Role=iam_role_arn,
+        Handler="proxy.handler",
+        Code={"ZipFile": build_proxy_package()},
+        Description=f"Proxy of an HTTP API to SageMaker endpoint {endpoint_name}",
+        Timeout=INTEGRATION_TIMEOUT_MS // 1000,
+        Environment={
+            "Variables": {
+                "ENDPOINT_NAME": endpoint_name,
+                "MIN_COMPRESSION_SIZE": str(GATEWAY_MIN_COMPRESSION_SIZE),
+            }
+        },
+    )
+    lambda_client.get_waiter("function_active_v2").wait(FunctionName=name)
+    arn: str = function["FunctionArn"]
+    return arn
+
+
+def delete_http_api(client: Any, lambda_client: Any, api: Dict[str, str]) -> None:
+    """Delete an HTTP API and its proxy function.
+
+    Args:
+        client (Any): The API Gateway v2 client.
+        lambda_client (Any): The Lambda client.
+        api (Dict[str, str]): The HTTP API, as listed by `get_resources`.
+    """
+    client.delete_api(ApiId=api["id"])
+    if api.get("function"):
+        lambda_client.delete_function(FunctionName=api["function"])
+
+
+def invoke_url(api_endpoint: str) -> str:
+    """Return the URL of the predict route of an HTTP API.
+
+    Args:
+        api_endpoint (str): The base URL of the API.
+
+    Returns:
+        str: The URL the REST API of an endpoint would have.
+    """
+    return f"{api_endpoint}/{STAGE_NAME}/predict"
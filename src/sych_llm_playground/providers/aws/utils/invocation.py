@@ -0,0 +1,366 @@
+"""Utility module for invoking deployed SageMaker endpoints.
+
+This module contains functions to build the Llama payloads sent to
+endpoints, to invoke endpoints through the pooled SageMaker Runtime
+client, and to extract the generated text from their responses.
+
+Functions:
+    endpoint_invoker: Return an `Invoker` for a single endpoint.
+    gateway_invoker: Return an `Invoker` for the API Gateway of an endpoint.
+    build_predict_payload: Build the payload for text generation models.
+    build_chat_payload: Build the payload for chat models.
+    parse_predict_response: Extract the generation of a text generation model.
+    parse_chat_response: Extract the generation of a chat model.
+    invoke_endpoint: Invoke an endpoint and decode its JSON response.
+    invoke_endpoint_stream: Invoke an endpoint and yield generated tokens.
+    warm_up_connection: Set up a pooled connection to the SageMaker Runtime.
+"""
+
+import contextlib
+import functools
+import gzip
+import json
+import urllib.request
+import uuid
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from ....utils.metrics import counter
+from .clients import get_client
+from .gateway import BODY_HASH_HEADER
+from .gateway import body_hash
+
+
+# Required by Llama 2 models to accept the EULA.
+CUSTOM_ATTRIBUTES = "accept_eula=true"
+
+DEFAULT_MAX_NEW_TOKENS = 256
+DEFAULT_TOP_P = 0.9
+DEFAULT_TEMPERATURE = 0.6
+
+# Bodies of at least this many bytes are compressed on the API Gateway path,
+# the `minimumCompressionSize` of the APIs created by `deploy`.
+GATEWAY_MIN_COMPRESSION_SIZE = 1024
+
+# gzip level of request bodies, trading a little size for less CPU time.
+GZIP_LEVEL = 6
+
+GATEWAY_BYTES = counter(
+    "sych_llm_pg_gateway_bytes_total",
+    "Bytes of bodies sent to and received from API Gateways, as on the wire.",
+    ["direction"],
+)
+
+# Endpoint that is never deployed, invoked to set up connections ahead of
+# the first request.
+WARM_UP_ENDPOINT_NAME = "sych-llm-pg-connection-warm-up"
+
+# Function sending a payload to a deployed model and returning its decoded response.
+Invoker = Callable[[Dict[str, Any]], Any]
+
+
+def _parameters(max_new_tokens: Any, top_p: Any, temperature: Any) -> Dict[str, Any]:
+    """Build the generation parameters shared by all payloads.
+
+    Args:
+        max_new_tokens (Any): Maximum number of generated tokens.
+        top_p (Any): Nucleus sampling probability.
+        temperature (Any): Sampling temperature.
+
+    Returns:
+        Dict[str, Any]: The generation parameters.
+    """
+    return {
+        "max_new_tokens": int(max_new_tokens),
+        "top_p": float(top_p),
+        "temperature": float(temperature),
+    }
+
+
+def build_predict_payload(
+    inputs: str,
+    max_new_tokens: Any = DEFAULT_MAX_NEW_TOKENS,
+    top_p: Any = DEFAULT_TOP_P,
+    temperature: Any = DEFAULT_TEMPERATURE,
+) -> Dict[str, Any]:
+    """Build the payload for text generation models.
+
+    Args:
+        inputs (str): The text to complete.
+        max_new_tokens (Any): Maximum number of generated tokens.
+        top_p (Any): Nucleus sampling probability.
+        temperature (Any): Sampling temperature.
+
+    Returns:
+        Dict[str, Any]: The payload.
+    """
+    return {
+        "inputs": inputs,
+        "parameters": _parameters(max_new_tokens, top_p, temperature),
+    }
+
+
+def build_chat_payload(
+    conversation_history: List[Dict[str, str]],
+    max_new_tokens: Any = DEFAULT_MAX_NEW_TOKENS,
+    top_p: Any = DEFAULT_TOP_P,
+    temperature: Any = DEFAULT_TEMPERATURE,
+) -> Dict[str, Any]:
+    """Build the payload for chat models.
+
+    Args:
+        conversation_history (List[Dict[str, str]]): The messages of the
+            conversation, each with a "role" and "content".
+        max_new_tokens (Any): Maximum number of generated tokens.
+        top_p (Any): Nucleus sampling probability.
+        temperature (Any): Sampling temperature.
+
+    Returns:
+        Dict[str, Any]: The payload.
+    """
+    return {
+        "inputs": [conversation_history],
+        "parameters": _parameters(max_new_tokens, top_p, temperature),
+    }
+
+
+def parse_predict_response(response_json: Any) -> str:
+    """Extract the generation of a text generation model.
+
+    Args:
+        response_json (Any): The decoded response of the endpoint.
+
+    Returns:
+        str: The generated text.
+    """
+    content: str = response_json[0]["generation"]
+    return content
+
+
+def parse_chat_response(response_json: Any) -> str:
+    """Extract the generation of a chat model.
+
+    Args:
+        response_json (Any): The decoded response of the endpoint.
+
+    Returns:
+        str: The content of the assistant's message.
+    """
+    content: str = response_json[0]["generation"]["content"]
+    return content
+
+
+def _component_kwargs(inference_component: Optional[str]) -> Dict[str, str]:
+    """Build the arguments addressing an inference component, if any.
+
+    Args:
+        inference_component (Optional[str]): The name of the component.
+
+    Returns:
+        Dict[str, str]: The arguments to invoke the endpoint with.
+    """
+    if not inference_component:
+        return {}
+    return {"InferenceComponentName": inference_component}
+
+
+def invoke_endpoint(
+    endpoint_name: str,
+    payload: Dict[str, Any],
+    runtime_client: Optional[Any] = None,
+    inference_component: Optional[str] = None,
+) -> Any:
+    """Invoke an endpoint and decode its JSON response.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+        payload (Dict[str, Any]): The payload to send.
+        runtime_client (Optional[Any]): The SageMaker Runtime client to use.
+            Defaults to the cached client.
+        inference_component (Optional[str]): The inference component of a
+            shared endpoint to invoke.
+
+    Returns:
+        Any: The decoded response.
+    """
+    client = runtime_client or get_client("sagemaker-runtime")
+    response = client.invoke_endpoint(
+        EndpointName=endpoint_name,
+        ContentType="application/json",
+        Accept="application/json",
+        CustomAttributes=CUSTOM_ATTRIBUTES,
+        Body=json.dumps(payload),
+        **_component_kwargs(inference_component),
+    )
+    return json.loads(response["Body"].read().decode("utf-8"))
+
+
+def endpoint_invoker(
+    endpoint_name: str, inference_component: Optional[str] = None
+) -> Invoker:
+    """Return an `Invoker` sending payloads to a single endpoint.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+        inference_component (Optional[str]): The inference component of a
+            shared endpoint to invoke.
+
+    Returns:
+        Invoker: The invoker.
+    """
+    return functools.partial(
+        invoke_endpoint, endpoint_name, inference_component=inference_component
+    )
+
+
+def gateway_invoker(
+    url: str,
+    timeout: float = 60.0,
+    compress: bool = True,
+    api_key: Optional[str] = None,
+    cache: bool = True,
+) -> Invoker:
+    """Return an `Invoker` sending payloads to the API Gateway of an endpoint.
+
+    Chat payloads resend the whole conversation on every turn, so with
+    `compress`, payloads of at least `GATEWAY_MIN_COMPRESSION_SIZE` bytes
+    are sent gzip-compressed, and compressed responses are accepted.
+
+    Every request carries the hash of its payload, the cache key of APIs
+    with a stage cache. Without `cache`, a random hash is sent instead, so
+    that requests are never answered from the cache, e.g. to measure the
+    latency of the endpoint.
+
+    Args:
+        url (str): The URL of the API, as returned by `create_api_gateway`.
+        timeout (float): Seconds to wait for a response.
+        compress (bool): Whether to compress requests and accept
+            compressed responses.
+        api_key (Optional[str]): The API key of the usage plan of the API.
+        cache (bool): Whether responses may come from the stage cache.
+
+    Returns:
+        Invoker: The invoker. Errors are raised as `urllib.error.HTTPError`.
+    """
+
+    def invoke(payload: Dict[str, Any]) -> Any:
+        data = json.dumps(payload).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "custom_attributes": CUSTOM_ATTRIBUTES,
+            BODY_HASH_HEADER: body_hash(data) if cache else uuid.uuid4().hex,
+        }
+        if api_key:
+            headers["x-api-key"] = api_key
+        if compress:
+            headers["Accept-Encoding"] = "gzip"
+            if len(data) >= GATEWAY_MIN_COMPRESSION_SIZE:
+                data = gzip.compress(data, compresslevel=GZIP_LEVEL)
+                headers["Content-Encoding"] = "gzip"
+
+        request = urllib.request.Request(url, data=data, headers=headers, method="POST")
+        GATEWAY_BYTES.inc(len(data), direction="sent")
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            encoding = response.headers.get("Content-Encoding")
+        GATEWAY_BYTES.inc(len(body), direction="received")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body.decode("utf-8"))
+
+    return invoke
+
+
+def invoke_endpoint_stream(
+    endpoint_name: str,
+    payload: Dict[str, Any],
+    runtime_client: Optional[Any] = None,
+    inference_component: Optional[str] = None,
+) -> Iterator[str]:
+    """Invoke an endpoint with response streaming and yield generated tokens.
+
+    The endpoint streams server-sent events of the form
+    `data:{"token": {"text": ...}}`, which may be split across or
+    combined within the parts of the response stream.
+
+    Args:
+        endpoint_name (str): The name of the endpoint.
+        payload (Dict[str, Any]): The payload to send.
+        runtime_client (Optional[Any]): The SageMaker Runtime client to use.
+            Defaults to the cached client.
+        inference_component (Optional[str]): The inference component of a
+            shared endpoint to invoke.
+
+    Yields:
+        str: The text of each generated token.
+    """
+    client = runtime_client or get_client("sagemaker-runtime")
+    response = client.invoke_endpoint_with_response_stream(
+        EndpointName=endpoint_name,
+        ContentType="application/json",
+        CustomAttributes=CUSTOM_ATTRIBUTES,
+        Body=json.dumps({**payload, "stream": True}),
+        **_component_kwargs(inference_component),
+    )
+
+    buffer = b""
+    for event in response["Body"]:
+        buffer += event.get("PayloadPart", {}).get("Bytes", b"")
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            token = _parse_stream_line(line)
+            if token:
+                yield token
+
+    token = _parse_stream_line(buffer)
+    if token:
+        yield token
+
+
+def _parse_stream_line(line: bytes) -> Optional[str]:
+    """Extract the token text of a single line of a response stream.
+
+    Args:
+        line (bytes): The line, optionally prefixed with "data:".
+
+    Returns:
+        Optional[str]: The token text, or None if the line has no token.
+    """
+    line = line.strip()
+    if line.startswith(b"data:"):
+        line = line[len(b"data:") :].strip()
+    if not line:
+        return None
+
+    event = json.loads(line)
+    token = event.get("token") or {}
+    if token.get("special"):
+        return None
+    text: Optional[str] = token.get("text")
+    return text
+
+
+def warm_up_connection(runtime_client: Optional[Any] = None) -> None:
+    """Set up a pooled connection to the SageMaker Runtime ahead of requests.
+
+    Invokes `WARM_UP_ENDPOINT_NAME`, which the SageMaker Runtime rejects
+    without reaching any model. The request still resolves credentials,
+    signs a request and opens the TLS connection kept in the pool of the
+    client, so the first invocation of a real endpoint skips that setup.
+    Errors are ignored.
+
+    Args:
+        runtime_client (Optional[Any]): The SageMaker Runtime client to warm
+            up. Defaults to the cached client.
+    """
+    client = runtime_client or get_client("sagemaker-runtime")
+    with contextlib.suppress(Exception):
+        client.invoke_endpoint(
+            EndpointName=WARM_UP_ENDPOINT_NAME,
+            ContentType="application/json",
+            Body=json.dumps(build_predict_payload("", max_new_tokens=1)),
+        )
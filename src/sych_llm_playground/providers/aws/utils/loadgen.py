@@ -0,0 +1,329 @@
+"""Utility module to generate open-loop load against deployed endpoints.
+
+A closed-loop test with a fixed number of workers only sends a request
+once the previous one has answered, so it slows down with the endpoint
+and hides queueing. An open-loop test sends requests on a schedule of
+arrivals, regardless of how many are still in flight: a constant rate, a
+Poisson process, a ramp of increasing rates, or the timestamps of a
+recorded trace. Latencies are measured from the scheduled time of each
+request, so waiting for a free sender is counted as well.
+
+Results are grouped into windows of time to form the curve of latency
+against offered load, whose knee is the load at which the endpoint
+saturates.
+
+Functions:
+    constant_schedule: Return evenly spaced arrival times.
+    poisson_schedule: Return the arrival times of a Poisson process.
+    step_schedule: Return arrival times of increasing constant rates.
+    read_trace: Read the arrivals of a recorded trace.
+    synthetic_payload: Build a payload with a prompt of a given length.
+    run_open_loop: Send payloads at their arrival times.
+    percentile: Return a percentile of values, by the nearest rank.
+    load_curve: Group results into latency and throughput by offered load.
+    saturation_knee: Find the first point of a load curve past saturation.
+"""
+
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .invocation import Invoker
+from .invocation import build_chat_payload
+from .invocation import build_predict_payload
+
+
+# Payload sent at an offset in seconds from the start of a run.
+Arrival = Tuple[float, Dict[str, Any]]
+
+# Ratio of the p99 latency of a point to the p99 of the lightest point
+# above which the endpoint is considered saturated.
+KNEE_LATENCY_FACTOR = 2.0
+
+
+def constant_schedule(rate: float, duration: float, start: float = 0.0) -> List[float]:
+    """Return evenly spaced arrival times.
+
+    Args:
+        rate (float): Arrivals per second.
+        duration (float): Seconds of the schedule.
+        start (float): Offset of the first arrival.
+
+    Returns:
+        List[float]: The arrival times.
+    """
+    return [start + index / rate for index in range(int(rate * duration))]
+
+
+def poisson_schedule(
+    rate: float,
+    duration: float,
+    start: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> List[float]:
+    """Return the arrival times of a Poisson process.
+
+    Args:
+        rate (float): Mean arrivals per second.
+        duration (float): Seconds of the schedule.
+        start (float): Offset of the schedule.
+        rng (Optional[random.Random]): The random number generator.
+
+    Returns:
+        List[float]: The arrival times, with exponential gaps.
+    """
+    rng = rng or random.Random()  # noqa: S311
+    arrivals = []
+    offset = rng.expovariate(rate)
+    while offset < duration:
+        arrivals.append(start + offset)
+        offset += rng.expovariate(rate)
+    return arrivals
+
+
+def step_schedule(
+    rate: float,
+    step_rate: float,
+    steps: int,
+    step_duration: float,
+    poisson: bool = False,
+    rng: Optional[random.Random] = None,
+) -> List[float]:
+    """Return the arrival times of a ramp of increasing rates.
+
+    Args:
+        rate (float): Arrivals per second of the first step.
+        step_rate (float): Arrivals per second added by every step.
+        steps (int): The number of steps.
+        step_duration (float): Seconds of every step.
+        poisson (bool): Whether arrivals within a step follow a Poisson
+            process rather than a constant rate.
+        rng (Optional[random.Random]): The random number generator.
+
+    Returns:
+        List[float]: The arrival times.
+    """
+    arrivals: List[float] = []
+    for step in range(steps):
+        step_start = step * step_duration
+        step_arrivals = rate + step * step_rate
+        arrivals.extend(
+            poisson_schedule(step_arrivals, step_duration, step_start, rng)
+            if poisson
+            else constant_schedule(step_arrivals, step_duration, step_start)
+        )
+    return arrivals
+
+
+def read_trace(trace_file: str) -> List[Dict[str, Any]]:
+    """Read the arrivals of a recorded trace.
+
+    The trace is a JSONL file with a "timestamp" in seconds and the
+    "prompt_words" of every request, and optionally its "max_new_tokens".
+
+    Args:
+        trace_file (str): The path of the file.
+
+    Returns:
+        List[Dict[str, Any]]: The records, sorted by time, with timestamps
+            made relative to the first one.
+
+    Raises:
+        ValueError: If a line is not valid JSON or lacks a field.
+    """
+    with open(trace_file) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    try:
+        records.sort(key=lambda record: float(record["timestamp"]))
+        first = float(records[0]["timestamp"]) if records else 0.0
+        return [
+            {
+                **record,
+                "timestamp": float(record["timestamp"]) - first,
+                "prompt_words": int(record["prompt_words"]),
+            }
+            for record in records
+        ]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid trace record, missing or invalid {e}") from e
+
+
+def synthetic_payload(
+    kind: str, prompt_words: int, max_new_tokens: int
+) -> Dict[str, Any]:
+    """Build a payload with a prompt of a given length.
+
+    Args:
+        kind (str): How the endpoint is interacted with, "predict" or "chat".
+        prompt_words (int): The number of words of the prompt.
+        max_new_tokens (int): Maximum number of generated tokens.
+
+    Returns:
+        Dict[str, Any]: The payload, in the format of the endpoint.
+    """
+    prompt = " ".join(["load"] * prompt_words)
+    if kind == "chat":
+        return build_chat_payload(
+            [{"role": "user", "content": prompt}], max_new_tokens=max_new_tokens
+        )
+    return build_predict_payload(prompt, max_new_tokens=max_new_tokens)
+
+
+def run_open_loop(
+    invoke: Invoker,
+    arrivals: List[Arrival],
+    max_in_flight: int = 256,
+    clock: Callable[[], float] = time.perf_counter,
+    sleep: Callable[[float], None] = time.sleep,
+) -> List[Dict[str, Any]]:
+    """Send payloads at their arrival times, regardless of pending ones.
+
+    Args:
+        invoke (Invoker): The invoker of the endpoint.
+        arrivals (List[Arrival]): The arrival times and payloads.
+        max_in_flight (int): Maximum number of requests in flight. Later
+            arrivals wait for a sender, and their wait counts as latency.
+        clock (Callable[[], float]): Clock in seconds.
+        sleep (Callable[[float], None]): Sleeps for a number of seconds.
+
+    Returns:
+        List[Dict[str, Any]]: One result per arrival, in order of arrival,
+            with its "scheduled" and "completed" offsets, its "latency"
+            from the scheduled time and its "error", if any.
+    """
+    arrivals = sorted(arrivals, key=_offset)
+    results: List[Dict[str, Any]] = [{} for _ in arrivals]
+    lock = threading.Lock()
+    start = clock()
+
+    def send(index: int, scheduled: float, payload: Dict[str, Any]) -> None:
+        error = None
+        try:
+            invoke(payload)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        completed = clock() - start
+        with lock:
+            results[index] = {
+                "scheduled": scheduled,
+                "completed": completed,
+                "latency": completed - scheduled,
+                "error": error,
+            }
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for index, (scheduled, payload) in enumerate(arrivals):
+            delay = scheduled - (clock() - start)
+            if delay > 0:
+                sleep(delay)
+            executor.submit(send, index, scheduled, payload)
+    return results
+
+
+def _offset(arrival: Arrival) -> float:
+    """Return the offset of an arrival, to sort arrivals by.
+
+    Args:
+        arrival (Arrival): The arrival.
+
+    Returns:
+        float: Its offset in seconds.
+    """
+    return arrival[0]
+
+
+def percentile(values: List[float], percentile: float) -> Optional[float]:
+    """Return a percentile of values, by the nearest rank.
+
+    Args:
+        values (List[float]): The values.
+        percentile (float): The percentile, between 0 and 100.
+
+    Returns:
+        Optional[float]: The percentile, or None without values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percentile / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def load_curve(results: List[Dict[str, Any]], window: float) -> List[Dict[str, Any]]:
+    """Group results into windows of latency and throughput by offered load.
+
+    Args:
+        results (List[Dict[str, Any]]): The results of `run_open_loop`.
+        window (float): Seconds of every window, e.g. of every step of a
+            ramp.
+
+    Returns:
+        List[Dict[str, Any]]: One point per window with requests, with the
+            "offered" and completed ("throughput") requests per second,
+            the "p50", "p90" and "p99" latencies of successful requests,
+            and the share of "errors".
+    """
+    windows: Dict[int, List[Dict[str, Any]]] = {}
+    completions: Dict[int, int] = {}
+    for result in results:
+        windows.setdefault(int(result["scheduled"] // window), []).append(result)
+        if result["error"] is None:
+            completed = int(result["completed"] // window)
+            completions[completed] = completions.get(completed, 0) + 1
+
+    curve = []
+    for index, window_results in sorted(windows.items()):
+        latencies = [
+            result["latency"] for result in window_results if result["error"] is None
+        ]
+        curve.append(
+            {
+                "start": index * window,
+                "requests": len(window_results),
+                "offered": len(window_results) / window,
+                "throughput": completions.get(index, 0) / window,
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p99": percentile(latencies, 99),
+                "errors": 1 - len(latencies) / len(window_results),
+            }
+        )
+    return curve
+
+
+def saturation_knee(
+    curve: List[Dict[str, Any]], latency_factor: float = KNEE_LATENCY_FACTOR
+) -> Optional[Dict[str, Any]]:
+    """Find the lightest point of a load curve past saturation.
+
+    A point is saturated when requests fail, or when its p99 latency
+    exceeds `latency_factor` times the p99 of the lightest point. As
+    latencies are measured from the scheduled times, requests queueing up
+    behind a saturated endpoint show as growing latencies.
+
+    Args:
+        curve (List[Dict[str, Any]]): The load curve.
+        latency_factor (float): Ratio of p99 latencies of saturation.
+
+    Returns:
+        Optional[Dict[str, Any]]: The saturated point with the lowest
+            offered load, or None if the endpoint never saturated.
+    """
+    points = sorted(curve, key=lambda point: point["offered"])
+    baseline = next((point["p99"] for point in points if point["p99"]), None)
+    for point in points:
+        if (
+            point["errors"] > 0
+            or point["p99"] is None
+            or (baseline and point["p99"] > latency_factor * baseline)
+        ):
+            return point
+    return None
@@ -0,0 +1,231 @@
+"""Utility module for working with endpoints in several AWS regions.
+
+A model deployed to several regions can be served from the region closest
+to the user. Commands fan out to the regions concurrently, and a
+`RegionSelector` picks the region with the lowest round-trip time, probed
+against the regional SageMaker Runtime front end so that no model is
+invoked. Round-trip times change as networks do, so the regions are
+re-probed in the background every `REPROBE_INTERVAL` seconds.
+
+Example:
+    selector = RegionSelector(["us-east-1", "eu-west-1"])
+    region = selector.choose()
+
+Functions:
+    parse_regions: Parse a comma-separated list of regions.
+    fan_out: Call a function for every region concurrently.
+    probe_region: Measure the round-trip time to a region.
+    regional_invoker: Return an invoker sending payloads to the fastest region.
+"""
+
+import contextvars
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .invocation import Invoker
+
+
+# Seconds after which the regions are probed again.
+REPROBE_INTERVAL = 300.0
+
+# Round trips per probe, of which the fastest is kept.
+PROBE_SAMPLES = 3
+
+
+def parse_regions(value: Optional[str]) -> List[str]:
+    """Parse a comma-separated list of regions.
+
+    Args:
+        value (Optional[str]): The regions, e.g. "us-east-1,eu-west-1".
+
+    Returns:
+        List[str]: The distinct regions, in order.
+    """
+    regions: List[str] = []
+    for region in (value or "").split(","):
+        region = region.strip()
+        if region and region not in regions:
+            regions.append(region)
+    return regions
+
+
+def fan_out(
+    regions: List[str], function: Callable[[str], Any]
+) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """Call a function for every region concurrently.
+
+    Every call runs in a copy of the caller's context, so spans it opens
+    nest under the caller's span.
+
+    Args:
+        regions (List[str]): The regions.
+        function (Callable[[str], Any]): Called with every region.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Exception]]: The results of the
+            regions where the function returned, and the errors of those
+            where it raised.
+    """
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+    if not regions:
+        return results, errors
+    with ThreadPoolExecutor(max_workers=len(regions)) as executor:
+        futures = {
+            region: executor.submit(contextvars.copy_context().run, function, region)
+            for region in regions
+        }
+    for region, future in futures.items():
+        error = future.exception()
+        if error is None:
+            results[region] = future.result()
+        elif isinstance(error, Exception):
+            errors[region] = error
+    return results, errors
+
+
+def probe_region(
+    region: str, samples: int = PROBE_SAMPLES, timeout: float = 5.0
+) -> float:
+    """Measure the round-trip time to the SageMaker Runtime of a region.
+
+    An unauthenticated request is answered with an error by the front
+    end of the region without reaching any endpoint. Every round trip
+    includes setting up the connection, which grows with the distance to
+    the region like the requests do.
+
+    Args:
+        region (str): The region.
+        samples (int): The number of round trips.
+        timeout (float): Seconds to wait for a response.
+
+    Returns:
+        float: The fastest round trip in seconds, or infinity if the region
+            could not be reached.
+    """
+    url = f"https://runtime.sagemaker.{region}.amazonaws.com/ping"
+    fastest = math.inf
+    for _ in range(samples):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:  # noqa: S310
+                response.read()
+        except urllib.error.HTTPError as e:
+            e.close()
+        except OSError:
+            continue
+        fastest = min(fastest, time.perf_counter() - start)
+    return fastest
+
+
+class RegionSelector:
+    """Choose the region with the lowest round-trip time."""
+
+    def __init__(
+        self,
+        regions: List[str],
+        probe: Callable[[str], float] = probe_region,
+        reprobe_interval: float = REPROBE_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a selector that has not probed the regions yet.
+
+        Args:
+            regions (List[str]): The regions to choose from.
+            probe (Callable[[str], float]): Measures the round-trip time to
+                a region in seconds, infinity if it is unreachable.
+            reprobe_interval (float): Seconds after which the regions are
+                probed again, in the background.
+            clock (Callable[[], float]): Clock in seconds.
+        """
+        self.regions = regions
+        self.probe = probe
+        self.reprobe_interval = reprobe_interval
+        self.clock = clock
+        self.latencies: Dict[str, float] = {}
+        self._probed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._reprobing: Optional[threading.Thread] = None
+
+    def probe_all(self) -> Dict[str, float]:
+        """Probe all regions concurrently.
+
+        Returns:
+            Dict[str, float]: The round-trip time to every region.
+        """
+        results, _ = fan_out(self.regions, self.probe)
+        latencies = {region: results.get(region, math.inf) for region in self.regions}
+        with self._lock:
+            self.latencies = latencies
+            self._probed_at = self.clock()
+        return latencies
+
+    def choose(self) -> str:
+        """Choose the fastest region, probing the regions when due.
+
+        The regions are probed before the first choice. Later probes run in
+        the background, and the previous choice stands until they are done.
+
+        Returns:
+            str: The region with the lowest round-trip time.
+        """
+        if self._probed_at is None:
+            self.probe_all()
+        elif self.clock() - self._probed_at >= self.reprobe_interval:
+            self._reprobe()
+        with self._lock:
+            return min(
+                self.regions, key=lambda region: self.latencies.get(region, math.inf)
+            )
+
+    def _reprobe(self) -> None:
+        """Probe the regions again in the background, unless already probing."""
+        with self._lock:
+            if self._reprobing is not None and self._reprobing.is_alive():
+                return
+            self._reprobing = threading.Thread(target=self.probe_all, daemon=True)
+            self._reprobing.start()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return the last round-trip time to every region.
+
+        Returns:
+            List[Dict[str, Any]]: The "region" and its "rtt" in
+                milliseconds, None if unreachable, from fastest to slowest.
+        """
+        with self._lock:
+            latencies = dict(self.latencies)
+        return [
+            {
+                "region": region,
+                "rtt": round(latency * 1000, 1) if math.isfinite(latency) else None,
+            }
+            for region, latency in sorted(latencies.items(), key=lambda item: item[1])
+        ]
+
+
+def regional_invoker(selector: RegionSelector, invokers: Dict[str, Invoker]) -> Invoker:
+    """Return an invoker sending every payload to the fastest region.
+
+    Args:
+        selector (RegionSelector): Chooses the region of every request.
+        invokers (Dict[str, Invoker]): The invoker of every region.
+
+    Returns:
+        Invoker: The invoker.
+    """
+
+    def invoke(payload: Dict[str, Any]) -> Any:
+        return invokers[selector.choose()](payload)
+
+    return invoke
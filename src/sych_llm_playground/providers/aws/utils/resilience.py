@@ -0,0 +1,485 @@
+"""Utility module for resilient invocation traffic.
+
+This module keeps transient failures such as throttling, model overload
+and dropped connections from failing a whole run. It contains:
+
+    - `classify_error`: Classifies errors as throttled, retryable or fatal.
+    - `is_endpoint_failure`: Whether an error counts against an endpoint.
+    - `AIMDLimiter`: Adaptive concurrency limit with additive increase and
+      multiplicative decrease, backing off on throttling and latency spikes.
+    - `TokenBucket`: Rate limiting of requests.
+    - `CircuitBreaker`: Stops sending requests to an endpoint that keeps
+      failing until a trial request succeeds.
+    - `ResilientInvoker`: Invokes endpoints through all of the above,
+      retrying retryable errors with exponential backoff.
+
+Example:
+    resilience = ResilientInvoker(rate_limit=10)
+    invoker = resilience.endpoint_invoker(endpoint_name)
+    response_json = invoker(payload)
+"""
+
+import functools
+import random
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionError
+from botocore.exceptions import HTTPClientError
+
+from ....utils.metrics import counter
+from .invocation import Invoker
+from .invocation import invoke_endpoint
+
+
+THROTTLED = "throttled"
+RETRYABLE = "retryable"
+FATAL = "fatal"
+
+THROTTLING_ERROR_CODES = [
+    "ThrottlingException",
+    "Throttling",
+    "TooManyRequestsException",
+    "ServiceUnavailable",
+]
+RETRYABLE_ERROR_CODES = [
+    "InternalFailure",
+    "InternalServerError",
+    "ModelNotReadyException",
+    "RequestTimeout",
+]
+# Raised when the model container fails a request, e.g. after it crashed or
+# ran out of memory.
+MODEL_ERROR_CODE = "ModelError"
+THROTTLING_STATUS_CODES = [429, 503]
+RETRYABLE_STATUS_CODES = [500, 502, 504]
+
+INVOCATION_RETRIES = counter(
+    "sych_llm_pg_invocation_retries_total",
+    "Invocations retried after throttling or retryable errors.",
+    ["error_class"],
+)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Return the HTTP status code behind an error, if there is one.
+
+    For errors raised by the model container (`ModelError`), this is the
+    status code returned by the model rather than by SageMaker.
+
+    Args:
+        error (Exception): The error.
+
+    Returns:
+        Optional[int]: The status code.
+    """
+    if isinstance(error, ClientError):
+        response = error.response
+        status = response.get("OriginalStatusCode") or response.get(
+            "ResponseMetadata", {}
+        ).get("HTTPStatusCode")
+        return int(status) if status else None
+    status = getattr(error, "code", None)  # e.g. urllib.error.HTTPError
+    return status if isinstance(status, int) else None
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    """Return the error code of an AWS error, if there is one.
+
+    Args:
+        error (Exception): The error.
+
+    Returns:
+        Optional[str]: The error code.
+    """
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code")
+        return str(code) if code else None
+    return None
+
+
+def classify_error(error: Exception) -> str:
+    """Classify an invocation error.
+
+    Args:
+        error (Exception): The error.
+
+    Returns:
+        str: `THROTTLED` for throttling and overload, which call for
+            sending less traffic, `RETRYABLE` for other transient errors
+            and `FATAL` for errors that retrying will not fix.
+    """
+    if isinstance(error, (ConnectionError, HTTPClientError, TimeoutError)):
+        return RETRYABLE
+
+    code = _error_code(error)
+    status = _status_code(error)
+    if code in THROTTLING_ERROR_CODES or status in THROTTLING_STATUS_CODES:
+        return THROTTLED
+    if code in RETRYABLE_ERROR_CODES or status in RETRYABLE_STATUS_CODES:
+        return RETRYABLE
+    return FATAL
+
+
+def is_endpoint_failure(error: Exception) -> bool:
+    """Return whether an invocation error counts against an endpoint's health.
+
+    Args:
+        error (Exception): The error.
+
+    Returns:
+        bool: True for throttling, transient errors and failures of the
+            model container. Other fatal errors are answers of a healthy
+            endpoint to a bad request.
+    """
+    return classify_error(error) != FATAL or _error_code(error) == MODEL_ERROR_CODE
+
+
+class AIMDLimiter:
+    """Adaptive concurrency limit with additive increase, multiplicative decrease.
+
+    The limit grows by about one for every limit's worth of healthy
+    requests, and is multiplied by `backoff` when a request is throttled or
+    its latency exceeds `latency_tolerance` times the baseline latency.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        baseline_alpha: float = 0.05,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            initial (int): The initial concurrency limit.
+            minimum (int): The lowest concurrency limit.
+            maximum (int): The highest concurrency limit.
+            backoff (float): Factor applied to the limit when backing off.
+            latency_tolerance (float): Multiple of the baseline latency
+                above which a latency counts as a spike.
+            baseline_alpha (float): Weight of the latest latency in the
+                slowly moving baseline latency.
+        """
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.baseline_alpha = baseline_alpha
+        self.baseline: Optional[float] = None
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent within the concurrency limit."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    def release(self, latency: Optional[float], throttled: bool = False) -> None:
+        """Record the outcome of a request and adapt the limit.
+
+        Args:
+            latency (Optional[float]): The latency of the request in seconds,
+                or None if it failed.
+            throttled (bool): Whether the request was throttled.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self._decrease()
+            elif latency is not None:
+                if self.baseline is None:
+                    self.baseline = latency
+                if latency > self.baseline * self.latency_tolerance:
+                    self._decrease()
+                else:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.baseline += self.baseline_alpha * (latency - self.baseline)
+            self._condition.notify_all()
+
+    def _decrease(self) -> None:
+        """Back off the limit, holding the condition's lock."""
+        self.limit = max(float(self.minimum), self.limit * self.backoff)
+
+
+class TokenBucket:
+    """Token bucket limiting the rate of requests."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (Optional[int]): Capacity of the bucket. Defaults to
+                one second's worth of tokens.
+        """
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting for one to be added if the bucket is empty."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because an endpoint's circuit is open."""
+
+
+class CircuitBreaker:
+    """Circuit breaker of a single endpoint.
+
+    The circuit opens after `failure_threshold` consecutive failures and
+    refuses requests for `reset_timeout` seconds. Afterwards it lets a
+    single trial request through, closing again if the trial succeeds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a closed circuit.
+
+        Args:
+            failure_threshold (int): Consecutive failures opening the circuit.
+            reset_timeout (float): Seconds before a trial request is let through.
+            clock (Callable[[], float]): Monotonic clock in seconds.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent.
+
+        Returns:
+            bool: True if the circuit is closed, or if it is open, has timed
+                out and this is the trial request.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (
+                self.state == self.OPEN
+                and self._clock() - self.opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if needed."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+
+
+class ResilientInvoker:
+    """Invoke endpoints with adaptive concurrency, rate limiting and retries."""
+
+    def __init__(
+        self,
+        runtime_client: Optional[Any] = None,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        rate_limit: Optional[float] = None,
+        limiter: Optional[AIMDLimiter] = None,
+        invoke: Callable[..., Any] = invoke_endpoint,
+    ) -> None:
+        """Initialize the invoker.
+
+        Args:
+            runtime_client (Optional[Any]): The SageMaker Runtime client to use.
+                Defaults to the cached client.
+            max_retries (int): Retries of a request after retryable errors.
+            base_delay (float): Seconds before the first retry, doubled for
+                every further retry.
+            max_delay (float): Maximum seconds between retries.
+            rate_limit (Optional[float]): Maximum requests per second.
+                No rate limit if None.
+            limiter (Optional[AIMDLimiter]): The concurrency limiter.
+                Defaults to an `AIMDLimiter` with default settings.
+            invoke (Callable[..., Any]): Function invoking an endpoint with
+                a payload, a runtime client and an optional inference component.
+        """
+        self.runtime_client = runtime_client
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.limiter = limiter or AIMDLimiter()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+        self._invoke = invoke
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint_name: str) -> CircuitBreaker:
+        """Return the circuit breaker of an endpoint.
+
+        Args:
+            endpoint_name (str): The name of the endpoint.
+
+        Returns:
+            CircuitBreaker: The circuit breaker.
+        """
+        with self._lock:
+            return self.breakers.setdefault(endpoint_name, CircuitBreaker())
+
+    def _attempt(
+        self,
+        endpoint_name: str,
+        payload: Dict[str, Any],
+        inference_component: Optional[str],
+    ) -> Any:
+        """Send a single request within the rate and concurrency limits.
+
+        Args:
+            endpoint_name (str): The name of the endpoint.
+            payload (Dict[str, Any]): The payload to send.
+            inference_component (Optional[str]): The inference component
+                of a shared endpoint to invoke.
+
+        Returns:
+            Any: The decoded response.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open.
+        """
+        target = (
+            f"{endpoint_name}/{inference_component}"
+            if inference_component
+            else endpoint_name
+        )
+        breaker = self.breaker(target)
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit open for endpoint {target!r} after repeated failures"
+            )
+
+        if self.bucket:
+            self.bucket.acquire()
+        self.limiter.acquire()
+        start = time.monotonic()
+        latency: Optional[float] = None
+        throttled = False
+        try:
+            result = self._invoke(
+                endpoint_name,
+                payload,
+                self.runtime_client,
+                inference_component=inference_component,
+            )
+            latency = time.monotonic() - start
+        except Exception as e:
+            throttled = classify_error(e) == THROTTLED
+            # A fatal error is an answer from a healthy endpoint to a bad
+            # request, so it closes the circuit like a success does.
+            if is_endpoint_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except BaseException:
+            # Interrupted trials reopen the circuit instead of holding the
+            # trial slot forever.
+            breaker.record_failure()
+            raise
+        finally:
+            self.limiter.release(latency, throttled=throttled)
+        breaker.record_success()
+        return result
+
+    def invoke_endpoint(
+        self,
+        endpoint_name: str,
+        payload: Dict[str, Any],
+        inference_component: Optional[str] = None,
+    ) -> Any:
+        """Invoke an endpoint, retrying retryable errors with backoff.
+
+        Args:
+            endpoint_name (str): The name of the endpoint.
+            payload (Dict[str, Any]): The payload to send.
+            inference_component (Optional[str]): The inference component
+                of a shared endpoint to invoke.
+
+        Returns:
+            Any: The decoded response.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(endpoint_name, payload, inference_component)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                error_class = classify_error(e)
+                if error_class == FATAL or attempt >= self.max_retries:
+                    raise
+            delay = min(self.max_delay, self.base_delay * 2**attempt)
+            time.sleep(random.uniform(0, delay))  # noqa: S311
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            INVOCATION_RETRIES.inc(error_class=error_class)
+
+    def endpoint_invoker(
+        self, endpoint_name: str, inference_component: Optional[str] = None
+    ) -> Invoker:
+        """Return an `Invoker` sending payloads to a single endpoint.
+
+        Args:
+            endpoint_name (str): The name of the endpoint.
+            inference_component (Optional[str]): The inference component
+                of a shared endpoint to invoke.
+
+        Returns:
+            Invoker: The invoker.
+        """
+        return functools.partial(
+            self.invoke_endpoint,
+            endpoint_name,
+            inference_component=inference_component,
+        )
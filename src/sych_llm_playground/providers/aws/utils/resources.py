@@ -1,19 +1,55 @@
 """Utility module for fetching specific AWS resources.
 
 This module contains functions to get deployed cloud resources
-such as models and endpoints, and api gateways.
+such as models and endpoints, and api gateways, both REST APIs and
+HTTP APIs.
+
+Fetched resources are cached for `RESOURCE_CACHE_TTL` seconds so that
+successive commands in the same process do not list them again. Commands
+that create or delete resources call `invalidate_resources`. Resources of
+several regions are listed concurrently by `get_resources_in_regions`.
 """
 
 import os
+import re
+import time
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import click
 import inquirer
 
 from ....utils.loader import start_loader
 from ....utils.loader import stop_loader
+from ....utils.metrics import counter
+from ....utils.metrics import histogram
+from .clients import get_client
+from .http_api import PROXY_FUNCTION_TAG
+from .http_api import invoke_url
+from .regions import fan_out
+
+
+# Seconds for which fetched resources are reused.
+RESOURCE_CACHE_TTL = 60.0
+
+# Client service of the resource types not listed with SageMaker.
+RESOURCE_SERVICES = {"API Gateway": "apigateway", "HTTP API": "apigatewayv2"}
+
+RESOURCE_LISTINGS = counter(
+    "sych_llm_pg_resource_listings_total",
+    "Calls to get_resources, by resource type and cache outcome.",
+    ["resource_type", "cache"],
+)
+RESOURCE_LISTING_SECONDS = histogram(
+    "sych_llm_pg_resource_listing_seconds",
+    "Seconds spent listing resources from AWS.",
+    ["resource_type"],
+)
+
+_resource_cache: Dict[Tuple[str, str], Tuple[float, List[Dict[str, str]]]] = {}
 
 
 def choose_resource(resource_type: str, client: Any, purpose: str) -> Dict[str, Any]:
@@ -54,6 +90,20 @@ def choose_resource(resource_type: str, client: Any, purpose: str) -> Dict[str,
     return selected_resource
 
 
+def model_id_from_endpoint(endpoint_name: str) -> Optional[str]:
+    """Extract the model ID from the name of an endpoint.
+
+    Args:
+        endpoint_name (str): The name of the endpoint, in the format
+            `sych-llm-pg-{model_id}-e-{timestamp}`.
+
+    Returns:
+        Optional[str]: The model ID, or None if the name does not match.
+    """
+    match = re.match(r"^sych-llm-pg-(.*?)-e-", endpoint_name)
+    return match.group(1) if match else None
+
+
 def get_resources(
     resource_type: str, client: Any, max_results: int = 99
 ) -> List[Dict[str, str]]:
@@ -67,7 +117,8 @@ def get_resources(
 
     Args:
         resource_type (str): Type of resource, either "Model",
-            "Endpoint", or "API Gateway".
+            "Endpoint", "Inference Component", "API Gateway" or
+            "HTTP API".
         client (Any): Client to use for fetching resources.
         max_results (int): Max number of results, default 99.
 
@@ -78,48 +129,23 @@ def get_resources(
     Raises:
         ValueError: If the provided resource_type is invalid.
     """
+    region = os.environ["AWS_DEFAULT_REGION"]
+    cached = _cached_resources(resource_type, region)
+    if cached is not None:
+        RESOURCE_LISTINGS.inc(resource_type=resource_type, cache="hit")
+        return cached
+    RESOURCE_LISTINGS.inc(resource_type=resource_type, cache="miss")
+
     try:
         loader_thread = start_loader(
             message=f"Fetching deployed {resource_type}s...", color="green"
         )
-        region = os.environ["AWS_DEFAULT_REGION"]
-        resources = []
-
-        if resource_type == "Model":
-            response = client.list_models(MaxResults=max_results)
-            resources = [{"name": item["ModelName"]} for item in response["Models"]]
-
-        elif resource_type == "Endpoint":
-            response = client.list_endpoints(MaxResults=max_results)
-            for item in response["Endpoints"]:
-                url = (
-                    f"https://runtime.sagemaker.{region}"
-                    f".amazonaws.com/endpoints/"
-                    f"{item['EndpointName']}/invocations"
-                )
-                resources.append({"name": item["EndpointName"], "url": url})
-
-        elif resource_type == "API Gateway":
-            response = client.get_rest_apis()
-            for item in response["items"]:
-                url = (
-                    f"https://{item['id']}.execute-api."
-                    f"{region}.amazonaws.com/prod/predict"
-                )
-                resources.append(
-                    {
-                        "name": item["name"],
-                        "id": item["id"],
-                        "method": "POST",
-                        "url": url,
-                    }
-                )
-
-        else:
-            raise ValueError("Invalid resource type")
-
+        with RESOURCE_LISTING_SECONDS.time(resource_type=resource_type):
+            resources = _list_resources(resource_type, client, region, max_results)
         stop_loader(loader_thread)
 
+        _resource_cache[(resource_type, region)] = (time.monotonic(), resources)
+
         if not resources:
             click.secho(f"No {resource_type}s deployed so far.\n", fg="red")
 
@@ -129,3 +155,166 @@ def get_resources(
         stop_loader(loader_thread)
         click.secho(f"Error fetching {resource_type}s: {e}", fg="red")
         exit(1)
+
+
+def get_resources_in_regions(
+    resource_type: str, regions: List[str], max_results: int = 99
+) -> List[Dict[str, str]]:
+    """Fetch deployed AWS resources of a type in several regions concurrently.
+
+    Regions whose resources cannot be listed are reported and skipped.
+
+    Args:
+        resource_type (str): Type of resource, as for `get_resources`.
+        regions (List[str]): The regions.
+        max_results (int): Max number of results per region, default 99.
+
+    Returns:
+        List[Dict[str, str]]: The resources of all regions, in the order of
+            the regions, each with its "region".
+    """
+
+    def list_region(region: str) -> List[Dict[str, str]]:
+        cached = _resource_cache.get((resource_type, region))
+        if cached and time.monotonic() - cached[0] < RESOURCE_CACHE_TTL:
+            RESOURCE_LISTINGS.inc(resource_type=resource_type, cache="hit")
+            return cached[1]
+        RESOURCE_LISTINGS.inc(resource_type=resource_type, cache="miss")
+        client = get_client(RESOURCE_SERVICES.get(resource_type, "sagemaker"), region)
+        with RESOURCE_LISTING_SECONDS.time(resource_type=resource_type):
+            resources = _list_resources(resource_type, client, region, max_results)
+        _resource_cache[(resource_type, region)] = (time.monotonic(), resources)
+        return resources
+
+    loader_thread = start_loader(
+        message=f"Fetching deployed {resource_type}s in {len(regions)} regions...",
+        color="green",
+    )
+    results, errors = fan_out(regions, list_region)
+    stop_loader(loader_thread)
+
+    for region, error in errors.items():
+        click.secho(f"Error fetching {resource_type}s in {region}: {error}", fg="red")
+    resources = [
+        {**resource, "region": region}
+        for region in regions
+        for resource in results.get(region, [])
+    ]
+    if not resources:
+        click.secho(f"No {resource_type}s deployed so far.\n", fg="red")
+    return resources
+
+
+def _list_resources(
+    resource_type: str, client: Any, region: str, max_results: int
+) -> List[Dict[str, str]]:
+    """List deployed AWS resources of a type.
+
+    Args:
+        resource_type (str): Type of resource.
+        client (Any): Client to use for fetching resources.
+        region (str): Region of the resources.
+        max_results (int): Max number of results.
+
+    Returns:
+        List[Dict[str, str]]: The resources.
+
+    Raises:
+        ValueError: If the provided resource_type is invalid.
+    """
+    resources = []
+
+    if resource_type == "Model":
+        response = client.list_models(MaxResults=max_results)
+        resources = [{"name": item["ModelName"]} for item in response["Models"]]
+
+    elif resource_type == "Endpoint":
+        response = client.list_endpoints(MaxResults=max_results)
+        for item in response["Endpoints"]:
+            url = (
+                f"https://runtime.sagemaker.{region}"
+                f".amazonaws.com/endpoints/"
+                f"{item['EndpointName']}/invocations"
+            )
+            resources.append({"name": item["EndpointName"], "url": url})
+
+    elif resource_type == "API Gateway":
+        response = client.get_rest_apis()
+        for item in response["items"]:
+            url = (
+                f"https://{item['id']}.execute-api."
+                f"{region}.amazonaws.com/prod/predict"
+            )
+            resources.append(
+                {
+                    "name": item["name"],
+                    "id": item["id"],
+                    "method": "POST",
+                    "url": url,
+                }
+            )
+
+    elif resource_type == "HTTP API":
+        response = client.get_apis(MaxResults=str(max_results))
+        resources = [
+            {
+                "name": item["Name"],
+                "id": item["ApiId"],
+                "method": "POST",
+                "url": invoke_url(item["ApiEndpoint"]),
+                "function": item.get("Tags", {}).get(PROXY_FUNCTION_TAG, ""),
+            }
+            for item in response["Items"]
+            if item["ProtocolType"] == "HTTP"
+        ]
+
+    elif resource_type == "Inference Component":
+        response = client.list_inference_components(MaxResults=max_results)
+        resources = [
+            {
+                "name": item["InferenceComponentName"],
+                "endpoint": item["EndpointName"],
+                "status": item["InferenceComponentStatus"],
+            }
+            for item in response["InferenceComponents"]
+        ]
+
+    else:
+        raise ValueError("Invalid resource type")
+
+    return resources
+
+
+def _cached_resources(
+    resource_type: str, region: str
+) -> Optional[List[Dict[str, str]]]:
+    """Return cached resources if they have not expired.
+
+    Args:
+        resource_type (str): Type of resource.
+        region (str): Region of the resources.
+
+    Returns:
+        Optional[List[Dict[str, str]]]: The cached resources, or None if
+            there are none or they have expired.
+    """
+    cached = _resource_cache.get((resource_type, region))
+    if not cached or time.monotonic() - cached[0] >= RESOURCE_CACHE_TTL:
+        return None
+
+    resources = cached[1]
+    if not resources:
+        click.secho(f"No {resource_type}s deployed so far.\n", fg="red")
+    return resources
+
+
+def invalidate_resources(resource_type: Optional[str] = None) -> None:
+    """Drop cached resources so the next fetch lists them again.
+
+    Args:
+        resource_type (Optional[str]): The type of resource to invalidate.
+            Invalidates all types if not provided.
+    """
+    for key in [*_resource_cache]:
+        if resource_type is None or key[0] == resource_type:
+            del _resource_cache[key]
@@ -0,0 +1,257 @@
+"""Utility module for spreading invocations across endpoints of the same model.
+
+Endpoints deployed from the same model ID are interchangeable, so requests
+can be balanced across them. An `EndpointRouter` picks an endpoint for each
+request with one of the `ROUTING_POLICIES`, tracks the number of
+outstanding requests and an exponentially weighted moving average (EWMA)
+of the latency of every endpoint, and temporarily ejects endpoints that
+keep failing.
+
+Example:
+    groups = group_by_model(endpoint_names)
+    router = EndpointRouter(groups[model_id], policy="p2c")
+    response_json = router.invoke(payload)
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .invocation import invoke_endpoint
+from .resilience import is_endpoint_failure
+from .resources import model_id_from_endpoint
+
+
+LEAST_OUTSTANDING = "least-outstanding"
+POWER_OF_TWO_CHOICES = "p2c"
+ROUTING_POLICIES = [LEAST_OUTSTANDING, POWER_OF_TWO_CHOICES]
+
+
+def group_by_model(endpoint_names: Iterable[str]) -> Dict[str, List[str]]:
+    """Group endpoints by the model ID encoded in their names.
+
+    Args:
+        endpoint_names (Iterable[str]): The names of the endpoints.
+
+    Returns:
+        Dict[str, List[str]]: The endpoints of every model ID. Endpoints
+            whose names do not encode a model ID are left out.
+    """
+    groups: Dict[str, List[str]] = {}
+    for endpoint_name in endpoint_names:
+        model_id = model_id_from_endpoint(endpoint_name)
+        if model_id:
+            groups.setdefault(model_id, []).append(endpoint_name)
+    return groups
+
+
+class EndpointStats:
+    """Routing statistics of a single endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics of an endpoint without requests."""
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ewma_latency: Optional[float] = None
+        self.ejected_until = 0.0
+
+
+class EndpointRouter:
+    """Route invocations across interchangeable endpoints."""
+
+    def __init__(
+        self,
+        endpoint_names: Iterable[str],
+        policy: str = LEAST_OUTSTANDING,
+        ewma_alpha: float = 0.3,
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0,
+        invoke: Callable[[str, Dict[str, Any]], Any] = invoke_endpoint,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            endpoint_names (Iterable[str]): The endpoints to route across.
+            policy (str): One of `ROUTING_POLICIES`.
+            ewma_alpha (float): Weight of the latest latency in the EWMA.
+            failure_threshold (int): Number of consecutive failures after
+                which an endpoint is ejected.
+            ejection_seconds (float): Seconds for which an endpoint stays
+                ejected. It is retried afterwards.
+            invoke (Callable[[str, Dict[str, Any]], Any]): Function invoking
+                an endpoint with a payload.
+            clock (Callable[[], float]): Monotonic clock in seconds.
+
+        Raises:
+            ValueError: If the policy is unknown or there are no endpoints.
+        """
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown routing policy {policy!r}")
+        self.stats = {name: EndpointStats() for name in endpoint_names}
+        if not self.stats:
+            raise ValueError("No endpoints to route across")
+
+        self.policy = policy
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self._invoke = invoke
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _load(self, endpoint_name: str) -> Tuple[int, float]:
+        """Return the sort key of an endpoint, lowest is least loaded.
+
+        Endpoints without latency samples sort first among endpoints
+        with the same number of outstanding requests, so they get probed.
+
+        Args:
+            endpoint_name (str): The name of the endpoint.
+
+        Returns:
+            Tuple[int, float]: The outstanding requests and EWMA latency.
+        """
+        stats = self.stats[endpoint_name]
+        return stats.outstanding, stats.ewma_latency or 0.0
+
+    def choose(self) -> str:
+        """Choose the endpoint for the next request.
+
+        Ejected endpoints are skipped. If all endpoints are ejected, the one
+        whose ejection ends first is chosen.
+
+        Returns:
+            str: The name of the chosen endpoint.
+        """
+        with self._lock:
+            return self._choose()
+
+    def _choose(self) -> str:
+        """Choose the endpoint for the next request, holding the lock.
+
+        Returns:
+            str: The name of the chosen endpoint.
+        """
+        now = self._clock()
+        healthy = [
+            endpoint_name
+            for endpoint_name, stats in self.stats.items()
+            if stats.ejected_until <= now
+        ]
+        if not healthy:
+            return min(self.stats, key=lambda name: self.stats[name].ejected_until)
+
+        if self.policy == POWER_OF_TWO_CHOICES and len(healthy) > 2:
+            healthy = random.sample(healthy, 2)  # noqa: S311
+        else:
+            random.shuffle(healthy)  # Break ties randomly
+        return min(healthy, key=self._load)
+
+    @contextmanager
+    def acquire(self) -> Iterator[str]:
+        """Choose an endpoint and track the request sent to it.
+
+        The request counts as outstanding while the context is active, and
+        its latency or failure is recorded when the context exits. Errors
+        that do not count against the endpoint's health, such as answers
+        to bad requests and interrupts, only end the request.
+
+        Yields:
+            str: The name of the chosen endpoint.
+        """
+        with self._lock:
+            endpoint_name = self._choose()
+            self.stats[endpoint_name].outstanding += 1
+        start = self._clock()
+        try:
+            yield endpoint_name
+        except Exception as e:
+            self._record(endpoint_name, None, failed=is_endpoint_failure(e))
+            raise
+        except BaseException:
+            self._record(endpoint_name, None, failed=False)
+            raise
+        else:
+            self._record(endpoint_name, self._clock() - start)
+
+    def _record(
+        self, endpoint_name: str, latency: Optional[float], failed: bool = True
+    ) -> None:
+        """Record the outcome of a request.
+
+        Args:
+            endpoint_name (str): The endpoint the request was sent to.
+            latency (Optional[float]): The latency of the request in
+                seconds, or None if it did not succeed.
+            failed (bool): Whether a request without a latency counts as a
+                failure of the endpoint.
+        """
+        with self._lock:
+            stats = self.stats[endpoint_name]
+            stats.outstanding -= 1
+            stats.requests += 1
+            if latency is None and not failed:
+                return
+            if latency is None:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                if stats.consecutive_failures >= self.failure_threshold:
+                    stats.ejected_until = self._clock() + self.ejection_seconds
+                return
+
+            stats.consecutive_failures = 0
+            stats.ejected_until = 0.0
+            stats.ewma_latency = (
+                latency
+                if stats.ewma_latency is None
+                else self.ewma_alpha * latency
+                + (1 - self.ewma_alpha) * stats.ewma_latency
+            )
+
+    def invoke(self, payload: Dict[str, Any]) -> Any:
+        """Invoke the chosen endpoint with a payload.
+
+        Args:
+            payload (Dict[str, Any]): The payload to send.
+
+        Returns:
+            Any: The decoded response.
+        """
+        with self.acquire() as endpoint_name:
+            return self._invoke(endpoint_name, payload)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Summarize the routing statistics of every endpoint.
+
+        Returns:
+            List[Dict[str, Any]]: The requests, failures, EWMA latency in
+                milliseconds and ejection state of every endpoint.
+        """
+        now = self._clock()
+        with self._lock:
+            return [
+                {
+                    "name": endpoint_name,
+                    "requests": stats.requests,
+                    "failures": stats.failures,
+                    "ewma_latency_ms": (
+                        round(stats.ewma_latency * 1000, 1)
+                        if stats.ewma_latency is not None
+                        else None
+                    ),
+                    "ejected": stats.ejected_until > now,
+                }
+                for endpoint_name, stats in self.stats.items()
+            ]
@@ -0,0 +1,247 @@
+"""This module provides utility functions for persisting chat sessions.
+
+Chat sessions are stored as append-only JSONL logs in the directory
+defined by the `SESSIONS_DIR` constant, one file per session. The first
+record of a log describes the session (endpoint, generation parameters and
+system instruction), and every following record holds a single turn. Turns
+are appended as they happen and files are never rewritten, so a session
+survives crashes and exits.
+
+Resuming a session reads the first record and then only as many turns
+from the end of the file as fit in the context window.
+
+Example:
+    # Start a session and log a turn
+    session = create_session(endpoint_name, parameters, system_instruction)
+    session.append_turn("Hi", "Hello! How can I help?")
+
+    # Resume it later
+    session = resume_session(session.session_id)
+"""
+
+import json
+import os
+import time
+import uuid
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from .credentials import BASE_DIR
+
+
+SESSIONS_DIR = os.path.join(BASE_DIR, "providers", "aws", ".sessions")
+
+# Approximate number of characters of conversation history kept in context
+# when resuming, leaving room for new tokens within Llama 2's 4096 tokens.
+CONTEXT_WINDOW_CHARS = 12000
+
+# Number of bytes read at a time when reading a log backwards.
+_BLOCK_SIZE = 64 * 1024
+
+
+class Session:
+    """A chat session backed by an append-only JSONL log."""
+
+    def __init__(self, header: Dict[str, Any], turns: List[Dict[str, str]]) -> None:
+        """Initialize the session.
+
+        Args:
+            header (Dict[str, Any]): The first record of the log.
+            turns (List[Dict[str, str]]): The turns currently in context,
+                each with a "user" and "assistant" message.
+        """
+        self.header = header
+        self.turns = turns
+
+    @property
+    def session_id(self) -> str:
+        """The ID of the session.
+
+        Returns:
+            str: The ID of the session.
+        """
+        session_id: str = self.header["id"]
+        return session_id
+
+    @property
+    def endpoint_name(self) -> str:
+        """The endpoint the session chats with.
+
+        Returns:
+            str: The name of the endpoint.
+        """
+        endpoint_name: str = self.header["endpoint"]
+        return endpoint_name
+
+    @property
+    def inference_component(self) -> Optional[str]:
+        """The inference component the session chats with, if any.
+
+        Returns:
+            Optional[str]: The name of the component of a shared endpoint.
+        """
+        inference_component: Optional[str] = self.header.get("component")
+        return inference_component
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        """The generation parameters of the session.
+
+        Returns:
+            Dict[str, Any]: The max_new_tokens, top_p and temperature.
+        """
+        parameters: Dict[str, Any] = self.header["parameters"]
+        return parameters
+
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """Build the conversation history of the turns in context.
+
+        Returns:
+            List[Dict[str, str]]: The messages, starting with the
+                system instruction if there is one.
+        """
+        history = []
+        if self.header.get("system"):
+            history.append({"role": "system", "content": self.header["system"]})
+        for turn in self.turns:
+            history.append({"role": "user", "content": turn["user"]})
+            history.append({"role": "assistant", "content": turn["assistant"]})
+        return history
+
+    def append_turn(self, user: str, assistant: str) -> None:
+        """Append a turn to the log.
+
+        Args:
+            user (str): The message of the user.
+            assistant (str): The response of the model.
+        """
+        turn = {"user": user, "assistant": assistant}
+        _append_record(self.session_id, {"type": "turn", "ts": time.time(), **turn})
+        self.turns.append(turn)
+
+
+def _session_file(session_id: str) -> str:
+    """Return the path of a session's log.
+
+    Args:
+        session_id (str): The ID of the session.
+
+    Returns:
+        str: The path of the log.
+    """
+    return os.path.join(SESSIONS_DIR, f"{session_id}.jsonl")
+
+
+def _append_record(session_id: str, record: Dict[str, Any]) -> None:
+    """Append a single record to a session's log.
+
+    A line left truncated by a crash is terminated first, so the record
+    starts a line of its own instead of joining the invalid one.
+
+    Args:
+        session_id (str): The ID of the session.
+        record (Dict[str, Any]): The record to append.
+    """
+    line = (json.dumps(record) + "\n").encode()
+    with open(_session_file(session_id), "a+b") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+
+
+def create_session(
+    endpoint_name: str,
+    parameters: Dict[str, Any],
+    system_instruction: str = "",
+    inference_component: Optional[str] = None,
+) -> Session:
+    """Create a new session and write its first record.
+
+    Args:
+        endpoint_name (str): The endpoint the session chats with.
+        parameters (Dict[str, Any]): The generation parameters.
+        system_instruction (str): The system instruction, if any.
+        inference_component (Optional[str]): The inference component of
+            a shared endpoint the session chats with, if any.
+
+    Returns:
+        Session: The new session.
+    """
+    os.makedirs(SESSIONS_DIR, exist_ok=True)
+    session_id = f"{int(time.time())}-{uuid.uuid4().hex[:6]}"
+    header = {
+        "type": "session",
+        "id": session_id,
+        "ts": time.time(),
+        "endpoint": endpoint_name,
+        "parameters": parameters,
+        "system": system_instruction,
+    }
+    if inference_component:
+        header["component"] = inference_component
+    _append_record(session_id, header)
+    return Session(header, [])
+
+
+def _read_lines_backwards(f: Any, start: int) -> Iterator[bytes]:
+    """Yield the lines of a file from its end back to a given offset.
+
+    Args:
+        f (Any): The file, opened in binary mode.
+        start (int): The offset at which to stop reading.
+
+    Yields:
+        bytes: The lines, last one first.
+    """
+    position = f.seek(0, os.SEEK_END)
+    remainder = b""
+    while position > start:
+        size = min(_BLOCK_SIZE, position - start)
+        position -= size
+        f.seek(position)
+        lines = (f.read(size) + remainder).split(b"\n")
+        remainder = lines.pop(0)
+        yield from reversed(lines)
+    yield remainder
+
+
+def resume_session(
+    session_id: str, context_window_chars: int = CONTEXT_WINDOW_CHARS
+) -> Optional[Session]:
+    """Load a session, reading only the turns that fit in the context window.
+
+    Args:
+        session_id (str): The ID of the session.
+        context_window_chars (int): Maximum number of characters of
+            turns to load. The most recent turn is always loaded.
+
+    Returns:
+        Optional[Session]: The session, or None if it does not exist.
+    """
+    path = _session_file(session_id)
+    if os.path.basename(path) != f"{session_id}.jsonl" or not os.path.exists(path):
+        return None
+
+    turns: List[Dict[str, str]] = []
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        chars = 0
+        for line in _read_lines_backwards(f, f.tell()):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Blank lines, or a turn cut short by a crash while writing.
+                continue
+            chars += len(record["user"]) + len(record["assistant"])
+            if turns and chars > context_window_chars:
+                break
+            turns.append({"user": record["user"], "assistant": record["assistant"]})
+
+    turns.reverse()
+    return Session(header, turns)
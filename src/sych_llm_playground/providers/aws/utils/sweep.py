@@ -0,0 +1,306 @@
+"""Utility module to sweep the sampling parameters of deployed models.
+
+A sweep sends a set of prompts with every cell of a space of
+`max_new_tokens`, `top_p` and `temperature` values, either the full grid of
+the given values or a random sample of cells. The requests of all cells run
+concurrently with a bounded number in flight, and every cell is summarized
+by its latency, output length and throughput.
+
+Responses do not report token counts, so output lengths are estimated from
+the generated text at `CHARS_PER_TOKEN` characters per token, which is close
+for English text and the Llama tokenizer.
+
+Functions:
+    parse_values: Parse the values or range of a sampling parameter.
+    grid_cells: Return every combination of the values of the parameters.
+    random_cells: Return a random sample of cells of the parameter space.
+    read_prompts: Read the prompts of a prompt file.
+    estimate_tokens: Estimate the number of tokens of a text.
+    build_payload: Build the payload of a prompt in the format of a model.
+    run_sweep: Send every prompt with every cell of a sweep.
+    summarize_results: Summarize the latency and throughput of results.
+    summarize_sweep: Summarize the results of a sweep per cell.
+    sort_cells: Sort the cells of a sweep by a metric, best first.
+"""
+
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .invocation import Invoker
+from .invocation import build_chat_payload
+from .invocation import build_predict_payload
+from .invocation import parse_chat_response
+from .invocation import parse_predict_response
+from .loadgen import percentile
+
+
+PARAMETERS = ("max_new_tokens", "top_p", "temperature")
+
+# Metrics of the cells of a sweep, and whether higher values are better.
+METRICS = {
+    "latency": False,
+    "p90": False,
+    "output_tokens": True,
+    "tokens_per_second": True,
+    "errors": False,
+}
+
+CHARS_PER_TOKEN = 4
+
+# Values of a parameter, or the bounds of a range to sample from.
+Values = Union[List[float], Tuple[float, float]]
+
+
+def parse_values(text: str, integer: bool = False) -> Values:
+    """Parse the values or range of a sampling parameter.
+
+    Args:
+        text (str): Comma-separated values, e.g. "0.2,0.6,1.0", or a range
+            to sample from, e.g. "0.2:1.0".
+        integer (bool): Whether the values must be integers.
+
+    Returns:
+        Values: The list of values, or the bounds of the range.
+
+    Raises:
+        ValueError: If a value is not a number, or a range is empty.
+    """
+    cast = int if integer else float
+    if ":" in text:
+        low, high = (cast(bound) for bound in text.split(":", 1))
+        if low > high:
+            raise ValueError(f"Empty range {text!r}")
+        return (low, high)
+    values = [cast(value) for value in text.split(",") if value.strip()]
+    if not values:
+        raise ValueError(f"No values in {text!r}")
+    return values
+
+
+def grid_cells(space: Dict[str, Values]) -> List[Dict[str, Any]]:
+    """Return every combination of the values of the parameters.
+
+    Args:
+        space (Dict[str, Values]): The values of every parameter.
+
+    Returns:
+        List[Dict[str, Any]]: The cells of the grid.
+
+    Raises:
+        ValueError: If a parameter has a range rather than values.
+    """
+    for parameter, values in space.items():
+        if isinstance(values, tuple):
+            raise ValueError(f"The {parameter} range can only be sampled from")
+    return [
+        dict(zip(space, combination, strict=True))
+        for combination in itertools.product(*space.values())
+    ]
+
+
+def random_cells(
+    space: Dict[str, Values], samples: int, rng: Optional[random.Random] = None
+) -> List[Dict[str, Any]]:
+    """Return a random sample of cells of the parameter space.
+
+    Values are drawn from the list of a parameter, or uniformly from its
+    range. Integer ranges yield integers.
+
+    Args:
+        space (Dict[str, Values]): The values or range of every parameter.
+        samples (int): The number of cells.
+        rng (Optional[random.Random]): The random number generator.
+
+    Returns:
+        List[Dict[str, Any]]: The cells.
+    """
+    rng = rng or random.Random()  # noqa: S311
+
+    def draw(values: Values) -> Any:
+        if isinstance(values, list):
+            return rng.choice(values)
+        low, high = values
+        if isinstance(low, int) and isinstance(high, int):
+            return rng.randint(low, high)
+        return round(rng.uniform(low, high), 3)
+
+    return [
+        {parameter: draw(values) for parameter, values in space.items()}
+        for _ in range(samples)
+    ]
+
+
+def read_prompts(prompt_file: str) -> List[str]:
+    """Read the prompts of a prompt file.
+
+    Args:
+        prompt_file (str): The path of a text file with one prompt per line.
+
+    Returns:
+        List[str]: The prompts, without blank lines.
+    """
+    with open(prompt_file) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The estimated number of tokens, at least 1 for a non-empty text.
+    """
+    return max(1, round(len(text) / CHARS_PER_TOKEN)) if text else 0
+
+
+def build_payload(kind: str, prompt: str, cell: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the payload of a prompt in the format of a model.
+
+    Args:
+        kind (str): How the endpoint is interacted with, "predict" or "chat".
+        prompt (str): The prompt.
+        cell (Dict[str, Any]): The sampling parameters.
+
+    Returns:
+        Dict[str, Any]: The payload, a prompt for text generation models
+            and a one-turn conversation for chat models.
+    """
+    if kind == "chat":
+        return build_chat_payload([{"role": "user", "content": prompt}], **cell)
+    return build_predict_payload(prompt, **cell)
+
+
+def run_sweep(
+    invoke: Invoker,
+    kind: str,
+    prompts: List[str],
+    cells: List[Dict[str, Any]],
+    max_in_flight: int = 4,
+    clock: Callable[[], float] = time.perf_counter,
+) -> List[Dict[str, Any]]:
+    """Send every prompt with every cell of a sweep.
+
+    Args:
+        invoke (Invoker): The invoker of the endpoint.
+        kind (str): How the endpoint is interacted with, "predict" or "chat".
+        prompts (List[str]): The prompts.
+        cells (List[Dict[str, Any]]): The sampling parameters of every cell.
+        max_in_flight (int): Maximum number of requests in flight.
+        clock (Callable[[], float]): Clock in seconds.
+
+    Returns:
+        List[Dict[str, Any]]: One result per request, with the "cell" index
+            and its parameters, the "prompt" index, the "latency", the
+            estimated "output_tokens" and the "error", if any.
+    """
+    parse = parse_chat_response if kind == "chat" else parse_predict_response
+    requests = list(itertools.product(range(len(cells)), range(len(prompts))))
+    results: List[Dict[str, Any]] = [{} for _ in requests]
+    lock = threading.Lock()
+
+    def send(index: int, cell: int, prompt: int) -> None:
+        payload = build_payload(kind, prompts[prompt], cells[cell])
+        start = clock()
+        output_tokens, error = 0, None
+        try:
+            output_tokens = estimate_tokens(parse(invoke(payload)))
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        result = {
+            "cell": cell,
+            **cells[cell],
+            "prompt": prompt,
+            "latency": clock() - start,
+            "output_tokens": output_tokens,
+            "error": error,
+        }
+        with lock:
+            results[index] = result
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for index, (cell, prompt) in enumerate(requests):
+            executor.submit(send, index, cell, prompt)
+    return results
+
+
+def summarize_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize the latency and throughput of a list of results.
+
+    Args:
+        results (List[Dict[str, Any]]): Results with their "latency",
+            estimated "output_tokens" and "error", if any.
+
+    Returns:
+        Dict[str, Any]: The number of "requests", the mean "latency" and
+            "p90" latency of successful requests in seconds, their mean
+            "output_tokens", the "tokens_per_second" generated over their
+            total latency and the number of "errors". Latency and
+            throughput are None if every request failed.
+    """
+    succeeded = [result for result in results if result["error"] is None]
+    latencies = [result["latency"] for result in succeeded]
+    tokens = sum(result["output_tokens"] for result in succeeded)
+    total = sum(latencies)
+    return {
+        "requests": len(results),
+        "latency": total / len(latencies) if latencies else None,
+        "p90": percentile(latencies, 90),
+        "output_tokens": tokens / len(succeeded) if succeeded else None,
+        "tokens_per_second": tokens / total if total else None,
+        "errors": len(results) - len(succeeded),
+    }
+
+
+def summarize_sweep(
+    cells: List[Dict[str, Any]], results: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Summarize the results of a sweep per cell.
+
+    Args:
+        cells (List[Dict[str, Any]]): The sampling parameters of every cell.
+        results (List[Dict[str, Any]]): The results of `run_sweep`.
+
+    Returns:
+        List[Dict[str, Any]]: One row per cell with its parameters, the
+            mean "latency" and "p90" latency of successful requests in
+            seconds, their mean "output_tokens", the "tokens_per_second"
+            generated over their total latency and the share of "errors".
+            Latency and throughput are None if every request failed.
+    """
+    rows = []
+    for index, cell in enumerate(cells):
+        summary = summarize_results(
+            [result for result in results if result["cell"] == index]
+        )
+        requests = summary["requests"]
+        summary["errors"] = summary["errors"] / requests if requests else 0.0
+        rows.append({**cell, **summary})
+    return rows
+
+
+def sort_cells(rows: List[Dict[str, Any]], metric: str) -> List[Dict[str, Any]]:
+    """Sort the cells of a sweep by a metric, best first.
+
+    Args:
+        rows (List[Dict[str, Any]]): The rows of `summarize_sweep`.
+        metric (str): One of `METRICS`.
+
+    Returns:
+        List[Dict[str, Any]]: The rows, those without the metric last.
+    """
+    higher_is_better = METRICS[metric]
+    measured = [row for row in rows if row[metric] is not None]
+    measured.sort(key=lambda row: row[metric], reverse=higher_is_better)
+    return measured + [row for row in rows if row[metric] is None]
@@ -0,0 +1,166 @@
+"""Utility module for blue/green updates of endpoints.
+
+An endpoint is updated in place by pointing it at a new endpoint
+configuration. With a blue/green deployment configuration, SageMaker
+provisions the new (green) fleet next to the old (blue) one, shifts
+traffic to it all at once, as a canary or in linear steps, and keeps the
+blue fleet until the shift is done and the alarms of the update stayed
+quiet for a baking period. If an alarm fires, traffic is rolled back to
+the blue fleet. The endpoint keeps its name throughout, so its API
+Gateway integration and URL are unchanged.
+
+Functions:
+    traffic_routing: Build the traffic routing configuration of an update.
+    create_rollback_alarms: Create the alarms rolling back a failed update.
+    delete_rollback_alarms: Delete the alarms of a finished update.
+    build_deployment_config: Build the blue/green deployment configuration.
+"""
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+TRAFFIC_SHIFTS = {
+    "all-at-once": "ALL_AT_ONCE",
+    "canary": "CANARY",
+    "linear": "LINEAR",
+}
+
+# Name of the production variant of endpoints created by `deploy`.
+VARIANT_NAME = "AllTraffic"
+
+# Seconds between the steps of a traffic shift.
+DEFAULT_WAIT_INTERVAL = 300
+
+# Seconds the blue fleet is kept after all traffic has shifted.
+DEFAULT_TERMINATION_WAIT = 300
+
+
+def traffic_routing(
+    traffic_shift: str,
+    step_percent: int,
+    wait_interval: int = DEFAULT_WAIT_INTERVAL,
+) -> Dict[str, Any]:
+    """Build the traffic routing configuration of an update.
+
+    Args:
+        traffic_shift (str): One of `TRAFFIC_SHIFTS`.
+        step_percent (int): The share of capacity of the canary, or of every
+            linear step, in percent.
+        wait_interval (int): Seconds between the steps of the shift, during
+            which the alarms are monitored.
+
+    Returns:
+        Dict[str, Any]: The `TrafficRoutingConfiguration`.
+    """
+    routing: Dict[str, Any] = {
+        "Type": TRAFFIC_SHIFTS[traffic_shift],
+        "WaitIntervalInSeconds": wait_interval,
+    }
+    step = {"Type": "CAPACITY_PERCENT", "Value": step_percent}
+    if traffic_shift == "canary":
+        routing["CanarySize"] = step
+    elif traffic_shift == "linear":
+        routing["LinearStepSize"] = step
+    return routing
+
+
+def create_rollback_alarms(
+    cloudwatch: Any,
+    endpoint_name: str,
+    rollback_on_errors: bool = True,
+    max_latency_ms: Optional[float] = None,
+) -> List[str]:
+    """Create the alarms rolling back a failed update of an endpoint.
+
+    Args:
+        cloudwatch (Any): The CloudWatch client.
+        endpoint_name (str): The name of the endpoint.
+        rollback_on_errors (bool): Whether to alarm on any invocation the
+            model fails with a 5xx error.
+        max_latency_ms (Optional[float]): The average model latency in
+            milliseconds to alarm above, if any.
+
+    Returns:
+        List[str]: The names of the alarms.
+    """
+    dimensions = [
+        {"Name": "EndpointName", "Value": endpoint_name},
+        {"Name": "VariantName", "Value": VARIANT_NAME},
+    ]
+    alarms = []
+    if rollback_on_errors:
+        alarms.append(f"{endpoint_name}-update-5xx-errors")
+        cloudwatch.put_metric_alarm(
+            AlarmName=alarms[-1],
+            MetricName="Invocation5XXErrors",
+            Namespace="AWS/SageMaker",
+            Dimensions=dimensions,
+            Statistic="Sum",
+            Period=60,
+            EvaluationPeriods=1,
+            Threshold=1,
+            ComparisonOperator="GreaterThanOrEqualToThreshold",
+            TreatMissingData="notBreaching",
+        )
+    if max_latency_ms is not None:
+        alarms.append(f"{endpoint_name}-update-model-latency")
+        cloudwatch.put_metric_alarm(
+            AlarmName=alarms[-1],
+            MetricName="ModelLatency",
+            Namespace="AWS/SageMaker",
+            Dimensions=dimensions,
+            Statistic="Average",
+            Period=60,
+            EvaluationPeriods=2,
+            DatapointsToAlarm=2,
+            # ModelLatency is reported in microseconds.
+            Threshold=max_latency_ms * 1000,
+            ComparisonOperator="GreaterThanThreshold",
+            TreatMissingData="notBreaching",
+        )
+    return alarms
+
+
+def delete_rollback_alarms(cloudwatch: Any, alarms: List[str]) -> None:
+    """Delete the alarms of an update once it has completed or rolled back.
+
+    Args:
+        cloudwatch (Any): The CloudWatch client.
+        alarms (List[str]): The names of the alarms, as returned by
+            `create_rollback_alarms`.
+    """
+    if alarms:
+        cloudwatch.delete_alarms(AlarmNames=alarms)
+
+
+def build_deployment_config(
+    routing: Dict[str, Any],
+    alarms: List[str],
+    termination_wait: int = DEFAULT_TERMINATION_WAIT,
+) -> Dict[str, Any]:
+    """Build the blue/green deployment configuration of an update.
+
+    Args:
+        routing (Dict[str, Any]): The traffic routing configuration.
+        alarms (List[str]): The alarms rolling the update back.
+        termination_wait (int): Seconds the blue fleet is kept after all
+            traffic has shifted, during which the update can still roll
+            back.
+
+    Returns:
+        Dict[str, Any]: The `DeploymentConfig` of `update_endpoint`.
+    """
+    config: Dict[str, Any] = {
+        "BlueGreenUpdatePolicy": {
+            "TrafficRoutingConfiguration": routing,
+            "TerminationWaitInSeconds": termination_wait,
+        }
+    }
+    if alarms:
+        config["AutoRollbackConfiguration"] = {
+            "Alarms": [{"AlarmName": alarm} for alarm in alarms]
+        }
+    return config
@@ -0,0 +1,202 @@
+"""Utility module to warm up newly deployed endpoints.
+
+The first requests to a new endpoint hit cold paths on the container,
+such as CUDA graph capture and allocator growth, and take much longer
+than the following ones. A warm-up sends representative payloads of
+increasing lengths at increasing concurrency, and repeats every step
+until its median latency stabilizes. The endpoint is ready once every
+step has stabilized, and the latencies of the rounds form the warm-up
+curve.
+
+Functions:
+    default_warmup_payloads: Build payloads of increasing prompt lengths.
+    concurrency_levels: Return the doubling concurrency levels of a warm-up.
+    warm_up: Warm up an endpoint and return its warm-up curve.
+"""
+
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .invocation import Invoker
+from .invocation import build_chat_payload
+from .invocation import build_predict_payload
+
+
+# Number of words of the prompts of the default payloads.
+DEFAULT_PROMPT_WORDS = [32, 256, 1024]
+
+# Tokens generated for each default payload.
+WARMUP_MAX_NEW_TOKENS = 64
+
+# Maximum relative change between the median latencies of two consecutive
+# rounds of a step for the step to be considered stable.
+STABILITY_TOLERANCE = 0.15
+
+# Maximum number of rounds of a step.
+MAX_ROUNDS = 6
+
+
+def default_warmup_payloads(
+    prompt_words: Optional[List[int]] = None,
+    kind: str = "predict",
+) -> List[Dict[str, Any]]:
+    """Build text generation payloads of increasing prompt lengths.
+
+    Args:
+        prompt_words (Optional[List[int]]): The number of words of each
+            prompt. Defaults to `DEFAULT_PROMPT_WORDS`.
+        kind (str): How the endpoint is interacted with, "predict" or "chat".
+
+    Returns:
+        List[Dict[str, Any]]: The payloads, in the format of the endpoint.
+    """
+    payloads = []
+    for words in sorted(prompt_words or DEFAULT_PROMPT_WORDS):
+        prompt = " ".join(["warm"] * words)
+        if kind == "chat":
+            payloads.append(
+                build_chat_payload(
+                    [{"role": "user", "content": prompt}],
+                    max_new_tokens=WARMUP_MAX_NEW_TOKENS,
+                )
+            )
+        else:
+            payloads.append(
+                build_predict_payload(prompt, max_new_tokens=WARMUP_MAX_NEW_TOKENS)
+            )
+    return payloads
+
+
+def concurrency_levels(max_concurrency: int) -> List[int]:
+    """Return the doubling concurrency levels of a warm-up.
+
+    Args:
+        max_concurrency (int): The highest concurrency.
+
+    Returns:
+        List[int]: The levels, e.g. `[1, 2, 4, 6]` for 6.
+    """
+    levels = [1]
+    while levels[-1] * 2 < max_concurrency:
+        levels.append(levels[-1] * 2)
+    if levels[-1] != max_concurrency:
+        levels.append(max_concurrency)
+    return levels
+
+
+def _round(
+    invoke: Invoker,
+    payload: Dict[str, Any],
+    concurrency: int,
+    executor: ThreadPoolExecutor,
+    clock: Callable[[], float],
+) -> Tuple[List[float], int]:
+    """Send a payload several times at once and time the invocations.
+
+    Args:
+        invoke (Invoker): The invoker.
+        payload (Dict[str, Any]): The payload.
+        concurrency (int): The number of invocations sent at once.
+        executor (ThreadPoolExecutor): The executor sending them.
+        clock (Callable[[], float]): Clock in seconds.
+
+    Returns:
+        Tuple[List[float], int]: The latencies of the successful
+            invocations, and the number of failed ones.
+    """
+
+    def timed() -> float:
+        start = clock()
+        invoke(payload)
+        return clock() - start
+
+    futures = [executor.submit(timed) for _ in range(concurrency)]
+    latencies = []
+    errors = 0
+    for future in futures:
+        try:
+            latencies.append(future.result())
+        except Exception:
+            errors += 1
+    return latencies, errors
+
+
+def warm_up(
+    invoke: Invoker,
+    payloads: List[Dict[str, Any]],
+    max_concurrency: int = 4,
+    tolerance: float = STABILITY_TOLERANCE,
+    max_rounds: int = MAX_ROUNDS,
+    on_round: Optional[Callable[[Dict[str, Any]], None]] = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    """Warm up an endpoint and return its warm-up curve.
+
+    Payloads are sent from the shortest to the longest, each at every
+    concurrency level. A step, one payload at one concurrency level, is
+    repeated until the median latency of a round is within `tolerance` of
+    the previous round's, or `max_rounds` rounds have been sent.
+
+    Args:
+        invoke (Invoker): The invoker of the endpoint.
+        payloads (List[Dict[str, Any]]): Representative payloads.
+        max_concurrency (int): The highest concurrency.
+        tolerance (float): Maximum relative change of the median latency
+            between two rounds of a stable step.
+        max_rounds (int): Maximum number of rounds of a step.
+        on_round (Optional[Callable[[Dict[str, Any]], None]]): Called with
+            every point of the curve as soon as it is measured.
+        clock (Callable[[], float]): Clock in seconds.
+
+    Returns:
+        Tuple[bool, List[Dict[str, Any]]]: Whether every step stabilized,
+            and the curve, one point per round with the "payload" index,
+            its "size" in bytes, the "concurrency", the "round", the
+            "p50" and "max" latencies and the number of "errors".
+    """
+    ordered = sorted(enumerate(payloads), key=lambda item: len(json.dumps(item[1])))
+    levels = concurrency_levels(max_concurrency)
+    curve: List[Dict[str, Any]] = []
+    ready = True
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        for index, payload in ordered:
+            for concurrency in levels:
+                previous: Optional[float] = None
+                stable = False
+                for round_number in range(1, max_rounds + 1):
+                    latencies, errors = _round(
+                        invoke, payload, concurrency, executor, clock
+                    )
+                    point: Dict[str, Any] = {
+                        "payload": index,
+                        "size": len(json.dumps(payload)),
+                        "concurrency": concurrency,
+                        "round": round_number,
+                        "p50": statistics.median(latencies) if latencies else None,
+                        "max": max(latencies) if latencies else None,
+                        "errors": errors,
+                    }
+                    curve.append(point)
+                    if on_round:
+                        on_round(point)
+
+                    median = point["p50"]
+                    if errors or median is None:
+                        previous = None
+                        continue
+                    if previous and abs(median - previous) <= tolerance * previous:
+                        stable = True
+                        break
+                    previous = median
+                ready = ready and stable
+
+    return ready, curve
@@ -0,0 +1,18 @@
+"""Module to resume hibernated endpoints.
+
+This module provides a CLI command that creates a hibernated endpoint
+again under the same name, so its API Gateway keeps working.
+
+Functions:
+    resume: CLI function to resume a hibernated endpoint.
+"""
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Resume a hibernated endpoint under the same name.")
+def resume() -> None:
+    """Resume a hibernated endpoint with the chosen provider."""
+    select_provider_and_call_function("resume")
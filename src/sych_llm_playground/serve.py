@@ -0,0 +1,62 @@
+"""Module to serve deployed models through an OpenAI-compatible API.
+
+This module provides a CLI command that runs a local HTTP server exposing
+`/v1/completions` and `/v1/chat/completions` in front of deployed models.
+
+Functions:
+    serve: CLI function to run the OpenAI-compatible proxy server.
+"""
+
+from typing import Optional
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Serve deployed models through an OpenAI-compatible API.")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Host to bind.")
+@click.option("--port", default=8000, show_default=True, help="Port to bind.")
+@click.option(
+    "--max-concurrency",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of concurrent model invocations.",
+)
+@click.option(
+    "--balance",
+    type=click.Choice(["least-outstanding", "p2c"]),
+    help="Balance requests across all endpoints of the same model.",
+)
+@click.option(
+    "--rate-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Maximum number of model invocations per second.",
+)
+def serve(
+    host: str,
+    port: int,
+    max_concurrency: int,
+    balance: Optional[str],
+    rate_limit: Optional[float],
+) -> None:
+    """Run a local OpenAI-compatible proxy server with the chosen provider.
+
+    Args:
+        host (str): The host to bind to.
+        port (int): The port to bind to.
+        max_concurrency (int): Maximum number of concurrent model invocations.
+        balance (Optional[str]): A routing policy to balance requests
+            across all endpoints of the same model.
+        rate_limit (Optional[float]): Maximum number of model invocations
+            per second.
+    """
+    select_provider_and_call_function(
+        "serve",
+        host=host,
+        port=port,
+        max_concurrency=max_concurrency,
+        balance=balance,
+        rate_limit=rate_limit,
+    )
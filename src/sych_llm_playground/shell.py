@@ -0,0 +1,110 @@
+"""Module for the interactive shell.
+
+This module provides a long-lived REPL in which the other commands
+can be run in succession. The provider is selected once, and provider
+state such as credentials, clients and fetched resources stays warm
+between commands.
+
+Functions:
+    shell: CLI function to start the interactive shell.
+"""
+
+import shlex
+from typing import List
+from typing import Optional
+
+import click
+
+from .utils.provider_selection import call_provider_function
+from .utils.provider_selection import pin_provider
+from .utils.provider_selection import select_provider
+
+
+EXIT_COMMANDS = ["exit", "quit"]
+
+
+@click.command(help="Start an interactive shell that keeps clients warm.")
+@click.pass_context
+def shell(ctx: click.Context) -> None:
+    """Run commands in succession within a single process.
+
+    The selected provider is pinned for the lifetime of the shell, and
+    errors raised by a command are reported without ending the shell.
+
+    Args:
+        ctx (click.Context): The context of the shell command.
+    """
+    root = ctx.find_root()
+    provider = select_provider()
+    call_provider_function(provider, "shell")
+    pin_provider(provider)
+
+    click.secho(
+        "Type a command (e.g. 'list', 'interact'), 'help' or 'exit'.\n",
+        fg="yellow",
+    )
+
+    try:
+        while True:
+            args = _read_args()
+            if args is None:
+                break
+            if not args:
+                continue
+            if args[0] in EXIT_COMMANDS:
+                break
+            if args[0] == "help":
+                args = ["--help"]
+            if args[0] == "shell":
+                click.secho("Already running a shell.\n", fg="yellow")
+                continue
+
+            _run_command(root, args)
+    finally:
+        pin_provider(None)
+
+    click.secho("Shell ended. \n", fg="yellow")
+
+
+def _read_args() -> Optional[List[str]]:
+    """Prompt for a command line and split it into arguments.
+
+    Returns:
+        Optional[List[str]]: The arguments, empty if the line is blank or
+            cannot be split, or None once the input has ended.
+    """
+    try:
+        line = input(click.style("sych-llm-pg> ", fg="blue"))
+    except (EOFError, KeyboardInterrupt):
+        click.echo()
+        return None
+
+    try:
+        return shlex.split(line)
+    except ValueError as e:
+        click.secho(f"Invalid command line: {e}\n", fg="red")
+        return []
+
+
+def _run_command(root: click.Context, args: List[str]) -> None:
+    """Run a single command of the root command group.
+
+    Args:
+        root (click.Context): The context of the root command group.
+        args (List[str]): The command line arguments of the command.
+    """
+    try:
+        root.command.main(
+            args=args,
+            prog_name=root.info_name,
+            standalone_mode=False,
+        )
+    except click.ClickException as e:
+        e.show()
+    except (click.Abort, KeyboardInterrupt):
+        click.secho("\nAborted.\n", fg="yellow")
+    except SystemExit:
+        # Commands exit on errors they have already reported.
+        pass
+    except Exception as e:
+        click.secho(f"An error occurred: {e}", fg="red")
@@ -0,0 +1,46 @@
+"""Module to submit payloads to asynchronous endpoints.
+
+This module provides a CLI command that submits the payloads of a JSONL
+file to an endpoint deployed with `deploy --async` and collects the
+responses.
+
+Functions:
+    submit: CLI function to submit payloads to an asynchronous endpoint.
+"""
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Submit payloads to asynchronous endpoints.")
+@click.argument("input_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output",
+    "output_file",
+    default="responses.jsonl",
+    show_default=True,
+    type=click.Path(dir_okay=False, writable=True),
+    help="JSONL file the responses are written to.",
+)
+@click.option(
+    "--max-workers",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of uploads and polls in parallel.",
+)
+def submit(input_file: str, output_file: str, max_workers: int) -> None:
+    """Submit the payloads of a JSONL file with the chosen provider.
+
+    Args:
+        input_file (str): The JSONL file of payloads, one per line.
+        output_file (str): The JSONL file the responses are written to.
+        max_workers (int): Maximum number of uploads and polls in parallel.
+    """
+    select_provider_and_call_function(
+        "submit",
+        input_file=input_file,
+        output_file=output_file,
+        max_workers=max_workers,
+    )
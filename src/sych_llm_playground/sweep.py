@@ -0,0 +1,143 @@
+"""Module to sweep the sampling parameters of deployed models.
+
+This module provides a CLI command that sends a set of prompts to a
+deployed model with every combination of sampling parameters, and reports
+the latency, output length and throughput of each.
+
+Functions:
+    sweep: CLI function to sweep the sampling parameters of a deployed model.
+"""
+
+from typing import Optional
+from typing import Tuple
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Sweep the sampling parameters of a deployed model.")
+@click.option(
+    "--prompt",
+    "prompts",
+    multiple=True,
+    help="A prompt to send with every combination. Repeat for several.",
+)
+@click.option(
+    "--prompts",
+    "prompt_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="A text file with one prompt per line.",
+)
+@click.option(
+    "--max-new-tokens",
+    default="64,128,256",
+    show_default=True,
+    help="Comma-separated values, or a 'min:max' range to sample from.",
+)
+@click.option(
+    "--top-p",
+    default="0.9",
+    show_default=True,
+    help="Comma-separated values, or a 'min:max' range to sample from.",
+)
+@click.option(
+    "--temperature",
+    default="0.2,0.6,1.0",
+    show_default=True,
+    help="Comma-separated values, or a 'min:max' range to sample from.",
+)
+@click.option(
+    "--samples",
+    type=click.IntRange(min=1),
+    help="Sample this many combinations at random instead of the full grid.",
+)
+@click.option("--seed", type=int, help="Seed of the random sample.")
+@click.option(
+    "--max-in-flight",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of requests in flight.",
+)
+@click.option(
+    "--sort-by",
+    default="tokens_per_second",
+    show_default=True,
+    type=click.Choice(
+        ["latency", "p90", "output_tokens", "tokens_per_second", "errors"]
+    ),
+    help="Metric the results are sorted by, best first.",
+)
+@click.option(
+    "--url",
+    help="Send the requests to an API Gateway URL instead of choosing an endpoint.",
+)
+@click.option(
+    "--payload-format",
+    default="predict",
+    show_default=True,
+    type=click.Choice(["predict", "chat"]),
+    help="Payload format of the model behind --url.",
+)
+@click.option(
+    "--api-key",
+    envvar="SYCH_LLM_PG_API_KEY",
+    help="API key of the API Gateway behind --url, if it has a usage plan.",
+)
+@click.option(
+    "--output",
+    "output_file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the result of every request to a JSONL file.",
+)
+def sweep(
+    prompts: Tuple[str, ...],
+    prompt_file: Optional[str],
+    max_new_tokens: str,
+    top_p: str,
+    temperature: str,
+    samples: Optional[int],
+    seed: Optional[int],
+    max_in_flight: int,
+    sort_by: str,
+    url: Optional[str],
+    payload_format: str,
+    api_key: Optional[str],
+    output_file: Optional[str],
+) -> None:
+    """Sweep the sampling parameters of a deployed model with the chosen provider.
+
+    Args:
+        prompts (Tuple[str, ...]): The prompts to send with every combination.
+        prompt_file (Optional[str]): A text file with one prompt per line.
+        max_new_tokens (str): The values or range of `max_new_tokens`.
+        top_p (str): The values or range of `top_p`.
+        temperature (str): The values or range of `temperature`.
+        samples (Optional[int]): The number of combinations to sample at
+            random, instead of the full grid.
+        seed (Optional[int]): Seed of the random sample.
+        max_in_flight (int): Maximum number of requests in flight.
+        sort_by (str): The metric the results are sorted by.
+        url (Optional[str]): An API Gateway URL to send the requests to.
+        payload_format (str): The payload format of the model behind the URL.
+        api_key (Optional[str]): The API key of the API Gateway behind the URL.
+        output_file (Optional[str]): A JSONL file the result of every
+            request is written to.
+    """
+    select_provider_and_call_function(
+        "sweep",
+        prompts=[*prompts],
+        prompt_file=prompt_file,
+        max_new_tokens=max_new_tokens,
+        top_p=top_p,
+        temperature=temperature,
+        samples=samples,
+        seed=seed,
+        max_in_flight=max_in_flight,
+        sort_by=sort_by,
+        url=url,
+        payload_format=payload_format,
+        api_key=api_key,
+        output_file=output_file,
+    )
@@ -0,0 +1,85 @@
+"""Module to run models over datasets without a live endpoint.
+
+This module provides a CLI command that launches a Batch Transform job
+over a JSONL dataset, tracks its progress and collects the results.
+
+Functions:
+    transform: CLI function to run a Batch Transform job.
+"""
+
+from typing import Optional
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Run a model over a dataset with Batch Transform.")
+@click.argument("input_path", metavar="INPUT")
+@click.option(
+    "--output",
+    "output_file",
+    default="results.jsonl",
+    show_default=True,
+    type=click.Path(dir_okay=False, writable=True),
+    help="JSONL file the merged results are written to.",
+)
+@click.option("--instance-type", help="Instance type, e.g. ml.g5.2xlarge.")
+@click.option(
+    "--instance-count",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of instances.",
+)
+@click.option(
+    "--max-concurrent-transforms",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of requests sent to each instance at a time.",
+)
+@click.option(
+    "--max-payload-mb",
+    default=6,
+    show_default=True,
+    type=click.IntRange(min=1, max=100),
+    help="Maximum size of a mini-batch of records in MB.",
+)
+@click.option(
+    "--create-model",
+    is_flag=True,
+    help="Create a new model for the job instead of using a deployed one.",
+)
+def transform(
+    input_path: str,
+    output_file: str,
+    instance_type: Optional[str],
+    instance_count: int,
+    max_concurrent_transforms: int,
+    max_payload_mb: int,
+    create_model: bool,
+) -> None:
+    """Run a Batch Transform job with the chosen provider.
+
+    Args:
+        input_path (str): A local JSONL dataset of payloads, or the S3 URI
+            of a dataset file or prefix.
+        output_file (str): The file the merged results are written to.
+        instance_type (Optional[str]): The instance type.
+        instance_count (int): The number of instances.
+        max_concurrent_transforms (int): Maximum number of requests sent to
+            each instance at a time.
+        max_payload_mb (int): Maximum size of a mini-batch in MB.
+        create_model (bool): Whether to create a new model for the job.
+    """
+    select_provider_and_call_function(
+        "transform",
+        input_path=input_path,
+        output_file=output_file,
+        instance_type=instance_type,
+        instance_count=instance_count,
+        max_concurrent_transforms=max_concurrent_transforms,
+        max_payload_mb=max_payload_mb,
+        create_model=create_model,
+    )
@@ -0,0 +1,122 @@
+"""Module to update deployed models in place.
+
+This module provides a CLI command that moves a deployed endpoint to a new
+model version or instance type with a blue/green deployment, keeping its
+name and API Gateway URL.
+
+Functions:
+    update: CLI function to update a deployed endpoint in place.
+"""
+
+from typing import Optional
+from typing import Tuple
+
+import click
+
+from .utils.provider_selection import select_provider_and_call_function
+
+
+@click.command(help="Update a deployed endpoint in place, blue/green.")
+@click.option(
+    "--model-version",
+    help="Model version to update to. Defaults to the supported version.",
+)
+@click.option(
+    "--instance-type",
+    help="Instance type of the new fleet. Defaults to the current one.",
+)
+@click.option(
+    "--instance-count",
+    type=click.IntRange(min=1),
+    help="Number of instances of the new fleet. Defaults to the current one.",
+)
+@click.option(
+    "--traffic-shift",
+    default="canary",
+    show_default=True,
+    type=click.Choice(["all-at-once", "canary", "linear"]),
+    help="How traffic shifts from the old fleet to the new one.",
+)
+@click.option(
+    "--step-percent",
+    default=10,
+    show_default=True,
+    type=click.IntRange(min=1, max=100),
+    help="Share of capacity of the canary, or of every linear step.",
+)
+@click.option(
+    "--wait-interval",
+    default=300,
+    show_default=True,
+    type=click.IntRange(min=0, max=3600),
+    help="Seconds between the steps of the shift, while alarms are monitored.",
+)
+@click.option(
+    "--termination-wait",
+    default=300,
+    show_default=True,
+    type=click.IntRange(min=0, max=3600),
+    help="Seconds the old fleet is kept after all traffic has shifted.",
+)
+@click.option(
+    "--alarm",
+    "alarms",
+    multiple=True,
+    help="An existing CloudWatch alarm that rolls the update back. Repeat "
+    + "for several.",
+)
+@click.option(
+    "--rollback-on-errors/--no-rollback-on-errors",
+    default=True,
+    show_default=True,
+    help="Roll back when the model fails an invocation with a 5xx error.",
+)
+@click.option(
+    "--max-latency-ms",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Roll back when the average model latency exceeds this.",
+)
+def update(
+    model_version: Optional[str],
+    instance_type: Optional[str],
+    instance_count: Optional[int],
+    traffic_shift: str,
+    step_percent: int,
+    wait_interval: int,
+    termination_wait: int,
+    alarms: Tuple[str, ...],
+    rollback_on_errors: bool,
+    max_latency_ms: Optional[float],
+) -> None:
+    """Update a deployed endpoint in place with the chosen provider.
+
+    Args:
+        model_version (Optional[str]): The model version to update to.
+        instance_type (Optional[str]): The instance type of the new fleet.
+        instance_count (Optional[int]): The number of instances of the new
+            fleet.
+        traffic_shift (str): How traffic shifts to the new fleet.
+        step_percent (int): The share of capacity of the canary, or of every
+            linear step, in percent.
+        wait_interval (int): Seconds between the steps of the shift.
+        termination_wait (int): Seconds the old fleet is kept after all
+            traffic has shifted.
+        alarms (Tuple[str, ...]): Existing CloudWatch alarms rolling the
+            update back.
+        rollback_on_errors (bool): Whether to roll back on 5xx errors.
+        max_latency_ms (Optional[float]): The average model latency in
+            milliseconds to roll back above, if any.
+    """
+    select_provider_and_call_function(
+        "update",
+        model_version=model_version,
+        instance_type=instance_type,
+        instance_count=instance_count,
+        traffic_shift=traffic_shift,
+        step_percent=step_percent,
+        wait_interval=wait_interval,
+        termination_wait=termination_wait,
+        alarms=[*alarms],
+        rollback_on_errors=rollback_on_errors,
+        max_latency_ms=max_latency_ms,
+    )
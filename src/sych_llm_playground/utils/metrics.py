@@ -0,0 +1,443 @@
+"""This module provides a lightweight process-wide metrics registry.
+
+Counters, gauges and fixed-bucket histograms are declared once by the
+modules they measure, and exported in the Prometheus text format to a
+file or stdout. Files are replaced atomically, so they can be read by the
+textfile collector of node-exporter.
+
+Recording is disabled until `enable_metrics` is called, and metrics then
+return as soon as they are updated, so instrumented code costs next to
+nothing when metrics are not exported.
+
+Functions:
+    - counter: Declare a counter in the registry.
+    - gauge: Declare a gauge in the registry.
+    - histogram: Declare a histogram in the registry.
+    - enable_metrics: Start recording metrics.
+    - metrics_enabled: Check whether metrics are recorded.
+    - export_metrics: Write the metrics to a file or stdout.
+
+Example:
+    REQUESTS = counter("requests_total", "Requests sent.", ["outcome"])
+    REQUESTS.inc(outcome="success")
+    export_metrics("/var/lib/node_exporter/textfile/sych.prom")
+"""
+
+import contextlib
+import math
+import os
+import sys
+import threading
+import time
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import cast
+
+
+# Histogram buckets in seconds, suited to API calls and model invocations.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = False
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value in the Prometheus text format.
+
+    Args:
+        value (float): The value.
+
+    Returns:
+        str: The formatted value.
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value.
+
+    Args:
+        value (str): The value.
+
+    Returns:
+        str: The value with backslashes, quotes and newlines escaped.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Format the labels of a sample in the Prometheus text format.
+
+    Args:
+        labels (Dict[str, str]): The labels.
+
+    Returns:
+        str: The formatted labels, empty without labels.
+    """
+    if not labels:
+        return ""
+    return (
+        "{"
+        + ",".join(name + '="' + _escape(value) + '"' for name, value in labels.items())
+        + "}"
+    )
+
+
+class Metric:
+    """Base class of metrics with labels."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        """Initialize a metric without samples.
+
+        Args:
+            name (str): The name of the metric.
+            help (str): The description of the metric.
+            labels (Sequence[str]): The names of its labels.
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        """Return the label values of a sample, in the order of the labels.
+
+        Args:
+            labels (Dict[str, object]): The labels of the sample.
+
+        Returns:
+            Tuple[str, ...]: The label values.
+        """
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield the samples of the metric.
+
+        Yields:
+            Sample: The name, labels and value of each sample.
+        """
+        yield from ()
+
+    def render(self) -> str:
+        """Render the metric in the Prometheus text format.
+
+        Returns:
+            str: The HELP and TYPE lines followed by the samples.
+        """
+        help = self.help.replace("\\", "\\\\").replace("\n", "\\n")
+        lines = [f"# HELP {self.name} {help}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(
+            f"{name}{_format_labels(labels)} {_format_value(value)}"
+            for name, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        """Initialize a counter without samples.
+
+        Args:
+            name (str): The name of the counter.
+            help (str): The description of the counter.
+            labels (Sequence[str]): The names of its labels.
+        """
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Increase the count.
+
+        Args:
+            amount (float): The increment.
+            **labels (object): The labels of the sample.
+        """
+        if not _enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield the count of every set of labels.
+
+        Yields:
+            Sample: The name, labels and value of each sample.
+        """
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labels, key, strict=True)), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        """Set the value.
+
+        Args:
+            value (float): The value.
+            **labels (object): The labels of the sample.
+        """
+        if not _enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        """Decrease the value.
+
+        Args:
+            amount (float): The decrement.
+            **labels (object): The labels of the sample.
+        """
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Distribution of observations in fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize a histogram without observations.
+
+        Args:
+            name (str): The name of the histogram.
+            help (str): The description of the histogram.
+            labels (Sequence[str]): The names of its labels.
+            buckets (Sequence[float]): The upper bounds of the buckets.
+                A `+Inf` bucket is always added.
+        """
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Record an observation.
+
+        Args:
+            value (float): The observation.
+            **labels (object): The labels of the sample.
+        """
+        if not _enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextlib.contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observe the seconds spent in the block.
+
+        Args:
+            **labels (object): The labels of the sample.
+
+        Yields:
+            None: Nothing.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield the cumulative buckets, sum and count of every set of labels.
+
+        Yields:
+            Sample: The name, labels and value of each sample.
+        """
+        with self._lock:
+            counts = {key: list(value) for key, value in self._counts.items()}
+            sums = dict(self._sums)
+        for key in sorted(counts):
+            labels = dict(zip(self.labels, key, strict=True))
+            for bound, count in zip(self.buckets, counts[key], strict=True):
+                yield (
+                    f"{self.name}_bucket",
+                    {**labels, "le": _format_value(bound)},
+                    count,
+                )
+            yield f"{self.name}_sum", labels, sums[key]
+            yield f"{self.name}_count", labels, counts[key][-1]
+
+
+class MetricsRegistry:
+    """Registry of the metrics of the process."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Register a metric, or return the metric registered with its name.
+
+        Args:
+            metric (Metric): The metric.
+
+        Returns:
+            Metric: The registered metric.
+
+        Raises:
+            TypeError: If the name is registered as another type of metric.
+        """
+        registered = self.metrics.setdefault(metric.name, metric)
+        if type(registered) is not type(metric):
+            raise TypeError(
+                f"Metric {metric.name!r} is already registered as a "
+                + f"{type(registered).__name__.lower()}"
+            )
+        return registered
+
+    def render(self) -> str:
+        """Render every metric with samples in the Prometheus text format.
+
+        Returns:
+            str: The exposition, ending with a newline.
+        """
+        blocks = [
+            metric.render()
+            for _, metric in sorted(self.metrics.items())
+            if any(True for _ in metric.samples())
+        ]
+        return "".join(f"{block}\n" for block in blocks)
+
+    def write(self, target: str) -> None:
+        """Write the metrics to a file, or stdout if the target is "-".
+
+        Files are written next to the target first and then renamed, so
+        readers never see a partial file.
+
+        Args:
+            target (str): The path of the file, or "-".
+        """
+        exposition = self.render()
+        if target == "-":
+            sys.stdout.write(exposition)
+            return
+        temporary_file = f"{target}.{os.getpid()}.tmp"
+        with open(temporary_file, "w") as f:
+            f.write(exposition)
+        os.replace(temporary_file, target)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    """Declare a counter in the registry.
+
+    Args:
+        name (str): The name of the counter.
+        help (str): The description of the counter.
+        labels (Sequence[str]): The names of its labels.
+
+    Returns:
+        Counter: The counter.
+
+    Raises:
+        TypeError: If the name is registered as another type of metric.
+    """
+    metric = REGISTRY.register(Counter(name, help, labels))
+    return cast(Counter, metric)
+
+
+def gauge(name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+    """Declare a gauge in the registry.
+
+    Args:
+        name (str): The name of the gauge.
+        help (str): The description of the gauge.
+        labels (Sequence[str]): The names of its labels.
+
+    Returns:
+        Gauge: The gauge.
+
+    Raises:
+        TypeError: If the name is registered as another type of metric.
+    """
+    metric = REGISTRY.register(Gauge(name, help, labels))
+    return cast(Gauge, metric)
+
+
+def histogram(
+    name: str,
+    help: str,
+    labels: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Declare a histogram in the registry.
+
+    Args:
+        name (str): The name of the histogram.
+        help (str): The description of the histogram.
+        labels (Sequence[str]): The names of its labels.
+        buckets (Sequence[float]): The upper bounds of the buckets.
+
+    Returns:
+        Histogram: The histogram.
+
+    Raises:
+        TypeError: If the name is registered as another type of metric.
+    """
+    metric = REGISTRY.register(Histogram(name, help, labels, buckets))
+    return cast(Histogram, metric)
+
+
+def enable_metrics(enabled: bool = True) -> None:
+    """Start, or stop, recording metrics.
+
+    Args:
+        enabled (bool): Whether metrics are recorded.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    """Check whether metrics are recorded.
+
+    Returns:
+        bool: True once `enable_metrics` has been called.
+    """
+    return _enabled
+
+
+def export_metrics(target: Optional[str]) -> None:
+    """Write the metrics of the registry to a file or stdout.
+
+    Args:
+        target (Optional[str]): The path of the file, "-" for stdout, or
+            None to skip the export.
+    """
+    if target:
+        REGISTRY.write(target)
@@ -4,49 +4,104 @@ This module provides functions to prompt the user for their preferred cloud prov
 and call the corresponding function based on the parent caller.
 
 Functions:
+    select_provider: Prompts the user to select a provider, unless one is pinned.
+    pin_provider: Pins a provider so that it is no longer prompted for.
+    call_provider_function: Calls the function of a given provider.
     select_provider_and_call_function: Prompts the user to select
         a provider and then call the corresponding function.
 """
 
 from importlib import import_module
 from typing import Any
+from typing import Optional
 
 import inquirer
 
 
-def select_provider_and_call_function(caller_function_name: str) -> None:
-    """Prompt the user to select a cloud provider and call the corresponding function.
+# Mapping function names to their respective modules
+functions_mapping = {
+    "AWS": {
+        "configure": "providers.aws.configure.configure",
+        "deploy": "providers.aws.deploy.deploy",
+        "list": "providers.aws.list.list",
+        "interact": "providers.aws.interact.interact",
+        "cleanup": "providers.aws.cleanup.cleanup",
+        "shell": "providers.aws.shell.shell",
+        "serve": "providers.aws.serve.serve",
+        "submit": "providers.aws.submit.submit",
+        "transform": "providers.aws.transform.transform",
+        "emulate": "providers.aws.emulate.emulate",
+        "loadgen": "providers.aws.loadgen.loadgen",
+        "sweep": "providers.aws.sweep.sweep",
+        "compare": "providers.aws.compare.compare",
+        "update": "providers.aws.update.update",
+        "hibernate": "providers.aws.hibernate.hibernate",
+        "resume": "providers.aws.hibernate.resume",
+    },
+}
 
-    Args:
-        caller_function_name (str): The name of the calling
-            function (e.g., "deploy", "configure").
+# Provider used without prompting, e.g. for the lifetime of a shell session.
+_pinned_provider: Optional[str] = None
+
+
+def select_provider() -> str:
+    """Prompt the user to select a cloud provider.
+
+    Returns:
+        str: The pinned provider if there is one, else the selected provider.
     """
+    if _pinned_provider is not None:
+        return _pinned_provider
+
     questions = [
         inquirer.List(
             "provider",
             message="Please choose a provider:",
-            choices=["AWS"],
+            choices=[*functions_mapping],
             carousel=True,
         ),
     ]
 
     answers = inquirer.prompt(questions)
-    provider_choice = answers["provider"]
-
-    # Mapping function names to their respective modules
-    functions_mapping = {
-        "AWS": {
-            "configure": "providers.aws.configure.configure",
-            "deploy": "providers.aws.deploy.deploy",
-            "list": "providers.aws.list.list",
-            "interact": "providers.aws.interact.interact",
-            "cleanup": "providers.aws.cleanup.cleanup",
-        },
-    }
+    provider_choice: str = answers["provider"]
+    return provider_choice
+
+
+def pin_provider(provider: Optional[str]) -> None:
+    """Pin a provider so that `select_provider` no longer prompts for one.
+
+    Args:
+        provider (Optional[str]): The provider to pin, or None to unpin.
+    """
+    global _pinned_provider
+    _pinned_provider = provider
 
+
+def call_provider_function(
+    provider_choice: str, caller_function_name: str, **kwargs: Any
+) -> None:
+    """Call the function of the given provider.
+
+    Args:
+        provider_choice (str): The provider (e.g., "AWS").
+        caller_function_name (str): The name of the calling
+            function (e.g., "deploy", "configure").
+        **kwargs (Any): Options passed on to the provider function.
+    """
     module_path = functions_mapping[provider_choice][caller_function_name]
     function_to_call = _dynamic_import(module_path)
-    function_to_call()
+    function_to_call(**kwargs)
+
+
+def select_provider_and_call_function(caller_function_name: str, **kwargs: Any) -> None:
+    """Prompt the user to select a cloud provider and call the corresponding function.
+
+    Args:
+        caller_function_name (str): The name of the calling
+            function (e.g., "deploy", "configure").
+        **kwargs (Any): Options passed on to the provider function.
+    """
+    call_provider_function(select_provider(), caller_function_name, **kwargs)
 
 
 def _dynamic_import(module_path: str) -> Any:
@@ -0,0 +1,211 @@
+"""This module records timelines of long-running commands as traces.
+
+Phases of work are recorded as spans with a start, an end and metadata.
+Spans nest, and the recorded timeline can be written in the Chrome trace
+event format, which chrome://tracing and https://ui.perfetto.dev open,
+and summarized in the terminal.
+
+Functions:
+    - start_tracing: Start recording spans into a new tracer.
+    - stop_tracing: Stop recording spans.
+    - span: Context manager recording a span into the active tracer.
+    - annotate: Add metadata to the trace of the active tracer.
+
+Example:
+    tracer = start_tracing()
+    with span("Create endpoint", endpoint_name=endpoint_name):
+        ...
+    stop_tracing()
+    tracer.write("deploy-trace.json")
+    click.echo(tracer.summary())
+
+Note:
+    Spans are no-ops while no tracer is active, so the code being traced
+    does not need to know whether tracing is enabled.
+
+    Nesting follows the `contextvars` context, so spans opened in worker
+    threads nest under the span that submitted the work as long as the
+    work runs in a copy of the submitter's context, e.g. with
+    `executor.submit(contextvars.copy_context().run, function)`.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+
+class Tracer:
+    """Records nested spans of work."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        """Initialize a tracer without spans.
+
+        Args:
+            clock (Callable[[], float]): Clock in seconds.
+        """
+        self.spans: List[Dict[str, Any]] = []
+        self.metadata: Dict[str, Any] = {}
+        self._clock = clock
+        self._origin = clock()
+        self._depth: contextvars.ContextVar[int] = contextvars.ContextVar(
+            "depth", default=0
+        )
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Record the work done in the block as a span.
+
+        Args:
+            name (str): The name of the span.
+            **args (Any): Metadata of the span.
+
+        Yields:
+            Dict[str, Any]: The metadata of the span, to add to.
+        """
+        depth = self._depth.get()
+        span: Dict[str, Any] = {
+            "name": name,
+            "start": self._clock() - self._origin,
+            "end": None,
+            "depth": depth,
+            "thread": threading.get_ident(),
+            "args": dict(args),
+        }
+        self.spans.append(span)
+        token = self._depth.set(depth + 1)
+        try:
+            yield span["args"]
+        except BaseException as e:
+            span["args"]["error"] = str(e) or type(e).__name__
+            raise
+        finally:
+            span["end"] = self._clock() - self._origin
+            self._depth.reset(token)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Export the spans in the Chrome trace event format.
+
+        Returns:
+            Dict[str, Any]: The trace, with one complete event per span.
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "sych-llm-playground"},
+            }
+        ]
+        for span in self.spans:
+            end = span["end"] if span["end"] is not None else span["start"]
+            events.append(
+                {
+                    "name": span["name"],
+                    "cat": "sych-llm-playground",
+                    "ph": "X",
+                    "ts": round(span["start"] * 1e6),
+                    "dur": round((end - span["start"]) * 1e6),
+                    "pid": pid,
+                    "tid": span["thread"],
+                    "args": span["args"],
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": self.metadata,
+        }
+
+    def write(self, path: str) -> None:
+        """Write the spans to a Chrome trace file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, indent=2, default=str)
+
+    def summary(self) -> str:
+        """Summarize the spans, indented by nesting, in the order they started.
+
+        Returns:
+            str: One line per span with its duration and its share of the
+                total duration of the top-level spans.
+        """
+        total = sum(
+            span["end"] - span["start"]
+            for span in self.spans
+            if span["depth"] == 0 and span["end"] is not None
+        )
+        lines = []
+        for span in self.spans:
+            if span["end"] is None:
+                continue
+            duration = span["end"] - span["start"]
+            share = f"{duration / total:4.0%}" if total else "   -"
+            failed = " (failed)" if "error" in span["args"] else ""
+            lines.append(
+                f"{duration:9.2f}s {share}  "
+                + "  " * span["depth"]
+                + f"{span['name']}{failed}"
+            )
+        return "\n".join(lines)
+
+
+_active_tracer: Optional[Tracer] = None
+
+
+def start_tracing() -> Tracer:
+    """Start recording spans into a new tracer.
+
+    Returns:
+        Tracer: The tracer recording the spans.
+    """
+    global _active_tracer
+    _active_tracer = Tracer()
+    return _active_tracer
+
+
+def stop_tracing() -> None:
+    """Stop recording spans."""
+    global _active_tracer
+    _active_tracer = None
+
+
+@contextlib.contextmanager
+def span(name: str, **args: Any) -> Iterator[Dict[str, Any]]:
+    """Record the work done in the block as a span of the active tracer.
+
+    Args:
+        name (str): The name of the span.
+        **args (Any): Metadata of the span.
+
+    Yields:
+        Dict[str, Any]: The metadata of the span, to add to.
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        yield dict(args)
+        return
+    with tracer.span(name, **args) as span_args:
+        yield span_args
+
+
+def annotate(**metadata: Any) -> None:
+    """Add metadata to the trace of the active tracer, e.g. the region.
+
+    Args:
+        **metadata (Any): The metadata.
+    """
+    if _active_tracer is not None:
+        _active_tracer.metadata.update(metadata)
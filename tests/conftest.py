@@ -0,0 +1,22 @@
+"""Fixtures shared by the test cases."""
+
+from typing import Any
+from typing import Callable
+
+import boto3
+import pytest
+
+
+@pytest.fixture
+def make_client() -> Callable[..., Any]:
+    """Fixture creating boto3 clients that never reach AWS."""
+
+    def make(service: str, region: str = "us-east-1") -> Any:
+        return boto3.client(
+            service,
+            region_name=region,
+            aws_access_key_id="x",
+            aws_secret_access_key="x",
+        )
+
+    return make
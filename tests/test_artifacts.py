@@ -0,0 +1,98 @@
+"""Test cases for the JumpStart artifact cache."""
+
+import json
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+
+import boto3
+import pytest
+from sagemaker.jumpstart.accessors import JumpStartModelsAccessor
+from sagemaker.session import Session
+
+from sych_llm_playground.providers.aws.utils import artifacts
+from sych_llm_playground.providers.aws.utils.artifacts import build_model
+from sych_llm_playground.providers.aws.utils.artifacts import invalidate_artifacts
+from sych_llm_playground.providers.aws.utils.artifacts import load_artifacts
+from sych_llm_playground.providers.aws.utils.artifacts import resolve_artifacts
+
+
+MODEL_ID = "meta-textgeneration-llama-2-7b-f"
+
+ARTIFACTS = {
+    "image_uri": "763104351884.dkr.ecr.us-east-1.amazonaws.com/tgi:latest",
+    "model_data": "s3://jumpstart-cache-prod-us-east-1/llama-2-7b-f.tar.gz",
+    "env": {"SM_NUM_GPUS": "1"},
+    "enable_network_isolation": True,
+    "deploy": {"initial_instance_count": 1, "instance_type": "ml.g5.2xlarge"},
+}
+
+
+@pytest.fixture
+def lookups(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Use a temporary cache and record the lookups of artifacts."""
+    calls: List[str] = []
+
+    def resolve(model_id: str, model_version: str, region: str) -> Dict[str, Any]:
+        calls.append(f"{region}/{model_id}/{model_version}")
+        return ARTIFACTS
+
+    monkeypatch.setattr(artifacts, "ARTIFACTS_FILE", str(tmp_path / "artifacts.json"))
+    monkeypatch.setattr(artifacts, "_resolve", resolve)
+    return calls
+
+
+def test_warm_cache_skips_lookups(
+    lookups: List[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It resolves artifacts once and builds models offline afterwards."""
+    assert resolve_artifacts(MODEL_ID, "2.0.0", "us-east-1") == ARTIFACTS
+    assert lookups == [f"us-east-1/{MODEL_ID}/2.0.0"]
+
+    def fail(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("JumpStart lookup on a warm cache")
+
+    monkeypatch.setattr(artifacts, "_resolve", fail)
+    monkeypatch.setattr(JumpStartModelsAccessor, "get_model_specs", fail)
+    cached = resolve_artifacts(MODEL_ID, "2.0.0", "us-east-1")
+    session = Session(
+        boto_session=boto3.Session(
+            region_name="us-east-1",
+            aws_access_key_id="x",
+            aws_secret_access_key="x",
+        )
+    )
+    model = build_model(cached, "arn:aws:iam::123456789012:role/role", "m", session)
+
+    assert model.image_uri == ARTIFACTS["image_uri"]
+    assert model.model_data == ARTIFACTS["model_data"]
+    assert model.env == ARTIFACTS["env"]
+
+
+def test_cache_keys_and_invalidation(lookups: List[str]) -> None:
+    """It keys artifacts by region, model and version and drops them on demand."""
+    resolve_artifacts(MODEL_ID, "2.0.0", "us-east-1")
+    resolve_artifacts(MODEL_ID, "2.0.0", "us-west-2")
+    resolve_artifacts(MODEL_ID, "1.1.0", "us-east-1")
+    resolve_artifacts("meta-textgeneration-llama-2-7b", "2.0.0", "us-east-1")
+    resolve_artifacts(MODEL_ID, "2.0.0", "us-east-1", refresh=True)
+    assert len(lookups) == 5
+
+    invalidate_artifacts(MODEL_ID)
+    assert [*load_artifacts()] == ["us-east-1/meta-textgeneration-llama-2-7b/2.0.0"]
+    invalidate_artifacts()
+    assert load_artifacts() == {}
+
+
+def test_cache_version(lookups: List[str]) -> None:
+    """It discards caches written by other versions."""
+    resolve_artifacts(MODEL_ID, "2.0.0", "us-east-1")
+    with open(artifacts.ARTIFACTS_FILE) as f:
+        cache = json.load(f)
+    cache["sagemaker_version"] = "0.0.0"
+    with open(artifacts.ARTIFACTS_FILE, "w") as f:
+        json.dump(cache, f)
+
+    resolve_artifacts(MODEL_ID, "2.0.0", "us-east-1")
+    assert len(lookups) == 2
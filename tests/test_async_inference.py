@@ -0,0 +1,148 @@
+"""Test cases for the asynchronous inference client."""
+
+import io
+import json
+from typing import Any
+from typing import Dict
+from typing import Tuple
+
+import pytest
+from botocore.exceptions import ClientError
+
+from sych_llm_playground.providers.aws.utils.async_inference import AsyncInferenceClient
+from sych_llm_playground.providers.aws.utils.async_inference import AsyncInferenceError
+from sych_llm_playground.providers.aws.utils.async_inference import parse_s3_uri
+
+
+OUTPUT_PATH = "s3://bucket/sych-llm-pg/async/e-1/output"
+
+
+class LocalS3:
+    """In-memory stand-in for the S3 client."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+        self.reads = 0
+
+    def put_object(self, **kwargs: Any) -> Dict[str, Any]:
+        """Store an object."""
+        self.objects[kwargs["Bucket"], kwargs["Key"]] = kwargs["Body"]
+        return {}
+
+    def get_object(self, **kwargs: Any) -> Dict[str, Any]:
+        """Return a stored object, or raise NoSuchKey like S3."""
+        self.reads += 1
+        key = kwargs["Bucket"], kwargs["Key"]
+        if key not in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "NoSuchKey", "Message": "Not found"}}, "GetObject"
+            )
+        return {"Body": io.BytesIO(self.objects[key])}
+
+
+class AsyncRuntime:
+    """Stand-in for an asynchronous endpoint, processing requests on the first poll."""
+
+    def __init__(self, s3: LocalS3) -> None:
+        """Initialize the endpoint with the S3 store it reads from and writes to."""
+        self.s3 = s3
+        self.requests: Dict[str, Any] = {}
+
+    def invoke_endpoint_async(self, **kwargs: Any) -> Dict[str, Any]:
+        """Accept a request, like SageMaker, before the response is written."""
+        inference_id = kwargs["InferenceId"]
+        prefix = "s3://bucket/sych-llm-pg/async/e-1"
+        self.requests[inference_id] = kwargs["InputLocation"]
+        return {
+            "OutputLocation": f"{prefix}/output/{inference_id}.out",
+            "FailureLocation": f"{prefix}/failure/{inference_id}-error.out",
+        }
+
+    def process(self) -> None:
+        """Write the responses of all accepted requests."""
+        for inference_id, input_location in self.requests.items():
+            payload = json.loads(self.s3.objects[parse_s3_uri(input_location)])
+            if payload["inputs"] == "fail":
+                key = f"sych-llm-pg/async/e-1/failure/{inference_id}-error.out"
+                self.s3.objects["bucket", key] = b"Model crashed"
+            else:
+                key = f"sych-llm-pg/async/e-1/output/{inference_id}.out"
+                body = json.dumps([{"generation": payload["inputs"].upper()}])
+                self.s3.objects["bucket", key] = body.encode()
+        self.requests = {}
+
+
+@pytest.fixture
+def s3() -> LocalS3:
+    """Fixture for the local S3 stand-in."""
+    return LocalS3()
+
+
+def test_map_collects_responses_and_failures(s3: LocalS3) -> None:
+    """It uploads payloads, then polls until every response has arrived."""
+    runtime = AsyncRuntime(s3)
+    client = AsyncInferenceClient(
+        "e-1", OUTPUT_PATH, s3_client=s3, runtime_client=runtime, poll_interval=0
+    )
+    payloads = [{"inputs": "a"}, {"inputs": "fail"}, {"inputs": "b"}]
+
+    original_get_object = s3.get_object
+
+    def get_object(**kwargs: Any) -> Dict[str, Any]:
+        # The endpoint processes the queue once polling starts.
+        runtime.process()
+        return original_get_object(**kwargs)
+
+    s3.get_object = get_object  # type: ignore[method-assign]
+    results = dict(client.map(payloads))
+
+    assert results[0] == [{"generation": "A"}]
+    assert results[2] == [{"generation": "B"}]
+    assert isinstance(results[1], AsyncInferenceError)
+    assert "Model crashed" in str(results[1])
+    uploaded = [key for _, key in s3.objects if "/input/" in key]
+    assert len(uploaded) == 3
+    assert all(key.startswith("sych-llm-pg/async/e-1/input/") for key in uploaded)
+
+
+def test_result_times_out(s3: LocalS3) -> None:
+    """It gives up on responses that do not arrive in time."""
+    client = AsyncInferenceClient(
+        "e-1",
+        OUTPUT_PATH,
+        s3_client=s3,
+        runtime_client=AsyncRuntime(s3),
+        poll_interval=0,
+        timeout=0,
+    )
+
+    with pytest.raises(AsyncInferenceError, match="No response"):
+        client.invoke({"inputs": "a"})
+
+
+def test_for_endpoint_requires_async_endpoint(s3: LocalS3) -> None:
+    """It reads the output path of asynchronous endpoints only."""
+
+    class SageMaker:
+        def __init__(self, config: Dict[str, Any]) -> None:
+            self.config = config
+
+        def describe_endpoint(self, **kwargs: Any) -> Dict[str, Any]:
+            return {"EndpointConfigName": "config"}
+
+        def describe_endpoint_config(self, **kwargs: Any) -> Dict[str, Any]:
+            return self.config
+
+    async_config = {
+        "AsyncInferenceConfig": {"OutputConfig": {"S3OutputPath": "s3://b/x/output"}}
+    }
+    client = AsyncInferenceClient.for_endpoint(
+        "e-1", SageMaker(async_config), s3_client=s3, runtime_client=object()
+    )
+    assert (client.bucket, client.input_prefix) == ("b", "x/input")
+
+    with pytest.raises(AsyncInferenceError, match="not an asynchronous endpoint"):
+        AsyncInferenceClient.for_endpoint(
+            "e-1", SageMaker({}), s3_client=s3, runtime_client=object()
+        )
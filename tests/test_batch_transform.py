@@ -0,0 +1,129 @@
+"""Test cases for the Batch Transform utilities."""
+
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from sych_llm_playground.providers.aws.utils.batch_transform import model_id_from_model
+from sych_llm_playground.providers.aws.utils.batch_transform import shard_lines
+from sych_llm_playground.providers.aws.utils.batch_transform import stream_results
+from sych_llm_playground.providers.aws.utils.batch_transform import upload_dataset
+from sych_llm_playground.providers.aws.utils.batch_transform import (
+    wait_for_transform_job,
+)
+
+
+class Body:
+    """Streaming body of an S3 object."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize the body with its content."""
+        self.data = data
+
+    def iter_lines(self) -> Iterator[bytes]:
+        """Yield the lines of the content."""
+        yield from self.data.splitlines()
+
+
+class LocalS3:
+    """In-memory stand-in for the S3 client."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+
+    def put_object(self, **kwargs: Any) -> Dict[str, Any]:
+        """Store an object."""
+        self.objects[kwargs["Bucket"], kwargs["Key"]] = kwargs["Body"]
+        return {}
+
+    def get_object(self, **kwargs: Any) -> Dict[str, Any]:
+        """Return a stored object."""
+        return {"Body": Body(self.objects[kwargs["Bucket"], kwargs["Key"]])}
+
+    def get_paginator(self, operation: str) -> "LocalS3":
+        """Return the paginator of list_objects_v2."""
+        return self
+
+    def paginate(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        """List the objects under a prefix as a single page."""
+        return [
+            {
+                "Contents": [
+                    {"Key": key, "Size": len(data)}
+                    for (bucket, key), data in self.objects.items()
+                    if bucket == kwargs["Bucket"] and key.startswith(kwargs["Prefix"])
+                ]
+            }
+        ]
+
+
+class TransformJobs:
+    """Stand-in for the SageMaker client, transforming a shard on every poll."""
+
+    def __init__(self, s3: LocalS3, input_keys: List[str]) -> None:
+        """Initialize the job with the shards to transform."""
+        self.s3 = s3
+        self.remaining = list(input_keys)
+
+    def describe_transform_job(self, **kwargs: Any) -> Dict[str, Any]:
+        """Transform the next shard and describe the job."""
+        if self.remaining:
+            key = self.remaining.pop(0)
+            records = self.s3.objects["bucket", key].splitlines()
+            name = key.rsplit("/", 1)[-1]
+            self.s3.objects["bucket", f"out/{name}.out"] = b"\n".join(
+                b'{"result": ' + record + b"}" for record in records
+            )
+        status = "InProgress" if self.remaining else "Completed"
+        return {"TransformJobStatus": status}
+
+
+def test_model_id_from_model() -> None:
+    """It extracts the model ID from the names of created models."""
+    name = "sych-llm-pg-meta-textgeneration-llama-2-7b-f-m-1692399247"
+    assert model_id_from_model(name) == "meta-textgeneration-llama-2-7b-f"
+    assert model_id_from_model("other-model") is None
+
+
+def test_shard_lines() -> None:
+    """It splits lines into ordered, contiguous shards without blank lines."""
+    lines = [b"1\n", b"\n", b"2\n", b"3\n", b"4\n", b"5"]
+    assert shard_lines(lines, 2) == [[b"1", b"2", b"3"], [b"4", b"5"]]
+    assert shard_lines(lines, 10) == [[b"1"], [b"2"], [b"3"], [b"4"], [b"5"]]
+
+
+def test_transform_round_trip(tmp_path: Path) -> None:
+    """It uploads shards, reports progress and streams results in order."""
+    dataset = tmp_path / "dataset.jsonl"
+    dataset.write_text("\n".join(str(i) for i in range(10)) + "\n")
+    s3 = LocalS3()
+
+    input_uri, keys = upload_dataset(str(dataset), "bucket", "in", 4, s3)
+    assert input_uri == "s3://bucket/in/"
+    assert len(keys) == 4
+
+    progress: List[Tuple[str, int, int]] = []
+    job = wait_for_transform_job(
+        "job",
+        input_uri,
+        "s3://bucket/out",
+        keys,
+        lambda *args: progress.append(args),
+        poll_interval=0,
+        sagemaker_client=TransformJobs(s3, keys),
+        s3_client=s3,
+    )
+
+    assert job["TransformJobStatus"] == "Completed"
+    assert progress == [
+        ("InProgress", 1, 4),
+        ("InProgress", 2, 4),
+        ("InProgress", 3, 4),
+        ("Completed", 4, 4),
+    ]
+    results = list(stream_results(input_uri, "s3://bucket/out", keys, s3))
+    assert results == [b'{"result": %d}' % i for i in range(10)]
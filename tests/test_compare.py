@@ -0,0 +1,55 @@
+"""Test cases for side-by-side comparisons of models."""
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from sych_llm_playground.providers.aws.utils.compare import Target
+from sych_llm_playground.providers.aws.utils.compare import compare_prompt
+from sych_llm_playground.providers.aws.utils.compare import side_by_side
+from sych_llm_playground.providers.aws.utils.compare import summarize_comparison
+
+
+def test_compare_prompt() -> None:
+    """It sends every model the payload of its family, and summarizes them."""
+    payloads: List[Dict[str, Any]] = []
+
+    def predict(payload: Dict[str, Any]) -> Any:
+        payloads.append(payload)
+        return [{"generation": "a" * 40}]
+
+    def chat(payload: Dict[str, Any]) -> Any:
+        payloads.append(payload)
+        return [{"generation": {"role": "assistant", "content": "b" * 80}}]
+
+    def failing(payload: Dict[str, Any]) -> Any:
+        raise TimeoutError("Model timed out")
+
+    targets: List[Target] = [
+        ("llama-2-7b", predict, "predict"),
+        ("llama-2-7b-f", chat, "chat"),
+        ("llama-2-70b", failing, "predict"),
+    ]
+    parameters = {"max_new_tokens": 64, "top_p": 0.9, "temperature": 0.6}
+    results = compare_prompt(targets, "Hello", parameters)
+
+    assert [result["target"] for result in results] == [
+        "llama-2-7b",
+        "llama-2-7b-f",
+        "llama-2-70b",
+    ]
+    assert results[1]["output"] == "b" * 80
+    assert results[2]["error"] == "Model timed out"
+    inputs = sorted(payloads, key=lambda payload: str(payload["inputs"]))
+    assert inputs[0]["inputs"] == "Hello"
+    assert inputs[1]["inputs"] == [[{"role": "user", "content": "Hello"}]]
+
+    rows = summarize_comparison(targets, results)
+    assert [row["output_tokens"] for row in rows] == [10, 20, None]
+    assert rows[2]["errors"] == 1
+
+
+def test_side_by_side() -> None:
+    """It wraps texts into columns of equal width."""
+    layout = side_by_side(["one two three four", "five"], width=23)
+    assert layout.splitlines() == ["one two      five", "three four"]
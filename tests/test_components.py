@@ -0,0 +1,182 @@
+"""Test cases for the inference component utilities."""
+
+import io
+import json
+from typing import Any
+from typing import Callable
+
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from sych_llm_playground.providers.aws.utils.components import ComponentDeploymentError
+from sych_llm_playground.providers.aws.utils.components import add_inference_component
+from sych_llm_playground.providers.aws.utils.components import component_env
+from sych_llm_playground.providers.aws.utils.components import create_shared_endpoint
+from sych_llm_playground.providers.aws.utils.components import is_shared_endpoint
+from sych_llm_playground.providers.aws.utils.components import model_id_from_component
+from sych_llm_playground.providers.aws.utils.components import unfit_models
+from sych_llm_playground.providers.aws.utils.components import wait_for_status
+from sych_llm_playground.providers.aws.utils.invocation import CUSTOM_ATTRIBUTES
+from sych_llm_playground.providers.aws.utils.invocation import invoke_endpoint
+from sych_llm_playground.providers.aws.utils.resources import _list_resources
+
+
+ENDPOINT = "sych-llm-pg-shared-e-1692399247"
+COMPONENT = "sych-llm-pg-meta-textgeneration-llama-2-7b-f-ic-1692399247"
+MODEL = "sych-llm-pg-meta-textgeneration-llama-2-7b-f-m-1692399247"
+
+
+def test_component_names() -> None:
+    """It recognizes shared endpoints and the models of components."""
+    assert is_shared_endpoint(ENDPOINT)
+    assert not is_shared_endpoint("sych-llm-pg-meta-textgeneration-llama-2-7b-f-e-1")
+    assert model_id_from_component(COMPONENT) == "meta-textgeneration-llama-2-7b-f"
+    assert model_id_from_component(MODEL) is None
+
+
+def test_component_accelerators() -> None:
+    """It sizes models to their components and to the instance type."""
+    env = {"SM_NUM_GPUS": "4", "HF_MODEL_ID": "/opt/ml/model"}
+    assert component_env(env, "meta-textgeneration-llama-2-13b-f") == {
+        "SM_NUM_GPUS": "2",
+        "HF_MODEL_ID": "/opt/ml/model",
+    }
+    assert env["SM_NUM_GPUS"] == "4"
+    models = ["meta-textgeneration-llama-2-13b", "meta-textgeneration-llama-2-70b"]
+    assert unfit_models(models, "ml.g5.12xlarge") == [models[1]]
+    assert unfit_models(models, "ml.g5.48xlarge") == []
+    assert unfit_models(models, "ml.unknown") == []
+
+
+def test_deploy_components(make_client: Callable[..., Any]) -> None:
+    """It creates a shared endpoint and reserves resources for each copy."""
+    sagemaker = make_client("sagemaker")
+    with Stubber(sagemaker) as stubber:
+        stubber.add_response(
+            "create_endpoint_config",
+            {"EndpointConfigArn": f"arn:aws:sagemaker:::endpoint-config/{ENDPOINT}"},
+            {
+                "EndpointConfigName": ENDPOINT,
+                "ExecutionRoleArn": "arn:aws:iam::123456789012:role/role",
+                "ProductionVariants": [
+                    {
+                        "VariantName": "AllTraffic",
+                        "InstanceType": "ml.g5.12xlarge",
+                        "InitialInstanceCount": 1,
+                        "RoutingConfig": {
+                            "RoutingStrategy": "LEAST_OUTSTANDING_REQUESTS"
+                        },
+                    }
+                ],
+            },
+        )
+        stubber.add_response(
+            "create_endpoint",
+            {"EndpointArn": f"arn:aws:sagemaker:::endpoint/{ENDPOINT}"},
+            {"EndpointName": ENDPOINT, "EndpointConfigName": ENDPOINT},
+        )
+        stubber.add_response(
+            "create_inference_component",
+            {"InferenceComponentArn": f"arn:aws:sagemaker:::ic/{COMPONENT}"},
+            {
+                "InferenceComponentName": COMPONENT,
+                "EndpointName": ENDPOINT,
+                "VariantName": "AllTraffic",
+                "Specification": {
+                    "ModelName": MODEL,
+                    "ComputeResourceRequirements": {
+                        "NumberOfAcceleratorDevicesRequired": 1,
+                        "MinMemoryRequiredInMb": 16384,
+                    },
+                },
+                "RuntimeConfig": {"CopyCount": 2},
+            },
+        )
+
+        create_shared_endpoint(
+            ENDPOINT,
+            "ml.g5.12xlarge",
+            1,
+            "arn:aws:iam::123456789012:role/role",
+            sagemaker,
+        )
+        add_inference_component(
+            ENDPOINT,
+            COMPONENT,
+            MODEL,
+            "meta-textgeneration-llama-2-7b-f",
+            copies=2,
+            sagemaker_client=sagemaker,
+        )
+        stubber.assert_no_pending_responses()
+
+
+def test_wait_for_status() -> None:
+    """It polls until the resource is in service and raises on failure."""
+    statuses = iter(["Creating", "Creating", "InService"])
+    wait_for_status(lambda: {"Status": next(statuses)}, "Status", poll_interval=0)
+    assert next(statuses, None) is None
+
+    try:
+        wait_for_status(
+            lambda: {"Status": "Failed", "FailureReason": "Insufficient capacity"},
+            "Status",
+            poll_interval=0,
+        )
+    except ComponentDeploymentError as e:
+        assert str(e) == "Insufficient capacity"
+    else:
+        raise AssertionError("ComponentDeploymentError not raised")
+
+
+def test_list_inference_components(make_client: Callable[..., Any]) -> None:
+    """It lists inference components with their endpoints."""
+    sagemaker = make_client("sagemaker")
+    with Stubber(sagemaker) as stubber:
+        stubber.add_response(
+            "list_inference_components",
+            {
+                "InferenceComponents": [
+                    {
+                        "InferenceComponentName": COMPONENT,
+                        "InferenceComponentArn": f"arn:aws:sagemaker:::ic/{COMPONENT}",
+                        "EndpointName": ENDPOINT,
+                        "EndpointArn": f"arn:aws:sagemaker:::endpoint/{ENDPOINT}",
+                        "VariantName": "AllTraffic",
+                        "InferenceComponentStatus": "InService",
+                        "CreationTime": "2023-08-19T00:00:00Z",
+                        "LastModifiedTime": "2023-08-19T00:00:00Z",
+                    }
+                ]
+            },
+            {"MaxResults": 99},
+        )
+        resources = _list_resources("Inference Component", sagemaker, "us-east-1", 99)
+
+    assert resources == [
+        {"name": COMPONENT, "endpoint": ENDPOINT, "status": "InService"}
+    ]
+
+
+def test_invoke_component(make_client: Callable[..., Any]) -> None:
+    """It addresses requests to a component of the shared endpoint."""
+    runtime = make_client("sagemaker-runtime")
+    data = b'[{"generation": "Hello"}]'
+    with Stubber(runtime) as stubber:
+        stubber.add_response(
+            "invoke_endpoint",
+            {"Body": StreamingBody(io.BytesIO(data), len(data))},
+            {
+                "EndpointName": ENDPOINT,
+                "InferenceComponentName": COMPONENT,
+                "ContentType": "application/json",
+                "Accept": "application/json",
+                "CustomAttributes": CUSTOM_ATTRIBUTES,
+                "Body": json.dumps({"inputs": "Hi"}),
+            },
+        )
+        response = invoke_endpoint(
+            ENDPOINT, {"inputs": "Hi"}, runtime, inference_component=COMPONENT
+        )
+
+    assert response == [{"generation": "Hello"}]
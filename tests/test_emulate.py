@@ -0,0 +1,165 @@
+"""Test cases for the local endpoint emulator."""
+
+import random
+import threading
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Iterator
+
+import boto3
+import pytest
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from sych_llm_playground.providers.aws.emulate import EmulatorServer
+from sych_llm_playground.providers.aws.emulate import LatencyModel
+from sych_llm_playground.providers.aws.emulate import create_emulator
+from sych_llm_playground.providers.aws.utils import clients
+from sych_llm_playground.providers.aws.utils.invocation import build_chat_payload
+from sych_llm_playground.providers.aws.utils.invocation import build_predict_payload
+from sych_llm_playground.providers.aws.utils.invocation import gateway_invoker
+from sych_llm_playground.providers.aws.utils.invocation import invoke_endpoint
+from sych_llm_playground.providers.aws.utils.invocation import invoke_endpoint_stream
+from sych_llm_playground.providers.aws.utils.invocation import parse_chat_response
+from sych_llm_playground.providers.aws.utils.invocation import parse_predict_response
+from sych_llm_playground.providers.aws.utils.resilience import THROTTLED
+from sych_llm_playground.providers.aws.utils.resilience import classify_error
+
+
+ENDPOINT = "sych-llm-pg-meta-textgeneration-llama-2-7b-e-1692586488"
+
+
+def start(server: EmulatorServer) -> Iterator[EmulatorServer]:
+    """Run an emulator in a thread until the test ends."""
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def emulator() -> Iterator[EmulatorServer]:
+    """Fixture running an emulator without delays on a free port."""
+    yield from start(
+        create_emulator("127.0.0.1", 0, time_to_first_token=0, token_delay=0)
+    )
+
+
+def runtime_client(server: EmulatorServer) -> Any:
+    """Create a SageMaker Runtime client pointed at an emulator."""
+    return boto3.client(
+        "sagemaker-runtime",
+        region_name="us-east-1",
+        endpoint_url=f"http://127.0.0.1:{server.server_port}",
+        aws_access_key_id="x",
+        aws_secret_access_key="x",
+        config=Config(retries={"max_attempts": 1}),
+    )
+
+
+def test_predict(emulator: EmulatorServer) -> None:
+    """It answers predict payloads with a generation limited by max_new_tokens."""
+    payload = build_predict_payload("The meaning of life is", max_new_tokens=4)
+    response = invoke_endpoint(ENDPOINT, payload, runtime_client(emulator))
+    assert parse_predict_response(response) == "This is a generated"
+
+
+def test_chat_through_gateway(emulator: EmulatorServer) -> None:
+    """It answers chat payloads on the API Gateway route."""
+    invoke = gateway_invoker(f"http://127.0.0.1:{emulator.server_port}/prod/predict")
+    response = invoke(build_chat_payload([{"role": "user", "content": "Hi"}]))
+    assert response[0]["generation"]["role"] == "assistant"
+    assert parse_chat_response(response).startswith("This is a generated")
+
+
+def test_response_stream(emulator: EmulatorServer) -> None:
+    """It streams the tokens as events of the response stream."""
+    payload = build_predict_payload("Hello", max_new_tokens=6)
+    tokens = list(invoke_endpoint_stream(ENDPOINT, payload, runtime_client(emulator)))
+    assert len(tokens) == 6
+    assert "".join(tokens) == "This is a generated response from"
+
+
+def test_injected_errors() -> None:
+    """It fails invocations with the injected error."""
+    server = create_emulator(
+        "127.0.0.1", 0, time_to_first_token=0, error_rate=1.0, error="throttling"
+    )
+    for emulator in start(server):
+        payload = build_predict_payload("Hello")
+        with pytest.raises(ClientError) as error:
+            invoke_endpoint(ENDPOINT, payload, runtime_client(emulator))
+        assert error.value.response["Error"]["Code"] == "ThrottlingException"
+        assert classify_error(error.value) == THROTTLED
+
+
+def test_concurrency_limit() -> None:
+    """It throttles invocations beyond the concurrency limit."""
+    server = create_emulator(
+        "127.0.0.1", 0, time_to_first_token=0.3, token_delay=0, max_concurrency=1
+    )
+    for emulator in start(server):
+        invoke = gateway_invoker(
+            f"http://127.0.0.1:{emulator.server_port}/prod/predict"
+        )
+        payload = build_predict_payload("Hello")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(invoke, payload) for _ in range(3)]
+        statuses = []
+        for future in futures:
+            error = future.exception()
+            statuses.append(
+                error.code if isinstance(error, urllib.error.HTTPError) else 200
+            )
+        assert sorted(statuses) == [200, 429, 429]
+
+
+def test_latency_model() -> None:
+    """It delays the first token by the TTFT and the others by the token delay."""
+    assert LatencyModel(0.5, 0.1).delays(3) == [0.5, 0.1, 0.1]
+    delays = LatencyModel(1.0, 1.0, jitter=0.2, rng=random.Random(0)).delays(100)
+    assert all(0.8 <= delay <= 1.2 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_runtime_url_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It points the SageMaker Runtime client at the URL of the environment."""
+    monkeypatch.setenv(clients.RUNTIME_URL_ENV, "http://127.0.0.1:8080")
+    clients.reset_clients()
+    try:
+        client = clients.get_client("sagemaker-runtime", region="us-east-1")
+        assert client.meta.endpoint_url == "http://127.0.0.1:8080"
+        sagemaker = clients.get_client("sagemaker", region="us-east-1")
+        assert sagemaker.meta.endpoint_url != "http://127.0.0.1:8080"
+    finally:
+        clients.reset_clients()
+
+
+def test_gateway_compression(emulator: EmulatorServer) -> None:
+    """It sends long conversations compressed through the API Gateway route."""
+    url = f"http://127.0.0.1:{emulator.server_port}/prod/predict"
+    history = [{"role": "user", "content": f"Message {i}. " * 20} for i in range(50)]
+    payload = build_chat_payload(history)
+
+    plain = gateway_invoker(url, compress=False)(payload)
+    plain_bytes = emulator.bytes_received
+    compressed = gateway_invoker(url)(payload)
+
+    assert compressed == plain
+    assert emulator.bytes_received - plain_bytes < plain_bytes / 5
+
+
+def test_gateway_response_compression() -> None:
+    """It compresses large responses for clients accepting gzip."""
+    server = create_emulator(
+        "127.0.0.1", 0, time_to_first_token=0, token_delay=0, max_tokens=400
+    )
+    for emulator in start(server):
+        url = f"http://127.0.0.1:{emulator.server_port}/prod/predict"
+        payload = build_predict_payload("Hello", max_new_tokens=400)
+        response = gateway_invoker(url)(payload)
+        assert len(parse_predict_response(response).split()) == 400
+        assert emulator.bytes_sent < len(parse_predict_response(response)) / 5
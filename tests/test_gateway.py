@@ -0,0 +1,170 @@
+"""Test cases for the stage settings of API Gateways."""
+
+import json
+import threading
+import urllib.request
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import pytest
+from botocore.stub import ANY
+from botocore.stub import Stubber
+
+from sych_llm_playground.providers.aws.emulate import create_emulator
+from sych_llm_playground.providers.aws.utils.gateway import BODY_HASH_HEADER
+from sych_llm_playground.providers.aws.utils.gateway import body_hash
+from sych_llm_playground.providers.aws.utils.gateway import create_usage_plan
+from sych_llm_playground.providers.aws.utils.gateway import delete_usage_plans
+from sych_llm_playground.providers.aws.utils.gateway import describe_gateway
+from sych_llm_playground.providers.aws.utils.gateway import stage_patch_operations
+from sych_llm_playground.providers.aws.utils.invocation import build_predict_payload
+from sych_llm_playground.providers.aws.utils.invocation import gateway_invoker
+
+
+API_ID = "a1b2c3d4e5"
+NAME = "sych-llm-pg-api-sych-llm-pg-meta-textgeneration-llama-2-7b-f-e-1692399247"
+
+
+def test_stage_patch_operations() -> None:
+    """It enables caching and throttling of the predict method."""
+    operations = stage_patch_operations(
+        {"cache_size": "0.5", "cache_ttl": 60, "rate_limit": 10.0, "burst_limit": 20}
+    )
+    assert {op["path"]: op["value"] for op in operations} == {
+        "/~1predict/POST/caching/enabled": "true",
+        "/~1predict/POST/caching/ttlInSeconds": "60",
+        "/~1predict/POST/throttling/rateLimit": "10.0",
+        "/~1predict/POST/throttling/burstLimit": "20",
+    }
+    assert stage_patch_operations({"cache_size": None, "cache_ttl": 300}) == []
+
+
+def test_create_usage_plan(make_client: Callable[..., Any]) -> None:
+    """It creates a usage plan with a daily quota and an API key."""
+    client = make_client("apigateway")
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "create_usage_plan",
+            {"id": "plan"},
+            {
+                "name": NAME,
+                "description": ANY,
+                "apiStages": [{"apiId": API_ID, "stage": "prod"}],
+                "quota": {"limit": 1000, "period": "DAY"},
+                "throttle": {"rateLimit": 5.0},
+            },
+        )
+        stubber.add_response(
+            "create_api_key",
+            {"id": "key", "value": "secret"},
+            {"name": NAME, "enabled": True},
+        )
+        stubber.add_response(
+            "create_usage_plan_key",
+            {},
+            {"usagePlanId": "plan", "keyId": "key", "keyType": "API_KEY"},
+        )
+        settings = {"quota": 1000, "rate_limit": 5.0, "burst_limit": None}
+        assert create_usage_plan(client, API_ID, NAME, settings) == "secret"
+
+
+def test_describe_gateway(make_client: Callable[..., Any]) -> None:
+    """It describes the cache, throttling and usage plan of an API."""
+    usage_plans: List[Dict[str, Any]] = [
+        {"id": "other", "name": "other", "apiStages": [{"apiId": "x"}]},
+        {
+            "id": "plan",
+            "name": "plan",
+            "apiStages": [{"apiId": API_ID, "stage": "prod"}],
+            "quota": {"limit": 1000, "period": "DAY"},
+        },
+    ]
+    client = make_client("apigateway")
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "get_stage",
+            {
+                "cacheClusterEnabled": True,
+                "cacheClusterSize": "0.5",
+                "methodSettings": {
+                    "~1predict/POST": {
+                        "cachingEnabled": True,
+                        "cacheTtlInSeconds": 60,
+                        "throttlingRateLimit": 10.0,
+                        "throttlingBurstLimit": 20,
+                    }
+                },
+            },
+            {"restApiId": API_ID, "stageName": "prod"},
+        )
+        assert describe_gateway(client, API_ID, usage_plans) == {
+            "cache": "0.5 GB, TTL 60s",
+            "throttling": "10 requests/s, burst 20",
+            "usage_plan": "plan: 1000 requests/day",
+        }
+
+
+def test_delete_usage_plans(make_client: Callable[..., Any]) -> None:
+    """It deletes the usage plans of an API before the API is deleted."""
+    client = make_client("apigateway")
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "get_usage_plans",
+            {
+                "items": [
+                    {"id": "other", "apiStages": [{"apiId": "x", "stage": "prod"}]},
+                    {"id": "plan", "apiStages": [{"apiId": API_ID, "stage": "prod"}]},
+                ]
+            },
+            {},
+        )
+        stubber.add_response(
+            "get_usage_plan_keys", {"items": [{"id": "key"}]}, {"usagePlanId": "plan"}
+        )
+        stubber.add_response("delete_api_key", {}, {"apiKey": "key"})
+        stubber.add_response(
+            "update_usage_plan",
+            {},
+            {
+                "usagePlanId": "plan",
+                "patchOperations": [
+                    {"op": "remove", "path": "/apiStages", "value": f"{API_ID}:prod"}
+                ],
+            },
+        )
+        stubber.add_response("delete_usage_plan", {}, {"usagePlanId": "plan"})
+        delete_usage_plans(client, API_ID)
+        stubber.assert_no_pending_responses()
+
+
+def test_gateway_cache_key_headers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It sends the body hash and API key, with a random hash to bypass caches."""
+    requests: List[urllib.request.Request] = []
+    urlopen = urllib.request.urlopen
+
+    def record(request: urllib.request.Request, timeout: float) -> Any:
+        requests.append(request)
+        return urlopen(request, timeout=timeout)
+
+    monkeypatch.setattr(urllib.request, "urlopen", record)
+    server = create_emulator("127.0.0.1", 0, time_to_first_token=0, token_delay=0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/prod/predict"
+        payload = build_predict_payload("Hello", max_new_tokens=2)
+        gateway_invoker(url, api_key="secret")(payload)
+        gateway_invoker(url, cache=False)(payload)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    cached, uncached = requests
+    expected = body_hash(json.dumps(payload).encode("utf-8"))
+    assert cached.get_header(BODY_HASH_HEADER.capitalize()) == expected
+    assert cached.get_header("X-api-key") == "secret"
+    assert uncached.get_header(BODY_HASH_HEADER.capitalize()) != expected
+    assert not uncached.has_header("X-api-key")
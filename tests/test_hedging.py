@@ -0,0 +1,61 @@
+"""Test cases for deadlines and hedged invocations."""
+
+import itertools
+import time
+from typing import Any
+from typing import Dict
+
+import pytest
+
+from sych_llm_playground.providers.aws.utils.hedging import DeadlineExceededError
+from sych_llm_playground.providers.aws.utils.hedging import HedgedInvoker
+
+
+def test_hedge_wins_over_straggler() -> None:
+    """It sends a duplicate after the hedge delay and returns the first answer."""
+    attempts = itertools.count()
+
+    def invoker(payload: Dict[str, Any]) -> Any:
+        attempt = next(attempts)
+        # The sixth request straggles, its duplicate answers right away.
+        time.sleep(1.0 if attempt == 5 else 0.01)
+        return attempt
+
+    hedger = HedgedInvoker(invoker, hedge_percentile=50, min_samples=5)
+    for _ in range(5):
+        hedger.invoke({})
+
+    start = time.monotonic()
+    assert hedger.invoke({}) == 6
+    assert time.monotonic() - start < 0.5
+    summary = hedger.summary()
+    assert summary["hedged"] == 1
+    assert summary["hedge_wins"] == 1
+    hedger.shutdown()
+
+
+def test_deadline_exceeded() -> None:
+    """It fails requests that do not answer before the deadline."""
+
+    def invoker(payload: Dict[str, Any]) -> Any:
+        time.sleep(0.5)
+
+    hedger = HedgedInvoker(invoker, deadline=0.05)
+
+    with pytest.raises(DeadlineExceededError):
+        hedger.invoke({})
+    assert hedger.summary()["deadlines_exceeded"] == 1
+    hedger.shutdown()
+
+
+def test_errors_are_raised() -> None:
+    """It raises the error of a failed request."""
+
+    def invoker(payload: Dict[str, Any]) -> Any:
+        raise RuntimeError("ModelError")
+
+    hedger = HedgedInvoker(invoker, deadline=1)
+
+    with pytest.raises(RuntimeError):
+        hedger.invoke({})
+    hedger.shutdown()
@@ -0,0 +1,147 @@
+"""Test cases for hibernating endpoints."""
+
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from sych_llm_playground.providers.aws.utils import hibernation
+from sych_llm_playground.providers.aws.utils.hibernation import drop_hibernation
+from sych_llm_playground.providers.aws.utils.hibernation import hibernate_endpoint
+from sych_llm_playground.providers.aws.utils.hibernation import load_hibernated
+from sych_llm_playground.providers.aws.utils.hibernation import record_hibernation
+from sych_llm_playground.providers.aws.utils.hibernation import resume_endpoint
+
+
+ENDPOINT_NAME = "sych-llm-pg-meta-textgeneration-llama-2-7b-f-e-1692586488"
+
+ENDPOINT_ARN = f"arn:aws:sagemaker:us-east-1:1:endpoint/{ENDPOINT_NAME}"
+
+RESOURCE_ID = f"endpoint/{ENDPOINT_NAME}/variant/AllTraffic"
+
+
+@pytest.fixture(autouse=True)
+def hibernation_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Fixture keeping the records in a temporary file."""
+    path = tmp_path / "hibernated.json"
+    monkeypatch.setattr(hibernation, "HIBERNATION_FILE", str(path))
+    return path
+
+
+def describe_endpoint_response() -> Dict[str, Any]:
+    """Return the description of the endpoint in service."""
+    return {
+        "EndpointName": ENDPOINT_NAME,
+        "EndpointArn": ENDPOINT_ARN,
+        "EndpointConfigName": ENDPOINT_NAME,
+        "EndpointStatus": "InService",
+        "CreationTime": 0,
+        "LastModifiedTime": 0,
+    }
+
+
+def test_hibernate_and_resume(make_client: Callable[..., Any]) -> None:
+    """It deletes only the endpoint, and resumes it from its configuration."""
+    sagemaker_client = make_client("sagemaker")
+    autoscaling_client = make_client("application-autoscaling")
+    with Stubber(sagemaker_client) as sagemaker, Stubber(
+        autoscaling_client
+    ) as autoscaling:
+        sagemaker.add_response(
+            "describe_endpoint",
+            describe_endpoint_response(),
+            {"EndpointName": ENDPOINT_NAME},
+        )
+        autoscaling.add_response(
+            "describe_scalable_targets",
+            {
+                "ScalableTargets": [
+                    {
+                        "ServiceNamespace": "sagemaker",
+                        "ResourceId": RESOURCE_ID,
+                        "ScalableDimension": hibernation.SCALABLE_DIMENSION,
+                        "MinCapacity": 0,
+                        "MaxCapacity": 2,
+                        "RoleARN": "arn:aws:iam::1:role/autoscaling",
+                        "CreationTime": 0,
+                    }
+                ]
+            },
+            {
+                "ServiceNamespace": "sagemaker",
+                "ResourceIds": [RESOURCE_ID],
+                "ScalableDimension": hibernation.SCALABLE_DIMENSION,
+            },
+        )
+        autoscaling.add_response(
+            "deregister_scalable_target",
+            {},
+            {
+                "ServiceNamespace": "sagemaker",
+                "ResourceId": RESOURCE_ID,
+                "ScalableDimension": hibernation.SCALABLE_DIMENSION,
+            },
+        )
+        sagemaker.add_response("delete_endpoint", {}, {"EndpointName": ENDPOINT_NAME})
+        record = hibernate_endpoint(
+            ENDPOINT_NAME, "us-east-1", sagemaker_client, autoscaling_client
+        )
+
+        sagemaker.add_response(
+            "create_endpoint",
+            {"EndpointArn": ENDPOINT_ARN},
+            {"EndpointName": ENDPOINT_NAME, "EndpointConfigName": ENDPOINT_NAME},
+        )
+        resume_endpoint(record, sagemaker_client)
+        sagemaker.assert_no_pending_responses()
+        autoscaling.assert_no_pending_responses()
+
+    assert record["endpoint_config"] == ENDPOINT_NAME
+    assert record["scale_to_zero"] == 2
+    assert [*load_hibernated()] == [f"us-east-1/{ENDPOINT_NAME}"]
+
+
+def test_refused_hibernation_is_not_recorded(make_client: Callable[..., Any]) -> None:
+    """It drops the record again if the endpoint cannot be deleted."""
+    sagemaker_client = make_client("sagemaker")
+    autoscaling_client = make_client("application-autoscaling")
+    with Stubber(sagemaker_client) as sagemaker, Stubber(
+        autoscaling_client
+    ) as autoscaling:
+        sagemaker.add_response(
+            "describe_endpoint",
+            describe_endpoint_response(),
+            {"EndpointName": ENDPOINT_NAME},
+        )
+        autoscaling.add_response("describe_scalable_targets", {"ScalableTargets": []})
+        sagemaker.add_client_error("delete_endpoint", "ValidationException")
+        with pytest.raises(ClientError):
+            hibernate_endpoint(
+                ENDPOINT_NAME, "us-east-1", sagemaker_client, autoscaling_client
+            )
+
+    assert load_hibernated() == {}
+
+
+def test_hibernation_records() -> None:
+    """It keeps the records of hibernated endpoints by region."""
+    assert load_hibernated() == {}
+
+    for region in ["us-east-1", "eu-west-1"]:
+        record_hibernation(
+            {
+                "endpoint_name": ENDPOINT_NAME,
+                "endpoint_config": ENDPOINT_NAME,
+                "region": region,
+                "scale_to_zero": None,
+                "hibernated_at": 0,
+            }
+        )
+    assert [*load_hibernated("eu-west-1")] == [f"eu-west-1/{ENDPOINT_NAME}"]
+
+    drop_hibernation(ENDPOINT_NAME, "us-east-1")
+    assert [*load_hibernated()] == [f"eu-west-1/{ENDPOINT_NAME}"]
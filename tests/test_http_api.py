@@ -0,0 +1,140 @@
+"""Test cases for the HTTP APIs of endpoints."""
+
+import base64
+import gzip
+import io
+import json
+import zipfile
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from sych_llm_playground.providers.aws.utils.http_api import PROXY_FUNCTION_TAG
+from sych_llm_playground.providers.aws.utils.http_api import build_proxy_package
+from sych_llm_playground.providers.aws.utils.http_api import delete_http_api
+from sych_llm_playground.providers.aws.utils.http_api import proxy_function_name
+from sych_llm_playground.providers.aws.utils.resources import _list_resources
+
+
+ENDPOINT = "sych-llm-pg-meta-textgeneration-llama-2-13b-f-e-1692399247"
+FUNCTION = "sych-llm-pg-proxy-meta-textgeneration-llama-2-13b-f-e-1692399247"
+
+
+@pytest.fixture
+def proxy(
+    monkeypatch: pytest.MonkeyPatch, make_client: Callable[..., Any]
+) -> Dict[str, Any]:
+    """Fixture loading the proxy function from its deployment package."""
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("ENDPOINT_NAME", ENDPOINT)
+    monkeypatch.setenv("MIN_COMPRESSION_SIZE", "1024")
+    with zipfile.ZipFile(io.BytesIO(build_proxy_package())) as archive:
+        source = archive.read("proxy.py").decode("utf-8")
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "proxy.py", "exec"), namespace)  # noqa: S102
+    namespace["runtime"] = make_client("sagemaker-runtime")
+    return namespace
+
+
+def test_proxy_function_name() -> None:
+    """It names proxy functions within the limit of Lambda."""
+    assert proxy_function_name(ENDPOINT) == FUNCTION
+    assert len(FUNCTION) == 64
+
+
+def test_proxy_compressed(proxy: Dict[str, Any]) -> None:
+    """It invokes the endpoint with gzip-compressed bodies both ways."""
+    payload = json.dumps({"inputs": "Hello"}).encode("utf-8")
+    generation = json.dumps([{"generation": "Hi " * 1000}]).encode("utf-8")
+    with Stubber(proxy["runtime"]) as stubber:
+        stubber.add_response(
+            "invoke_endpoint",
+            {"Body": StreamingBody(io.BytesIO(generation), len(generation))},
+            {
+                "EndpointName": ENDPOINT,
+                "ContentType": "application/json",
+                "Body": payload,
+                "CustomAttributes": "accept_eula=true",
+            },
+        )
+        response = proxy["handler"](
+            {
+                "headers": {
+                    "content-encoding": "gzip",
+                    "accept-encoding": "gzip, deflate",
+                    "custom_attributes": "accept_eula=true",
+                },
+                "body": base64.b64encode(gzip.compress(payload)).decode("ascii"),
+                "isBase64Encoded": True,
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert gzip.decompress(base64.b64decode(response["body"])) == generation
+
+
+def test_proxy_passes_errors_through(proxy: Dict[str, Any]) -> None:
+    """It returns the status code of the endpoint rather than a generic one."""
+    with Stubber(proxy["runtime"]) as stubber:
+        stubber.add_client_error(
+            "invoke_endpoint",
+            service_error_code="ModelError",
+            service_message="Input too long",
+            http_status_code=424,
+        )
+        response = proxy["handler"]({"body": '{"inputs": "Hello"}'}, None)
+
+    assert response["statusCode"] == 424
+    assert "Input too long" in json.loads(response["body"])["message"]
+
+
+def test_list_and_delete_http_apis(make_client: Callable[..., Any]) -> None:
+    """It lists HTTP APIs with their URL and deletes their proxy function."""
+    client = make_client("apigatewayv2")
+    lambda_client = make_client("lambda")
+    with Stubber(client) as stubber, Stubber(lambda_client) as lambda_stubber:
+        stubber.add_response(
+            "get_apis",
+            {
+                "Items": [
+                    {
+                        "Name": f"sych-llm-pg-api-{ENDPOINT}",
+                        "ApiId": "a1b2c3d4e5",
+                        "ApiEndpoint": "https://a1b2c3d4e5.execute-api.us-east-1"
+                        + ".amazonaws.com",
+                        "ProtocolType": "HTTP",
+                        "RouteSelectionExpression": "$request.method $request.path",
+                        "Tags": {PROXY_FUNCTION_TAG: FUNCTION},
+                    },
+                    {
+                        "Name": "websocket",
+                        "ApiId": "f6g7h8i9j0",
+                        "ProtocolType": "WEBSOCKET",
+                        "RouteSelectionExpression": "$request.body.action",
+                    },
+                ]
+            },
+            {"MaxResults": "99"},
+        )
+        stubber.add_response("delete_api", {}, {"ApiId": "a1b2c3d4e5"})
+        lambda_stubber.add_response("delete_function", {}, {"FunctionName": FUNCTION})
+
+        resources = _list_resources("HTTP API", client, "us-east-1", 99)
+        assert resources == [
+            {
+                "name": f"sych-llm-pg-api-{ENDPOINT}",
+                "id": "a1b2c3d4e5",
+                "method": "POST",
+                "url": "https://a1b2c3d4e5.execute-api.us-east-1.amazonaws.com"
+                + "/prod/predict",
+                "function": FUNCTION,
+            }
+        ]
+        delete_http_api(client, lambda_client, resources[0])
+        lambda_stubber.assert_no_pending_responses()
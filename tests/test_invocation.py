@@ -0,0 +1,29 @@
+"""Test cases for the invocation of endpoints."""
+
+from typing import Any
+from typing import Callable
+
+from botocore.stub import ANY
+from botocore.stub import Stubber
+
+from sych_llm_playground.providers.aws.utils.invocation import WARM_UP_ENDPOINT_NAME
+from sych_llm_playground.providers.aws.utils.invocation import warm_up_connection
+
+
+def test_warm_up_connection(make_client: Callable[..., Any]) -> None:
+    """It sends a request no model answers, and ignores its rejection."""
+    client = make_client("sagemaker-runtime")
+    with Stubber(client) as stubber:
+        stubber.add_client_error(
+            "invoke_endpoint",
+            service_error_code="ValidationError",
+            service_message=f"Endpoint {WARM_UP_ENDPOINT_NAME} not found.",
+            http_status_code=400,
+            expected_params={
+                "EndpointName": WARM_UP_ENDPOINT_NAME,
+                "ContentType": "application/json",
+                "Body": ANY,
+            },
+        )
+        warm_up_connection(client)
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,140 @@
+"""Test cases for the open-loop load generator."""
+
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+
+from sych_llm_playground.providers.aws.emulate import create_emulator
+from sych_llm_playground.providers.aws.utils.invocation import gateway_invoker
+from sych_llm_playground.providers.aws.utils.loadgen import constant_schedule
+from sych_llm_playground.providers.aws.utils.loadgen import load_curve
+from sych_llm_playground.providers.aws.utils.loadgen import poisson_schedule
+from sych_llm_playground.providers.aws.utils.loadgen import read_trace
+from sych_llm_playground.providers.aws.utils.loadgen import run_open_loop
+from sych_llm_playground.providers.aws.utils.loadgen import saturation_knee
+from sych_llm_playground.providers.aws.utils.loadgen import step_schedule
+from sych_llm_playground.providers.aws.utils.loadgen import synthetic_payload
+
+
+def result(scheduled: float, latency: float, error: Any = None) -> Dict[str, Any]:
+    """Build the result of a request."""
+    return {
+        "scheduled": scheduled,
+        "completed": scheduled + latency,
+        "latency": latency,
+        "error": error,
+    }
+
+
+def test_schedules() -> None:
+    """It schedules constant, Poisson and ramped arrivals."""
+    assert constant_schedule(4, 1) == [0, 0.25, 0.5, 0.75]
+
+    arrivals = poisson_schedule(100, 10, rng=random.Random(0))
+    assert 900 < len(arrivals) < 1100
+    assert arrivals == sorted(arrivals) and arrivals[-1] < 10
+
+    ramp = step_schedule(1, 2, steps=3, step_duration=2)
+    per_step = [
+        sum(1 for t in ramp if 2 * step <= t < 2 * step + 2) for step in range(3)
+    ]
+    assert per_step == [2, 6, 10]
+
+
+def test_read_trace(tmp_path: Path) -> None:
+    """It sorts a trace and makes its timestamps relative."""
+    trace_file = tmp_path / "trace.jsonl"
+    trace_file.write_text(
+        '{"timestamp": 1700000002.5, "prompt_words": 10}\n\n'
+        + '{"timestamp": 1700000000, "prompt_words": "20", "max_new_tokens": 8}\n'
+    )
+    records = read_trace(str(trace_file))
+    assert [(r["timestamp"], r["prompt_words"]) for r in records] == [
+        (0.0, 20),
+        (2.5, 10),
+    ]
+
+    trace_file.write_text('{"timestamp": 1}\n')
+    with pytest.raises(ValueError):
+        read_trace(str(trace_file))
+
+
+def test_synthetic_payload() -> None:
+    """It builds payloads in the format of the endpoint."""
+    predict = synthetic_payload("predict", 3, 16)
+    assert predict["inputs"] == "load load load"
+    assert predict["parameters"]["max_new_tokens"] == 16
+    chat = synthetic_payload("chat", 2, 16)
+    assert chat["inputs"] == [[{"role": "user", "content": "load load"}]]
+
+
+def test_open_loop_does_not_wait_for_responses() -> None:
+    """It sends requests on schedule while earlier ones are in flight."""
+    sent: List[float] = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def invoke(payload: Dict[str, Any]) -> Any:
+        with lock:
+            sent.append(time.perf_counter() - start)
+        time.sleep(0.3)
+        if payload["fail"]:
+            raise RuntimeError("Boom")
+
+    arrivals = [(index * 0.05, {"fail": index == 2}) for index in range(4)]
+    results = run_open_loop(invoke, arrivals)
+
+    assert max(sent) < 0.3
+    assert [r["scheduled"] for r in results] == [0, 0.05, 0.1, 0.15000000000000002]
+    assert all(r["latency"] >= 0.3 for r in results)
+    assert results[2]["error"] == "Boom"
+
+
+def test_load_curve_and_knee() -> None:
+    """It reports latency by offered load and finds the saturation knee."""
+    results = (
+        [result(t / 2, 1.0) for t in range(4)]  # 2/s in [0, 2)
+        + [result(2 + t / 4, 1.1) for t in range(8)]  # 4/s in [2, 4)
+        + [result(4 + t / 8, 3.0) for t in range(16)]  # 8/s in [4, 6)
+    )
+    curve = load_curve(results, window=2)
+    assert [point["offered"] for point in curve] == [2, 4, 8]
+    assert [point["p50"] for point in curve] == [1.0, 1.1, 3.0]
+    assert curve[0]["errors"] == 0
+
+    knee = saturation_knee(curve)
+    assert knee is not None and knee["offered"] == 8
+    assert saturation_knee(curve[:2]) is None
+
+    failing = load_curve([result(0, 1.0), result(0.5, 1.0, "Throttled")], window=2)
+    assert failing[0]["errors"] == 0.5
+    assert saturation_knee(failing) == failing[0]
+
+
+def test_load_against_emulator() -> None:
+    """It saturates an emulated endpoint with limited concurrency."""
+    server = create_emulator(
+        "127.0.0.1", 0, time_to_first_token=0.1, token_delay=0, max_concurrency=1
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        invoke = gateway_invoker(f"http://127.0.0.1:{server.server_port}/prod/predict")
+        payload = synthetic_payload("predict", 8, 4)
+        arrivals = [(t, payload) for t in step_schedule(2, 18, 2, 1)]
+        curve = load_curve(run_open_loop(invoke, arrivals), window=1)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert [point["offered"] for point in curve] == [2, 20]
+    assert curve[0]["errors"] == 0
+    assert json.dumps(saturation_knee(curve)) == json.dumps(curve[1])
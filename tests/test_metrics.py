@@ -0,0 +1,88 @@
+"""Test cases for the metrics registry."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from sych_llm_playground.utils.metrics import Counter
+from sych_llm_playground.utils.metrics import Gauge
+from sych_llm_playground.utils.metrics import Histogram
+from sych_llm_playground.utils.metrics import MetricsRegistry
+from sych_llm_playground.utils.metrics import enable_metrics
+
+
+@pytest.fixture
+def enabled() -> Iterator[None]:
+    """Record metrics during a test."""
+    enable_metrics()
+    yield
+    enable_metrics(False)
+
+
+def test_disabled_metrics() -> None:
+    """It records nothing while metrics are disabled."""
+    requests = Counter("requests_total", "Requests.", ["outcome"])
+    latency = Histogram("latency_seconds", "Latency.")
+    requests.inc(outcome="ok")
+    latency.observe(0.2)
+
+    assert list(requests.samples()) == []
+    assert list(latency.samples()) == []
+
+
+def test_prometheus_exposition(enabled: None, tmp_path: Path) -> None:
+    """It renders counters, gauges and histograms in the text format."""
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("requests_total", "Requests.", ["outcome"]))
+    assert isinstance(requests, Counter)
+    requests.inc(outcome="ok")
+    requests.inc(2, outcome='a "quoted"\nerror')
+    inflight = registry.register(Gauge("inflight", "Requests in flight."))
+    assert isinstance(inflight, Gauge)
+    inflight.set(3)
+    inflight.dec()
+    latency = registry.register(
+        Histogram("latency_seconds", "Latency.", ["mode"], buckets=[0.5, 1.0])
+    )
+    assert isinstance(latency, Histogram)
+    latency.observe(0.2, mode="chat")
+    latency.observe(0.7, mode="chat")
+    latency.observe(4.0, mode="chat")
+    registry.register(Counter("unused_total", "Never incremented."))
+
+    target = tmp_path / "sych.prom"
+    registry.write(str(target))
+
+    assert target.read_text() == (
+        "# HELP inflight Requests in flight.\n"
+        "# TYPE inflight gauge\n"
+        "inflight 2\n"
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{mode="chat",le="0.5"} 1\n'
+        'latency_seconds_bucket{mode="chat",le="1"} 2\n'
+        'latency_seconds_bucket{mode="chat",le="+Inf"} 3\n'
+        'latency_seconds_sum{mode="chat"} 4.9\n'
+        'latency_seconds_count{mode="chat"} 3\n'
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{outcome="a \\"quoted\\"\\nerror"} 2\n'
+        'requests_total{outcome="ok"} 1\n'
+    )
+    assert [path.name for path in tmp_path.iterdir()] == ["sych.prom"]
+
+
+def test_register_returns_existing_metric() -> None:
+    """It returns the metric already registered under a name."""
+    registry = MetricsRegistry()
+    first = registry.register(Counter("requests_total", "Requests."))
+    assert registry.register(Counter("requests_total", "Requests.")) is first
+
+
+def test_register_rejects_other_metric_types() -> None:
+    """It refuses to register a name again as another type of metric."""
+    registry = MetricsRegistry()
+    registry.register(Counter("requests_total", "Requests."))
+    with pytest.raises(TypeError):
+        registry.register(Gauge("requests_total", "Requests."))
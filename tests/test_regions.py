@@ -0,0 +1,117 @@
+"""Test cases for working with endpoints in several regions."""
+
+import math
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import pytest
+from botocore.stub import Stubber
+
+from sych_llm_playground.providers.aws.utils import resources
+from sych_llm_playground.providers.aws.utils.regions import RegionSelector
+from sych_llm_playground.providers.aws.utils.regions import fan_out
+from sych_llm_playground.providers.aws.utils.regions import parse_regions
+from sych_llm_playground.providers.aws.utils.regions import regional_invoker
+
+
+def test_parse_regions() -> None:
+    """It parses distinct regions, ignoring blanks."""
+    assert parse_regions(" us-east-1, eu-west-1,,us-east-1 ") == [
+        "us-east-1",
+        "eu-west-1",
+    ]
+    assert parse_regions(None) == []
+
+
+def test_fan_out() -> None:
+    """It separates the results of regions from their errors."""
+
+    def function(region: str) -> str:
+        if region == "eu-west-1":
+            raise ValueError("unavailable")
+        return region.upper()
+
+    results, errors = fan_out(["us-east-1", "eu-west-1"], function)
+    assert results == {"us-east-1": "US-EAST-1"}
+    assert [*errors] == ["eu-west-1"]
+
+
+def test_region_selector_reprobes() -> None:
+    """It chooses the fastest region, and switches after probing again."""
+    latencies = {"us-east-1": 0.08, "eu-west-1": 0.02, "ap-south-1": math.inf}
+    now = [0.0]
+    selector = RegionSelector(
+        [*latencies],
+        probe=lambda region: latencies[region],
+        reprobe_interval=60,
+        clock=lambda: now[0],
+    )
+    assert selector.choose() == "eu-west-1"
+
+    latencies["eu-west-1"] = 0.2
+    now[0] = 30
+    assert selector.choose() == "eu-west-1"
+    now[0] = 60
+    selector.choose()
+    deadline = time.monotonic() + 5
+    while selector.choose() != "us-east-1" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert selector.choose() == "us-east-1"
+    assert selector.summary() == [
+        {"region": "us-east-1", "rtt": 80.0},
+        {"region": "eu-west-1", "rtt": 200.0},
+        {"region": "ap-south-1", "rtt": None},
+    ]
+
+
+def test_regional_invoker() -> None:
+    """It sends payloads to the invoker of the chosen region."""
+    selector = RegionSelector(
+        ["us-east-1", "eu-west-1"],
+        probe=lambda region: 0.01 if region == "eu-west-1" else 0.1,
+    )
+    invoke = regional_invoker(
+        selector,
+        {
+            "us-east-1": lambda payload: "us-east-1",
+            "eu-west-1": lambda payload: "eu-west-1",
+        },
+    )
+    assert invoke({"inputs": "Hello"}) == "eu-west-1"
+
+
+def test_get_resources_in_regions(
+    monkeypatch: pytest.MonkeyPatch, make_client: Callable[..., Any]
+) -> None:
+    """It lists the endpoints of every region and reports failing regions."""
+    clients = {
+        region: make_client("sagemaker", region)
+        for region in ["us-east-1", "eu-west-1"]
+    }
+    monkeypatch.setattr(resources, "_resource_cache", {})
+    monkeypatch.setattr(
+        resources, "get_client", lambda service, region: clients[region]
+    )
+    endpoint: Dict[str, Any] = {
+        "EndpointName": "sych-llm-pg-meta-textgeneration-llama-2-7b-f-e-1692399247",
+        "EndpointArn": "arn:aws:sagemaker:us-east-1:123456789012:endpoint/x",
+        "CreationTime": "2023-08-19T00:00:00Z",
+        "LastModifiedTime": "2023-08-19T00:00:00Z",
+        "EndpointStatus": "InService",
+    }
+    with Stubber(clients["us-east-1"]) as stubber, Stubber(
+        clients["eu-west-1"]
+    ) as failing:
+        stubber.add_response("list_endpoints", {"Endpoints": [endpoint]})
+        failing.add_client_error("list_endpoints", service_error_code="AccessDenied")
+        listed: List[Dict[str, str]] = resources.get_resources_in_regions(
+            "Endpoint", ["us-east-1", "eu-west-1"]
+        )
+
+    assert [(item["name"], item["region"]) for item in listed] == [
+        (endpoint["EndpointName"], "us-east-1")
+    ]
@@ -0,0 +1,161 @@
+"""Test cases for the resilient invocation layer."""
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.exceptions import EndpointConnectionError
+
+from sych_llm_playground.providers.aws.utils.resilience import FATAL
+from sych_llm_playground.providers.aws.utils.resilience import RETRYABLE
+from sych_llm_playground.providers.aws.utils.resilience import THROTTLED
+from sych_llm_playground.providers.aws.utils.resilience import AIMDLimiter
+from sych_llm_playground.providers.aws.utils.resilience import CircuitBreaker
+from sych_llm_playground.providers.aws.utils.resilience import CircuitOpenError
+from sych_llm_playground.providers.aws.utils.resilience import ResilientInvoker
+from sych_llm_playground.providers.aws.utils.resilience import classify_error
+
+
+def client_error(
+    code: str, status: int = 400, original_status: Optional[int] = None
+) -> ClientError:
+    """Build a ClientError as raised by botocore."""
+    response: Dict[str, Any] = {
+        "Error": {"Code": code, "Message": code},
+        "ResponseMetadata": {"HTTPStatusCode": status},
+    }
+    if original_status:
+        response["OriginalStatusCode"] = original_status
+    return ClientError(response, "InvokeEndpoint")
+
+
+class FlakyEndpoint:
+    """Endpoint raising queued errors before answering."""
+
+    def __init__(self, errors: List[Exception]) -> None:
+        """Initialize the endpoint with the errors to raise."""
+        self.errors = errors
+        self.calls = 0
+
+    def __call__(
+        self,
+        endpoint_name: str,
+        payload: Any,
+        runtime_client: Any,
+        inference_component: Optional[str] = None,
+    ) -> Any:
+        """Raise the next queued error, or answer."""
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return [{"generation": endpoint_name}]
+
+
+def test_classify_error() -> None:
+    """It separates throttling, transient and fatal errors."""
+    assert classify_error(client_error("ThrottlingException")) == THROTTLED
+    assert classify_error(client_error("ModelError", 424, 429)) == THROTTLED
+    assert classify_error(client_error("ModelNotReadyException")) == RETRYABLE
+    assert classify_error(EndpointConnectionError(endpoint_url="x")) == RETRYABLE
+    assert classify_error(client_error("ValidationError")) == FATAL
+    assert classify_error(KeyError("generation")) == FATAL
+
+
+def test_aimd_limiter_adapts() -> None:
+    """It ramps up while healthy and halves on throttling or latency spikes."""
+    limiter = AIMDLimiter(initial=4, maximum=8)
+    for _ in range(8):
+        limiter.acquire()
+        limiter.release(1.0)
+    assert 5 <= limiter.limit <= 6
+
+    limiter.acquire()
+    limiter.release(None, throttled=True)
+    assert 2.5 <= limiter.limit <= 3
+
+    before = limiter.limit
+    limiter.acquire()
+    limiter.release(10.0)
+    assert limiter.limit == before / 2
+
+
+def test_circuit_breaker_opens_and_recovers() -> None:
+    """It opens after repeated failures and closes after a successful trial."""
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=10, clock=lambda: now[0]
+    )
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()  # Only a single trial request
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_retries_retryable_errors() -> None:
+    """It retries transient errors until the endpoint answers."""
+    endpoint = FlakyEndpoint(
+        [client_error("ThrottlingException"), client_error("ModelNotReadyException")]
+    )
+    invoker = ResilientInvoker(base_delay=0, invoke=endpoint)
+
+    assert invoker.endpoint_invoker("e-1")({}) == [{"generation": "e-1"}]
+    assert endpoint.calls == 3
+    assert invoker.retries == 2
+
+
+def test_does_not_retry_fatal_errors() -> None:
+    """It raises fatal errors right away."""
+    endpoint = FlakyEndpoint([client_error("ValidationError")])
+    invoker = ResilientInvoker(base_delay=0, invoke=endpoint)
+
+    with pytest.raises(ClientError):
+        invoker.invoke_endpoint("e-1", {})
+    assert endpoint.calls == 1
+
+
+def test_refuses_requests_while_circuit_is_open() -> None:
+    """It stops invoking an endpoint that keeps failing."""
+    endpoint = FlakyEndpoint([client_error("ServiceUnavailable")] * 10)
+    invoker = ResilientInvoker(max_retries=9, base_delay=0, invoke=endpoint)
+
+    with pytest.raises(CircuitOpenError):
+        invoker.invoke_endpoint("e-1", {})
+    assert endpoint.calls == invoker.breaker("e-1").failure_threshold
+
+
+def test_fatal_trial_closes_circuit() -> None:
+    """It closes a half-open circuit when the trial request fails fatally."""
+    endpoint = FlakyEndpoint([client_error("ValidationError")])
+    invoker = ResilientInvoker(base_delay=0, invoke=endpoint)
+    breaker = invoker.breaker("e-1")
+    breaker.state = breaker.OPEN
+    breaker.reset_timeout = 0
+
+    with pytest.raises(ClientError):
+        invoker.invoke_endpoint("e-1", {})
+    assert breaker.state == breaker.CLOSED
+    assert invoker.limiter.in_flight == 0
+    assert invoker.invoke_endpoint("e-1", {}) == [{"generation": "e-1"}]
+
+
+def test_model_error_trial_reopens_circuit() -> None:
+    """It reopens a half-open circuit when the model container fails."""
+    endpoint = FlakyEndpoint([client_error("ModelError", 424)])
+    invoker = ResilientInvoker(base_delay=0, invoke=endpoint)
+    breaker = invoker.breaker("e-1")
+    breaker.state = breaker.OPEN
+    breaker.reset_timeout = 0
+
+    with pytest.raises(ClientError):
+        invoker.invoke_endpoint("e-1", {})
+    assert breaker.state == breaker.OPEN
+    assert endpoint.calls == 1
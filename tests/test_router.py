@@ -0,0 +1,117 @@
+"""Test cases for the endpoint router."""
+
+from typing import Any
+from typing import Dict
+
+import pytest
+from botocore.exceptions import ClientError
+
+from sych_llm_playground.providers.aws.utils.router import EndpointRouter
+from sych_llm_playground.providers.aws.utils.router import group_by_model
+
+
+def client_error(code: str, status: int) -> ClientError:
+    """Build a ClientError as raised by botocore."""
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": code},
+            "ResponseMetadata": {"HTTPStatusCode": status},
+        },
+        "InvokeEndpoint",
+    )
+
+
+class Clock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Initialize the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_group_by_model() -> None:
+    """It groups endpoints by the model ID encoded in their names."""
+    groups = group_by_model(
+        [
+            "sych-llm-pg-meta-textgeneration-llama-2-7b-e-1",
+            "sych-llm-pg-meta-textgeneration-llama-2-7b-f-e-2",
+            "sych-llm-pg-meta-textgeneration-llama-2-7b-e-3",
+            "other-endpoint",
+        ]
+    )
+
+    assert groups == {
+        "meta-textgeneration-llama-2-7b": [
+            "sych-llm-pg-meta-textgeneration-llama-2-7b-e-1",
+            "sych-llm-pg-meta-textgeneration-llama-2-7b-e-3",
+        ],
+        "meta-textgeneration-llama-2-7b-f": [
+            "sych-llm-pg-meta-textgeneration-llama-2-7b-f-e-2"
+        ],
+    }
+
+
+def test_least_outstanding_requests() -> None:
+    """It routes to the endpoint with the fewest outstanding requests."""
+    router = EndpointRouter(["a", "b"])
+
+    with router.acquire() as first:
+        with router.acquire() as second:
+            assert {first, second} == {"a", "b"}
+
+
+def test_prefers_lower_latency() -> None:
+    """It routes idle traffic to the endpoint with the lowest latency EWMA."""
+    clock = Clock()
+    router = EndpointRouter(["a", "b"], clock=clock)
+    for endpoint_name, latency in [("a", 2.0), ("b", 1.0)]:
+        router.stats[endpoint_name].ewma_latency = latency
+
+    assert router.choose() == "b"
+
+
+def test_ejects_failing_endpoints() -> None:
+    """It ejects endpoints after consecutive failures and retries them later."""
+    clock = Clock()
+
+    def invoke(endpoint_name: str, payload: Dict[str, Any]) -> Any:
+        if endpoint_name == "a":
+            raise client_error("ModelError", 424)
+        return endpoint_name
+
+    router = EndpointRouter(
+        ["a", "b"], failure_threshold=2, ejection_seconds=10, invoke=invoke, clock=clock
+    )
+    router.stats["b"].outstanding = 1  # Make "a" the first choice
+
+    for _ in range(2):
+        with pytest.raises(ClientError):
+            router.invoke({})
+    assert router.invoke({}) == "b"
+    assert [stats["ejected"] for stats in router.summary()] == [True, False]
+
+    clock.now = 11
+    assert router.choose() == "a"
+
+
+def test_bad_requests_do_not_eject() -> None:
+    """It counts neither answers to bad requests nor interrupts as failures."""
+    errors = [client_error("ValidationError", 400), KeyboardInterrupt()]
+
+    def invoke(endpoint_name: str, payload: Dict[str, Any]) -> Any:
+        raise errors.pop(0)
+
+    router = EndpointRouter(["a"], failure_threshold=1, invoke=invoke)
+    with pytest.raises(ClientError):
+        router.invoke({})
+    with pytest.raises(KeyboardInterrupt):
+        router.invoke({})
+
+    stats = router.stats["a"]
+    assert (stats.requests, stats.failures, stats.outstanding) == (2, 0, 0)
+    assert stats.consecutive_failures == 0
+    assert not router.summary()[0]["ejected"]
@@ -0,0 +1,122 @@
+"""Test cases for the OpenAI-compatible proxy server."""
+
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+import pytest
+
+from sych_llm_playground.providers.aws.serve import ProxyServer
+from sych_llm_playground.providers.aws.serve import create_server
+
+
+CHAT_ENDPOINT = "sych-llm-pg-meta-textgeneration-llama-2-7b-f-e-1692586488"
+PREDICT_ENDPOINT = "sych-llm-pg-meta-textgeneration-llama-2-7b-e-1692586488"
+
+
+class StubRuntimeClient:
+    """SageMaker Runtime client returning canned Llama responses."""
+
+    def __init__(self) -> None:
+        """Initialize the stub."""
+        self.payloads: List[Dict[str, Any]] = []
+
+    def invoke_endpoint(self, **kwargs: Any) -> Any:
+        """Return a Llama-shaped response for the endpoint's payload format."""
+        self.payloads.append(json.loads(kwargs["Body"]))
+        body: List[Dict[str, Any]]
+        if kwargs["EndpointName"] == CHAT_ENDPOINT:
+            body = [{"generation": {"role": "assistant", "content": "Hello!"}}]
+        else:
+            body = [{"generation": "42."}]
+        return {"Body": io.BytesIO(json.dumps(body).encode())}
+
+    def invoke_endpoint_with_response_stream(self, **kwargs: Any) -> Any:
+        """Return a response stream whose events split lines arbitrarily."""
+        self.payloads.append(json.loads(kwargs["Body"]))
+        stream = b'data:{"token": {"text": "Hel"}}\ndata:{"token": {"text": "lo"}}\n'
+        parts = [stream[:10], stream[10:40], stream[40:]]
+        return {"Body": [{"PayloadPart": {"Bytes": part}} for part in parts]}
+
+
+@pytest.fixture
+def runtime() -> StubRuntimeClient:
+    """Fixture for the stubbed SageMaker Runtime client."""
+    return StubRuntimeClient()
+
+
+@pytest.fixture
+def server(runtime: StubRuntimeClient) -> Iterator[ProxyServer]:
+    """Fixture running the proxy server on a free port."""
+    server = create_server(
+        "127.0.0.1", 0, CHAT_ENDPOINT, [PREDICT_ENDPOINT], runtime_client=runtime
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def post(server: ProxyServer, path: str, body: Any) -> bytes:
+    """Send a POST request to the proxy server and return the response body."""
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_port}{path}",
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:  # noqa: S310
+        data: bytes = response.read()
+        return data
+
+
+def test_chat_completion(server: ProxyServer, runtime: StubRuntimeClient) -> None:
+    """It translates chat completions into chat payloads."""
+    messages = [{"role": "user", "content": "Hi"}]
+    body = post(
+        server, "/v1/chat/completions", {"messages": messages, "max_tokens": 32}
+    )
+
+    assert json.loads(body)["choices"][0]["message"]["content"] == "Hello!"
+    assert runtime.payloads[0]["inputs"] == [messages]
+    assert runtime.payloads[0]["parameters"]["max_new_tokens"] == 32
+
+
+def test_completion_on_predict_endpoint(
+    server: ProxyServer, runtime: StubRuntimeClient
+) -> None:
+    """It routes requests to the endpoint named as the model."""
+    body = post(
+        server, "/v1/completions", {"model": PREDICT_ENDPOINT, "prompt": "6 x 7 ="}
+    )
+
+    assert json.loads(body)["choices"][0]["text"] == "42."
+    assert runtime.payloads[0]["inputs"] == "6 x 7 ="
+
+
+def test_streaming_chat_completion(server: ProxyServer) -> None:
+    """It streams generated tokens as server-sent events."""
+    messages = [{"role": "user", "content": "Hi"}]
+    body = post(server, "/v1/chat/completions", {"messages": messages, "stream": True})
+
+    events = [line[len("data: ") :] for line in body.decode().split("\n\n") if line]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event)["choices"][0] for event in events[:-1]]
+    assert "".join(chunk["delta"].get("content", "") for chunk in chunks) == "Hello"
+    assert chunks[-1]["finish_reason"] == "stop"
+
+
+def test_rejects_bodies_that_are_not_objects(server: ProxyServer) -> None:
+    """It answers JSON bodies other than objects with an OpenAI-style error."""
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post(server, "/v1/chat/completions", ["Hi"])
+
+    assert error.value.code == 400
+    assert "error" in json.loads(error.value.read())
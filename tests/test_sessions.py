@@ -0,0 +1,74 @@
+"""Test cases for the chat session log."""
+
+from pathlib import Path
+
+import pytest
+
+from sych_llm_playground.providers.aws.utils import sessions
+
+
+@pytest.fixture(autouse=True)
+def sessions_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Fixture storing sessions in a temporary directory."""
+    monkeypatch.setattr(sessions, "SESSIONS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_turns_are_appended(sessions_dir: Path) -> None:
+    """It writes one record per turn after the session record."""
+    session = sessions.create_session("endpoint", {"top_p": 0.9}, "Be brief.")
+    session.append_turn("Hi", "Hello!")
+    session.append_turn("Bye", "Goodbye!")
+
+    lines = (sessions_dir / f"{session.session_id}.jsonl").read_text().splitlines()
+    assert len(lines) == 3
+
+
+def test_resume_reads_only_the_tail(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It resumes with the most recent turns that fit in the context window."""
+    monkeypatch.setattr(sessions, "_BLOCK_SIZE", 64)
+    session = sessions.create_session("endpoint", {"top_p": 0.9}, "Be brief.")
+    for i in range(100):
+        session.append_turn(f"question {i:03}", f"answer {i:03}")
+
+    resumed = sessions.resume_session(session.session_id, context_window_chars=100)
+
+    assert resumed is not None
+    assert resumed.endpoint_name == "endpoint"
+    assert [turn["user"] for turn in resumed.turns] == [
+        f"question {i:03}" for i in range(96, 100)
+    ]
+    history = resumed.conversation_history()
+    assert history[0] == {"role": "system", "content": "Be brief."}
+    assert history[-1] == {"role": "assistant", "content": "answer 099"}
+
+
+def test_resume_skips_a_truncated_turn(sessions_dir: Path) -> None:
+    """It ignores a turn cut short while being written."""
+    session = sessions.create_session("endpoint", {})
+    session.append_turn("Hi", "Hello!")
+    with open(sessions_dir / f"{session.session_id}.jsonl", "a") as f:
+        f.write('{"type": "turn", "user": "Are yo')
+
+    resumed = sessions.resume_session(session.session_id)
+
+    assert resumed is not None
+    assert resumed.turns == [{"user": "Hi", "assistant": "Hello!"}]
+
+
+def test_append_after_a_truncated_turn(sessions_dir: Path) -> None:
+    """It keeps turns appended after a turn cut short while being written."""
+    session = sessions.create_session("endpoint", {})
+    with open(sessions_dir / f"{session.session_id}.jsonl", "a") as f:
+        f.write('{"type": "turn", "user": "Are yo')
+    session.append_turn("Hi", "Hello!")
+
+    resumed = sessions.resume_session(session.session_id)
+
+    assert resumed is not None
+    assert resumed.turns == [{"user": "Hi", "assistant": "Hello!"}]
+
+
+def test_resume_unknown_session() -> None:
+    """It returns None for unknown sessions."""
+    assert sessions.resume_session("unknown") is None
@@ -0,0 +1,52 @@
+"""Test cases for the shell module."""
+
+from typing import Any
+from typing import List
+
+import pytest
+from click.testing import CliRunner
+
+from sych_llm_playground import __main__
+from sych_llm_playground import shell
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Fixture for invoking command-line interfaces."""
+    return CliRunner()
+
+
+def test_shell_runs_commands_until_exit(
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It warms up the provider once and runs commands until exit."""
+    calls: List[str] = []
+
+    def fake_call(provider: str, name: str, **kwargs: Any) -> None:
+        calls.append(name)
+
+    monkeypatch.setattr(shell, "select_provider", lambda: "AWS")
+    monkeypatch.setattr(shell, "call_provider_function", fake_call)
+
+    result = runner.invoke(__main__.main, ["shell"], input="help\nshell\nexit\n")
+
+    assert result.exit_code == 0
+    assert calls == ["shell"]
+    assert "Commands:" in result.output
+    assert "Already running a shell." in result.output
+
+
+def test_shell_reports_unbalanced_quotes(
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It reports a line it cannot split and keeps running."""
+    monkeypatch.setattr(shell, "select_provider", lambda: "AWS")
+    monkeypatch.setattr(shell, "call_provider_function", lambda *a, **k: None)
+
+    result = runner.invoke(
+        __main__.main, ["shell"], input="interact --resume 'abc\nexit\n"
+    )
+
+    assert result.exit_code == 0
+    assert "Invalid command line: No closing quotation" in result.output
+    assert "Shell ended." in result.output
@@ -0,0 +1,70 @@
+"""Test cases for sweeps of sampling parameters."""
+
+from typing import Any
+from typing import Dict
+
+import pytest
+
+from sych_llm_playground.providers.aws.sweep import build_cells
+from sych_llm_playground.providers.aws.utils.sweep import run_sweep
+from sych_llm_playground.providers.aws.utils.sweep import sort_cells
+from sych_llm_playground.providers.aws.utils.sweep import summarize_sweep
+
+
+def test_build_cells() -> None:
+    """It builds the full grid, or samples ranges at random."""
+    grid = build_cells("64,128", "0.9", "0.2,0.6,1.0")
+    assert len(grid) == 6
+    assert grid[0] == {"max_new_tokens": 64, "top_p": 0.9, "temperature": 0.2}
+
+    cells = build_cells("32:256", "0.5:1", "0.6", samples=20, seed=7)
+    assert len(cells) == 20
+    assert all(32 <= cell["max_new_tokens"] <= 256 for cell in cells)
+    assert all(isinstance(cell["max_new_tokens"], int) for cell in cells)
+    assert all(0.5 <= cell["top_p"] <= 1 for cell in cells)
+    assert cells == build_cells("32:256", "0.5:1", "0.6", samples=20, seed=7)
+
+    with pytest.raises(ValueError):
+        build_cells("32:256", "0.9", "0.6")
+    with pytest.raises(ValueError):
+        build_cells("many", "0.9", "0.6")
+
+
+def test_run_sweep() -> None:
+    """It measures every cell and sorts the cells by a metric."""
+    cells = [
+        {"max_new_tokens": 8, "top_p": 0.9, "temperature": 0.6},
+        {"max_new_tokens": 64, "top_p": 0.9, "temperature": 0.6},
+        {"max_new_tokens": 128, "top_p": 0.9, "temperature": 0.6},
+    ]
+    now = [0.0]
+
+    def invoke(payload: Dict[str, Any]) -> Any:
+        tokens = payload["parameters"]["max_new_tokens"]
+        if tokens == 128:
+            raise TimeoutError("Model timed out")
+        now[0] += tokens / 32
+        return [{"generation": "abcd" * tokens}]
+
+    results = run_sweep(
+        invoke,
+        "predict",
+        ["Hello", "Bonjour"],
+        cells,
+        max_in_flight=1,
+        clock=lambda: now[0],
+    )
+    assert len(results) == 6
+    assert [result["error"] for result in results[4:]] == ["Model timed out"] * 2
+
+    rows = summarize_sweep(cells, results)
+    assert rows[0]["output_tokens"] == 8
+    assert rows[0]["latency"] == pytest.approx(0.25)
+    assert rows[1]["tokens_per_second"] == pytest.approx(32)
+    assert rows[2]["errors"] == 1.0
+    assert rows[2]["latency"] is None
+
+    by_latency = sort_cells(rows, "latency")
+    assert [row["max_new_tokens"] for row in by_latency] == [8, 64, 128]
+    by_tokens = sort_cells(rows, "output_tokens")
+    assert [row["max_new_tokens"] for row in by_tokens] == [64, 8, 128]
@@ -0,0 +1,93 @@
+"""Test cases for the tracing utilities."""
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from sych_llm_playground.providers.aws.utils.regions import fan_out
+from sych_llm_playground.utils.tracing import Tracer
+from sych_llm_playground.utils.tracing import annotate
+from sych_llm_playground.utils.tracing import span
+from sych_llm_playground.utils.tracing import start_tracing
+from sych_llm_playground.utils.tracing import stop_tracing
+
+
+def ticks() -> Iterator[float]:
+    """Yield the times of a fake clock advancing one second per reading."""
+    now = 0.0
+    while True:
+        yield now
+        now += 1.0
+
+
+def test_nested_spans(tmp_path: Path) -> None:
+    """It records nested spans and writes them as a Chrome trace."""
+    clock = ticks()
+    tracer = Tracer(clock=lambda: next(clock))
+
+    with tracer.span("Deploy"):
+        with tracer.span("Create model", model_name="m") as args:
+            args["instance_type"] = "ml.g5.2xlarge"
+        with pytest.raises(RuntimeError):
+            with tracer.span("Create endpoint"):
+                raise RuntimeError("Capacity error")
+
+    trace_file = tmp_path / "trace.json"
+    tracer.write(str(trace_file))
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+
+    assert [(e["name"], e["ts"], e["dur"]) for e in spans] == [
+        ("Deploy", 1_000_000, 5_000_000),
+        ("Create model", 2_000_000, 1_000_000),
+        ("Create endpoint", 4_000_000, 1_000_000),
+    ]
+    assert spans[1]["args"] == {"model_name": "m", "instance_type": "ml.g5.2xlarge"}
+    assert spans[2]["args"] == {"error": "Capacity error"}
+    assert tracer.summary().splitlines() == [
+        "     5.00s 100%  Deploy",
+        "     1.00s  20%    Create model",
+        "     1.00s  20%    Create endpoint (failed)",
+    ]
+
+
+def test_active_tracer() -> None:
+    """It records spans only while tracing is active."""
+    with span("Untraced", key="value") as args:
+        assert args == {"key": "value"}
+
+    tracer = start_tracing()
+    try:
+        annotate(region="us-east-1")
+        with span("Traced"):
+            pass
+    finally:
+        stop_tracing()
+    with span("Untraced"):
+        pass
+
+    assert [s["name"] for s in tracer.spans] == ["Traced"]
+    assert tracer.to_chrome_trace()["otherData"] == {"region": "us-east-1"}
+
+
+def test_worker_thread_spans_nest() -> None:
+    """It nests spans of regions deployed concurrently under their caller."""
+    tracer = start_tracing()
+    try:
+        with span("Deploy"):
+
+            def deploy_region(region: str) -> None:
+                with span("Deploy region", region=region):
+                    pass
+
+            fan_out(["us-east-1", "eu-west-1"], deploy_region)
+    finally:
+        stop_tracing()
+
+    assert sorted((s["name"], s["depth"]) for s in tracer.spans) == [
+        ("Deploy", 0),
+        ("Deploy region", 1),
+        ("Deploy region", 1),
+    ]
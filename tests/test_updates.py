@@ -0,0 +1,95 @@
+"""Test cases for blue/green updates of endpoints."""
+
+from typing import Any
+from typing import Callable
+
+from botocore.stub import Stubber
+
+from sych_llm_playground.providers.aws.utils.updates import build_deployment_config
+from sych_llm_playground.providers.aws.utils.updates import create_rollback_alarms
+from sych_llm_playground.providers.aws.utils.updates import delete_rollback_alarms
+from sych_llm_playground.providers.aws.utils.updates import traffic_routing
+
+
+def test_traffic_routing() -> None:
+    """It sizes the canary or the linear steps by capacity."""
+    assert traffic_routing("canary", 10, 60) == {
+        "Type": "CANARY",
+        "WaitIntervalInSeconds": 60,
+        "CanarySize": {"Type": "CAPACITY_PERCENT", "Value": 10},
+    }
+    assert traffic_routing("linear", 25)["LinearStepSize"]["Value"] == 25
+    assert traffic_routing("all-at-once", 10) == {
+        "Type": "ALL_AT_ONCE",
+        "WaitIntervalInSeconds": 300,
+    }
+
+
+def test_build_deployment_config() -> None:
+    """It rolls back on the alarms only when there are any."""
+    routing = traffic_routing("all-at-once", 100, 0)
+    assert "AutoRollbackConfiguration" not in build_deployment_config(routing, [])
+    config = build_deployment_config(routing, ["errors"], 120)
+    assert config["BlueGreenUpdatePolicy"]["TerminationWaitInSeconds"] == 120
+    assert config["AutoRollbackConfiguration"] == {"Alarms": [{"AlarmName": "errors"}]}
+
+
+def test_create_rollback_alarms(make_client: Callable[..., Any]) -> None:
+    """It alarms on 5xx errors and on model latency in microseconds."""
+    client = make_client("cloudwatch")
+    dimensions = [
+        {"Name": "EndpointName", "Value": "sych-llm-pg-a-e-1"},
+        {"Name": "VariantName", "Value": "AllTraffic"},
+    ]
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "put_metric_alarm",
+            {},
+            {
+                "AlarmName": "sych-llm-pg-a-e-1-update-5xx-errors",
+                "MetricName": "Invocation5XXErrors",
+                "Namespace": "AWS/SageMaker",
+                "Dimensions": dimensions,
+                "Statistic": "Sum",
+                "Period": 60,
+                "EvaluationPeriods": 1,
+                "Threshold": 1,
+                "ComparisonOperator": "GreaterThanOrEqualToThreshold",
+                "TreatMissingData": "notBreaching",
+            },
+        )
+        stubber.add_response(
+            "put_metric_alarm",
+            {},
+            {
+                "AlarmName": "sych-llm-pg-a-e-1-update-model-latency",
+                "MetricName": "ModelLatency",
+                "Namespace": "AWS/SageMaker",
+                "Dimensions": dimensions,
+                "Statistic": "Average",
+                "Period": 60,
+                "EvaluationPeriods": 2,
+                "DatapointsToAlarm": 2,
+                "Threshold": 1500000.0,
+                "ComparisonOperator": "GreaterThanThreshold",
+                "TreatMissingData": "notBreaching",
+            },
+        )
+        alarms = create_rollback_alarms(client, "sych-llm-pg-a-e-1", True, 1500.0)
+        stubber.assert_no_pending_responses()
+    assert alarms == [
+        "sych-llm-pg-a-e-1-update-5xx-errors",
+        "sych-llm-pg-a-e-1-update-model-latency",
+    ]
+    assert create_rollback_alarms(client, "sych-llm-pg-a-e-1", False) == []
+
+
+def test_delete_rollback_alarms(make_client: Callable[..., Any]) -> None:
+    """It deletes the alarms of a finished update, if there are any."""
+    client = make_client("cloudwatch")
+    alarms = ["sych-llm-pg-a-e-1-update-5xx-errors"]
+    with Stubber(client) as stubber:
+        stubber.add_response("delete_alarms", {}, {"AlarmNames": alarms})
+        delete_rollback_alarms(client, alarms)
+        delete_rollback_alarms(client, [])
+        stubber.assert_no_pending_responses()
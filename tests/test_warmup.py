@@ -0,0 +1,110 @@
+"""Test cases for the warm-up of new endpoints."""
+
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+
+from sych_llm_playground.providers.aws.utils.warmup import concurrency_levels
+from sych_llm_playground.providers.aws.utils.warmup import default_warmup_payloads
+from sych_llm_playground.providers.aws.utils.warmup import warm_up
+
+
+class ColdEndpoint:
+    """Stand-in for an endpoint whose first requests are slow.
+
+    Every invocation advances a fake clock by its latency, which drops
+    from `cold` to `warm` seconds over the first `cold_requests` requests.
+    """
+
+    def __init__(self, cold: float, warm: float, cold_requests: int) -> None:
+        """Initialize a cold endpoint."""
+        self.cold = cold
+        self.warm = warm
+        self.cold_requests = cold_requests
+        self.requests = 0
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def clock(self) -> float:
+        """Return the time of the fake clock."""
+        return self.now
+
+    def __call__(self, payload: Dict[str, Any]) -> Any:
+        """Invoke the endpoint, advancing the fake clock."""
+        with self.lock:
+            self.requests += 1
+            if self.requests <= self.cold_requests:
+                self.now += self.cold / self.requests
+            else:
+                self.now += self.warm
+        return [{"generation": ""}]
+
+
+def test_concurrency_levels() -> None:
+    """It doubles the concurrency up to the highest level."""
+    assert concurrency_levels(1) == [1]
+    assert concurrency_levels(4) == [1, 2, 4]
+    assert concurrency_levels(6) == [1, 2, 4, 6]
+
+
+def test_default_warmup_payloads() -> None:
+    """It builds prompts of increasing lengths."""
+    payloads = default_warmup_payloads([256, 32])
+    assert [len(p["inputs"].split()) for p in payloads] == [32, 256]
+
+
+def test_warm_up_chat_model() -> None:
+    """It warms up chat models with chat payloads, which they accept."""
+    endpoint = ColdEndpoint(cold=10.0, warm=1.0, cold_requests=1)
+
+    def chat(payload: Dict[str, Any]) -> Any:
+        if not isinstance(payload["inputs"], list):
+            raise ValueError("Chat models expect a list of dialogs")
+        return endpoint(payload)
+
+    payloads = default_warmup_payloads([32], kind="chat")
+    assert payloads[0]["inputs"][0][0]["role"] == "user"
+    ready, _ = warm_up(chat, payloads, max_concurrency=1, clock=endpoint.clock)
+    assert ready
+
+
+def test_warm_up_until_stable() -> None:
+    """It repeats a step until latency stabilizes and reports the curve."""
+    endpoint = ColdEndpoint(cold=10.0, warm=1.0, cold_requests=3)
+    points: List[Dict[str, Any]] = []
+
+    ready, curve = warm_up(
+        endpoint,
+        [{"inputs": "Hi"}],
+        max_concurrency=1,
+        on_round=points.append,
+        clock=endpoint.clock,
+    )
+
+    assert ready
+    assert curve == points
+    assert [point["p50"] for point in curve] == pytest.approx(
+        [10.0, 5.0, 10.0 / 3, 1.0, 1.0]
+    )
+
+
+def test_warm_up_not_stable() -> None:
+    """It is not ready when latency does not stabilize or requests fail."""
+
+    def failing(payload: Dict[str, Any]) -> Any:
+        raise ConnectionError("Endpoint unreachable")
+
+    ready, curve = warm_up(
+        failing,
+        [{"inputs": "Hi"}, {"inputs": "Hello"}],
+        max_concurrency=2,
+        max_rounds=2,
+    )
+
+    assert not ready
+    assert len(curve) == 2 * 2 * 2
+    assert curve[0]["errors"] == 1 and curve[-1]["errors"] == 2
+    assert all(point["p50"] is None for point in curve)